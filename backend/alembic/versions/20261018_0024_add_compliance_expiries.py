@@ -0,0 +1,72 @@
+"""Add compliance_expiries projection and cache_versions tables
+
+Revision ID: 20261018_0024
+Revises: 20260127_1200
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0024'
+down_revision = '20260127_1200'
+branch_labels = None
+depends_on = None
+
+
+EMPLOYEE_EXPIRY_FIELDS = [
+    ('visa_expiry_date', 'Visa'),
+    ('emirates_id_expiry', 'Emirates ID'),
+    ('medical_fitness_expiry', 'Medical Fitness'),
+    ('iloe_expiry', 'ILOE'),
+    ('contract_end_date', 'Contract'),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'cache_versions',
+        sa.Column('scope', sa.String(50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('scope'),
+    )
+
+    op.create_table(
+        'compliance_expiries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(20), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('document_type', sa.String(100), nullable=False),
+        sa.Column('expiry_date', sa.Date(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'source_id', 'document_type', name='uq_compliance_expiries_source'),
+    )
+    op.create_index('ix_compliance_expiries_expiry_date', 'compliance_expiries', ['expiry_date'])
+    op.create_index('ix_compliance_expiries_employee_id', 'compliance_expiries', ['employee_id'])
+
+    # Backfill from employee columns and employee documents
+    for field, label in EMPLOYEE_EXPIRY_FIELDS:
+        op.execute(f"""
+            INSERT INTO compliance_expiries (employee_id, source, source_id, document_type, expiry_date)
+            SELECT id, 'employee', id, '{label}', {field}
+            FROM employees
+            WHERE {field} IS NOT NULL
+        """)
+    op.execute("""
+        INSERT INTO compliance_expiries (employee_id, source, source_id, document_type, expiry_date)
+        SELECT employee_id, 'document', id, document_name, expiry_date
+        FROM employee_documents
+        WHERE expiry_date IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_compliance_expiries_employee_id', table_name='compliance_expiries')
+    op.drop_index('ix_compliance_expiries_expiry_date', table_name='compliance_expiries')
+    op.drop_table('compliance_expiries')
+    op.drop_table('cache_versions')
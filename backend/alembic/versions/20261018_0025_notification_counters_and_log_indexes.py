@@ -0,0 +1,44 @@
+"""Add notification unread counters and listing indexes
+
+Revision ID: 20261018_0025
+Revises: 20261018_0024
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0025'
+down_revision = '20261018_0024'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', sa.String(50), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.execute("""
+        INSERT INTO notification_counters (user_id, unread_count)
+        SELECT user_id, COUNT(*)
+        FROM notifications
+        WHERE user_id IS NOT NULL AND is_read = false
+        GROUP BY user_id
+    """)
+
+    op.create_index(
+        'ix_notifications_user_read_created',
+        'notifications',
+        ['user_id', 'is_read', 'created_at'],
+    )
+    op.create_index('ix_audit_logs_entity_timestamp', 'audit_logs', ['entity', 'timestamp'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_entity_timestamp', table_name='audit_logs')
+    op.drop_index('ix_notifications_user_read_created', table_name='notifications')
+    op.drop_table('notification_counters')
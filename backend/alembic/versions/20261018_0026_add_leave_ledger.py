@@ -0,0 +1,74 @@
+"""Add append-only leave ledger
+
+Revision ID: 20261018_0026
+Revises: 20261018_0025
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0026'
+down_revision = '20261018_0025'
+branch_labels = None
+depends_on = None
+
+
+OPENING_COLUMNS = [
+    ('accrual', 'entitlement'),
+    ('carry_forward', 'carried_forward'),
+    ('adjustment', 'adjustment'),
+    ('pending', 'pending'),
+    ('taken', 'used'),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'leave_ledger_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('leave_type', sa.String(50), nullable=False),
+        sa.Column('entry_type', sa.String(20), nullable=False),
+        sa.Column('days', sa.Numeric(6, 2), nullable=False),
+        sa.Column('leave_request_id', sa.Integer(), nullable=True),
+        sa.Column('note', sa.String(255), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.ForeignKeyConstraint(['leave_request_id'], ['leave_requests.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_leave_ledger_employee_year', 'leave_ledger_entries', ['employee_id', 'year', 'leave_type'])
+    op.create_index('ix_leave_ledger_entries_leave_request_id', 'leave_ledger_entries', ['leave_request_id'])
+
+    # Approved days used to be added to pending; requests awaiting approval reserved nothing
+    op.execute("UPDATE leave_balances SET used = used + pending")
+    op.execute("""
+        UPDATE leave_balances b
+        SET pending = COALESCE((
+            SELECT SUM(r.total_days)
+            FROM leave_requests r
+            WHERE r.employee_id = b.employee_id
+            AND r.leave_type = b.leave_type
+            AND r.status = 'pending'
+            AND EXTRACT(YEAR FROM r.start_date) = b.year
+        ), 0)
+    """)
+
+    for entry_type, column in OPENING_COLUMNS:
+        op.execute(f"""
+            INSERT INTO leave_ledger_entries (employee_id, year, leave_type, entry_type, days, note)
+            SELECT employee_id, year, leave_type, '{entry_type}', {column}, 'Opening balance'
+            FROM leave_balances
+            WHERE {column} <> 0
+        """)
+
+
+def downgrade() -> None:
+    # Balances keep the ledger semantics (approved days in used)
+    op.drop_index('ix_leave_ledger_entries_leave_request_id', table_name='leave_ledger_entries')
+    op.drop_index('ix_leave_ledger_employee_year', table_name='leave_ledger_entries')
+    op.drop_table('leave_ledger_entries')
@@ -0,0 +1,84 @@
+"""Add offset-hours ledger and materialized balances
+
+Revision ID: 20261018_0027
+Revises: 20261018_0026
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0027'
+down_revision = '20261018_0026'
+branch_labels = None
+depends_on = None
+
+
+ENTRY_TYPES = ['earned', 'used', 'expired', 'adjusted']
+
+
+def upgrade() -> None:
+    op.create_table(
+        'offset_hours_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('entry_type', sa.String(20), nullable=False),
+        sa.Column('hours', sa.Numeric(6, 2), nullable=False),
+        sa.Column('entry_date', sa.Date(), nullable=False),
+        sa.Column('attendance_record_id', sa.Integer(), nullable=True),
+        sa.Column('note', sa.String(255), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.ForeignKeyConstraint(['attendance_record_id'], ['attendance_records.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_offset_hours_employee_created', 'offset_hours_entries', ['employee_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_offset_hours_entries_attendance_record_id', 'offset_hours_entries', ['attendance_record_id']
+    )
+
+    op.create_table(
+        'offset_hours_balances',
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        *[
+            sa.Column(name, sa.Numeric(8, 2), server_default='0', nullable=False)
+            for name in ENTRY_TYPES
+        ],
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.PrimaryKeyConstraint('employee_id'),
+    )
+
+    # Backfill: earned hours from attendance, and "Used" references as time off taken
+    op.execute("""
+        INSERT INTO offset_hours_entries (employee_id, entry_type, hours, entry_date, attendance_record_id, note)
+        SELECT employee_id, 'earned', offset_hours_earned, attendance_date, id, 'Opening balance'
+        FROM attendance_records
+        WHERE offset_hours_earned > 0
+    """)
+    op.execute("""
+        INSERT INTO offset_hours_entries (employee_id, entry_type, hours, entry_date, attendance_record_id, note)
+        SELECT employee_id, 'used', offset_hours_earned, attendance_date, id, offset_day_reference
+        FROM attendance_records
+        WHERE offset_hours_earned > 0 AND offset_day_reference LIKE '%Used%'
+    """)
+    totals = ", ".join(
+        f"COALESCE(SUM(CASE WHEN entry_type = '{t}' THEN hours ELSE 0 END), 0)" for t in ENTRY_TYPES
+    )
+    op.execute(f"""
+        INSERT INTO offset_hours_balances (employee_id, {", ".join(ENTRY_TYPES)})
+        SELECT employee_id, {totals}
+        FROM offset_hours_entries
+        GROUP BY employee_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('offset_hours_balances')
+    op.drop_index('ix_offset_hours_entries_attendance_record_id', table_name='offset_hours_entries')
+    op.drop_index('ix_offset_hours_employee_created', table_name='offset_hours_entries')
+    op.drop_table('offset_hours_entries')
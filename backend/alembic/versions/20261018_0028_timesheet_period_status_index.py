@@ -0,0 +1,22 @@
+"""Add composite index for the timesheet month grid
+
+Revision ID: 20261018_0028
+Revises: 20261018_0027
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+revision = '20261018_0028'
+down_revision = '20261018_0027'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_timesheets_period_status', 'timesheets', ['year', 'month', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_timesheets_period_status', table_name='timesheets')
@@ -0,0 +1,29 @@
+"""Track background CV scoring status on candidates
+
+Revision ID: 20261018_0029
+Revises: 20261018_0028
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0029'
+down_revision = '20261018_0028'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('candidates', sa.Column('cv_scoring_status', sa.String(length=20), nullable=True))
+    op.add_column('candidates', sa.Column('cv_scoring_attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('candidates', sa.Column('cv_scoring_error', sa.String(length=500), nullable=True))
+    op.create_index('ix_candidates_cv_scoring_status', 'candidates', ['cv_scoring_status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidates_cv_scoring_status', table_name='candidates')
+    op.drop_column('candidates', 'cv_scoring_error')
+    op.drop_column('candidates', 'cv_scoring_attempts')
+    op.drop_column('candidates', 'cv_scoring_status')
@@ -0,0 +1,48 @@
+"""Add persisted CV text and score caches
+
+Revision ID: 20261018_0030
+Revises: 20261018_0029
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0030'
+down_revision = '20261018_0029'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'cv_text_cache',
+        sa.Column('content_hash', sa.String(length=64), primary_key=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('char_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_cv_text_cache_last_used_at', 'cv_text_cache', ['last_used_at'])
+    op.create_table(
+        'cv_score_cache',
+        sa.Column('cache_key', sa.String(length=64), primary_key=True),
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('job_hash', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=50), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_cv_score_cache_text_hash', 'cv_score_cache', ['text_hash'])
+    op.create_index('ix_cv_score_cache_last_used_at', 'cv_score_cache', ['last_used_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cv_score_cache_last_used_at', table_name='cv_score_cache')
+    op.drop_index('ix_cv_score_cache_text_hash', table_name='cv_score_cache')
+    op.drop_table('cv_score_cache')
+    op.drop_index('ix_cv_text_cache_last_used_at', table_name='cv_text_cache')
+    op.drop_table('cv_text_cache')
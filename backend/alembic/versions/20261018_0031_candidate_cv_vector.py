@@ -0,0 +1,23 @@
+"""Store hashed CV term vectors for local candidate pre-ranking
+
+Revision ID: 20261018_0031
+Revises: 20261018_0030
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0031'
+down_revision = '20261018_0030'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('candidates', sa.Column('cv_vector', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('candidates', 'cv_vector')
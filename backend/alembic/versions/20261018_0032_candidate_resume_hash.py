@@ -0,0 +1,25 @@
+"""Store the CV content hash on candidates for bulk-upload de-duplication
+
+Revision ID: 20261018_0032
+Revises: 20261018_0031
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0032'
+down_revision = '20261018_0031'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('candidates', sa.Column('resume_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_candidates_resume_hash', 'candidates', ['resume_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidates_resume_hash', table_name='candidates')
+    op.drop_column('candidates', 'resume_hash')
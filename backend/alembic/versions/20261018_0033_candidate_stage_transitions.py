@@ -0,0 +1,45 @@
+"""Add candidate stage transition history
+
+Revision ID: 20261018_0033
+Revises: 20261018_0032
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0033'
+down_revision = '20261018_0032'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'candidate_stage_transitions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('candidate_id', sa.Integer(), sa.ForeignKey('candidates.id', ondelete='CASCADE'), nullable=False),
+        sa.Column(
+            'recruitment_request_id', sa.Integer(),
+            sa.ForeignKey('recruitment_requests.id', ondelete='CASCADE'), nullable=False,
+        ),
+        sa.Column('from_stage', sa.String(length=50), nullable=True),
+        sa.Column('to_stage', sa.String(length=50), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('stage_seconds', sa.Integer(), nullable=True),
+        sa.Column('elapsed_seconds', sa.Integer(), nullable=True),
+    )
+    op.create_index(
+        'ix_candidate_stage_transitions_candidate_id', 'candidate_stage_transitions', ['candidate_id']
+    )
+    op.create_index(
+        'ix_candidate_stage_transitions_request_stage', 'candidate_stage_transitions',
+        ['recruitment_request_id', 'to_stage'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_candidate_stage_transitions_request_stage', table_name='candidate_stage_transitions')
+    op.drop_index('ix_candidate_stage_transitions_candidate_id', table_name='candidate_stage_transitions')
+    op.drop_table('candidate_stage_transitions')
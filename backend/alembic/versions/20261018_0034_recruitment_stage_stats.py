@@ -0,0 +1,55 @@
+"""Add per-requisition stage aggregates
+
+Revision ID: 20261018_0034
+Revises: 20261018_0033
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0034'
+down_revision = '20261018_0033'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'recruitment_stage_stats',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column(
+            'recruitment_request_id', sa.Integer(),
+            sa.ForeignKey('recruitment_requests.id', ondelete='CASCADE'), nullable=False,
+        ),
+        sa.Column('stage', sa.String(length=50), nullable=False),
+        sa.Column('entered', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('exited', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('elapsed_seconds', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('stage_seconds', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.UniqueConstraint('recruitment_request_id', 'stage', name='uq_recruitment_stage_stats_request_stage'),
+    )
+    # Seed from the transitions recorded so far
+    op.execute(
+        """
+        INSERT INTO recruitment_stage_stats
+            (recruitment_request_id, stage, entered, exited, elapsed_seconds, stage_seconds)
+        SELECT recruitment_request_id, stage,
+               SUM(entered), SUM(exited), SUM(elapsed_seconds), SUM(stage_seconds)
+        FROM (
+            SELECT recruitment_request_id, to_stage AS stage, 1 AS entered, 0 AS exited,
+                   COALESCE(elapsed_seconds, 0) AS elapsed_seconds, 0 AS stage_seconds
+            FROM candidate_stage_transitions
+            UNION ALL
+            SELECT recruitment_request_id, from_stage, 0, 1, 0, COALESCE(stage_seconds, 0)
+            FROM candidate_stage_transitions
+            WHERE from_stage IS NOT NULL
+        ) moves
+        GROUP BY recruitment_request_id, stage
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('recruitment_stage_stats')
@@ -0,0 +1,25 @@
+"""Record when a worker claimed a candidate's CV scoring job
+
+Revision ID: 20261018_0035
+Revises: 20261018_0034
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0035'
+down_revision = '20261018_0034'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'candidates', sa.Column('cv_scoring_started_at', sa.DateTime(timezone=True), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('candidates', 'cv_scoring_started_at')
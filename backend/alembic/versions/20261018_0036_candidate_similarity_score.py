@@ -0,0 +1,78 @@
+"""Store local pre-rank similarity and the job version of each LLM CV score
+
+Revision ID: 20261018_0036
+Revises: 20261018_0035
+Create Date: 2026-10-18
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0036'
+down_revision = '20261018_0035'
+branch_labels = None
+depends_on = None
+
+
+recruitment_requests = sa.table(
+    'recruitment_requests',
+    sa.column('id', sa.Integer),
+    sa.column('position_title', sa.String),
+    sa.column('job_description', sa.Text),
+    sa.column('required_skills', sa.JSON),
+)
+candidates = sa.table(
+    'candidates',
+    sa.column('recruitment_request_id', sa.Integer),
+    sa.column('cv_scoring', sa.Integer),
+    sa.column('cv_scored_job_hash', sa.String),
+)
+
+
+def _requisition_hash(job_title, job_description, required_skills) -> str:
+    # Frozen copy of app.services.cv_cache.requisition_hash
+    skills = "\x1f".join(sorted({s.strip().casefold() for s in required_skills or [] if s and s.strip()}))
+    return hashlib.sha256(f"{job_title}\n{job_description or ''}\n{skills}".encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('candidates', sa.Column('similarity_score', sa.Float(), nullable=True))
+    op.add_column('candidates', sa.Column('cv_scored_job_hash', sa.String(64), nullable=True))
+
+    # The pre-ranker wrote similarity into the legacy ai_ranking field
+    op.execute("""
+        UPDATE candidates
+        SET similarity_score = ai_ranking / 100.0, ai_ranking = NULL
+        WHERE cv_vector IS NOT NULL AND ai_ranking IS NOT NULL
+    """)
+
+    # Existing LLM scores were current until now
+    bind = op.get_bind()
+    requests = bind.execute(
+        sa.select(recruitment_requests).where(
+            recruitment_requests.c.id.in_(
+                sa.select(candidates.c.recruitment_request_id).where(candidates.c.cv_scoring.isnot(None))
+            )
+        )
+    ).all()
+    for request in requests:
+        bind.execute(
+            candidates.update()
+            .where(candidates.c.recruitment_request_id == request.id, candidates.c.cv_scoring.isnot(None))
+            .values(cv_scored_job_hash=_requisition_hash(
+                request.position_title, request.job_description, request.required_skills
+            ))
+        )
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE candidates
+        SET ai_ranking = ROUND(similarity_score * 100)
+        WHERE similarity_score IS NOT NULL AND ai_ranking IS NULL
+    """)
+    op.drop_column('candidates', 'cv_scored_job_hash')
+    op.drop_column('candidates', 'similarity_score')
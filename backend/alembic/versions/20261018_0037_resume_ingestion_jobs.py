@@ -0,0 +1,59 @@
+"""Persist bulk resume ingestion jobs and their per-file progress
+
+Revision ID: 20261018_0037
+Revises: 20261018_0036
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20261018_0037'
+down_revision = '20261018_0036'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resume_ingestion_jobs',
+        sa.Column('job_id', sa.String(length=32), primary_key=True),
+        sa.Column(
+            'recruitment_request_id', sa.Integer(),
+            sa.ForeignKey('recruitment_requests.id', ondelete='CASCADE'), nullable=False,
+        ),
+        sa.Column('created_by', sa.String(length=50), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total_files', sa.Integer(), nullable=False),
+        sa.Column('error', sa.String(length=500), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        'ix_resume_ingestion_jobs_recruitment_request_id', 'resume_ingestion_jobs', ['recruitment_request_id']
+    )
+    op.create_index('ix_resume_ingestion_jobs_finished_at', 'resume_ingestion_jobs', ['finished_at'])
+
+    op.create_table(
+        'resume_ingestion_files',
+        sa.Column(
+            'job_id', sa.String(length=32),
+            sa.ForeignKey('resume_ingestion_jobs.job_id', ondelete='CASCADE'), primary_key=True,
+        ),
+        sa.Column('file_index', sa.Integer(), primary_key=True),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('duplicate_of', sa.Integer(), nullable=True),
+        sa.Column('error', sa.String(length=500), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('resume_ingestion_files')
+    op.drop_index('ix_resume_ingestion_jobs_finished_at', table_name='resume_ingestion_jobs')
+    op.drop_index('ix_resume_ingestion_jobs_recruitment_request_id', table_name='resume_ingestion_jobs')
+    op.drop_table('resume_ingestion_jobs')
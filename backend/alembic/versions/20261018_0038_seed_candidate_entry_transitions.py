@@ -0,0 +1,75 @@
+"""Seed pipeline entry transitions for candidates that predate the log
+
+Revision ID: 20261018_0038
+Revises: 20261018_0037
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+revision = '20261018_0038'
+down_revision = '20261018_0037'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Same rule as RecruitmentMetricsService.seed_entry_transitions: never-moved
+    # candidates enter their current stage when it last changed, the others the
+    # stage their first logged move left, on their creation date
+    op.execute(
+        """
+        INSERT INTO candidate_stage_transitions
+            (candidate_id, recruitment_request_id, from_stage, to_stage, changed_at,
+             stage_seconds, elapsed_seconds)
+        SELECT c.id, c.recruitment_request_id, NULL,
+               COALESCE(first_move.from_stage, c.stage),
+               entered.at,
+               NULL,
+               GREATEST(CAST(EXTRACT(EPOCH FROM entered.at - COALESCE(c.created_at, entered.at)) AS INTEGER), 0)
+        FROM candidates c
+        LEFT JOIN LATERAL (
+            SELECT t.from_stage
+            FROM candidate_stage_transitions t
+            WHERE t.candidate_id = c.id
+            ORDER BY t.changed_at, t.id
+            LIMIT 1
+        ) first_move ON true
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN first_move.from_stage IS NULL
+                        THEN COALESCE(c.stage_changed_at, c.created_at, now())
+                        ELSE COALESCE(c.created_at, now())
+                   END AS at
+        ) entered
+        WHERE NOT EXISTS (
+            SELECT 1 FROM candidate_stage_transitions e
+            WHERE e.candidate_id = c.id AND e.from_stage IS NULL
+        )
+        """
+    )
+    # Recompute the aggregates seeded by 20261018_0034 to include the new entries
+    op.execute("DELETE FROM recruitment_stage_stats")
+    op.execute(
+        """
+        INSERT INTO recruitment_stage_stats
+            (recruitment_request_id, stage, entered, exited, elapsed_seconds, stage_seconds)
+        SELECT recruitment_request_id, stage,
+               SUM(entered), SUM(exited), SUM(elapsed_seconds), SUM(stage_seconds)
+        FROM (
+            SELECT recruitment_request_id, to_stage AS stage, 1 AS entered, 0 AS exited,
+                   COALESCE(elapsed_seconds, 0) AS elapsed_seconds, 0 AS stage_seconds
+            FROM candidate_stage_transitions
+            UNION ALL
+            SELECT recruitment_request_id, from_stage, 0, 1, 0, COALESCE(stage_seconds, 0)
+            FROM candidate_stage_transitions
+            WHERE from_stage IS NOT NULL
+        ) moves
+        GROUP BY recruitment_request_id, stage
+        """
+    )
+
+
+def downgrade() -> None:
+    # Entry transitions are indistinguishable from those recorded by the app
+    pass
@@ -0,0 +1,29 @@
+"""Mark leave balances as converted to ledger semantics
+
+Revision 20261018_0026 converts the balances; startup migrations check this
+marker before converting balances on deployments built by create_all.
+
+Revision ID: 20261018_0039
+Revises: 20261018_0038
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+revision = '20261018_0039'
+down_revision = '20261018_0038'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        INSERT INTO cache_versions (scope, version)
+        SELECT 'leave_ledger_conversion', 1
+        WHERE NOT EXISTS (SELECT 1 FROM cache_versions WHERE scope = 'leave_ledger_conversion')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM cache_versions WHERE scope = 'leave_ledger_conversion'")
@@ -6,7 +6,7 @@ from jwt.exceptions import PyJWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.jwt import decode_jwt
+from app.auth.jwt import decode_jwt, verified_token_cache
 from app.auth.roles import ALLOWED_ROLES, resolve_role_from_claims
 from app.core.config import get_settings
 from app.database import get_session
@@ -17,6 +17,7 @@ async def authenticate_token(authorization: Optional[str] = Header(default=None)
     Authenticate JWT token and return claims.
     Uses HS256 local signing for employee authentication.
     Falls back to JWKS for SSO tokens if configured.
+    Verified tokens are cached until expiry, so repeat requests skip crypto.
     """
     if authorization is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authorization header missing")
@@ -26,15 +27,28 @@ async def authenticate_token(authorization: Optional[str] = Header(default=None)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authorization header")
 
     settings = get_settings()
-    
+    token = token.strip()
+
+    cached = verified_token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    # Only attempt local verification for HS256 tokens; SSO tokens go straight to JWKS
     try:
-        claims = jwt.decode(token.strip(), settings.auth_secret_key, algorithms=["HS256"])
-        return claims
+        algorithm = jwt.get_unverified_header(token).get("alg")
     except PyJWTError:
-        pass
+        algorithm = None
+
+    if algorithm in (None, "HS256"):
+        try:
+            claims = jwt.decode(token, settings.auth_secret_key, algorithms=["HS256"])
+            verified_token_cache.put(token, claims)
+            return claims
+        except PyJWTError:
+            pass
     
     try:
-        return await decode_jwt(token.strip(), settings)
+        return await decode_jwt(token, settings)
     except HTTPException:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
 
@@ -1,7 +1,11 @@
+import asyncio
 import base64
+import hashlib
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import httpx
 import jwt
@@ -15,22 +19,133 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 
 _JWKS_CACHE: dict[str, Dict[str, Any]] | None = None
+# Pre-parsed key objects for _JWKS_CACHE, so verification skips PyJWK.from_dict
+_JWKS_KEYS: dict[str, PyJWK] = {}
 _JWKS_FETCHED_AT: datetime | None = None
 _JWKS_TTL_SECONDS = 300
+# Refresh in the background once the cached keys are this close to expiring
+_JWKS_REFRESH_AHEAD_SECONDS = 60
 
+_JWKS_LOCK: asyncio.Lock | None = None
+_JWKS_REFRESH_TASK: asyncio.Task | None = None
 
-def _is_cache_valid() -> bool:
+_VERIFIED_TOKEN_CACHE_SIZE = 1024
+
+
+class VerifiedTokenCache:
+    """
+    LRU of already-verified tokens, keyed by SHA-256 of the token.
+
+    Entries live until the token's ``exp`` so repeat requests carrying the
+    same bearer token skip signature verification entirely.
+    """
+
+    def __init__(self, maxsize: int = _VERIFIED_TOKEN_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        try:
+            expires_at = float(claims["exp"])
+        except (KeyError, TypeError, ValueError):
+            return  # Never cache tokens without a usable expiry
+        if expires_at <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = (expires_at, dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+verified_token_cache = VerifiedTokenCache()
+
+
+def _jwks_age() -> timedelta | None:
     if _JWKS_CACHE is None or _JWKS_FETCHED_AT is None:
-        return False
-    return datetime.now(timezone.utc) - _JWKS_FETCHED_AT < timedelta(seconds=_JWKS_TTL_SECONDS)
+        return None
+    return datetime.now(timezone.utc) - _JWKS_FETCHED_AT
 
 
-async def _fetch_jwks(settings: Settings) -> dict[str, Dict[str, Any]]:
-    global _JWKS_CACHE, _JWKS_FETCHED_AT
+def _is_cache_valid() -> bool:
+    age = _jwks_age()
+    return age is not None and age < timedelta(seconds=_JWKS_TTL_SECONDS)
+
+
+def _needs_background_refresh() -> bool:
+    age = _jwks_age()
+    return age is not None and age >= timedelta(
+        seconds=_JWKS_TTL_SECONDS - _JWKS_REFRESH_AHEAD_SECONDS
+    )
+
 
+def _get_jwks_lock() -> asyncio.Lock:
+    global _JWKS_LOCK
+    if _JWKS_LOCK is None:
+        _JWKS_LOCK = asyncio.Lock()
+    return _JWKS_LOCK
+
+
+def _schedule_background_refresh(settings: Settings) -> None:
+    """Start one background refresh task if none is already running."""
+    global _JWKS_REFRESH_TASK
+
+    if _JWKS_REFRESH_TASK is not None and not _JWKS_REFRESH_TASK.done():
+        return
+
+    async def _refresh() -> None:
+        try:
+            await _refresh_jwks(settings, force=True)
+        except HTTPException:
+            # Cached keys stay in use until TTL; the next miss retries the fetch
+            pass
+
+    _JWKS_REFRESH_TASK = asyncio.create_task(_refresh())
+
+
+async def _fetch_jwks(settings: Settings) -> dict[str, Dict[str, Any]]:
     if _is_cache_valid():
+        if _needs_background_refresh():
+            _schedule_background_refresh(settings)
         return _JWKS_CACHE or {}
 
+    return await _refresh_jwks(settings)
+
+
+async def _refresh_jwks(settings: Settings, force: bool = False) -> dict[str, Dict[str, Any]]:
+    """Fetch the JWKS once for all concurrent callers (single-flight)."""
+    fetched_at = _JWKS_FETCHED_AT
+    async with _get_jwks_lock():
+        # Another caller refreshed while we were waiting for the lock
+        if _JWKS_FETCHED_AT != fetched_at and _is_cache_valid():
+            return _JWKS_CACHE or {}
+        if not force and _is_cache_valid():
+            return _JWKS_CACHE or {}
+        return await _download_jwks(settings)
+
+
+async def _download_jwks(settings: Settings) -> dict[str, Dict[str, Any]]:
+    global _JWKS_CACHE, _JWKS_KEYS, _JWKS_FETCHED_AT
+
     if not settings.auth_jwks_url:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -50,7 +165,16 @@ async def _fetch_jwks(settings: Settings) -> dict[str, Dict[str, Any]]:
     if not keys:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="No JWKS keys available")
 
-    _JWKS_CACHE = {key.get("kid"): key for key in keys if key.get("kid")}
+    jwks = {key.get("kid"): key for key in keys if key.get("kid")}
+    parsed: dict[str, PyJWK] = {}
+    for kid, key_data in jwks.items():
+        try:
+            parsed[kid] = PyJWK.from_dict(key_data)
+        except PyJWTError as exc:
+            logger.warning("Skipping unusable JWKS key", extra={"kid": kid}, exc_info=exc)
+
+    _JWKS_CACHE = jwks
+    _JWKS_KEYS = parsed
     _JWKS_FETCHED_AT = datetime.now(timezone.utc)
     return _JWKS_CACHE or {}
 
@@ -82,13 +206,15 @@ def _decode_dev_token(token: str, settings: Settings) -> Dict[str, Any]:
 
 
 async def decode_jwt(token: str, settings: Settings | None = None) -> Dict[str, Any]:
-    global _JWKS_FETCHED_AT
-
     settings = settings or get_settings()
 
     if settings.dev_auth_bypass:
         return _decode_dev_token(token, settings)
 
+    cached = verified_token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         unverified_header = jwt.get_unverified_header(token)
     except PyJWTError:
@@ -101,16 +227,16 @@ async def decode_jwt(token: str, settings: Settings | None = None) -> Dict[str,
 
     key_data = jwks.get(kid)
     if key_data is None:
-        _JWKS_FETCHED_AT = None
-        jwks = await _fetch_jwks(settings)
+        # Possibly a rotated key - one forced refresh shared by concurrent callers
+        jwks = await _refresh_jwks(settings, force=True)
         key_data = jwks.get(kid)
 
-    if key_data is None:
+    signing_key = _JWKS_KEYS.get(kid)
+    if key_data is None or signing_key is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unknown token key")
 
     algorithm = key_data.get("alg", "RS256")
     try:
-        signing_key = PyJWK.from_dict(key_data)
         claims = jwt.decode(
             token,
             signing_key.key,
@@ -134,4 +260,5 @@ async def decode_jwt(token: str, settings: Settings | None = None) -> Dict[str,
     if expires_at <= datetime.now(timezone.utc):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
 
-    return claims
+    verified_token_cache.put(token, claims)
+    return dict(claims)
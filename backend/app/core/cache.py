@@ -0,0 +1,110 @@
+"""In-process caches for rarely-changing reference data.
+
+Each cache is bound to a *scope* with a counter row in ``cache_versions``.
+Writers call :func:`bump_cache_version` inside their transaction; readers keep
+the derived value in memory and only rebuild it when the stored version moves.
+Other worker processes notice a bump on their next version check, which runs
+at most once every ``check_interval`` seconds.
+"""
+
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_REGISTRY: Dict[str, List["VersionedCache"]] = defaultdict(list)
+
+
+async def get_cache_version(session: AsyncSession, scope: str) -> int:
+    """Return the current version for a scope (0 if never bumped)."""
+    from app.models.cache_version import CacheVersion
+
+    result = await session.execute(
+        select(CacheVersion.version).where(CacheVersion.scope == scope)
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def bump_cache_version(session: AsyncSession, scope: str) -> None:
+    """
+    Increment a scope's version in the caller's transaction.
+
+    Local caches for the scope are expired immediately so the next read in
+    this process re-checks the version once the transaction has committed.
+    """
+    from app.models.cache_version import CacheVersion
+
+    result = await session.execute(
+        update(CacheVersion)
+        .where(CacheVersion.scope == scope)
+        .values(version=CacheVersion.version + 1)
+    )
+    if not result.rowcount:
+        await session.execute(insert(CacheVersion).values(scope=scope, version=1))
+
+    for cache in _REGISTRY.get(scope, []):
+        cache.expire()
+
+
+class VersionedCache(Generic[T]):
+    """Holds one value derived from the database, rebuilt on version change."""
+
+    def __init__(
+        self,
+        scope: str,
+        loader: Callable[[AsyncSession], Awaitable[T]],
+        check_interval: float = 30.0,
+    ) -> None:
+        self.scope = scope
+        self._loader = loader
+        self.check_interval = check_interval
+        self._value: Optional[T] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        _REGISTRY[scope].append(self)
+
+    def expire(self) -> None:
+        """Force a version check on the next read."""
+        self._checked_at = 0.0
+
+    def clear(self) -> None:
+        """Drop the cached value entirely."""
+        self._value = None
+        self._version = None
+        self._checked_at = 0.0
+
+    async def get(self, session: AsyncSession) -> T:
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < self.check_interval:
+            return self._value
+
+        version = await get_cache_version(session, self.scope)
+        if self._value is None or version != self._version:
+            logger.info("Rebuilding cache", extra={"scope": self.scope, "version": version})
+            self._value = await self._loader(session)
+            self._version = version
+        self._checked_at = now
+        return self._value
+
+
+_VERSION_CACHES: Dict[str, "VersionedCache[int]"] = {}
+
+
+async def get_cached_version(session: AsyncSession, scope: str) -> int:
+    """A scope's version, re-read from the database at most every check interval."""
+    cache = _VERSION_CACHES.get(scope)
+    if cache is None:
+        async def _load(s: AsyncSession) -> int:
+            return await get_cache_version(s, scope)
+
+        cache = VersionedCache(scope, _load)
+        _VERSION_CACHES[scope] = cache
+    return await cache.get(session)
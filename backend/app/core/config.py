@@ -71,6 +71,58 @@ class Settings(BaseSettings):
         default=None,
         description="Pre-issued JWT used when dev_auth_bypass is enabled",
     )
+    cv_scoring_backend: str = Field(
+        default="openai",
+        description="CV scoring backend: 'openai' or 'stub' (deterministic, offline)",
+    )
+    cv_scoring_workers: int = Field(
+        default=4,
+        description="Concurrent background CV scoring jobs",
+    )
+    cv_scoring_max_attempts: int = Field(
+        default=4,
+        description="Attempts per CV scoring job before it is marked failed",
+    )
+    cv_scoring_lease_seconds: int = Field(
+        default=600,
+        description="Seconds before a CV scoring job left in 'scoring' is presumed abandoned and recovered",
+    )
+    cv_cache_max_entries: int = Field(
+        default=10000,
+        description="Rows kept in each persisted CV text/score cache before LRU eviction",
+    )
+    cv_extract_workers: int = Field(
+        default=2,
+        description="Processes in the CV text extraction pool",
+    )
+    cv_extract_timeout_seconds: float = Field(
+        default=20.0,
+        description="Per-document CV text extraction timeout",
+    )
+    cv_extract_max_pages: int = Field(
+        default=10,
+        description="PDF pages read per CV before extraction stops",
+    )
+    cv_extract_max_chars: int = Field(
+        default=4000,
+        description="Characters extracted per CV (scoring reads the first 4,000)",
+    )
+    resume_parser_workers: int = Field(
+        default=2,
+        description="Warm resume parser processes (each loads the spaCy models once)",
+    )
+    cv_llm_top_n: int = Field(
+        default=50,
+        description="Candidates per requisition sent to the LLM scorer after local pre-ranking (0 = all)",
+    )
+    wps_employer_id: str = Field(
+        default="",
+        description="MOHRE establishment ID written to the payroll SIF control record",
+    )
+    wps_routing_code: str = Field(
+        default="",
+        description="Employer's WPS agent routing code for the payroll SIF control record",
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
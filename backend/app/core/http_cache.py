@@ -0,0 +1,60 @@
+"""Conditional GET helpers: strong ETags, 304 responses and snapshot storage.
+
+Read-mostly views (calendars, holiday lists) are rendered once per data
+version and kept as encoded JSON. The ETag is derived from the version, so a
+revalidation with a matching ``If-None-Match`` is answered with 304 without
+touching the underlying tables.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+# Authenticated data: browsers may store it but must revalidate every time
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def cached_json(content: Any, etag: str, cache_control: str = PRIVATE_REVALIDATE) -> JSONResponse:
+    return JSONResponse(content=content, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+class SnapshotCache:
+    """Bounded LRU of encoded payloads keyed by view key, valid for one ETag."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, tuple[str, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, etag: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != etag:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, etag: str, payload: Any) -> None:
+        self._entries[key] = (etag, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
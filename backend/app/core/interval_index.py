@@ -0,0 +1,58 @@
+"""Static index over inclusive date intervals.
+
+Items are sorted by start date with a running maximum end date. Because the
+running maximum never decreases, both the start dates and the maximum ends are
+bisectable: a range query is two bisects plus a scan of the candidates, and
+"the interval in progress or next to start" is a single bisect. Used for
+public holidays (work calendar, clock-in reminders) and leave overlap checks.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    """Immutable interval index; ``bounds`` maps an item to its (start, end) dates."""
+
+    def __init__(self, items: Iterable[T], bounds: Callable[[T], Tuple[date, date]]) -> None:
+        # Stable sort, so items sharing a range keep the caller's order
+        self._items: List[T] = sorted(items, key=bounds)
+        self._starts: List[date] = []
+        self._ends: List[date] = []
+        # _max_end[k] = latest end among items[0..k]; non-decreasing, so bisectable
+        self._max_end: List[date] = []
+        latest: Optional[date] = None
+        for item in self._items:
+            start, end = bounds(item)
+            self._starts.append(start)
+            self._ends.append(end)
+            latest = end if latest is None or end > latest else latest
+            self._max_end.append(latest)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def overlapping(self, start: date, end: date) -> List[T]:
+        """Items intersecting the inclusive range, ordered by start date."""
+        if end < start:
+            return []
+        lo = bisect_left(self._max_end, start)
+        hi = bisect_right(self._starts, end)
+        return [self._items[k] for k in range(lo, hi) if self._ends[k] >= start]
+
+    def at(self, day: date) -> Optional[T]:
+        """The earliest-starting item covering ``day``, or None."""
+        matches = self.overlapping(day, day)
+        return matches[0] if matches else None
+
+    def next_from(self, day: date) -> Optional[T]:
+        """The item in progress on ``day`` or, failing that, the next one to start."""
+        k = bisect_left(self._max_end, day)
+        # max_end jumps past ``day`` at k, so item k itself ends on/after ``day``
+        return self._items[k] if k < len(self._items) else None
@@ -0,0 +1,54 @@
+"""Keyset (cursor) pagination helpers.
+
+Listings ordered newest-first by ``(timestamp, id)`` page with an opaque
+cursor holding the last row's sort key, so every page is an index range
+scan instead of an OFFSET that re-reads all earlier rows.
+"""
+
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset_page(
+    query: Select,
+    timestamp_col: InstrumentedAttribute,
+    id_col: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: int,
+) -> Select:
+    """Apply newest-first keyset ordering; fetches ``limit + 1`` rows to detect a next page."""
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(timestamp_col, id_col) < tuple_(timestamp, row_id))
+    return query.order_by(timestamp_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int, timestamp_attr: str) -> Tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_attr), last.id)
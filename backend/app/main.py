@@ -58,6 +58,21 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Could not start attendance scheduler: {e}")
 
+    # Start background CV scoring workers (recovers jobs left pending)
+    try:
+        from app.services.cv_scoring_queue import cv_scoring_queue
+        await cv_scoring_queue.start()
+        logger.info("CV scoring queue started")
+    except Exception as e:
+        logger.warning(f"Could not start CV scoring queue: {e}")
+
+    # Load the resume parser's NLP models once, before the first upload
+    try:
+        from app.services.resume_parser import resume_parser_service
+        await resume_parser_service.start()
+    except Exception as e:
+        logger.warning(f"Could not start resume parser workers: {e}")
+
     yield
     
     # Shutdown
@@ -68,6 +83,17 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Could not stop attendance scheduler: {e}")
     
+    try:
+        from app.services.cv_scoring_queue import cv_scoring_queue
+        await cv_scoring_queue.stop()
+    except Exception as e:
+        logger.warning(f"Could not stop CV scoring queue: {e}")
+
+    from app.services.document_extraction import document_extractor
+    document_extractor.shutdown()
+    from app.services.resume_parser import resume_parser_service
+    resume_parser_service.shutdown()
+    
     logger.info("Application shutdown")
 
 
@@ -7,7 +7,7 @@ from app.models.onboarding_token import OnboardingToken
 from app.models.system_settings import SystemSetting, DEFAULT_FEATURE_TOGGLES
 from app.models.passes import Pass, PASS_TYPES
 from app.models.attendance import (
-    AttendanceRecord, WORK_TYPES, ATTENDANCE_STATUSES, OVERTIME_TYPES,
+    AttendanceRecord, OffsetHoursEntry, OffsetHoursBalance, OFFSET_ENTRY_TYPES, WORK_TYPES, ATTENDANCE_STATUSES, OVERTIME_TYPES,
     WORK_LOCATIONS, EMPLOYEE_OVERTIME_POLICIES, WORK_SCHEDULES,
     STANDARD_WORK_HOURS_5_DAY, STANDARD_WORK_HOURS_6_DAY, MAX_WEEKLY_HOURS,
     RAMADAN_REDUCTION_HOURS, RAMADAN_WORK_HOURS, MAX_OVERTIME_HOURS_PER_DAY,
@@ -22,6 +22,10 @@ from app.models.nomination import EoyNomination, NOMINATION_STATUSES, ELIGIBLE_J
 from app.models.nomination_settings import NominationSettings
 from app.models.insurance_census import InsuranceCensusRecord, InsuranceCensusImportBatch, MANDATORY_FIELDS, MANDATORY_FIELDS_FOR_RENEWAL
 
+from app.models.cache_version import CacheVersion
+from app.models.cv_cache import CVTextCache, CVScoreCache
+from app.models.compliance_expiry import ComplianceExpiry, EMPLOYEE_EXPIRY_FIELDS
+
 from app.models.renewal import Base, Renewal, RenewalAuditLog
 
 __all__ = [
@@ -31,7 +35,7 @@ __all__ = [
     "OnboardingToken",
     "SystemSetting", "DEFAULT_FEATURE_TOGGLES",
     "Pass", "PASS_TYPES",
-    "AttendanceRecord", "WORK_TYPES", "ATTENDANCE_STATUSES", "OVERTIME_TYPES",
+    "AttendanceRecord", "OffsetHoursEntry", "OffsetHoursBalance", "OFFSET_ENTRY_TYPES", "WORK_TYPES", "ATTENDANCE_STATUSES", "OVERTIME_TYPES",
     "WORK_LOCATIONS", "EMPLOYEE_OVERTIME_POLICIES", "WORK_SCHEDULES",
     "STANDARD_WORK_HOURS_5_DAY", "STANDARD_WORK_HOURS_6_DAY", "MAX_WEEKLY_HOURS",
     "RAMADAN_REDUCTION_HOURS", "RAMADAN_WORK_HOURS", "MAX_OVERTIME_HOURS_PER_DAY",
@@ -43,5 +47,8 @@ __all__ = [
     "ActivityLog",
     "EoyNomination", "NOMINATION_STATUSES", "ELIGIBLE_JOB_LEVELS",
     "NominationSettings",
-    "InsuranceCensusRecord", "InsuranceCensusImportBatch", "MANDATORY_FIELDS", "MANDATORY_FIELDS_FOR_RENEWAL"
+    "InsuranceCensusRecord", "InsuranceCensusImportBatch", "MANDATORY_FIELDS", "MANDATORY_FIELDS_FOR_RENEWAL",
+    "CacheVersion",
+    "CVTextCache", "CVScoreCache",
+    "ComplianceExpiry", "EMPLOYEE_EXPIRY_FIELDS",
 ]
@@ -2,7 +2,7 @@ from datetime import date, datetime, time
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, Numeric, String, Text, Time, func
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, Time, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.renewal import Base
@@ -154,6 +154,56 @@ class AttendanceRecord(Base):
     correction_approver = relationship("Employee", foreign_keys=[correction_approved_by])
 
 
+class OffsetHoursEntry(Base):
+    """Append-only ledger of offset (time-off-in-lieu) hours.
+    
+    Every change to an OffsetHoursBalance column is recorded here in the same
+    transaction, so the balance row is a materialized running total and
+    balance reads are single-row lookups.
+    """
+    __tablename__ = "offset_hours_entries"
+    __table_args__ = (
+        # Paginated history: one employee's entries newest-first
+        Index("ix_offset_hours_employee_created", "employee_id", "created_at", "id"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), nullable=False)
+    entry_type: Mapped[str] = mapped_column(String(20), nullable=False)  # see OFFSET_ENTRY_TYPES
+    
+    # Signed number of hours applied to the balance column for entry_type
+    hours: Mapped[Decimal] = mapped_column(Numeric(6, 2), nullable=False)
+    entry_date: Mapped[date] = mapped_column(Date, nullable=False)
+    
+    attendance_record_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("attendance_records.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    note: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_by: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class OffsetHoursBalance(Base):
+    """Running offset-hours totals per employee (materialized from the ledger)."""
+    __tablename__ = "offset_hours_balances"
+    
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), primary_key=True)
+    earned: Mapped[Decimal] = mapped_column(Numeric(8, 2), default=Decimal("0"), nullable=False)
+    used: Mapped[Decimal] = mapped_column(Numeric(8, 2), default=Decimal("0"), nullable=False)
+    expired: Mapped[Decimal] = mapped_column(Numeric(8, 2), default=Decimal("0"), nullable=False)
+    adjusted: Mapped[Decimal] = mapped_column(Numeric(8, 2), default=Decimal("0"), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+    
+    @property
+    def balance(self) -> Decimal:
+        """Available hours: earned + adjusted - used - expired."""
+        return self.earned + self.adjusted - self.used - self.expired
+
+
 # Work type constants - expanded per requirements
 WORK_TYPES = ["office", "wfh", "field", "client_site", "business_travel", "leave", "holiday"]
 
@@ -182,6 +232,11 @@ ATTENDANCE_STATUSES = ["pending", "present", "absent", "late", "half-day", "on-l
 OVERTIME_TYPES = ["none", "pre-approved", "auto-calculated", "requested"]
 EMPLOYEE_OVERTIME_POLICIES = ["N/A", "Offset", "Paid"]
 
+# Offset ledger entry types -> OffsetHoursBalance column they move
+# earned: overtime converted to offset hours (+) / corrected down (-)
+# used: hours taken as time off; expired: hours lapsed unused; adjusted: HR correction (+/-)
+OFFSET_ENTRY_TYPES = ["earned", "used", "expired", "adjusted"]
+
 # Work schedule types - linked to Employee master work_schedule field
 WORK_SCHEDULES = ["5 days", "6 days"]
 
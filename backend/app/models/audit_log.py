@@ -1,10 +1,13 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, Text, Boolean
+from sqlalchemy import String, Integer, DateTime, Text, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.employee import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_entity_timestamp", "entity", "timestamp"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     action: Mapped[str] = mapped_column(String(100), nullable=False)
     entity: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.renewal import Base
+
+
+class CacheVersion(Base):
+    """Monotonic version counter per cached data scope.
+
+    Writers bump the counter in the same transaction as their change so every
+    worker process can tell when its in-memory copy of derived data is stale.
+    """
+
+    __tablename__ = "cache_versions"
+
+    scope: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -0,0 +1,46 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.renewal import Base
+
+
+# Employee columns projected into compliance_expiries (column, label)
+EMPLOYEE_EXPIRY_FIELDS = [
+    ("visa_expiry_date", "Visa"),
+    ("emirates_id_expiry", "Emirates ID"),
+    ("medical_fitness_expiry", "Medical Fitness"),
+    ("iloe_expiry", "ILOE"),
+    ("contract_end_date", "Contract"),
+]
+
+EXPIRY_SOURCES = ["employee", "document"]
+
+
+class ComplianceExpiry(Base):
+    """Normalized projection of every tracked expiry date.
+
+    One row per (source, source_id, document_type). Rows are rewritten whenever
+    the owning employee or document changes so alert buckets can be answered by
+    an index range scan on ``expiry_date`` instead of loading every employee.
+    """
+
+    __tablename__ = "compliance_expiries"
+    __table_args__ = (
+        UniqueConstraint("source", "source_id", "document_type", name="uq_compliance_expiries_source"),
+        Index("ix_compliance_expiries_expiry_date", "expiry_date"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    employee_id: Mapped[int] = mapped_column(
+        ForeignKey("employees.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # "employee" for Employee columns, "document" for EmployeeDocument rows
+    source: Mapped[str] = mapped_column(String(20), nullable=False)
+    source_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    document_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    expiry_date: Mapped[date] = mapped_column(Date, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
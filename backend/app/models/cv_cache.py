@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy import JSON, DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.renewal import Base
+
+
+class CVTextCache(Base):
+    """Extracted CV text keyed by the SHA-256 of the uploaded file bytes.
+
+    The same file uploaded again (re-application, another requisition) reuses
+    the text instead of re-running PDF/DOCX extraction.
+    """
+
+    __tablename__ = "cv_text_cache"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    char_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class CVScoreCache(Base):
+    """Normalized CV scores keyed by (text hash, job hash, skills, model).
+
+    ``cache_key`` is the SHA-256 of those parts; a hit makes repeat scoring
+    free and returns exactly the earlier result.
+    """
+
+    __tablename__ = "cv_score_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    text_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    job_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    model: Mapped[str] = mapped_column(String(50), nullable=False)
+    result: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
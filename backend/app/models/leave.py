@@ -9,7 +9,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.renewal import Base
@@ -59,10 +59,10 @@ class LeaveBalance(Base):
     # Carried forward from previous year
     carried_forward: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=Decimal("0"), nullable=False)
     
-    # Used this year
+    # Used this year (approved leave) - maintained by the leave ledger
     used: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=Decimal("0"), nullable=False)
     
-    # Pending (approved but not yet taken)
+    # Pending (requested, awaiting approval) - maintained by the leave ledger
     pending: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=Decimal("0"), nullable=False)
     
     # Adjusted (manual adjustments by HR)
@@ -90,9 +90,8 @@ class LeaveRequest(Base):
     """Leave request submitted by employee.
     
     Workflow:
-    1. Employee submits request
-    2. Manager approves/rejects
-    3. If approved, balance is deducted when leave starts
+    1. Employee submits request (days reserved as pending)
+    2. Manager approves/rejects (pending moves to used, or is released)
     4. Attendance shows "On Leave" status during leave period
     """
     __tablename__ = "leave_requests"
@@ -139,3 +138,42 @@ class LeaveRequest(Base):
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+# Ledger entry types and the LeaveBalance column each one moves
+LEDGER_ENTRY_TYPES = {
+    "accrual": "entitlement",           # Yearly entitlement granted
+    "carry_forward": "carried_forward", # Unused days brought from the previous year
+    "adjustment": "adjustment",         # Manual HR adjustment
+    "pending": "pending",               # Requested, awaiting approval (+) / released (-)
+    "taken": "used",                    # Approved leave (+) / cancelled after approval (-)
+}
+
+
+class LeaveLedgerEntry(Base):
+    """Append-only leave ledger.
+    
+    Every change to a LeaveBalance column is recorded here in the same
+    transaction, so LeaveBalance is a materialized running total of the ledger
+    and balance reads stay single-row lookups.
+    """
+    __tablename__ = "leave_ledger_entries"
+    __table_args__ = (
+        Index("ix_leave_ledger_employee_year", "employee_id", "year", "leave_type"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    leave_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    entry_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    
+    # Signed number of days applied to the balance column for entry_type
+    days: Mapped[Decimal] = mapped_column(Numeric(6, 2), nullable=False)
+    
+    leave_request_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("leave_requests.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    note: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_by: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
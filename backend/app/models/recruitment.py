@@ -3,8 +3,8 @@ from datetime import date, datetime
 from typing import List, Optional, TYPE_CHECKING
 
 from sqlalchemy import (
-    Boolean, Date, DateTime, ForeignKey, Integer,
-    String, Text, DECIMAL, JSON, func
+    BigInteger, Boolean, Date, DateTime, Float, ForeignKey, Index, Integer, LargeBinary,
+    String, Text, UniqueConstraint, DECIMAL, JSON, func
 )
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -141,6 +141,7 @@ class Candidate(Base):
 
     # Resume & Documents
     resume_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    resume_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)  # SHA-256 of the CV file, for de-duplication
     linkedin_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     portfolio_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     documents: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # {cv: path, portfolio: path, certificates: [], passport: path, visa: path}
@@ -166,6 +167,13 @@ class Candidate(Base):
     screening_rank: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Position rank within position
     resume_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Link to uploaded CV
     cv_scored_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # When CV was last scored
+    cv_scored_job_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # Job version cv_scoring was made against
+    cv_scoring_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True, index=True)  # queued, scoring, scored, failed
+    cv_scoring_attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    cv_scoring_error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Last failure reason
+    cv_scoring_started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)  # Lease start of the worker scoring it
+    cv_vector: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)  # Hashed term vector for local pre-ranking
+    similarity_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Local (offline) job similarity (0-1)
     
     # Enhanced scoring breakdown (from JSON analysis)
     score_breakdown: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # {skills_match: 30, experience_match: 25, education_match: 15, salary_fit: 15, culture_fit: 15}
@@ -223,6 +231,111 @@ class Candidate(Base):
     evaluations: Mapped[List["Evaluation"]] = relationship(back_populates="candidate", cascade="all, delete-orphan")
 
 
+class CandidateStageTransition(Base):
+    """Append-only history of candidate pipeline moves.
+
+    One row per stage change, written in the same transaction as the move.
+    ``stage_seconds`` is the time spent in ``from_stage`` and
+    ``elapsed_seconds`` the time since the candidate applied, both fixed at
+    write time so duration metrics are plain aggregates.
+    """
+
+    __tablename__ = "candidate_stage_transitions"
+    __table_args__ = (
+        Index("ix_candidate_stage_transitions_request_stage", "recruitment_request_id", "to_stage"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    candidate_id: Mapped[int] = mapped_column(
+        ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    recruitment_request_id: Mapped[int] = mapped_column(
+        ForeignKey("recruitment_requests.id", ondelete="CASCADE"), nullable=False
+    )
+    from_stage: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    to_stage: Mapped[str] = mapped_column(String(50), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    stage_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    elapsed_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+
+class RecruitmentStageStat(Base):
+    """Running per-stage totals for a requisition, kept in step with
+    ``candidate_stage_transitions``.
+
+    ``entered`` counts moves into the stage (including the initial
+    application) with ``elapsed_seconds`` summing time since application;
+    ``exited`` counts moves out with ``stage_seconds`` summing time spent in
+    the stage. Funnel and velocity reports read these rows only.
+    """
+
+    __tablename__ = "recruitment_stage_stats"
+    __table_args__ = (
+        UniqueConstraint("recruitment_request_id", "stage", name="uq_recruitment_stage_stats_request_stage"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    recruitment_request_id: Mapped[int] = mapped_column(
+        ForeignKey("recruitment_requests.id", ondelete="CASCADE"), nullable=False
+    )
+    stage: Mapped[str] = mapped_column(String(50), nullable=False)
+    entered: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    exited: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    elapsed_seconds: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    stage_seconds: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class ResumeIngestionJob(Base):
+    """A bulk resume upload and its progress.
+
+    The job runs in the worker process that received the upload, but its
+    status and per-file rows are written back as it goes, so any worker can
+    answer a progress poll.
+    """
+
+    __tablename__ = "resume_ingestion_jobs"
+
+    job_id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    recruitment_request_id: Mapped[int] = mapped_column(
+        ForeignKey("recruitment_requests.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    created_by: Mapped[str] = mapped_column(String(50), nullable=False)
+    source: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="running")  # running, completed, failed
+    total_files: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+
+    files: Mapped[List["ResumeIngestionFile"]] = relationship(
+        order_by="ResumeIngestionFile.index", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    @property
+    def counts(self) -> dict:
+        counts: dict = {}
+        for entry in self.files:
+            counts[entry.status] = counts.get(entry.status, 0) + 1
+        return counts
+
+
+class ResumeIngestionFile(Base):
+    """One CV of a bulk resume upload."""
+
+    __tablename__ = "resume_ingestion_files"
+
+    job_id: Mapped[str] = mapped_column(
+        ForeignKey("resume_ingestion_jobs.job_id", ondelete="CASCADE"), primary_key=True
+    )
+    index: Mapped[int] = mapped_column("file_index", Integer, primary_key=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # stored, parsed, created, duplicate, failed
+    size: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    candidate_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    duplicate_of: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+
+
 class Interview(Base):
     """Interview scheduling and management."""
 
@@ -321,6 +434,9 @@ RECRUITMENT_STAGES = [
     {"key": "rejected", "name": "Rejected", "order": 99},
 ]
 
+# Background CV scoring job states (Candidate.cv_scoring_status)
+CV_SCORING_STATUSES = ["queued", "scoring", "scored", "failed"]
+
 # Interview types - Categories of interviews (used for interview_type field)
 # These describe WHAT kind of interview it is
 INTERVIEW_TYPES = [
@@ -9,7 +9,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.renewal import Base
@@ -33,6 +33,10 @@ class Timesheet(Base):
     Requires manager approval before payroll processing.
     """
     __tablename__ = "timesheets"
+    __table_args__ = (
+        # Month grid: status counts and pages for one period
+        Index("ix_timesheets_period_status", "year", "month", "status"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id"), nullable=False, index=True)
@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.pagination import keyset_page, split_page
 from app.models.audit_log import AuditLog
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 class AuditLogRepository:
     async def create(self, session: AsyncSession, **kwargs) -> AuditLog:
@@ -11,11 +12,19 @@ class AuditLogRepository:
         await session.refresh(log)
         return log
 
-    async def list(self, session: AsyncSession, entity: Optional[str] = None, user_id: Optional[str] = None) -> List[AuditLog]:
+    async def list(
+        self,
+        session: AsyncSession,
+        entity: Optional[str] = None,
+        user_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[AuditLog], Optional[str]]:
         query = select(AuditLog)
         if entity:
             query = query.where(AuditLog.entity == entity)
         if user_id:
             query = query.where(AuditLog.user_id == user_id)
-        result = await session.execute(query.order_by(AuditLog.timestamp.desc()))
-        return result.scalars().all()
+        query = keyset_page(query, AuditLog.timestamp, AuditLog.id, cursor, limit)
+        result = await session.execute(query)
+        return split_page(list(result.scalars().all()), limit, "timestamp")
@@ -1,5 +1,5 @@
 from datetime import date, datetime, timezone
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
 
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -132,3 +132,43 @@ class EmployeeRepository:
             .order_by(Employee.name)
         )
         return result.scalars().all()
+
+    async def bulk_update(
+        self, session: AsyncSession, changes: List[dict], fields: Sequence[str]
+    ) -> List[tuple]:
+        """
+        Apply per-employee field changes as one by-primary-key executemany UPDATE.
+
+        Each change dict carries ``employee_id`` plus any subset of ``fields``.
+        Matching rows are resolved with a single SELECT, then the parameter sets
+        are sent through ``update(Employee)`` so SQLAlchemy batches rows sharing
+        the same keys; omitted fields keep their value while explicit ``None``
+        clears it. Works on every dialect (no ``UPDATE ... FROM (VALUES ...)``).
+        Returns ``(id, employee_id)`` for every row that matched.
+        """
+        if not changes:
+            return []
+
+        result = await session.execute(
+            select(Employee.id, Employee.employee_id).where(
+                Employee.employee_id.in_([change["employee_id"] for change in changes])
+            )
+        )
+        matched = [tuple(row) for row in result.all()]
+        ids = {employee_id: id for id, employee_id in matched}
+
+        params = []
+        for change in changes:
+            id = ids.get(change["employee_id"])
+            if id is None:
+                continue
+            row = {field: change[field] for field in fields if field in change}
+            if row:
+                row["id"] = id
+                params.append(row)
+
+        if params:
+            await session.execute(
+                update(Employee).execution_options(synchronize_session=False), params
+            )
+        return matched
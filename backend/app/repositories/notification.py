@@ -1,29 +1,80 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models.notification import Notification
-from typing import List, Optional
+from sqlalchemy import insert, select, update
+from app.core.pagination import keyset_page, split_page
+from app.models.notification import Notification, NotificationCounter
+from typing import List, Optional, Tuple
 
 class NotificationRepository:
-    async def create(self, session: AsyncSession, **kwargs) -> Notification:
+    async def add(self, session: AsyncSession, **kwargs) -> Notification:
+        """Stage a notification and bump the recipient's unread counter (no commit)."""
         notification = Notification(**kwargs)
         session.add(notification)
+        if notification.user_id and not notification.is_read:
+            await self._adjust_unread(session, notification.user_id, 1)
+        return notification
+
+    async def create(self, session: AsyncSession, **kwargs) -> Notification:
+        notification = await self.add(session, **kwargs)
         await session.commit()
         await session.refresh(notification)
         return notification
 
-    async def list(self, session: AsyncSession, user_id: Optional[str] = None, unread_only: bool = False) -> List[Notification]:
+    async def list(
+        self,
+        session: AsyncSession,
+        user_id: Optional[str] = None,
+        unread_only: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Notification], Optional[str]]:
         query = select(Notification)
         if user_id:
             query = query.where(Notification.user_id == user_id)
         if unread_only:
             query = query.where(Notification.is_read == False)
-        result = await session.execute(query.order_by(Notification.created_at.desc()))
-        return result.scalars().all()
+        query = keyset_page(query, Notification.created_at, Notification.id, cursor, limit)
+        result = await session.execute(query)
+        return split_page(list(result.scalars().all()), limit, "created_at")
 
     async def mark_read(self, session: AsyncSession, notification_id: int) -> Optional[Notification]:
         notification = await session.get(Notification, notification_id)
         if notification:
+            if not notification.is_read and notification.user_id:
+                await self._adjust_unread(session, notification.user_id, -1)
             notification.is_read = True
             await session.commit()
             await session.refresh(notification)
         return notification
+
+    async def mark_all_read(self, session: AsyncSession, user_id: str) -> int:
+        """Mark every unread notification for a user read in one statement."""
+        result = await session.execute(
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read == False)
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=0)
+        )
+        await session.commit()
+        return result.rowcount or 0
+
+    async def unread_count(self, session: AsyncSession, user_id: str) -> int:
+        result = await session.execute(
+            select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+        )
+        return max(result.scalar_one_or_none() or 0, 0)
+
+    async def _adjust_unread(self, session: AsyncSession, user_id: str, delta: int) -> None:
+        result = await session.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=NotificationCounter.unread_count + delta)
+        )
+        if not result.rowcount and delta > 0:
+            await session.execute(
+                insert(NotificationCounter).values(user_id=user_id, unread_count=delta)
+            )
@@ -5,10 +5,11 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 import jwt
 from jwt.exceptions import PyJWTError
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.core.time import get_utc_now, get_uae_today, get_uae_today_from_utc, to_uae
 from app.database import get_session
 from app.models.employee import Employee
@@ -22,12 +23,16 @@ from app.models.attendance import (
     WORK_LOCATIONS, WORK_LOCATIONS_REQUIRE_REMARKS
 )
 from app.models.system_settings import SystemSetting
+from app.services.offset_hours import (
+    HOURS_PER_OFFSET_DAY, InsufficientOffsetBalance, offset_hours_service
+)
 from app.schemas.attendance import (
     ClockInRequest, ClockOutRequest, BreakRequest,
     AttendanceResponse, AttendanceDashboard, EmployeeWorkSettings,
     WFHApprovalRequest, OvertimeApprovalRequest, TodayAttendanceStatus,
     ManualAttendanceRequest, AttendanceCorrectionRequest, CorrectionApprovalRequest,
-    ExceptionalOvertimeRequest, OffsetBalanceSummary, OffsetDayRecord,
+    ExceptionalOvertimeRequest, OffsetBalanceSummary, OffsetHoursEntryCreate,
+    OffsetHoursHistoryPage,
     PaidOvertimeSummary, PaidOvertimeRecord,
     ManagerDailySummary, ManagerDailySummaryRow
 )
@@ -621,6 +626,7 @@ async def clock_out(
         # For Offset policy, track offset hours earned
         if overtime_policy.upper() == "OFFSET":
             record.offset_hours_earned = overtime_hrs
+            await offset_hours_service.sync_record(session, record, current_user.id)
     elif overtime_hrs and overtime_hrs > 0:
         # Overtime not applicable for this employee
         record.overtime_hours = Decimal("0")
@@ -1185,6 +1191,11 @@ async def approve_overtime(
         # Update offset hours if employee uses Offset policy
         if emp_overtime_type and emp_overtime_type.upper() == "OFFSET":
             record.offset_hours_earned = request.hours
+            try:
+                await offset_hours_service.sync_record(session, record, current_user.id)
+            except InsufficientOffsetBalance as e:
+                await session.rollback()
+                raise HTTPException(status_code=400, detail=str(e))
     
     if request.notes:
         record.notes = (record.notes or "") + f"\nOvertime {'Approved' if request.approved else 'Rejected'}: {request.notes}"
@@ -1269,9 +1280,12 @@ async def get_offset_balance(
     
     For employees with overtime_type = "Offset", this returns:
     - Total offset hours earned from overtime
-    - Total offset hours used as time-off
-    - Available balance (earned - used)
+    - Total offset hours used as time-off (and expired / adjusted by HR)
+    - Available balance (earned + adjusted - used - expired)
     - Balance converted to days (balance / 8 hours)
+    
+    Totals come from the materialized ledger balance; use
+    /offset-history/{employee_id} for the entry-by-entry history.
     """
     # Check if admin/HR or the employee themselves
     if current_user.role not in ["admin", "hr"] and current_user.id != employee_id:
@@ -1279,67 +1293,84 @@ async def get_offset_balance(
     
     # Get employee
     emp_result = await session.execute(
-        select(Employee).where(Employee.id == employee_id)
+        select(Employee.name).where(Employee.id == employee_id)
     )
-    employee = emp_result.scalar_one_or_none()
+    employee_name = emp_result.scalar_one_or_none()
     
-    if not employee:
+    if employee_name is None:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    # Get all attendance records with offset hours
-    records_result = await session.execute(
-        select(AttendanceRecord).where(
-            and_(
-                AttendanceRecord.employee_id == employee_id,
-                AttendanceRecord.offset_hours_earned > 0
-            )
-        ).order_by(AttendanceRecord.attendance_date.desc())
-    )
-    records = records_result.scalars().all()
+    balance = await offset_hours_service.get_balance(session, employee_id)
+    if not balance:
+        return OffsetBalanceSummary(employee_id=employee_id, employee_name=employee_name)
     
-    total_earned = Decimal("0")
-    total_used = Decimal("0")
-    offset_records = []
-    
-    for record in records:
-        earned = record.offset_hours_earned or Decimal("0")
-        total_earned += earned
-        
-        # Check if offset was used (referenced in offset_day_reference)
-        used = Decimal("0")
-        status = "available"
-        if record.offset_day_reference and "Used" in record.offset_day_reference:
-            used = earned
-            total_used += used
-            status = "used"
-        
-        offset_records.append(OffsetDayRecord(
-            attendance_date=record.attendance_date,
-            hours_earned=earned,
-            hours_used=used,
-            reference=record.offset_day_reference,
-            status=status
-        ))
-    
-    balance = total_earned - total_used
-    days_balance = balance / Decimal("8")  # Convert to days
+    available = balance.balance
+    days_balance = available / HOURS_PER_OFFSET_DAY  # Convert to days
     
     return OffsetBalanceSummary(
         employee_id=employee_id,
-        employee_name=employee.name,
-        total_offset_hours_earned=total_earned,
-        total_offset_hours_used=total_used,
-        offset_hours_balance=balance,
+        employee_name=employee_name,
+        total_offset_hours_earned=balance.earned,
+        total_offset_hours_used=balance.used,
+        total_offset_hours_expired=balance.expired,
+        total_offset_hours_adjusted=balance.adjusted,
+        offset_hours_balance=available,
         offset_days_balance=days_balance.quantize(Decimal("0.01")),
-        records=offset_records
     )
 
 
+@router.get("/offset-history/{employee_id}", response_model=OffsetHoursHistoryPage)
+async def get_offset_history(
+    employee_id: int,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Page through an employee's offset-hours ledger, newest first."""
+    if current_user.role not in ["admin", "hr"] and current_user.id != employee_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    items, next_cursor = await offset_hours_service.history(session, employee_id, cursor, limit)
+    return OffsetHoursHistoryPage(items=items, next_cursor=next_cursor)
+
+
+@router.post("/offset-balance/{employee_id}/entries", response_model=OffsetBalanceSummary)
+async def post_offset_entry(
+    employee_id: int,
+    entry: OffsetHoursEntryCreate,
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Record offset hours taken as time off, expired, or adjusted (admin/HR only)."""
+    if current_user.role not in ["admin", "hr"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    if entry.entry_type != "adjusted" and entry.hours <= 0:
+        raise HTTPException(status_code=400, detail="Hours must be positive")
+    
+    employee = await session.get(Employee, employee_id)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    
+    try:
+        await offset_hours_service.post(
+            session, employee_id, entry.entry_type, entry.hours,
+            entry_date=entry.entry_date, note=entry.note, created_by=current_user.id,
+        )
+    except InsufficientOffsetBalance as e:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    await session.commit()
+    
+    return await get_offset_balance(employee_id, current_user, session)
+
+
 @router.get("/paid-overtime-summary/{employee_id}", response_model=PaidOvertimeSummary)
 async def get_paid_overtime_summary(
     employee_id: int,
     start_date: date = Query(..., description="Period start date"),
     end_date: date = Query(..., description="Period end date"),
+    include_records: bool = Query(True, description="Include the per-day breakdown"),
     current_user: Employee = Depends(get_current_employee),
     session: AsyncSession = Depends(get_session)
 ):
@@ -1349,7 +1380,9 @@ async def get_paid_overtime_summary(
     this returns:
     - Total overtime hours broken down by rate (125% vs 150%)
     - Calculated overtime amounts
-    - Individual records for review
+    - Individual records for review (skip with include_records=false)
+    
+    Totals are aggregated in the database in one pass.
     """
     # Check if admin/HR or the employee themselves
     if current_user.role not in ["admin", "hr"] and current_user.id != employee_id:
@@ -1364,70 +1397,70 @@ async def get_paid_overtime_summary(
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    # Get attendance records with overtime in the period
-    # Include records where: employee has Paid policy OR exceptional_overtime is True
-    records_result = await session.execute(
-        select(AttendanceRecord).where(
-            and_(
-                AttendanceRecord.employee_id == employee_id,
-                AttendanceRecord.attendance_date >= start_date,
-                AttendanceRecord.attendance_date <= end_date,
-                AttendanceRecord.overtime_hours > 0,
-                AttendanceRecord.overtime_approved == True
-            )
-        ).order_by(AttendanceRecord.attendance_date)
-    )
-    records = records_result.scalars().all()
-    
     # Calculate hourly rate from basic salary
     hourly_rate = None
     if employee.basic_salary:
         hourly_rate = (employee.basic_salary / Decimal("30")) / Decimal("8")
     
-    # Check employee's overtime policy once outside the loop
-    overtime_policy = (employee.overtime_type or "N/A").upper()
-    is_paid_policy = overtime_policy == "PAID"
+    # Approved overtime in the period; only exceptional days count unless the
+    # employee is on the Paid policy
+    conditions = [
+        AttendanceRecord.employee_id == employee_id,
+        AttendanceRecord.attendance_date >= start_date,
+        AttendanceRecord.attendance_date <= end_date,
+        AttendanceRecord.overtime_hours > 0,
+        AttendanceRecord.overtime_approved == True,
+    ]
+    if (employee.overtime_type or "N/A").upper() != "PAID":
+        conditions.append(AttendanceRecord.exceptional_overtime == True)
+    
+    hours = AttendanceRecord.overtime_hours
+    is_night = AttendanceRecord.is_night_overtime == True
+    is_holiday = and_(AttendanceRecord.is_night_overtime == False, AttendanceRecord.is_holiday_overtime == True)
+    is_regular = and_(AttendanceRecord.is_night_overtime == False, AttendanceRecord.is_holiday_overtime == False)
+    
+    totals_result = await session.execute(
+        select(
+            func.coalesce(func.sum(case((is_regular, hours), else_=0)), 0),
+            func.coalesce(func.sum(case((is_night, hours), else_=0)), 0),
+            func.coalesce(func.sum(case((is_holiday, hours), else_=0)), 0),
+        ).where(and_(*conditions))
+    )
+    regular_overtime_hours, night_overtime_hours, holiday_overtime_hours = (
+        Decimal(str(v)) for v in totals_result.one()
+    )
+    premium_hours = night_overtime_hours + holiday_overtime_hours
+    total_overtime_hours = regular_overtime_hours + premium_hours
     
-    total_overtime_hours = Decimal("0")
-    regular_overtime_hours = Decimal("0")
-    night_overtime_hours = Decimal("0")
-    holiday_overtime_hours = Decimal("0")
     total_amount = Decimal("0")
-    overtime_records = []
+    if hourly_rate:
+        total_amount = hourly_rate * (
+            regular_overtime_hours * OVERTIME_RATE_REGULAR + premium_hours * OVERTIME_RATE_HOLIDAY
+        )
     
-    for record in records:
-        # Only include if employee has Paid policy or this is exceptional overtime
-        if not is_paid_policy and not record.exceptional_overtime:
-            continue
-        
-        hours = record.overtime_hours or Decimal("0")
-        total_overtime_hours += hours
-        
-        # Determine rate
-        if record.is_night_overtime or record.is_holiday_overtime:
-            rate = OVERTIME_RATE_HOLIDAY  # 1.50
-            if record.is_night_overtime:
-                night_overtime_hours += hours
-            else:
-                holiday_overtime_hours += hours
-        else:
-            rate = OVERTIME_RATE_REGULAR  # 1.25
-            regular_overtime_hours += hours
-        
-        # Calculate amount
-        amount = Decimal("0")
-        if hourly_rate:
-            amount = hours * hourly_rate * rate
-            total_amount += amount
-        
-        overtime_records.append(PaidOvertimeRecord(
-            attendance_date=record.attendance_date,
-            overtime_hours=hours,
-            rate=rate,
-            amount=amount,
-            is_exceptional=record.exceptional_overtime,
-            notes=record.exceptional_overtime_reason if record.exceptional_overtime else None
-        ))
+    overtime_records = []
+    if include_records:
+        records_result = await session.execute(
+            select(
+                AttendanceRecord.attendance_date,
+                AttendanceRecord.overtime_hours,
+                AttendanceRecord.is_night_overtime,
+                AttendanceRecord.is_holiday_overtime,
+                AttendanceRecord.exceptional_overtime,
+                AttendanceRecord.exceptional_overtime_reason,
+            ).where(and_(*conditions)).order_by(AttendanceRecord.attendance_date)
+        )
+        for attendance_date, record_hours, night, holiday, exceptional, reason in records_result.all():
+            # 150% for night/holiday overtime, 125% otherwise
+            rate = OVERTIME_RATE_HOLIDAY if night or holiday else OVERTIME_RATE_REGULAR
+            overtime_records.append(PaidOvertimeRecord(
+                attendance_date=attendance_date,
+                overtime_hours=record_hours,
+                rate=rate,
+                amount=record_hours * hourly_rate * rate if hourly_rate else Decimal("0"),
+                is_exceptional=exceptional,
+                notes=reason if exceptional else None
+            ))
     
     return PaidOvertimeSummary(
         employee_id=employee_id,
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.audit_log import AuditLogService
 from app.repositories.audit_log import AuditLogRepository
-from app.schemas.audit_log import AuditLogBase, AuditLogResponse
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.schemas.audit_log import AuditLogBase, AuditLogPage, AuditLogResponse
 from app.auth.dependencies import require_role
 from app.database import get_session
-from typing import List, Optional
+from typing import Optional
 
 router = APIRouter(prefix="/api/audit-logs", tags=["audit-logs"])
 service = AuditLogService(AuditLogRepository())
@@ -18,11 +19,13 @@ async def log_action(
 ):
     return await service.log_action(session, data)
 
-@router.get("", response_model=List[AuditLogResponse])
+@router.get("", response_model=AuditLogPage)
 async def list_logs(
     entity: Optional[str] = None,
     user_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     session: AsyncSession = Depends(get_session),
     user = Depends(require_role(["admin"]))
 ):
-    return await service.list(session, entity, user_id)
+    return await service.list(session, entity, user_id, cursor, limit)
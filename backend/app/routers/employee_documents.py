@@ -21,6 +21,7 @@ from app.schemas.employee_document import (
     DocumentListResponse,
 )
 from app.auth.dependencies import require_auth, require_hr
+from app.services.compliance_expiries import compliance_expiry_service
 
 router = APIRouter(prefix="/api/employees", tags=["Employee Documents"])
 
@@ -182,6 +183,8 @@ async def create_document_metadata(
     )
     
     session.add(document)
+    await session.flush()
+    await compliance_expiry_service.sync_document(session, document)
     await session.commit()
     await session.refresh(document)
     
@@ -303,6 +306,7 @@ async def process_document_ocr(
             document.issue_date = extracted.issue_date
         if extracted.expiry_date and not document.expiry_date:
             document.expiry_date = extracted.expiry_date
+            await compliance_expiry_service.sync_document(session, document)
         
         await session.commit()
         await session.refresh(document)
@@ -404,6 +408,9 @@ async def update_document(
     for field, value in update_data.items():
         setattr(document, field, value)
     
+    if update_data.keys() & {"expiry_date", "document_name"}:
+        await compliance_expiry_service.sync_document(session, document)
+    
     await session.commit()
     await session.refresh(document)
     
@@ -485,6 +492,7 @@ async def delete_document(
     if document.file_path and os.path.exists(document.file_path):
         os.remove(document.file_path)
     
+    await compliance_expiry_service.remove_document(session, document.id)
     await session.delete(document)
     await session.commit()
     
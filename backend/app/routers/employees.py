@@ -4,6 +4,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, File, UploadFile, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.dependencies import get_employee_id_from_token
 from app.core.security import require_role
 from app.database import get_session
 from app.schemas.employee import (
@@ -282,12 +283,14 @@ async def export_employees(
 async def bulk_update_employees(
     updates: List[dict],
     role: str = Depends(require_role(["admin", "hr"])),
+    actor_id: str = Depends(get_employee_id_from_token),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Bulk update multiple employees at once (JSON body).
     
     Updates department, manager, status, job title, and location for multiple employees.
+    All changes are applied in a single set-based UPDATE and audited as one batch.
     
     **Request body format:**
     ```json
@@ -312,8 +315,9 @@ async def bulk_update_employees(
     - `updated`: Count of successfully updated employees
     - `not_found`: Count of employees not found
     - `errors`: List of error messages (max 20)
+    - `results`: Per-employee outcome (`updated` or `not_found`)
     """
-    return await employee_service.bulk_update_employees(session, updates)
+    return await employee_service.bulk_update_employees(session, updates, actor_id)
 
 
 @router.get(
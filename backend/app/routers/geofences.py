@@ -1,21 +1,27 @@
 """Geofence management router."""
+import calendar
+from datetime import date
 from typing import List
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 import jwt
 from jwt.exceptions import PyJWTError
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.database import get_session
+from app.models.attendance import AttendanceRecord
 from app.models.employee import Employee
-from app.models.geofence import Geofence, DEFAULT_GEOFENCES, is_within_geofence
+from app.models.geofence import Geofence, DEFAULT_GEOFENCES
 from app.schemas.geofence import (
     GeofenceCreate, GeofenceUpdate, GeofenceResponse,
-    GeofenceValidationRequest, GeofenceValidationResponse, NearbyGeofence
+    GeofenceValidationRequest, GeofenceValidationResponse, NearbyGeofence,
+    GeofenceBatchValidationRequest, GeofenceBatchValidationResponse,
+    GeofenceAuditEntry, GeofenceAuditResponse
 )
 from app.services.attendance_service import AttendanceService
+from app.services.geofence_index import get_geofence_index, invalidate_geofences
 
 router = APIRouter(prefix="/geofences", tags=["Geofences"])
 
@@ -80,6 +86,31 @@ async def list_geofences(
     ]
 
 
+# Declared before /{geofence_id} so "nearby" is not parsed as an id
+@router.get("/nearby", response_model=List[NearbyGeofence])
+async def get_nearby_geofences(
+    latitude: float = Query(..., description="Current latitude"),
+    longitude: float = Query(..., description="Current longitude"),
+    max_distance: int = Query(5000, description="Maximum distance in meters"),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Get geofences near a location, sorted by distance."""
+    index = await get_geofence_index(session)
+    
+    return [
+        NearbyGeofence(
+            name=gf.name,
+            distance_meters=distance,
+            within_radius=distance <= gf.radius_meters,
+            latitude=gf.latitude,
+            longitude=gf.longitude,
+            radius_meters=gf.radius_meters
+        )
+        for gf, distance in index.nearby(latitude, longitude, max_distance)
+    ]
+
+
 @router.get("/{geofence_id}", response_model=GeofenceResponse)
 async def get_geofence(
     geofence_id: int,
@@ -137,6 +168,7 @@ async def create_geofence(
     )
     
     session.add(new_geofence)
+    await invalidate_geofences(session)
     await session.commit()
     await session.refresh(new_geofence)
     
@@ -189,6 +221,7 @@ async def update_geofence(
     if update.is_active is not None:
         geofence.is_active = update.is_active
     
+    await invalidate_geofences(session)
     await session.commit()
     await session.refresh(geofence)
     
@@ -234,42 +267,82 @@ async def validate_location(
     )
 
 
-@router.get("/nearby", response_model=List[NearbyGeofence])
-async def get_nearby_geofences(
-    latitude: float = Query(..., description="Current latitude"),
-    longitude: float = Query(..., description="Current longitude"),
-    max_distance: int = Query(5000, description="Maximum distance in meters"),
+@router.post("/validate-batch", response_model=GeofenceBatchValidationResponse)
+async def validate_locations(
+    request: GeofenceBatchValidationRequest,
     current_user: Employee = Depends(get_current_employee),
     session: AsyncSession = Depends(get_session)
 ):
-    """Get geofences near a location, sorted by distance."""
+    """Validate many GPS points against geofences in one vectorized pass."""
+    service = AttendanceService(session)
+    results = await service.validate_geofences([
+        (float(p.latitude), float(p.longitude), p.work_location) for p in request.points
+    ])
+    valid = sum(1 for r in results if r["is_valid"])
+    
+    return GeofenceBatchValidationResponse(
+        valid_count=valid,
+        invalid_count=len(results) - valid,
+        results=[GeofenceValidationResponse(**r) for r in results]
+    )
+
+
+@router.get("/audit/{year}/{month}", response_model=GeofenceAuditResponse)
+async def audit_clock_in_locations(
+    year: int,
+    month: int,
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Check a month of GPS clock-ins against geofences (HR/Admin only)."""
+    if current_user.role not in ["admin", "hr"]:
+        raise HTTPException(status_code=403, detail="Only HR/Admin can audit clock-in locations")
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail="Invalid month")
+    
     result = await session.execute(
-        select(Geofence).where(Geofence.is_active == True)
+        select(
+            AttendanceRecord.id,
+            AttendanceRecord.employee_id,
+            AttendanceRecord.attendance_date,
+            AttendanceRecord.work_location,
+            AttendanceRecord.clock_in_latitude,
+            AttendanceRecord.clock_in_longitude,
+        ).where(
+            and_(
+                AttendanceRecord.attendance_date >= date(year, month, 1),
+                AttendanceRecord.attendance_date <= date(year, month, calendar.monthrange(year, month)[1]),
+                AttendanceRecord.clock_in_latitude.isnot(None),
+                AttendanceRecord.clock_in_longitude.isnot(None),
+            )
+        ).order_by(AttendanceRecord.attendance_date, AttendanceRecord.id)
     )
-    geofences = result.scalars().all()
+    records = result.all()
     
-    nearby = []
-    for gf in geofences:
-        is_within, distance = is_within_geofence(
-            latitude, longitude,
-            float(gf.latitude), float(gf.longitude),
-            gf.radius_meters
+    service = AttendanceService(session)
+    results = await service.validate_geofences([
+        (float(r.clock_in_latitude), float(r.clock_in_longitude), r.work_location) for r in records
+    ])
+    flagged = [
+        GeofenceAuditEntry(
+            attendance_id=r.id,
+            employee_id=r.employee_id,
+            attendance_date=r.attendance_date,
+            work_location=r.work_location,
+            distance_meters=outcome.get("distance_meters"),
+            message=outcome["message"]
         )
-        
-        if distance <= max_distance:
-            nearby.append({
-                "name": gf.name,
-                "distance_meters": distance,
-                "within_radius": is_within,
-                "latitude": gf.latitude,
-                "longitude": gf.longitude,
-                "radius_meters": gf.radius_meters
-            })
-    
-    # Sort by distance
-    nearby.sort(key=lambda x: x["distance_meters"])
+        for r, outcome in zip(records, results)
+        if not outcome["is_valid"]
+    ]
     
-    return [NearbyGeofence(**g) for g in nearby]
+    return GeofenceAuditResponse(
+        year=year,
+        month=month,
+        total_checked=len(records),
+        flagged_count=len(flagged),
+        flagged=flagged
+    )
 
 
 @router.post("/init")
@@ -306,6 +379,8 @@ async def initialize_default_geofences(
         session.add(geofence)
         created.append(gf_data["name"])
     
+    if created:
+        await invalidate_geofences(session)
     await session.commit()
     
     return {
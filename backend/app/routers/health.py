@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import require_role
 from app.database import get_session
+from app.services.org_hierarchy import invalidate_org_hierarchy
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -519,6 +520,7 @@ async def fix_production_data(
         )
         results["line_manager"]["backfilled_fuzzy"] = backfill_fuzzy.rowcount if hasattr(backfill_fuzzy, 'rowcount') else 0
         
+        await invalidate_org_hierarchy(session)
         await session.commit()
         
         # Check remaining
@@ -841,6 +843,7 @@ async def seed_all_employees(
                 {"max_id": max_id}
             )
 
+        await invalidate_org_hierarchy(session)
         await session.commit()
 
         return {
@@ -896,6 +899,8 @@ async def import_data(
                 results[table_name] = result["imported"]
                 all_errors.extend(result["errors"])
         
+        if "employees" in data:
+            await invalidate_org_hierarchy(session)
         await session.commit()
         
     except Exception as e:
@@ -1,5 +1,6 @@
 """Leave management router with enhanced features and UAE compliance."""
 from datetime import date, datetime, timezone
+from decimal import Decimal
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
@@ -9,16 +10,28 @@ from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.time import get_uae_today
 from app.database import get_session
 from app.models.employee import Employee
 from app.models.leave import LeaveRequest, LeaveBalance, LEAVE_TYPES
 from app.models.public_holiday import PublicHoliday
 from app.schemas.leave import (
     LeaveBalanceResponse, LeaveBalanceSummary, LeaveRequestCreate,
-    LeaveRequestResponse, LeaveApprovalRequest, LeaveCalendarEntry,
-    PublicHolidayResponse
+    LeaveRequestResponse, LeaveApprovalRequest, LeaveBulkApprovalRequest,
+    LeaveBulkApprovalResponse, LeaveCalendarEntry,
+    LeaveCoverageResponse, LeaveLedgerEntryResponse, PublicHolidayResponse
 )
+from app.services.calendar_snapshots import (
+    HOLIDAY_SCOPES, LEAVE_CALENDAR_SCOPES, invalidate_leave_calendar, serve_snapshot
+)
+from app.services.leave_approvals import leave_approval_service
+from app.services.leave_coverage import (
+    DEFAULT_ABSENCE_THRESHOLD, MAX_COVERAGE_DAYS, leave_coverage_service
+)
+from app.services.leave_ledger import leave_ledger_service
+from app.services.org_hierarchy import get_org_hierarchy
 from app.services.leave_service import get_leave_service
+from app.services.work_calendar import get_work_calendar
 
 router = APIRouter(prefix="/leave", tags=["Leave Management"])
 
@@ -174,6 +187,8 @@ async def create_leave_request(
     )
     
     session.add(leave_request)
+    await session.flush()
+    await leave_ledger_service.request_submitted(session, leave_request)
     await session.commit()
     await session.refresh(leave_request)
     
@@ -248,6 +263,36 @@ async def get_leave_requests(
     ]
 
 
+@router.post("/bulk-approve", response_model=LeaveBulkApprovalResponse)
+async def bulk_approve_leave_requests(
+    decision: LeaveBulkApprovalRequest,
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Approve or reject many pending leave requests in one transaction (manager/HR only).
+    
+    Balances and overlaps are validated for the whole batch; requests that fail
+    are reported and left pending while the rest are applied together. Each
+    affected employee gets one digest notification.
+    """
+    if current_user.role not in ["admin", "hr", "manager"]:
+        raise HTTPException(status_code=403, detail="Only managers and HR can approve leave")
+    
+    results = await leave_approval_service.bulk_decide(
+        session,
+        decision.request_ids,
+        approved=decision.approved,
+        actor=current_user,
+        rejection_reason=decision.rejection_reason,
+    )
+    processed = sum(1 for r in results if r["status"] in ("approved", "rejected"))
+    return LeaveBulkApprovalResponse(
+        processed=processed,
+        failed=len(results) - processed,
+        results=results,
+    )
+
+
 @router.post("/{request_id}/approve", response_model=LeaveRequestResponse)
 async def approve_leave_request(
     request_id: int,
@@ -285,24 +330,72 @@ async def approve_leave_request(
         leave_request.status = "approved"
         leave_request.approved_by = current_user.id
         leave_request.approved_at = now
-        
-        # Update leave balance
-        balance_result = await session.execute(
-            select(LeaveBalance).where(
-                and_(
-                    LeaveBalance.employee_id == leave_request.employee_id,
-                    LeaveBalance.year == leave_request.start_date.year,
-                    LeaveBalance.leave_type == leave_request.leave_type
-                )
-            )
-        )
-        balance = balance_result.scalar_one_or_none()
-        if balance:
-            balance.pending += leave_request.total_days
+        await leave_ledger_service.request_approved(session, leave_request, current_user.id)
+        await invalidate_leave_calendar(session)
     else:
         leave_request.status = "rejected"
         leave_request.rejection_reason = approval.rejection_reason
+        await leave_ledger_service.request_released(
+            session, leave_request, "pending", current_user.id, note="Rejected"
+        )
+    
+    await session.commit()
+    await session.refresh(leave_request)
+    
+    return LeaveRequestResponse(
+        id=leave_request.id,
+        employee_id=leave_request.employee_id,
+        leave_type=leave_request.leave_type,
+        start_date=leave_request.start_date,
+        end_date=leave_request.end_date,
+        is_half_day=leave_request.is_half_day,
+        half_day_type=leave_request.half_day_type,
+        total_days=leave_request.total_days,
+        reason=leave_request.reason,
+        status=leave_request.status,
+        approved_by=leave_request.approved_by,
+        approved_at=leave_request.approved_at,
+        rejection_reason=leave_request.rejection_reason,
+        created_at=leave_request.created_at
+    )
+
+
+@router.post("/{request_id}/cancel", response_model=LeaveRequestResponse)
+async def cancel_leave_request(
+    request_id: int,
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Cancel a pending or approved leave request and return its days to the balance.
+    
+    Employees can cancel their own requests before the leave starts; HR/admin can
+    cancel any pending or approved request.
+    """
+    result = await session.execute(
+        select(LeaveRequest).where(LeaveRequest.id == request_id)
+    )
+    leave_request = result.scalar_one_or_none()
+    
+    if not leave_request:
+        raise HTTPException(status_code=404, detail="Leave request not found")
+    
+    is_hr = current_user.role in ["admin", "hr"]
+    if not is_hr:
+        if leave_request.employee_id != current_user.id:
+            raise HTTPException(status_code=403, detail="You can only cancel your own leave requests")
+        if leave_request.start_date <= get_uae_today():
+            raise HTTPException(status_code=400, detail="Leave has already started; contact HR to cancel")
     
+    previous_status = leave_request.status
+    if previous_status not in ["pending", "approved"]:
+        raise HTTPException(status_code=400, detail=f"Cannot cancel a {previous_status} leave request")
+    
+    leave_request.status = "cancelled"
+    await leave_ledger_service.request_released(
+        session, leave_request, previous_status, current_user.id, note="Cancelled"
+    )
+    if previous_status == "approved":
+        await invalidate_leave_calendar(session)
     await session.commit()
     await session.refresh(leave_request)
     
@@ -331,6 +424,7 @@ async def get_leave_calendar(
     month: Optional[int] = Query(None, description="Filter by month (1-12)"),
     year: Optional[int] = Query(None, description="Filter by year"),
     include_holidays: bool = Query(True, description="Include public holidays"),
+    if_none_match: Optional[str] = Header(None),
     current_user: Employee = Depends(get_current_employee),
     session: AsyncSession = Depends(get_session)
 ):
@@ -338,6 +432,7 @@ async def get_leave_calendar(
     
     Shows approved leaves only for transparency. Optionally filters by month/year.
     If include_holidays is True, public holidays are included in the response.
+    Served from a versioned snapshot with an ETag; unchanged ranges return 304.
     """
     # Apply month/year filters if provided
     if month and year:
@@ -349,99 +444,152 @@ async def get_leave_calendar(
         start_date = date(year, 1, 1)
         end_date = date(year, 12, 31)
     
-    # Get approved leaves
-    result = await session.execute(
-        select(LeaveRequest, Employee).join(
-            Employee, LeaveRequest.employee_id == Employee.id
-        ).where(
-            and_(
-                LeaveRequest.status == "approved",
-                LeaveRequest.start_date <= end_date,
-                LeaveRequest.end_date >= start_date
-            )
-        ).order_by(LeaveRequest.start_date)
-    )
-    leaves = result.all()
-    
-    calendar_entries = [
-        LeaveCalendarEntry(
-            employee_id=leave.employee_id,
-            employee_name=emp.name,
-            leave_type=leave.leave_type,
-            start_date=leave.start_date,
-            end_date=leave.end_date,
-            status=leave.status,
-            is_half_day=leave.is_half_day,
-            is_holiday=False
-        )
-        for leave, emp in leaves
-    ]
-    
-    # Add public holidays if requested
-    if include_holidays:
-        holiday_result = await session.execute(
-            select(PublicHoliday).where(
+    async def build() -> List[LeaveCalendarEntry]:
+        # Get approved leaves
+        result = await session.execute(
+            select(LeaveRequest, Employee).join(
+                Employee, LeaveRequest.employee_id == Employee.id
+            ).where(
                 and_(
-                    PublicHoliday.is_active == True,
-                    PublicHoliday.start_date <= end_date,
-                    PublicHoliday.end_date >= start_date
+                    LeaveRequest.status == "approved",
+                    LeaveRequest.start_date <= end_date,
+                    LeaveRequest.end_date >= start_date
                 )
-            ).order_by(PublicHoliday.start_date)
+            ).order_by(LeaveRequest.start_date)
         )
-        holidays = holiday_result.scalars().all()
+        leaves = result.all()
         
-        # Add holidays as calendar entries
-        for holiday in holidays:
-            calendar_entries.append(
-                LeaveCalendarEntry(
-                    employee_id=0,  # System entry
-                    employee_name=holiday.name,
-                    leave_type="public_holiday",
-                    start_date=holiday.start_date,
-                    end_date=holiday.end_date,
-                    status="approved",
-                    is_half_day=False,
-                    is_holiday=True
-                )
+        calendar_entries = [
+            LeaveCalendarEntry(
+                employee_id=leave.employee_id,
+                employee_name=emp.name,
+                leave_type=leave.leave_type,
+                start_date=leave.start_date,
+                end_date=leave.end_date,
+                status=leave.status,
+                is_half_day=leave.is_half_day,
+                is_holiday=False
             )
+            for leave, emp in leaves
+        ]
+        
+        # Add public holidays if requested
+        if include_holidays:
+            holiday_result = await session.execute(
+                select(PublicHoliday).where(
+                    and_(
+                        PublicHoliday.is_active == True,
+                        PublicHoliday.start_date <= end_date,
+                        PublicHoliday.end_date >= start_date
+                    )
+                ).order_by(PublicHoliday.start_date)
+            )
+            holidays = holiday_result.scalars().all()
+            
+            # Add holidays as calendar entries
+            for holiday in holidays:
+                calendar_entries.append(
+                    LeaveCalendarEntry(
+                        employee_id=0,  # System entry
+                        employee_name=holiday.name,
+                        leave_type="public_holiday",
+                        start_date=holiday.start_date,
+                        end_date=holiday.end_date,
+                        status="approved",
+                        is_half_day=False,
+                        is_holiday=True
+                    )
+                )
+        
+        # Sort by start date
+        calendar_entries.sort(key=lambda x: x.start_date)
+        
+        return calendar_entries
+    
+    return await serve_snapshot(
+        session,
+        ("leave_calendar", start_date, end_date, include_holidays),
+        LEAVE_CALENDAR_SCOPES,
+        build,
+        if_none_match,
+    )
+
+
+@router.get("/coverage", response_model=LeaveCoverageResponse)
+async def get_leave_coverage(
+    start_date: date = Query(..., description="Range start date"),
+    end_date: date = Query(..., description="Range end date"),
+    department: Optional[str] = Query(None, description="Limit to one department (HR/admin)"),
+    include_pending: bool = Query(False, description="Count pending requests as absences"),
+    threshold: float = Query(DEFAULT_ABSENCE_THRESHOLD, ge=0, le=100, description="Absence % that raises a conflict"),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Team coverage for a date range: people available per day, department absence %
+    and conflict warnings.
     
-    # Sort by start date
-    calendar_entries.sort(key=lambda x: x.start_date)
-    
-    return calendar_entries
+    HR/admin see the whole company (optionally one department), managers see
+    their reporting line, everyone else sees their own department.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="End date must be after start date")
+    if (end_date - start_date).days + 1 > MAX_COVERAGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_COVERAGE_DAYS} days")
+    
+    employee_ids = None
+    if current_user.role in ["admin", "hr"]:
+        pass
+    elif current_user.role == "manager":
+        org = await get_org_hierarchy(session)
+        employee_ids = [current_user.id, *org.subtree_ids(current_user.id)]
+        department = None
+    else:
+        department = current_user.department
+    
+    return await leave_coverage_service.coverage(
+        session, start_date, end_date,
+        employee_ids=employee_ids,
+        department=department,
+        include_pending=include_pending,
+        threshold=threshold,
+    )
 
 
 @router.get("/holidays", response_model=List[PublicHolidayResponse])
 async def get_public_holidays(
     year: int = Query(..., description="Year to fetch holidays for"),
+    if_none_match: Optional[str] = Header(None),
     current_user: Employee = Depends(get_current_employee),
     session: AsyncSession = Depends(get_session)
 ):
     """Get all public holidays for a specific year."""
-    result = await session.execute(
-        select(PublicHoliday).where(
-            and_(
-                PublicHoliday.year == year,
-                PublicHoliday.is_active == True
+    async def build() -> List[PublicHolidayResponse]:
+        result = await session.execute(
+            select(PublicHoliday).where(
+                and_(
+                    PublicHoliday.year == year,
+                    PublicHoliday.is_active == True
+                )
+            ).order_by(PublicHoliday.start_date)
+        )
+        holidays = result.scalars().all()
+        
+        return [
+            PublicHolidayResponse(
+                id=h.id,
+                name=h.name,
+                name_arabic=h.name_arabic,
+                start_date=h.start_date,
+                end_date=h.end_date,
+                year=h.year,
+                holiday_type=h.holiday_type,
+                is_paid=h.is_paid,
+                description=h.description
             )
-        ).order_by(PublicHoliday.start_date)
-    )
-    holidays = result.scalars().all()
+            for h in holidays
+        ]
     
-    return [
-        PublicHolidayResponse(
-            id=h.id,
-            name=h.name,
-            name_arabic=h.name_arabic,
-            start_date=h.start_date,
-            end_date=h.end_date,
-            year=h.year,
-            holiday_type=h.holiday_type,
-            is_paid=h.is_paid,
-            description=h.description
-        )
-        for h in holidays
-    ]
+    return await serve_snapshot(session, ("leave_holidays", year), HOLIDAY_SCOPES, build, if_none_match)
 
 
 @router.get("/holidays/check/{check_date}")
@@ -454,16 +602,7 @@ async def check_if_holiday(
     
     Returns holiday details if the date is a holiday, otherwise returns null.
     """
-    result = await session.execute(
-        select(PublicHoliday).where(
-            and_(
-                PublicHoliday.is_active == True,
-                PublicHoliday.start_date <= check_date,
-                PublicHoliday.end_date >= check_date
-            )
-        )
-    )
-    holiday = result.scalar_one_or_none()
+    holiday = (await get_work_calendar(session)).holiday_on(check_date)
     
     if holiday:
         return {
@@ -527,3 +666,44 @@ async def get_my_leave_balance(
             for b in balances
         ]
     )
+
+
+@router.get("/ledger/{employee_id}", response_model=List[LeaveLedgerEntryResponse])
+async def get_leave_ledger(
+    employee_id: int,
+    year: int = Query(default=None, description="Year (defaults to current year)"),
+    leave_type: Optional[str] = Query(None, description="Filter by leave type"),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Get the leave ledger (every balance movement) for an employee."""
+    if current_user.role not in ["admin", "hr"] and current_user.id != employee_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    if not year:
+        year = get_uae_today().year
+    
+    entries = await leave_ledger_service.history(session, employee_id, year, leave_type)
+    return [LeaveLedgerEntryResponse.model_validate(e) for e in entries]
+
+
+@router.post("/rollover/{year}")
+async def rollover_leave_year(
+    year: int,
+    max_carry_forward: Optional[Decimal] = Query(None, ge=0, description="Cap on carried-forward annual days"),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Open next year's leave balances for all active employees (HR/Admin only).
+    
+    Carries unused annual leave forward and re-grants each entitlement. Balances
+    already opened for the next year are skipped, so re-running is safe.
+    """
+    if current_user.role not in ["admin", "hr"]:
+        raise HTTPException(status_code=403, detail="Only HR/Admin can run the leave rollover")
+    
+    summary = await leave_ledger_service.rollover_year(
+        session, year, max_carry_forward, actor_id=current_user.id
+    )
+    await session.commit()
+    return summary
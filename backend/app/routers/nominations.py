@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_session
 from app.models import Employee, EoyNomination, ELIGIBLE_JOB_LEVELS
 from app.models.audit_log import AuditLog
-from app.models.notification import Notification
+from app.repositories.notification import NotificationRepository
 from app.schemas.nomination import (
     NominationCreate, NominationResponse, NominationUpdate, NominationContentUpdate,
     EligibleEmployee, NominationListResponse, NominationStats, EligibleManager,
@@ -24,6 +24,7 @@ from app.schemas.nomination import (
 )
 from app.models.nomination_settings import NominationSettings
 from app.services.email_service import send_nomination_confirmation_email
+from app.services.org_hierarchy import OrgHierarchy, OrgNode, get_org_hierarchy
 from app.auth.dependencies import require_role
 
 VERIFICATION_SECRET = os.environ.get("AUTH_SECRET_KEY", "nomination-verify-secret-key")
@@ -127,37 +128,21 @@ async def get_eligible_managers(
     if year is None:
         year = datetime.now().year
     
-    all_employees_stmt = select(Employee).where(
-        and_(
-            Employee.is_active == True,
-            func.lower(func.trim(Employee.employment_status)) == "active"
-        )
-    )
-    result = await session.execute(all_employees_stmt)
-    all_employees = result.scalars().all()
-    
-    manager_reports: dict[int, list] = {}
-    for emp in all_employees:
-        if emp.line_manager_id:
-            if emp.line_manager_id not in manager_reports:
-                manager_reports[emp.line_manager_id] = []
-            if check_eligible_job_level(emp.function):
-                manager_reports[emp.line_manager_id].append(emp)
+    org = await get_org_hierarchy(session)
+    manager_reports = _eligible_reports_by_manager(org)
     
     eligible_managers = []
     for manager_id, reports in manager_reports.items():
-        if len(reports) > 0:
-            manager = next((e for e in all_employees if e.id == manager_id), None)
-            if manager:
-                eligible_managers.append(EligibleManager(
-                    id=manager.id,
-                    employee_id=manager.employee_id,
-                    name=manager.name,
-                    job_title=manager.job_title,
-                    department=manager.department,
-                    email=manager.email,
-                    eligible_reports_count=len(reports)
-                ))
+        manager = org.get(manager_id)
+        eligible_managers.append(EligibleManager(
+            id=manager.id,
+            employee_id=manager.employee_id,
+            name=manager.name,
+            job_title=manager.job_title,
+            department=manager.department,
+            email=manager.email,
+            eligible_reports_count=len(reports)
+        ))
     
     eligible_managers.sort(key=lambda m: m.name)
     return eligible_managers
@@ -176,6 +161,21 @@ def check_eligible_job_level(function: str | None) -> bool:
     return False
 
 
+def _eligible_reports_by_manager(org: OrgHierarchy) -> Dict[int, List[OrgNode]]:
+    """Active managers mapped to their active direct reports at an eligible job level."""
+    manager_reports: Dict[int, List[OrgNode]] = {}
+    for manager in org.managers():
+        if not manager.is_active_employee:
+            continue
+        reports = [
+            report for report in org.direct_reports(manager.id)
+            if report.is_active_employee and check_eligible_job_level(report.function)
+        ]
+        if reports:
+            manager_reports[manager.id] = reports
+    return manager_reports
+
+
 @router.get(
     "/pass/status/{manager_id}",
     response_model=ManagerNominationStatus,
@@ -407,7 +407,8 @@ async def submit_nomination_secure(
     
     # Create notification for the manager with link to view/revise (same transaction)
     nomination_url = f"/nomination-pass?view={new_nomination.id}"
-    notification = Notification(
+    await NotificationRepository().add(
+        session,
         user_id=str(nominator_id),
         title="EOY Nomination Submitted",
         message=f"Your nomination of {nominee.name} for Employee of the Year {year} has been submitted successfully. Click to view details.",
@@ -415,7 +416,6 @@ async def submit_nomination_secure(
         link=nomination_url,
         is_read=False
     )
-    session.add(notification)
     
     # Commit all changes atomically
     await session.commit()
@@ -971,21 +971,8 @@ async def get_manager_progress(
     if year is None:
         year = datetime.now().year
     
-    all_employees_stmt = select(Employee).where(
-        and_(
-            Employee.is_active == True,
-            func.lower(func.trim(Employee.employment_status)) == "active"
-        )
-    )
-    result = await session.execute(all_employees_stmt)
-    all_employees = result.scalars().all()
-    
-    manager_ids_with_reports = set()
-    for emp in all_employees:
-        if emp.line_manager_id:
-            manager = next((e for e in all_employees if e.id == emp.line_manager_id), None)
-            if manager and check_eligible_job_level(emp.function):
-                manager_ids_with_reports.add(emp.line_manager_id)
+    org = await get_org_hierarchy(session)
+    manager_ids_with_reports = set(_eligible_reports_by_manager(org))
     
     nominations_stmt = select(EoyNomination).where(EoyNomination.nomination_year == year)
     nominations_result = await session.execute(nominations_stmt)
@@ -993,24 +980,25 @@ async def get_manager_progress(
     
     managers_progress = []
     for manager_id in manager_ids_with_reports:
-        manager = next((e for e in all_employees if e.id == manager_id), None)
-        if manager:
-            nomination = nominations.get(manager_id)
-            nominee = None
-            if nomination:
-                nominee = next((e for e in all_employees if e.id == nomination.nominee_id), None)
-            
-            managers_progress.append(ManagerProgress(
-                id=manager.id,
-                employee_id=manager.employee_id,
-                name=manager.name,
-                email=manager.email,
-                job_title=manager.job_title,
-                department=manager.department,
-                has_nominated=nomination is not None,
-                nominated_at=nomination.created_at if nomination else None,
-                nominee_name=nominee.name if nominee else None
-            ))
+        manager = org.get(manager_id)
+        nomination = nominations.get(manager_id)
+        nominee = None
+        if nomination:
+            nominee = org.get(nomination.nominee_id)
+            if nominee and not nominee.is_active_employee:
+                nominee = None
+        
+        managers_progress.append(ManagerProgress(
+            id=manager.id,
+            employee_id=manager.employee_id,
+            name=manager.name,
+            email=manager.email,
+            job_title=manager.job_title,
+            department=manager.department,
+            has_nominated=nomination is not None,
+            nominated_at=nomination.created_at if nomination else None,
+            nominee_name=nominee.name if nominee else None
+        ))
     
     managers_progress.sort(key=lambda m: (not m.has_nominated, m.name))
     submitted_count = sum(1 for m in managers_progress if m.has_nominated)
@@ -1047,21 +1035,8 @@ async def send_invitation_emails(
     if not settings.is_open:
         raise HTTPException(status_code=400, detail="Nominations are not currently open. Please open nominations first.")
     
-    all_employees_stmt = select(Employee).where(
-        and_(
-            Employee.is_active == True,
-            func.lower(func.trim(Employee.employment_status)) == "active"
-        )
-    )
-    result = await session.execute(all_employees_stmt)
-    all_employees = result.scalars().all()
-    
-    manager_ids_with_reports = set()
-    for emp in all_employees:
-        if emp.line_manager_id:
-            manager = next((e for e in all_employees if e.id == emp.line_manager_id), None)
-            if manager and check_eligible_job_level(emp.function):
-                manager_ids_with_reports.add(emp.line_manager_id)
+    org = await get_org_hierarchy(session)
+    manager_ids_with_reports = set(_eligible_reports_by_manager(org))
     
     nominations_stmt = select(EoyNomination.nominator_id).where(EoyNomination.nomination_year == year)
     nominations_result = await session.execute(nominations_stmt)
@@ -1079,8 +1054,8 @@ async def send_invitation_emails(
     body = request.body or settings.invitation_email_body
     
     for manager_id in target_manager_ids:
-        manager = next((e for e in all_employees if e.id == manager_id), None)
-        if manager and manager.email:
+        manager = org.get(manager_id)
+        if manager and manager.is_active_employee and manager.email:
             try:
                 emails_sent += 1
             except Exception:
@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.notification import NotificationService
 from app.repositories.notification import NotificationRepository
-from app.schemas.notification import NotificationCreate, NotificationResponse
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.schemas.notification import (
+    MarkAllReadResponse,
+    NotificationCreate,
+    NotificationPage,
+    NotificationResponse,
+    UnreadCountResponse,
+)
 from app.auth.dependencies import authenticate_token
 from app.database import get_session
-from typing import List, Optional, Any
+from typing import Optional, Any
 
 router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 service = NotificationService(NotificationRepository())
@@ -18,14 +25,31 @@ async def create_notification(
 ):
     return await service.create(session, data)
 
-@router.get("", response_model=List[NotificationResponse])
+@router.get("", response_model=NotificationPage)
 async def list_notifications(
     unread_only: bool = False,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     session: AsyncSession = Depends(get_session),
     claims: dict[str, Any] = Depends(authenticate_token)
 ):
     employee_id = claims.get("sub")
-    return await service.list(session, employee_id, unread_only)
+    return await service.list(session, employee_id, unread_only, cursor, limit)
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def unread_count(
+    session: AsyncSession = Depends(get_session),
+    claims: dict[str, Any] = Depends(authenticate_token)
+):
+    """Unread badge count for the notification bell (single-row lookup)."""
+    return UnreadCountResponse(unread=await service.unread_count(session, claims.get("sub")))
+
+@router.post("/read-all", response_model=MarkAllReadResponse)
+async def mark_all_read(
+    session: AsyncSession = Depends(get_session),
+    claims: dict[str, Any] = Depends(authenticate_token)
+):
+    return MarkAllReadResponse(updated=await service.mark_all_read(session, claims.get("sub")))
 
 @router.post("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_read(
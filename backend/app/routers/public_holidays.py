@@ -1,5 +1,6 @@
 """Public holiday management router."""
 from datetime import date
+from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 import jwt
@@ -11,6 +12,8 @@ from app.core.config import get_settings
 from app.database import get_session
 from app.models.employee import Employee
 from app.models.public_holiday import PublicHoliday, get_default_uae_holidays
+from app.services.calendar_snapshots import HOLIDAY_SCOPES, serve_snapshot
+from app.services.work_calendar import get_work_calendar, invalidate_work_calendar
 from app.schemas.public_holiday import (
     PublicHolidayCreate, PublicHolidayUpdate, PublicHolidayResponse,
     HolidayCalendar, IsHolidayResponse
@@ -51,44 +54,48 @@ async def get_current_employee(
 @router.get("/year/{year}", response_model=HolidayCalendar)
 async def get_holidays_by_year(
     year: int,
+    if_none_match: Optional[str] = Header(None),
     current_user: Employee = Depends(get_current_employee),
     session: AsyncSession = Depends(get_session)
 ):
-    """Get all public holidays for a year."""
-    result = await session.execute(
-        select(PublicHoliday).where(
-            and_(
-                PublicHoliday.year == year,
-                PublicHoliday.is_active == True
-            )
-        ).order_by(PublicHoliday.start_date)
-    )
-    holidays = result.scalars().all()
-    
-    # Calculate total days off
-    total_days = sum((h.end_date - h.start_date).days + 1 for h in holidays)
+    """Get all public holidays for a year (ETag-cached snapshot)."""
+    async def build() -> HolidayCalendar:
+        result = await session.execute(
+            select(PublicHoliday).where(
+                and_(
+                    PublicHoliday.year == year,
+                    PublicHoliday.is_active == True
+                )
+            ).order_by(PublicHoliday.start_date)
+        )
+        holidays = result.scalars().all()
+        
+        # Calculate total days off
+        total_days = sum((h.end_date - h.start_date).days + 1 for h in holidays)
+        
+        return HolidayCalendar(
+            year=year,
+            total_holidays=len(holidays),
+            total_days_off=total_days,
+            holidays=[
+                PublicHolidayResponse(
+                    id=h.id,
+                    name=h.name,
+                    name_arabic=h.name_arabic,
+                    start_date=h.start_date,
+                    end_date=h.end_date,
+                    year=h.year,
+                    holiday_type=h.holiday_type,
+                    is_paid=h.is_paid,
+                    description=h.description,
+                    is_active=h.is_active,
+                    created_at=h.created_at
+                )
+                for h in holidays
+            ]
+        )
     
-    return HolidayCalendar(
-        year=year,
-        total_holidays=len(holidays),
-        total_days_off=total_days,
-        holidays=[
-            PublicHolidayResponse(
-                id=h.id,
-                name=h.name,
-                name_arabic=h.name_arabic,
-                start_date=h.start_date,
-                end_date=h.end_date,
-                year=h.year,
-                holiday_type=h.holiday_type,
-                is_paid=h.is_paid,
-                description=h.description,
-                is_active=h.is_active,
-                created_at=h.created_at
-            )
-            for h in holidays
-        ]
-    )
+    return await serve_snapshot(session, ("holiday_calendar", year), HOLIDAY_SCOPES, build, if_none_match)
 
 
 @router.get("/check/{check_date}", response_model=IsHolidayResponse)
@@ -98,16 +105,7 @@ async def check_if_holiday(
     session: AsyncSession = Depends(get_session)
 ):
     """Check if a specific date is a public holiday."""
-    result = await session.execute(
-        select(PublicHoliday).where(
-            and_(
-                PublicHoliday.is_active == True,
-                PublicHoliday.start_date <= check_date,
-                PublicHoliday.end_date >= check_date
-            )
-        )
-    )
-    holiday = result.scalar_one_or_none()
+    holiday = (await get_work_calendar(session)).holiday_on(check_date)
     
     if holiday:
         return IsHolidayResponse(
@@ -158,6 +156,7 @@ async def create_holiday(
     )
     
     session.add(new_holiday)
+    await invalidate_work_calendar(session)
     await session.commit()
     await session.refresh(new_holiday)
     
@@ -213,6 +212,7 @@ async def update_holiday(
     if update.is_active is not None:
         holiday.is_active = update.is_active
     
+    await invalidate_work_calendar(session)
     await session.commit()
     await session.refresh(holiday)
     
@@ -270,6 +270,7 @@ async def initialize_default_holidays(
         session.add(holiday)
         created.append(h["name"])
     
+    await invalidate_work_calendar(session)
     await session.commit()
     
     return {
@@ -5,31 +5,42 @@ from fastapi import (
     APIRouter, Depends, HTTPException, File, UploadFile,
     Query, status, Request
 )
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-import tempfile
-import os
 from pathlib import Path
 
 from app.auth.dependencies import require_role
+from app.core.config import get_settings
 from app.database import get_session
 from app.routers.auth import get_current_employee_id
 from app.main import limiter
+from app.models.recruitment import Candidate
 from app.schemas.recruitment import (
     RecruitmentRequestCreate, RecruitmentRequestUpdate, RecruitmentRequestResponse,
     CandidateCreate, CandidateUpdate, CandidateResponse, CandidateSelfServiceUpdate,
     InterviewCreate, InterviewUpdate, InterviewResponse,
     InterviewSlotsProvide, InterviewSlotConfirm,
     EvaluationCreate, EvaluationResponse,
-    ParsedResumeData, RecruitmentStats, RecruitmentMetrics,
+    ParsedResumeData, RecruitmentStats, RecruitmentMetrics, RecruitmentFunnel,
     StageInfo, InterviewTypeInfo, EmploymentTypeInfo,
-    BulkCandidateStageUpdate, BulkCandidateReject, BulkOperationResult
+    BulkCandidateStageUpdate, BulkCandidateReject, BulkOperationResult,
+    CVScoringStatus, RescoreProgressResponse, PreRankedCandidate, PreRankResponse,
+    CVExtractionMetrics, ResumeIngestionJobResponse
 )
 from app.services.recruitment_service import recruitment_service
 from app.services.resume_parser import resume_parser_service
-from app.services.cv_scoring_service import score_candidate_cv
+from app.services.cv_scoring_queue import cv_scoring_queue
+from app.services.cv_rescoring import requisition_rescorer
+from app.services.cv_ranking import candidate_pre_ranker
+from app.services.document_extraction import document_extractor
+from app.services.cv_cache import content_hash
+from app.services.resume_ingestion import IngestionError, resume_ingestion_service
 
 router = APIRouter(prefix="/recruitment", tags=["recruitment"])
 
+# Request fields the CV scores depend on
+RESCORE_FIELDS = ("position_title", "job_description", "required_skills")
+
 
 # ============================================================================
 # METADATA ENDPOINTS
@@ -86,6 +97,38 @@ async def get_metrics(
     return await recruitment_service.get_recruitment_metrics(session)
 
 
+@router.get(
+    "/metrics/cv-extraction",
+    response_model=CVExtractionMetrics,
+    summary="Get CV text extraction timing"
+)
+async def get_cv_extraction_metrics(
+    role: str = Depends(require_role(["admin", "hr"]))
+):
+    """
+    Per-document-type extraction counts, failures, timeouts and timing for
+    this process.
+
+    **Admin and HR only.**
+    """
+    return document_extractor.snapshot()
+
+
+@router.get("/funnel", response_model=RecruitmentFunnel, summary="Get stage funnel and velocity")
+async def get_funnel(
+    request_id: Optional[int] = Query(None, description="Limit to one recruitment request"),
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Entries, exits, conversion to the next stage and average days per stage,
+    from the pre-aggregated stage-transition totals.
+
+    **Admin and HR only.**
+    """
+    return await recruitment_service.get_funnel(session, request_id)
+
+
 @router.post(
     "/bulk-update",
     response_model=BulkOperationResult,
@@ -94,6 +137,7 @@ async def get_metrics(
 async def bulk_update_candidate_stage(
     data: BulkCandidateStageUpdate,
     role: str = Depends(require_role(["admin", "hr"])),
+    employee_id: str = Depends(get_current_employee_id),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -104,11 +148,15 @@ async def bulk_update_candidate_stage(
     {
         "candidate_ids": [1, 2, 3, 4],
         "new_stage": "interview",
-        "notes": "Moving to interview round"
+        "notes": "Moving to interview round",
+        "notify_candidates": false
     }
     ```
     
     **Valid stages:** applied, screening, interview, offer, hired, rejected
+
+    Up to 500 candidates per request. With `notify_candidates`, candidates
+    with an email address are notified in the background.
     
     **Returns:**
     - `success_count`: Number of successfully updated candidates
@@ -118,12 +166,17 @@ async def bulk_update_candidate_stage(
     
     **Admin and HR only.**
     """
-    return await recruitment_service.bulk_update_candidate_stage(
-        session,
-        data.candidate_ids,
-        data.new_stage,
-        data.notes
-    )
+    try:
+        return await recruitment_service.bulk_update_stage(
+            session,
+            data.candidate_ids,
+            data.new_stage,
+            data.notes,
+            performed_by_id=employee_id,
+            notify_candidates=data.notify_candidates
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post(
@@ -134,6 +187,7 @@ async def bulk_update_candidate_stage(
 async def bulk_reject_candidates(
     data: BulkCandidateReject,
     role: str = Depends(require_role(["admin", "hr"])),
+    employee_id: str = Depends(get_current_employee_id),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -152,13 +206,17 @@ async def bulk_reject_candidates(
     - Status set to "rejected"
     - Rejection reason recorded
     - Note added to recruiter notes
+
+    Hired candidates are not rejected and are returned in `failed_ids`.
     
     **Admin and HR only.**
     """
     return await recruitment_service.bulk_reject_candidates(
         session,
         data.candidate_ids,
-        data.rejection_reason
+        data.rejection_reason,
+        performed_by_id=employee_id,
+        notify_candidates=data.notify_candidates
     )
 
 
@@ -244,14 +302,141 @@ async def update_recruitment_request(
     """
     Update a recruitment request.
 
-    **Admin and HR only.**
+    **Admin and HR only.** Changing the title, job description or required
+    skills re-scores the requisition's candidates in the background; an edit
+    made while a re-score runs is picked up by a follow-up run.
     """
+    changes = data.model_dump(exclude_unset=True)
+    existing = await recruitment_service.get_request(session, request_id)
+    if not existing:
+        raise HTTPException(status_code=404, detail="Recruitment request not found")
+    job_changed = any(
+        field in changes and changes[field] != getattr(existing, field)
+        for field in RESCORE_FIELDS
+    )
+
     request = await recruitment_service.update_request(session, request_id, data)
     if not request:
         raise HTTPException(status_code=404, detail="Recruitment request not found")
+    if job_changed:
+        requisition_rescorer.start(request_id)
     return request
 
 
+def _rescore_response(request_id: int, progress, status_counts: dict) -> RescoreProgressResponse:
+    if progress is None:
+        return RescoreProgressResponse(recruitment_request_id=request_id, status_counts=status_counts)
+    return RescoreProgressResponse(
+        recruitment_request_id=request_id,
+        job_id=progress.job_id,
+        status=progress.status,
+        total=progress.total,
+        scored=progress.scored,
+        failed=progress.failed,
+        started_at=progress.started_at,
+        finished_at=progress.finished_at,
+        error=progress.error,
+        status_counts=status_counts,
+    )
+
+
+@router.post(
+    "/requests/{request_id}/rescore",
+    response_model=RescoreProgressResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Re-score all candidates of a recruitment request"
+)
+async def rescore_recruitment_request(
+    request_id: int,
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Re-score every candidate with a CV on file against the current job
+    description. Returns immediately; poll the GET endpoint for progress.
+    A re-score already running for the request is returned as-is.
+
+    **Admin and HR only.**
+    """
+    request = await recruitment_service.get_request(session, request_id)
+    if not request:
+        raise HTTPException(status_code=404, detail="Recruitment request not found")
+    progress = requisition_rescorer.start(request_id)
+    return _rescore_response(request_id, progress, {})
+
+
+@router.post(
+    "/requests/{request_id}/pre-rank",
+    response_model=PreRankResponse,
+    summary="Rank a recruitment request's candidates locally"
+)
+async def pre_rank_recruitment_request(
+    request_id: int,
+    llm_top_n: Optional[int] = Query(
+        None, ge=0, description="Queue LLM scoring for this many top candidates (default from settings; 0 = none)"
+    ),
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Rank every candidate with a CV on file by similarity to the job title,
+    description and required skills, fully offline, and fill
+    ``similarity_score``/``screening_rank``. The top ``llm_top_n`` candidates
+    without an LLM score for the current job are queued for it.
+
+    **Admin and HR only.**
+    """
+    request = await recruitment_service.get_request(session, request_id)
+    if not request:
+        raise HTTPException(status_code=404, detail="Recruitment request not found")
+
+    if llm_top_n is None:
+        llm_top_n = get_settings().cv_llm_top_n or None
+    ranked, to_score = await candidate_pre_ranker.rank_and_queue(session, request_id, llm_top_n)
+    result = await session.execute(
+        select(Candidate.id, Candidate.screening_rank, Candidate.cv_scoring_status)
+        .where(Candidate.id.in_([cid for cid, _ in ranked]))
+    )
+    rows = {row.id: row for row in result.all()}
+
+    return PreRankResponse(
+        recruitment_request_id=request_id,
+        ranked=[
+            PreRankedCandidate(
+                candidate_id=cid,
+                similarity=round(similarity, 4),
+                screening_rank=rows[cid].screening_rank,
+                cv_scoring_status=rows[cid].cv_scoring_status,
+            )
+            for cid, similarity in ranked
+        ],
+        llm_queued=to_score,
+    )
+
+
+@router.get(
+    "/requests/{request_id}/rescore",
+    response_model=RescoreProgressResponse,
+    summary="Get re-score progress for a recruitment request"
+)
+async def get_rescore_progress(
+    request_id: int,
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Progress of the latest re-score started in this process, plus the
+    candidates' persisted scoring status counts.
+
+    **Admin and HR only.**
+    """
+    request = await recruitment_service.get_request(session, request_id)
+    if not request:
+        raise HTTPException(status_code=404, detail="Recruitment request not found")
+    status_counts = await requisition_rescorer.status_counts(session, request_id)
+    return _rescore_response(request_id, requisition_rescorer.progress(request_id), status_counts)
+
+
 @router.post(
     "/requests/{request_id}/approve",
     response_model=RecruitmentRequestResponse,
@@ -789,8 +974,6 @@ async def upload_candidate_cv(
     
     # SECURITY: Sanitize filename to prevent path traversal
     safe_filename = Path(file.filename).name  # This removes any directory components
-    # SECURITY: Sanitize filename to prevent path traversal
-    safe_filename = Path(file.filename).name  # This removes any directory components
     
     # Save CV to storage
     resume_dir = Path("storage/resumes")
@@ -800,44 +983,52 @@ async def upload_candidate_cv(
     with open(resume_path, 'wb') as f:
         f.write(content)
     
-    # Score the CV against job requirements
-    job_description = request.job_description or f"Position: {request.position_title}"
-    required_skills = getattr(request, 'required_skills', None) or []
-    
-    scores = await score_candidate_cv(
-        candidate_id=candidate_id,
-        cv_content=content,
-        filename=safe_filename,
-        job_title=request.position_title,
-        job_description=job_description,
-        required_skills=required_skills,
-        db_session=session
-    )
+    # Score the CV against job requirements in the background
+    candidate.resume_path = str(resume_path)
+    candidate.resume_hash = content_hash(content)
+    candidate.cv_vector = None
+    candidate.similarity_score = None
+    await cv_scoring_queue.enqueue(session, [candidate_id])
     
-    if scores:
-        return {
-            "success": True,
-            "candidate_id": candidate_id,
-            "filename": safe_filename,
-            "resume_path": str(resume_path),
-            "scores": {
-                "cv_scoring": scores["cv_scoring"],
-                "skills_match_score": scores["skills_match_score"],
-                "education_level": scores["education_level"],
-                "years_experience": scores["years_experience"],
-                "current_position": scores["current_position"]
-            }
-        }
-    else:
-        # CV saved but scoring failed
-        return {
-            "success": True,
-            "candidate_id": candidate_id,
-            "filename": safe_filename,
-            "resume_path": str(resume_path),
-            "scores": None,
-            "message": "CV uploaded but automatic scoring could not be completed"
-        }
+    return {
+        "success": True,
+        "candidate_id": candidate_id,
+        "filename": safe_filename,
+        "resume_path": str(resume_path),
+        "scores": None,
+        "scoring_status": "queued",
+        "message": "CV uploaded; scoring queued. Poll the cv-score endpoint for results."
+    }
+
+
+@router.get(
+    "/candidates/{candidate_id}/cv-score",
+    response_model=CVScoringStatus,
+    summary="Get CV scoring status"
+)
+async def get_candidate_cv_score(
+    candidate_id: int,
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Poll the background CV scoring job for a candidate.
+
+    **Admin and HR only.**
+    """
+    candidate = await recruitment_service.get_candidate(session, candidate_id)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    return CVScoringStatus(
+        candidate_id=candidate.id,
+        status=candidate.cv_scoring_status,
+        attempts=candidate.cv_scoring_attempts,
+        error=candidate.cv_scoring_error,
+        cv_scoring=candidate.cv_scoring,
+        skills_match_score=candidate.skills_match_score,
+        cv_scored_at=candidate.cv_scored_at
+    )
 
 
 # ============================================================================
@@ -867,27 +1058,14 @@ async def parse_resume(
 
     **Admin and HR only.**
     """
-    # Save uploaded file temporarily
-    suffix = Path(file.filename).suffix if file.filename else '.pdf'
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_file_path = tmp_file.name
-
-    try:
-        # Parse resume
-        parsed_data = await resume_parser_service.parse_resume(tmp_file_path)
-
-        return {
-            "success": parsed_data.get('parsed', False),
-            "filename": file.filename,
-            "data": parsed_data
-        }
+    content = await file.read()
+    parsed_data = await resume_parser_service.parse_bytes(content, file.filename or 'resume.pdf')
 
-    finally:
-        # Clean up temp file
-        if os.path.exists(tmp_file_path):
-            os.remove(tmp_file_path)
+    return {
+        "success": parsed_data.get('parsed', False),
+        "filename": file.filename,
+        "data": parsed_data
+    }
 
 
 @router.post(
@@ -911,102 +1089,133 @@ async def create_candidate_from_resume(
 
     **Admin and HR only.**
     """
-    # Save uploaded file temporarily
-    suffix = Path(file.filename).suffix if file.filename else '.pdf'
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_file_path = tmp_file.name
+    content = await file.read()
+    parsed_data = await resume_parser_service.parse_bytes(content, file.filename or 'resume.pdf')
 
-    try:
-        # Parse resume
-        parsed_data = await resume_parser_service.parse_resume(tmp_file_path)
+    if not parsed_data.get('parsed'):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to parse resume: {parsed_data.get('error', 'Unknown error')}"
+        )
 
-        if not parsed_data.get('parsed'):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to parse resume: {parsed_data.get('error', 'Unknown error')}"
-            )
+    # Validate we got minimum required data
+    if not parsed_data.get('name') and not parsed_data.get('email'):
+        raise HTTPException(
+            status_code=400,
+            detail="Could not extract name or email from resume. Please add candidate manually."
+        )
 
-        # Validate we got minimum required data
-        if not parsed_data.get('name') and not parsed_data.get('email'):
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract name or email from resume. Please add candidate manually."
-            )
+    # Build notes from parsed data
+    notes_parts = []
+    if parsed_data.get('skills'):
+        notes_parts.append(f"Skills: {', '.join(parsed_data['skills'][:10])}")
+    if parsed_data.get('education'):
+        notes_parts.append(f"Education: {', '.join(parsed_data['education'][:3])}")
+    if parsed_data.get('company_names'):
+        notes_parts.append(f"Previous companies: {', '.join(parsed_data['company_names'][:3])}")
+
+    # Create candidate from parsed data
+    candidate_data = CandidateCreate(
+        recruitment_request_id=recruitment_request_id,
+        full_name=parsed_data.get('name') or 'Unknown',
+        email=parsed_data.get('email') or 'unknown@example.com',
+        phone=parsed_data.get('mobile_number'),
+        current_position=(
+            parsed_data.get('designation', [''])[0]
+            if parsed_data.get('designation') else None
+        ),
+        current_company=(
+            parsed_data.get('company_names', [''])[0]
+            if parsed_data.get('company_names') else None
+        ),
+        years_experience=parsed_data.get('total_experience'),
+        source=source,
+        notes='\n'.join(notes_parts) if notes_parts else None,
+        emirates_id=parsed_data.get('emirates_id'),
+        visa_status=parsed_data.get('visa_status')
+    )
 
-        # Build notes from parsed data
-        notes_parts = []
-        if parsed_data.get('skills'):
-            notes_parts.append(f"Skills: {', '.join(parsed_data['skills'][:10])}")
-        if parsed_data.get('education'):
-            notes_parts.append(f"Education: {', '.join(parsed_data['education'][:3])}")
-        if parsed_data.get('company_names'):
-            notes_parts.append(f"Previous companies: {', '.join(parsed_data['company_names'][:3])}")
-
-        # Create candidate from parsed data
-        candidate_data = CandidateCreate(
-            recruitment_request_id=recruitment_request_id,
-            full_name=parsed_data.get('name') or 'Unknown',
-            email=parsed_data.get('email') or 'unknown@example.com',
-            phone=parsed_data.get('mobile_number'),
-            current_position=(
-                parsed_data.get('designation', [''])[0]
-                if parsed_data.get('designation') else None
-            ),
-            current_company=(
-                parsed_data.get('company_names', [''])[0]
-                if parsed_data.get('company_names') else None
-            ),
-            years_experience=parsed_data.get('total_experience'),
-            source=source,
-            notes='\n'.join(notes_parts) if notes_parts else None,
-            emirates_id=parsed_data.get('emirates_id'),
-            visa_status=parsed_data.get('visa_status')
-        )
+    # Create candidate
+    candidate = await recruitment_service.add_candidate(session, candidate_data, employee_id)
 
-        # Create candidate
-        candidate = await recruitment_service.add_candidate(session, candidate_data, employee_id)
+    # Save resume file
+    resume_dir = Path("storage/resumes")
+    resume_dir.mkdir(parents=True, exist_ok=True)
+    resume_path = resume_dir / f"{candidate.candidate_number}_{file.filename}"
 
-        # Save resume file
-        resume_dir = Path("storage/resumes")
-        resume_dir.mkdir(parents=True, exist_ok=True)
-        resume_path = resume_dir / f"{candidate.candidate_number}_{file.filename}"
+    with open(resume_path, 'wb') as f:
+        f.write(content)
 
-        with open(resume_path, 'wb') as f:
-            f.write(content)
+    # Update candidate with resume path
+    candidate.resume_path = str(resume_path)
+    candidate.resume_hash = content_hash(content)
+    await recruitment_service.update_candidate(
+        session, candidate.id,
+        CandidateUpdate(notes=f"{candidate.notes or ''}\nResume: {resume_path}".strip())
+    )
 
-        # Update candidate with resume path
-        await recruitment_service.update_candidate(
-            session, candidate.id,
-            CandidateUpdate(notes=f"{candidate.notes or ''}\nResume: {resume_path}".strip())
-        )
+    # Score the CV against job requirements in the background
+    await cv_scoring_queue.enqueue(session, [candidate.id])
 
-        # Get recruitment request for job details
-        request = await recruitment_service.get_request(session, recruitment_request_id)
-        if request:
-            # Automatically score the CV against job requirements
-            job_description = request.job_description or f"Position: {request.position_title}"
-            required_skills = getattr(request, 'required_skills', None) or []
-            
-            await score_candidate_cv(
-                candidate_id=candidate.id,
-                cv_content=content,
-                filename=file.filename or "resume.pdf",
-                job_title=request.position_title,
-                job_description=job_description,
-                required_skills=required_skills,
-                db_session=session
-            )
+    # Refresh to pick up the queued scoring status
+    candidate = await recruitment_service.get_candidate(session, candidate.id)
 
-        # Refresh to get updated data including scores
-        candidate = await recruitment_service.get_candidate(session, candidate.id)
+    return candidate
 
-        return candidate
 
-    finally:
-        if os.path.exists(tmp_file_path):
-            os.remove(tmp_file_path)
+@router.post(
+    "/requests/{request_id}/candidates/bulk-upload",
+    response_model=ResumeIngestionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Create candidates from many resumes"
+)
+async def bulk_upload_resumes(
+    request_id: int,
+    files: List[UploadFile] = File(..., description="CV files and/or zip archives of CVs"),
+    source: str = Query("Bulk Upload", description="Candidate source"),
+    employee_id: str = Depends(get_current_employee_id),
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Upload up to 500 CVs (individually or zipped) for one recruitment request.
+
+    Files are stored immediately; parsing, de-duplication (by content, email
+    or phone), candidate creation and scoring run in the background. Poll
+    the ingestion job for per-file progress.
+
+    **Admin and HR only.**
+    """
+    request = await recruitment_service.get_request(session, request_id)
+    if not request:
+        raise HTTPException(status_code=404, detail="Recruitment request not found")
+
+    try:
+        job = await resume_ingestion_service.submit(request_id, files, employee_id, source)
+    except IngestionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ResumeIngestionJobResponse.model_validate(job)
+
+
+@router.get(
+    "/ingestion-jobs/{job_id}",
+    response_model=ResumeIngestionJobResponse,
+    summary="Get bulk resume upload progress"
+)
+async def get_ingestion_job(
+    job_id: str,
+    role: str = Depends(require_role(["admin", "hr"])),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Per-file progress of a bulk resume upload.
+
+    **Admin and HR only.**
+    """
+    job = await resume_ingestion_service.get_job(session, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return ResumeIngestionJobResponse.model_validate(job)
 
 
 # ============================================================================
@@ -1279,6 +1488,7 @@ async def get_evaluation(
 async def bulk_reject_candidates_alt(
     data: BulkCandidateReject,
     role: str = Depends(require_role(["admin", "hr"])),
+    employee_id: str = Depends(get_current_employee_id),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -1287,12 +1497,13 @@ async def bulk_reject_candidates_alt(
     Efficiently rejects multiple candidates with a single reason,
     reducing processing time for screening decisions.
     
-    Maximum 100 candidates per request.
+    Maximum 500 candidates per request.
 
     **Admin and HR only.**
     """
     result = await recruitment_service.bulk_reject_candidates(
-        session, data.candidate_ids, data.rejection_reason
+        session, data.candidate_ids, data.rejection_reason,
+        performed_by_id=employee_id, notify_candidates=data.notify_candidates
     )
     return BulkOperationResult(**result)
 
@@ -3,20 +3,25 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 import jwt
 from jwt.exceptions import PyJWTError
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.database import get_session
+from app.database import AsyncSessionLocal, get_session
 from app.models.employee import Employee
 from app.models.timesheet import Timesheet, TIMESHEET_STATUSES
 from app.schemas.timesheet import (
     TimesheetSummary, TimesheetResponse, TimesheetSubmit,
-    TimesheetApproval, TimesheetList, MonthlyAttendanceAnalytics
+    TimesheetApproval, TimesheetGridRow, TimesheetList, MonthlyAttendanceAnalytics
 )
 from app.services.attendance_service import AttendanceService
+from app.services.org_hierarchy import get_org_hierarchy
+from app.services.payroll_export import (
+    EXPORT_FORMATS, default_payroll_reference, payroll_export_service
+)
 
 router = APIRouter(prefix="/timesheets", tags=["Timesheets"])
 
@@ -291,86 +296,112 @@ async def hr_approve_timesheet(
     return build_timesheet_response(timesheet)
 
 
+# Status buckets reported alongside the list
+PENDING_STATUSES = ("draft", "submitted")
+APPROVED_STATUSES = ("manager_approved", "hr_approved", "exported")
+
+# Grid sort keys -> ORDER BY (ties broken by timesheet id)
+TIMESHEET_SORTS = {
+    "employee": (Employee.name.asc(),),
+    "status": (Timesheet.status.asc(), Employee.name.asc()),
+    "compliance": (Timesheet.has_compliance_issues.desc(), Employee.name.asc()),
+    "overtime": (Timesheet.total_overtime_hours.desc(), Employee.name.asc()),
+    "late": (Timesheet.total_late_arrivals.desc(), Employee.name.asc()),
+    "absences": (Timesheet.total_absent_days.desc(), Employee.name.asc()),
+}
+
+# Columns returned in compact mode (see TimesheetGridRow)
+GRID_COLUMNS = (
+    Timesheet.id,
+    Timesheet.employee_id,
+    Employee.name.label("employee_name"),
+    Timesheet.status,
+    Timesheet.total_working_days,
+    Timesheet.total_present_days,
+    Timesheet.total_absent_days,
+    Timesheet.total_leave_days,
+    Timesheet.total_late_arrivals,
+    Timesheet.total_overtime_hours,
+    Timesheet.has_compliance_issues,
+)
+
+
 @router.get("/list/{year}/{month}", response_model=TimesheetList)
 async def list_timesheets(
     year: int,
     month: int,
     status_filter: Optional[str] = Query(None, description="Filter by status"),
+    sort_by: str = Query("employee", description="employee, status, compliance, overtime, late or absences"),
+    compact: bool = Query(False, description="Return only the grid columns"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
     current_user: Employee = Depends(get_current_employee),
     session: AsyncSession = Depends(get_session)
 ):
-    """List timesheets for a month (HR/Admin sees all, managers see team, employees see own)."""
-    query = select(Timesheet).where(
-        and_(
-            Timesheet.year == year,
-            Timesheet.month == month
+    """List timesheets for a month (HR/Admin sees all, managers see team, employees see own).
+    
+    Status counts come from one GROUP BY over the whole selection; the list
+    itself is one sorted page.
+    """
+    if sort_by not in TIMESHEET_SORTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort_by. Must be one of: {', '.join(TIMESHEET_SORTS)}"
         )
-    )
+    
+    conditions = [Timesheet.year == year, Timesheet.month == month]
     
     if current_user.role not in ["admin", "hr"]:
         if current_user.role == "manager":
-            # Get team members
-            team_result = await session.execute(
-                select(Employee.id).where(Employee.line_manager_id == current_user.id)
-            )
-            team_ids = [r for r in team_result.scalars().all()]
+            # Get team members from the cached reporting-line index
+            org = await get_org_hierarchy(session)
+            team_ids = list(org.direct_report_ids(current_user.id))
             team_ids.append(current_user.id)
-            query = query.where(Timesheet.employee_id.in_(team_ids))
+            conditions.append(Timesheet.employee_id.in_(team_ids))
         else:
-            query = query.where(Timesheet.employee_id == current_user.id)
+            conditions.append(Timesheet.employee_id == current_user.id)
     
     if status_filter:
-        query = query.where(Timesheet.status == status_filter)
+        conditions.append(Timesheet.status == status_filter)
     
+    # Count by status
+    counts_result = await session.execute(
+        select(Timesheet.status, func.count()).where(and_(*conditions)).group_by(Timesheet.status)
+    )
+    status_counts = {row_status: count for row_status, count in counts_result.all()}
+    total = sum(status_counts.values())
+    
+    columns = GRID_COLUMNS if compact else (Timesheet, Employee.name)
+    query = (
+        select(*columns)
+        .join(Employee, Employee.id == Timesheet.employee_id)
+        .where(and_(*conditions))
+        .order_by(*TIMESHEET_SORTS[sort_by], Timesheet.id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
     result = await session.execute(query)
-    timesheets = result.scalars().all()
     
-    # Count by status
-    pending = sum(1 for t in timesheets if t.status in ["draft", "submitted"])
-    approved = sum(1 for t in timesheets if t.status in ["manager_approved", "hr_approved", "exported"])
-    rejected = sum(1 for t in timesheets if t.status == "rejected")
+    if compact:
+        timesheets = [TimesheetGridRow.model_validate(row) for row in result.all()]
+    else:
+        timesheets = [
+            TimesheetSummary.model_validate(t).model_copy(update={"employee_name": name})
+            for t, name in result.all()
+        ]
     
     return TimesheetList(
         year=year,
         month=month,
-        total_count=len(timesheets),
-        pending_count=pending,
-        approved_count=approved,
-        rejected_count=rejected,
-        timesheets=[
-            TimesheetSummary(
-                id=t.id,
-                employee_id=t.employee_id,
-                year=t.year,
-                month=t.month,
-                status=t.status,
-                total_working_days=t.total_working_days,
-                total_present_days=t.total_present_days,
-                total_absent_days=t.total_absent_days,
-                total_leave_days=t.total_leave_days,
-                total_wfh_days=t.total_wfh_days,
-                total_late_arrivals=t.total_late_arrivals,
-                total_early_departures=t.total_early_departures,
-                total_regular_hours=t.total_regular_hours,
-                total_overtime_hours=t.total_overtime_hours,
-                total_night_overtime_hours=t.total_night_overtime_hours,
-                total_holiday_overtime_hours=t.total_holiday_overtime_hours,
-                total_overtime_amount=t.total_overtime_amount,
-                offset_hours_earned=t.offset_hours_earned,
-                offset_hours_used=t.offset_hours_used,
-                days_at_head_office=t.days_at_head_office,
-                days_at_kezad=t.days_at_kezad,
-                days_at_safario=t.days_at_safario,
-                days_at_sites=t.days_at_sites,
-                days_at_meeting=t.days_at_meeting,
-                days_at_event=t.days_at_event,
-                food_allowance_days=t.food_allowance_days,
-                food_allowance_total=t.food_allowance_total,
-                has_compliance_issues=t.has_compliance_issues,
-                compliance_notes=t.compliance_notes
-            )
-            for t in timesheets
-        ]
+        total_count=total,
+        pending_count=sum(status_counts.get(s, 0) for s in PENDING_STATUSES),
+        approved_count=sum(status_counts.get(s, 0) for s in APPROVED_STATUSES),
+        rejected_count=status_counts.get("rejected", 0),
+        status_counts=status_counts,
+        page=page,
+        page_size=page_size,
+        total_pages=max((total + page_size - 1) // page_size, 1),
+        timesheets=timesheets
     )
 
 
@@ -387,3 +418,42 @@ async def get_monthly_analytics(
     
     service = AttendanceService(session)
     return await service.get_monthly_analytics(year, month)
+
+
+@router.post("/payroll-export/{year}/{month}")
+async def export_payroll(
+    year: int,
+    month: int,
+    export_format: str = Query("csv", alias="format", description="csv or sif (WPS fixed-width)"),
+    reference: Optional[str] = Query(None, max_length=100, description="Payroll reference; defaults to PAY-YYYY-MM"),
+    current_user: Employee = Depends(get_current_employee),
+    session: AsyncSession = Depends(get_session)
+):
+    """Mark the month's HR-approved timesheets as exported and stream the payroll file (HR/Admin only).
+    
+    Retrying with the same reference re-streams the same batch.
+    """
+    if current_user.role not in ["admin", "hr"]:
+        raise HTTPException(status_code=403, detail="Only HR/Admin can export payroll")
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail="Invalid month")
+    
+    reference = reference or default_payroll_reference(year, month)
+    claim = await payroll_export_service.claim(session, year, month, reference)
+    if not claim.total_rows:
+        raise HTTPException(status_code=404, detail="No HR-approved timesheets to export for this month")
+    
+    return StreamingResponse(
+        payroll_export_service.stream(AsyncSessionLocal, year, month, claim, export_format),
+        media_type="text/csv" if export_format == "csv" else "text/plain",
+        headers={
+            "Content-Disposition": f"attachment; filename={reference}.{export_format}",
+            "X-Payroll-Reference": reference,
+            "X-Payroll-Rows": str(claim.total_rows),
+        }
+    )
@@ -202,24 +202,44 @@ class ExceptionalOvertimeRequest(BaseModel):
     is_holiday_overtime: bool = Field(False, description="Is this holiday overtime? 150% rate")
 
 
-class OffsetDayRecord(BaseModel):
-    """Individual offset day record."""
-    attendance_date: date
-    hours_earned: Decimal
-    hours_used: Decimal = Decimal("0")
-    reference: Optional[str] = None  # e.g., "Used on 2026-01-15"
-    status: str = "available"  # available, used, expired
-
-
 class OffsetBalanceSummary(BaseModel):
     """Summary of offset hours balance for an employee."""
     employee_id: int
     employee_name: str
     total_offset_hours_earned: Decimal = Decimal("0")  # Total offset hours accumulated
     total_offset_hours_used: Decimal = Decimal("0")  # Hours used as time-off
+    total_offset_hours_expired: Decimal = Decimal("0")  # Hours lapsed unused
+    total_offset_hours_adjusted: Decimal = Decimal("0")  # Net HR adjustments
     offset_hours_balance: Decimal = Decimal("0")  # Available balance
     offset_days_balance: Decimal = Decimal("0")  # Balance converted to days (balance / 8)
-    records: List[OffsetDayRecord] = []  # Detailed breakdown
+
+
+class OffsetHoursEntryResponse(BaseModel):
+    """One offset-hours ledger entry."""
+    id: int
+    entry_type: str  # earned, used, expired, adjusted
+    hours: Decimal
+    entry_date: date
+    attendance_record_id: Optional[int] = None
+    note: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OffsetHoursHistoryPage(BaseModel):
+    """Page of offset-hours ledger entries, newest first."""
+    items: List[OffsetHoursEntryResponse]
+    next_cursor: Optional[str] = None
+
+
+class OffsetHoursEntryCreate(BaseModel):
+    """HR posting against an employee's offset hours (time off taken, expiry, correction)."""
+    entry_type: str = Field(..., pattern="^(used|expired|adjusted)$", description="used, expired or adjusted")
+    hours: Decimal = Field(..., description="Hours; positive except for downward adjustments")
+    entry_date: Optional[date] = Field(default=None, description="Defaults to today (UAE)")
+    note: Optional[str] = Field(default=None, max_length=255)
 
 
 class PaidOvertimeRecord(BaseModel):
@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 
 class AuditLogBase(BaseModel):
     action: str
@@ -13,3 +13,7 @@ class AuditLogResponse(AuditLogBase):
     id: int
     timestamp: datetime
     model_config = ConfigDict(from_attributes=True)
+
+class AuditLogPage(BaseModel):
+    items: List[AuditLogResponse]
+    next_cursor: Optional[str] = None
@@ -1,7 +1,7 @@
 """Geofence schemas."""
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -70,3 +70,34 @@ class NearbyGeofence(BaseModel):
     latitude: Decimal
     longitude: Decimal
     radius_meters: int
+
+
+class GeofenceBatchValidationRequest(BaseModel):
+    """Many GPS points to validate in one call."""
+    points: List[GeofenceValidationRequest] = Field(..., min_length=1, max_length=5000)
+
+
+class GeofenceBatchValidationResponse(BaseModel):
+    """Per-point results in request order."""
+    valid_count: int
+    invalid_count: int
+    results: List[GeofenceValidationResponse]
+
+
+class GeofenceAuditEntry(BaseModel):
+    """A clock-in recorded outside its geofence."""
+    attendance_id: int
+    employee_id: int
+    attendance_date: date
+    work_location: Optional[str] = None
+    distance_meters: Optional[float] = None
+    message: str
+
+
+class GeofenceAuditResponse(BaseModel):
+    """Geofence audit of a month's clock-in locations."""
+    year: int
+    month: int
+    total_checked: int
+    flagged_count: int
+    flagged: List[GeofenceAuditEntry]
@@ -1,7 +1,7 @@
 """Leave management schemas."""
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -32,6 +32,22 @@ class LeaveBalanceSummary(BaseModel):
     balances: List[LeaveBalanceResponse] = []
 
 
+class LeaveLedgerEntryResponse(BaseModel):
+    """One balance movement in the leave ledger."""
+    id: int
+    employee_id: int
+    year: int
+    leave_type: str
+    entry_type: str
+    days: Decimal
+    leave_request_id: Optional[int] = None
+    note: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
 class LeaveRequestCreate(BaseModel):
     """Create a new leave request."""
     leave_type: str = Field(..., description="Type of leave: annual, sick, maternity, etc.")
@@ -77,6 +93,27 @@ class LeaveApprovalRequest(BaseModel):
     rejection_reason: Optional[str] = Field(default=None, description="Reason for rejection")
 
 
+class LeaveBulkApprovalRequest(BaseModel):
+    """Approve or reject several pending leave requests at once."""
+    request_ids: List[int] = Field(..., min_length=1, max_length=500, description="Leave request IDs")
+    approved: bool = Field(..., description="True to approve, False to reject")
+    rejection_reason: Optional[str] = Field(default=None, description="Reason for rejection")
+
+
+class LeaveBulkDecisionResult(BaseModel):
+    """Outcome for one request in a bulk decision."""
+    request_id: int
+    status: str  # approved, rejected, not_found, skipped, forbidden, conflict, insufficient_balance
+    detail: Optional[str] = None
+
+
+class LeaveBulkApprovalResponse(BaseModel):
+    """Per-request outcomes of a bulk approval or rejection."""
+    processed: int
+    failed: int
+    results: List[LeaveBulkDecisionResult] = []
+
+
 class LeaveCalendarEntry(BaseModel):
     """Calendar entry for leave display."""
     employee_id: int
@@ -89,6 +126,43 @@ class LeaveCalendarEntry(BaseModel):
     is_holiday: bool = False
 
 
+class DepartmentCoverage(BaseModel):
+    """Absence for one department on one day."""
+    headcount: int
+    on_leave: float
+    absence_pct: float
+
+
+class LeaveCoverageDay(BaseModel):
+    """Team coverage for one calendar day."""
+    date: date
+    is_weekend: bool = False
+    is_holiday: bool = False
+    headcount: int
+    on_leave: float
+    available: float
+    departments: Dict[str, DepartmentCoverage] = {}
+
+
+class LeaveCoverageConflict(BaseModel):
+    """A day where a department's absence reaches the threshold."""
+    date: date
+    department: str
+    on_leave: float
+    headcount: int
+    absence_pct: float
+    message: str
+
+
+class LeaveCoverageResponse(BaseModel):
+    """Per-day coverage, department absence and conflict warnings for a range."""
+    start_date: date
+    end_date: date
+    threshold_pct: float
+    days: List[LeaveCoverageDay] = []
+    conflicts: List[LeaveCoverageConflict] = []
+
+
 class PublicHolidayResponse(BaseModel):
     """Public holiday response."""
     id: int
@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 
 class NotificationBase(BaseModel):
     user_id: Optional[str] = None
@@ -17,3 +17,13 @@ class NotificationResponse(NotificationBase):
     is_read: bool
     created_at: datetime
     model_config = ConfigDict(from_attributes=True)
+
+class NotificationPage(BaseModel):
+    items: List[NotificationResponse]
+    next_cursor: Optional[str] = None
+
+class UnreadCountResponse(BaseModel):
+    unread: int
+
+class MarkAllReadResponse(BaseModel):
+    updated: int
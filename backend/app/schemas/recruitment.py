@@ -176,6 +176,7 @@ class CandidateResponse(CandidateBase):
     pass_number: Optional[str] = None
     resume_path: Optional[str] = None
     documents: Optional[Dict[str, Any]] = None
+    cv_scoring_status: Optional[str] = None
     status: str
     stage: str
     stage_changed_at: Optional[datetime] = None
@@ -369,15 +370,17 @@ class EmploymentTypeInfo(BaseModel):
 # Bulk Operations Schemas
 class BulkCandidateStageUpdate(BaseModel):
     """Schema for bulk updating candidate stages."""
-    candidate_ids: List[int] = Field(..., min_length=1, max_length=100, description="List of candidate IDs")
+    candidate_ids: List[int] = Field(..., min_length=1, max_length=500, description="List of candidate IDs")
     new_stage: str = Field(..., description="New stage: applied, screening, interview, offer, hired, rejected")
     notes: Optional[str] = Field(None, description="Optional notes for the stage change")
+    notify_candidates: bool = Field(False, description="Email candidates about the change in the background")
 
 
 class BulkCandidateReject(BaseModel):
     """Schema for bulk rejecting candidates."""
-    candidate_ids: List[int] = Field(..., min_length=1, max_length=100, description="List of candidate IDs")
+    candidate_ids: List[int] = Field(..., min_length=1, max_length=500, description="List of candidate IDs")
     rejection_reason: str = Field(..., min_length=1, description="Reason for rejection")
+    notify_candidates: bool = Field(False, description="Email candidates about the rejection in the background")
 
 
 class BulkOperationResult(BaseModel):
@@ -388,6 +391,95 @@ class BulkOperationResult(BaseModel):
     message: str
 
 
+class CVScoringStatus(BaseModel):
+    """Background CV scoring state for one candidate."""
+    candidate_id: int
+    status: Optional[str] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    cv_scoring: Optional[int] = None
+    skills_match_score: Optional[int] = None
+    cv_scored_at: Optional[datetime] = None
+
+
+class RescoreProgressResponse(BaseModel):
+    """Progress of a requisition-wide CV re-score."""
+    recruitment_request_id: int
+    job_id: Optional[str] = None
+    status: Optional[str] = None
+    total: int = 0
+    scored: int = 0
+    failed: int = 0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    status_counts: Dict[str, int] = {}
+
+
+class PreRankedCandidate(BaseModel):
+    """One candidate's local (offline) job similarity."""
+    candidate_id: int
+    similarity: float
+    screening_rank: Optional[int] = None
+    cv_scoring_status: Optional[str] = None
+
+
+class PreRankResponse(BaseModel):
+    """Result of ranking a requisition's candidates without the LLM."""
+    recruitment_request_id: int
+    ranked: List[PreRankedCandidate]
+    llm_queued: List[int] = []
+
+
+class DocumentExtractionStats(BaseModel):
+    """Extraction timing for one document type."""
+    documents: int
+    failures: int
+    timeouts: int
+    truncated: int
+    pages: int
+    total_seconds: float
+    max_seconds: float
+    avg_seconds: float
+
+
+class CVExtractionMetrics(BaseModel):
+    """CV text extraction pool configuration and timing."""
+    workers: int
+    timeout_seconds: float
+    max_pages: int
+    max_chars: int
+    by_type: Dict[str, DocumentExtractionStats] = {}
+
+
+class IngestionFileStatus(BaseModel):
+    """Progress of one file in a bulk resume upload."""
+    model_config = ConfigDict(from_attributes=True)
+
+    index: int
+    filename: str
+    status: str
+    size: int = 0
+    candidate_id: Optional[int] = None
+    duplicate_of: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ResumeIngestionJobResponse(BaseModel):
+    """Bulk resume upload job with per-file progress."""
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: str
+    recruitment_request_id: int
+    status: str
+    total_files: int
+    counts: Dict[str, int] = {}
+    files: List[IngestionFileStatus] = []
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
 # Enhanced Analytics Schemas
 class RecruitmentMetrics(BaseModel):
     """Schema for detailed recruitment metrics."""
@@ -424,6 +516,27 @@ class RecruitmentMetrics(BaseModel):
     requests_by_priority: Dict[str, int]
 
 
+class FunnelStageStats(BaseModel):
+    """Funnel and velocity figures for one pipeline stage."""
+    stage: str
+    name: str
+    entered: int
+    exited: int
+    current: int
+    conversion_rate: Optional[float] = None  # % of entries reaching the next stage
+    avg_days_in_stage: Optional[float] = None
+    avg_days_to_reach: Optional[float] = None  # from application
+
+
+class RecruitmentFunnel(BaseModel):
+    """Stage funnel for one requisition, or all when no ID is given."""
+    recruitment_request_id: Optional[int] = None
+    applications: int
+    hires: int
+    hire_rate: Optional[float] = None
+    stages: List[FunnelStageStats]
+
+
 # Assessment Schemas - LOCKED DESIGN DECISION
 # Assessments are NOT stages - they are action-triggered events inside Screening/Interview
 # Technical: Triggered by Manager | Soft Skill: Triggered by HR | Combined: HR + Manager
@@ -1,7 +1,7 @@
 """Timesheet schemas."""
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -92,15 +92,36 @@ class TimesheetApproval(BaseModel):
     rejection_reason: Optional[str] = Field(default=None, description="Reason for rejection")
 
 
+class TimesheetGridRow(BaseModel):
+    """Compact timesheet projection with only the columns the month grid shows."""
+    id: int
+    employee_id: int
+    employee_name: Optional[str] = None
+    status: str
+    total_working_days: int
+    total_present_days: int
+    total_absent_days: int
+    total_leave_days: Decimal
+    total_late_arrivals: int
+    total_overtime_hours: Decimal
+    has_compliance_issues: bool
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TimesheetList(BaseModel):
-    """List of timesheets."""
+    """One page of a month's timesheets with status counts for the whole selection."""
     year: int
     month: int
     total_count: int
     pending_count: int
     approved_count: int
     rejected_count: int
-    timesheets: List[TimesheetSummary] = []
+    status_counts: Dict[str, int] = {}
+    page: int = 1
+    page_size: int = 0
+    total_pages: int = 1
+    timesheets: List[Union[TimesheetSummary, TimesheetGridRow]] = []
 
 
 class MonthlyAttendanceAnalytics(BaseModel):
@@ -4,6 +4,8 @@ This module provides:
 - 10:00 AM daily manager email
 - 9:30 AM missing clock-in reminder
 - 5:30 PM missing clock-out reminder
+- 12:05 AM compliance expiry alert precompute
+- 12:10 AM on 1 January leave balance rollover
 
 Uses APScheduler for task scheduling.
 Install with: pip install apscheduler
@@ -20,11 +22,9 @@ except ImportError:
     AsyncIOScheduler = None
     CronTrigger = None
 
-from sqlalchemy import select
-
 from app.database import async_session_maker
-from app.models.employee import Employee
 from app.services.attendance_service import AttendanceService
+from app.services.org_hierarchy import get_org_hierarchy
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +73,22 @@ class AttendanceScheduler:
             name="Clock-out Reminder"
         )
         
+        # 12:05 AM UAE (20:05 UTC) - Precompute default compliance alert view
+        self.scheduler.add_job(
+            self._refresh_compliance_alerts,
+            CronTrigger(hour=20, minute=5, timezone="UTC"),  # 12:05 AM UAE
+            id="compliance_alerts",
+            name="Compliance Alerts Precompute"
+        )
+        
+        # 12:10 AM UAE on 1 January (20:10 UTC on 31 December) - Leave year rollover
+        self.scheduler.add_job(
+            self._rollover_leave_balances,
+            CronTrigger(month=12, day=31, hour=20, minute=10, timezone="UTC"),  # 1 Jan 12:10 AM UAE
+            id="leave_rollover",
+            name="Leave Balance Year-End Rollover"
+        )
+        
         self.scheduler.start()
         self.is_running = True
         logger.info("Attendance scheduler started")
@@ -111,40 +127,54 @@ class AttendanceScheduler:
         logger.info("Running manager summary email task")
         try:
             async with async_session_maker() as session:
-                # Get all managers
-                result = await session.execute(
-                    select(Employee).where(
-                        Employee.role.in_(["manager", "admin", "hr"])
-                    )
-                )
-                managers = result.scalars().all()
+                # Managers with an active team, from the cached reporting-line index
+                org = await get_org_hierarchy(session)
+                managers = [
+                    m for m in org.managers()
+                    if m.role in ("manager", "admin", "hr") and org.has_team(m.id, active_only=True)
+                ]
                 
                 service = AttendanceService(session)
                 success_count = 0
                 
                 for manager in managers:
-                    # Check if manager has team members
-                    team_result = await session.execute(
-                        select(Employee.id).where(
-                            Employee.line_manager_id == manager.id
-                        ).limit(1)
-                    )
-                    has_team = team_result.scalar_one_or_none()
-                    
-                    if has_team:
-                        success = await service.send_manager_daily_summary_email(manager.id)
-                        if success:
-                            success_count += 1
+                    success = await service.send_manager_daily_summary_email(manager.id)
+                    if success:
+                        success_count += 1
                 
                 logger.info(f"Sent {success_count} manager summary emails")
         except Exception as e:
             logger.error(f"Error sending manager summaries: {e}")
     
+    async def _refresh_compliance_alerts(self):
+        """Precompute the default 60-day compliance alert view for the new day."""
+        logger.info("Running compliance alerts precompute task")
+        try:
+            from app.services.compliance_expiries import compliance_expiry_service
+            async with async_session_maker() as session:
+                await compliance_expiry_service.refresh_default_view(session)
+        except Exception as e:
+            logger.error(f"Error precomputing compliance alerts: {e}")
+    
+    async def _rollover_leave_balances(self):
+        """Open the new leave year: re-grant entitlements and carry forward annual leave."""
+        logger.info("Running leave rollover task")
+        try:
+            from app.core.time import get_uae_today
+            from app.services.leave_ledger import leave_ledger_service
+            async with async_session_maker() as session:
+                summary = await leave_ledger_service.rollover_year(session, get_uae_today().year - 1)
+                await session.commit()
+                logger.info(f"Opened {summary['balances_opened']} leave balances for {summary['to_year']}")
+        except Exception as e:
+            logger.error(f"Error running leave rollover: {e}")
+    
     async def trigger_now(self, task_name: str) -> dict:
         """Manually trigger a task immediately.
         
         Args:
-            task_name: One of "clockin_reminder", "clockout_reminder", "manager_summary"
+            task_name: One of "clockin_reminder", "clockout_reminder", "manager_summary",
+                "compliance_alerts", "leave_rollover"
         
         Returns:
             Result dictionary with status
@@ -152,7 +182,9 @@ class AttendanceScheduler:
         tasks = {
             "clockin_reminder": self._send_clockin_reminders,
             "clockout_reminder": self._send_clockout_reminders,
-            "manager_summary": self._send_manager_summaries
+            "manager_summary": self._send_manager_summaries,
+            "compliance_alerts": self._refresh_compliance_alerts,
+            "leave_rollover": self._rollover_leave_balances,
         }
         
         if task_name not in tasks:
@@ -12,7 +12,7 @@ This service provides:
 import logging
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,9 +22,12 @@ from app.models.attendance import AttendanceRecord, WORK_LOCATIONS
 from app.models.leave import LeaveRequest, LeaveBalance
 from app.models.public_holiday import PublicHoliday
 from app.models.timesheet import Timesheet
-from app.models.geofence import Geofence, is_within_geofence
 from app.models.notification import Notification
+from app.repositories.notification import NotificationRepository
 from app.services.email_service import get_email_service
+from app.services.geofence_index import get_geofence_index, validate_many, validation_result
+from app.services.leave_ledger import leave_ledger_service
+from app.services.work_calendar import HolidayInfo, get_work_calendar
 from app.core.time import get_uae_today
 
 logger = logging.getLogger(__name__)
@@ -80,10 +83,14 @@ class AttendanceService:
         if is_half_day:
             total_days = Decimal("0.5")
         else:
-            # Count weekdays between dates (excluding Fridays for 6-day, Fri+Sat for 5-day)
-            # Simplified: just count calendar days for now
-            delta = (end_date - start_date).days + 1
-            total_days = Decimal(str(delta))
+            # Count working days (excluding Fridays for 6-day, Fri+Sat for 5-day, and holidays)
+            schedule_result = await self.session.execute(
+                select(Employee.work_schedule).where(Employee.id == employee_id)
+            )
+            calendar = await get_work_calendar(self.session)
+            total_days = Decimal(str(calendar.working_days(
+                start_date, end_date, schedule_result.scalar_one_or_none()
+            )))
         
         leave_request = LeaveRequest(
             employee_id=employee_id,
@@ -98,6 +105,8 @@ class AttendanceService:
         )
         
         self.session.add(leave_request)
+        await self.session.flush()
+        await leave_ledger_service.request_submitted(self.session, leave_request)
         await self.session.commit()
         await self.session.refresh(leave_request)
         
@@ -105,18 +114,10 @@ class AttendanceService:
     
     # ==================== PUBLIC HOLIDAY INTEGRATION ====================
     
-    async def is_public_holiday(self, check_date: date) -> Optional[PublicHoliday]:
-        """Check if a date is a public holiday."""
-        result = await self.session.execute(
-            select(PublicHoliday).where(
-                and_(
-                    PublicHoliday.is_active == True,
-                    PublicHoliday.start_date <= check_date,
-                    PublicHoliday.end_date >= check_date
-                )
-            )
-        )
-        return result.scalar_one_or_none()
+    async def is_public_holiday(self, check_date: date) -> Optional[HolidayInfo]:
+        """Check if a date is a public holiday (served from the in-memory work calendar)."""
+        calendar = await get_work_calendar(self.session)
+        return calendar.holiday_on(check_date)
     
     async def get_holidays_for_year(self, year: int) -> List[PublicHoliday]:
         """Get all public holidays for a year."""
@@ -138,78 +139,17 @@ class AttendanceService:
         user_lon: float,
         work_location: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Validate GPS coordinates against geofences."""
-        # Get all active geofences
-        result = await self.session.execute(
-            select(Geofence).where(Geofence.is_active == True)
-        )
-        geofences = result.scalars().all()
-        
-        if not geofences:
-            return {
-                "is_valid": True,
-                "message": "No geofences configured",
-                "validation_required": False
-            }
-        
-        # If work_location specified, check that specific geofence
-        if work_location:
-            for gf in geofences:
-                if gf.name == work_location:
-                    is_within, distance = is_within_geofence(
-                        user_lat, user_lon,
-                        float(gf.latitude), float(gf.longitude),
-                        gf.radius_meters
-                    )
-                    return {
-                        "is_valid": is_within or not gf.validation_required,
-                        "work_location": work_location,
-                        "matched_geofence": gf.name if is_within else None,
-                        "distance_meters": distance,
-                        "within_radius": is_within,
-                        "validation_required": gf.validation_required,
-                        "message": f"Within {gf.name}" if is_within else f"{distance:.0f}m from {gf.name}"
-                    }
-        
-        # Otherwise, find nearest geofence
-        nearest = None
-        nearest_distance = float('inf')
-        matched = None
-        
-        for gf in geofences:
-            is_within, distance = is_within_geofence(
-                user_lat, user_lon,
-                float(gf.latitude), float(gf.longitude),
-                gf.radius_meters
-            )
-            if is_within:
-                matched = gf
-                nearest_distance = distance
-                break
-            if distance < nearest_distance:
-                nearest = gf
-                nearest_distance = distance
-        
-        if matched:
-            return {
-                "is_valid": True,
-                "work_location": matched.name,
-                "matched_geofence": matched.name,
-                "distance_meters": nearest_distance,
-                "within_radius": True,
-                "validation_required": matched.validation_required,
-                "message": f"Location detected: {matched.name}"
-            }
-        
-        return {
-            "is_valid": False,
-            "work_location": None,
-            "matched_geofence": None,
-            "distance_meters": nearest_distance,
-            "within_radius": False,
-            "validation_required": nearest.validation_required if nearest else False,
-            "message": f"Outside all geofences. Nearest: {nearest.name} ({nearest_distance:.0f}m)" if nearest else "No geofences found"
-        }
+        """Validate GPS coordinates against the cached geofence index."""
+        index = await get_geofence_index(self.session)
+        return validation_result(index, user_lat, user_lon, work_location)
+    
+    async def validate_geofences(
+        self,
+        points: List[Tuple[float, float, Optional[str]]]
+    ) -> List[Dict[str, Any]]:
+        """Validate many ``(lat, lon, work_location)`` points in one vectorized pass."""
+        index = await get_geofence_index(self.session)
+        return validate_many(index, points)
     
     # ==================== TIMESHEET GENERATION ====================
     
@@ -327,11 +267,13 @@ class AttendanceService:
                 has_issues = True
                 issues.append(f"{record.attendance_date}: Exceeded limits")
         
-        # Calculate working days (simplified)
-        total_working_days = (end_date - start_date).days + 1
-        weekends = sum(1 for d in range(total_working_days) 
-                      if (start_date + timedelta(days=d)).weekday() in [4, 5])  # Fri, Sat
-        total_working_days -= weekends
+        # Working days for the employee's weekend pattern, excluding public holidays
+        schedule_result = await self.session.execute(
+            select(Employee.work_schedule).where(Employee.id == employee_id)
+        )
+        work_schedule = schedule_result.scalar_one_or_none()
+        calendar = await get_work_calendar(self.session)
+        total_working_days = calendar.working_days(start_date, end_date, work_schedule)
         
         # Get leave days
         leaves_result = await self.session.execute(
@@ -345,7 +287,14 @@ class AttendanceService:
             )
         )
         leaves = leaves_result.scalars().all()
-        total_leave = sum(l.total_days for l in leaves)
+        # Leave working days clipped to this month, counted in one vectorized call
+        full_day_leaves = [l for l in leaves if not l.is_half_day]
+        leave_days = calendar.working_days_batch(
+            [max(l.start_date, start_date) for l in full_day_leaves],
+            [min(l.end_date, end_date) for l in full_day_leaves],
+            [work_schedule] * len(full_day_leaves),
+        )
+        total_leave = Decimal(int(leave_days.sum())) + Decimal("0.5") * (len(leaves) - len(full_day_leaves))
         
         # Create or update timesheet
         if not timesheet:
@@ -473,14 +422,14 @@ class AttendanceService:
         link: Optional[str] = None
     ) -> Notification:
         """Create an attendance-related notification."""
-        notification = Notification(
+        notification = await NotificationRepository().add(
+            self.session,
             user_id=user_id,
             title=title,
             message=message,
             type=notification_type,
             link=link
         )
-        self.session.add(notification)
         await self.session.commit()
         return notification
     
@@ -492,6 +441,10 @@ class AttendanceService:
         """
         today = get_uae_today()
         
+        # Nobody is reminded on a public holiday
+        if await self.is_public_holiday(today):
+            return 0
+        
         # Get all active employees
         emp_result = await self.session.execute(
             select(Employee).where(Employee.is_active == True)
@@ -514,11 +467,6 @@ class AttendanceService:
                 if leave:
                     continue
                 
-                # Check if holiday
-                holiday = await self.is_public_holiday(today)
-                if holiday:
-                    continue
-                
                 # Send notification
                 await self.create_attendance_notification(
                     user_id=str(emp.id),
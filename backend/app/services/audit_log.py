@@ -1,7 +1,7 @@
 from app.repositories.audit_log import AuditLogRepository
-from app.schemas.audit_log import AuditLogBase, AuditLogResponse
+from app.schemas.audit_log import AuditLogBase, AuditLogPage, AuditLogResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Optional
 
 class AuditLogService:
     def __init__(self, repo: AuditLogRepository):
@@ -11,6 +11,16 @@ class AuditLogService:
         log = await self.repo.create(session, **data.dict())
         return AuditLogResponse.from_orm(log)
 
-    async def list(self, session: AsyncSession, entity: Optional[str] = None, user_id: Optional[str] = None) -> List[AuditLogResponse]:
-        logs = await self.repo.list(session, entity, user_id)
-        return [AuditLogResponse.from_orm(l) for l in logs]
+    async def list(
+        self,
+        session: AsyncSession,
+        entity: Optional[str] = None,
+        user_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> AuditLogPage:
+        logs, next_cursor = await self.repo.list(session, entity, user_id, cursor, limit)
+        return AuditLogPage(
+            items=[AuditLogResponse.from_orm(l) for l in logs],
+            next_cursor=next_cursor,
+        )
@@ -0,0 +1,53 @@
+"""Versioned calendar snapshots for the leave and holiday calendar views.
+
+A snapshot is keyed by view and (year, month, scope). Its ETag is derived from
+the ``leave_calendar`` and ``public_holidays`` cache versions, which leave
+approvals/cancellations and holiday edits bump. Month flipping in the UI is
+answered from memory (or with a 304) until one of those versions moves.
+"""
+from typing import Any, Awaitable, Callable, Hashable, Optional, Sequence
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import bump_cache_version, get_cached_version
+from app.core.http_cache import SnapshotCache, cached_json, etag_matches, make_etag, not_modified
+from app.services.work_calendar import HOLIDAYS_CACHE_SCOPE
+
+LEAVE_CALENDAR_CACHE_SCOPE = "leave_calendar"
+
+_snapshots = SnapshotCache(maxsize=512)
+
+
+async def invalidate_leave_calendar(session: AsyncSession) -> None:
+    """Bump the leave-calendar version (call in the same transaction as the write)."""
+    await bump_cache_version(session, LEAVE_CALENDAR_CACHE_SCOPE)
+
+
+async def serve_snapshot(
+    session: AsyncSession,
+    key: Hashable,
+    scopes: Sequence[str],
+    build: Callable[[], Awaitable[Any]],
+    if_none_match: Optional[str] = None,
+) -> Response:
+    """
+    Return a 304, a cached snapshot or a freshly built one for ``key``.
+
+    ``build`` is only awaited when no snapshot exists for the current versions.
+    """
+    versions = [await get_cached_version(session, scope) for scope in scopes]
+    etag = make_etag(key, *versions)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    payload = _snapshots.get(key, etag)
+    if payload is None:
+        payload = jsonable_encoder(await build())
+        _snapshots.put(key, etag, payload)
+    return cached_json(payload, etag)
+
+
+LEAVE_CALENDAR_SCOPES = (LEAVE_CALENDAR_CACHE_SCOPE, HOLIDAYS_CACHE_SCOPE)
+HOLIDAY_SCOPES = (HOLIDAYS_CACHE_SCOPE,)
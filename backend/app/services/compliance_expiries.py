@@ -0,0 +1,209 @@
+"""Compliance expiry projection and alert buckets.
+
+Expiry dates live on several tables (employee compliance columns and uploaded
+documents). They are projected into ``compliance_expiries`` on write so alert
+queries become a single index range scan on ``expiry_date``.
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import VersionedCache, bump_cache_version
+from app.core.logging import get_logger
+from app.core.time import get_uae_today
+from app.models.compliance_expiry import ComplianceExpiry, EMPLOYEE_EXPIRY_FIELDS
+from app.models.employee import Employee
+from app.models.employee_document import EmployeeDocument
+
+logger = get_logger(__name__)
+
+COMPLIANCE_CACHE_SCOPE = "compliance_expiries"
+DEFAULT_ALERT_DAYS = 60
+
+
+class ComplianceExpiryService:
+    """Maintains the expiry projection and answers alert bucket queries."""
+
+    def __init__(self) -> None:
+        # Precomputed default (60-day) view, rebuilt daily or on any write
+        self._default_view: VersionedCache[dict] = VersionedCache(
+            COMPLIANCE_CACHE_SCOPE, self._load_default_view, check_interval=60
+        )
+
+    async def sync_employee(self, session: AsyncSession, employee: Employee) -> None:
+        """Rewrite the projection rows for an employee's own expiry columns."""
+        await session.execute(
+            delete(ComplianceExpiry).where(
+                ComplianceExpiry.source == "employee",
+                ComplianceExpiry.source_id == employee.id,
+            )
+        )
+        rows = [
+            {
+                "employee_id": employee.id,
+                "source": "employee",
+                "source_id": employee.id,
+                "document_type": label,
+                "expiry_date": getattr(employee, field),
+            }
+            for field, label in EMPLOYEE_EXPIRY_FIELDS
+            if getattr(employee, field, None)
+        ]
+        if rows:
+            await session.execute(insert(ComplianceExpiry), rows)
+        await bump_cache_version(session, COMPLIANCE_CACHE_SCOPE)
+
+    async def sync_document(self, session: AsyncSession, document: EmployeeDocument) -> None:
+        """Rewrite the projection row for an employee document."""
+        await session.execute(
+            delete(ComplianceExpiry).where(
+                ComplianceExpiry.source == "document",
+                ComplianceExpiry.source_id == document.id,
+            )
+        )
+        if document.expiry_date:
+            await session.execute(
+                insert(ComplianceExpiry).values(
+                    employee_id=document.employee_id,
+                    source="document",
+                    source_id=document.id,
+                    document_type=document.document_name,
+                    expiry_date=document.expiry_date,
+                )
+            )
+        await bump_cache_version(session, COMPLIANCE_CACHE_SCOPE)
+
+    async def remove_document(self, session: AsyncSession, document_id: int) -> None:
+        """Drop the projection row for a deleted document."""
+        await session.execute(
+            delete(ComplianceExpiry).where(
+                ComplianceExpiry.source == "document",
+                ComplianceExpiry.source_id == document_id,
+            )
+        )
+        await bump_cache_version(session, COMPLIANCE_CACHE_SCOPE)
+
+    async def invalidate(self, session: AsyncSession) -> None:
+        """Mark cached alert views stale (e.g. after an employee is deactivated)."""
+        await bump_cache_version(session, COMPLIANCE_CACHE_SCOPE)
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """Rebuild the whole projection with set-based INSERT ... SELECT statements."""
+        await session.execute(delete(ComplianceExpiry))
+
+        target = ["employee_id", "source", "source_id", "document_type", "expiry_date"]
+        for field, label in EMPLOYEE_EXPIRY_FIELDS:
+            column = getattr(Employee, field)
+            await session.execute(
+                insert(ComplianceExpiry).from_select(
+                    target,
+                    select(
+                        Employee.id,
+                        literal("employee"),
+                        Employee.id,
+                        literal(label),
+                        column,
+                    ).where(column.is_not(None)),
+                )
+            )
+        await session.execute(
+            insert(ComplianceExpiry).from_select(
+                target,
+                select(
+                    EmployeeDocument.employee_id,
+                    literal("document"),
+                    EmployeeDocument.id,
+                    EmployeeDocument.document_name,
+                    EmployeeDocument.expiry_date,
+                ).where(EmployeeDocument.expiry_date.is_not(None)),
+            )
+        )
+        await bump_cache_version(session, COMPLIANCE_CACHE_SCOPE)
+
+        result = await session.execute(select(func.count()).select_from(ComplianceExpiry))
+        count = result.scalar() or 0
+        logger.info(f"Rebuilt compliance expiry projection with {count} rows")
+        return count
+
+    async def get_alerts(self, session: AsyncSession, days: int = DEFAULT_ALERT_DAYS) -> dict:
+        """
+        Get expiry alerts grouped by urgency.
+
+        - expired: Already expired
+        - days_7: Expiring within 7 days
+        - days_30: Expiring within 30 days
+        - days_custom: Expiring within ``days`` (default 60)
+        """
+        today = get_uae_today()
+        if days != DEFAULT_ALERT_DAYS:
+            return await self._query_alerts(session, days, today)
+
+        view = await self._default_view.get(session)
+        if view["date"] != today:
+            self._default_view.clear()
+            view = await self._default_view.get(session)
+        return view["alerts"]
+
+    async def refresh_default_view(self, session: AsyncSession) -> None:
+        """Recompute the default view (run daily after midnight UAE)."""
+        self._default_view.clear()
+        await self._default_view.get(session)
+
+    async def _load_default_view(self, session: AsyncSession) -> dict:
+        today = get_uae_today()
+        return {"date": today, "alerts": await self._query_alerts(session, DEFAULT_ALERT_DAYS, today)}
+
+    async def _query_alerts(
+        self, session: AsyncSession, days: int, today: Optional[date] = None
+    ) -> dict:
+        today = today or get_uae_today()
+        # The 7/30-day buckets are always reported, even for shorter horizons
+        horizon = today + timedelta(days=max(days, 30))
+        result = await session.execute(
+            select(
+                Employee.employee_id,
+                Employee.name,
+                ComplianceExpiry.document_type,
+                ComplianceExpiry.expiry_date,
+                ComplianceExpiry.source,
+            )
+            .join(Employee, Employee.id == ComplianceExpiry.employee_id)
+            .where(
+                Employee.is_active.is_(True),
+                ComplianceExpiry.expiry_date <= horizon,
+            )
+            .order_by(ComplianceExpiry.expiry_date, Employee.name)
+        )
+
+        alerts = {
+            'expired': [],
+            'days_7': [],
+            'days_30': [],
+            'days_custom': []
+        }
+        for employee_id, name, document_type, expiry, source in result.all():
+            days_until = (expiry - today).days
+            alert = {
+                'employee_id': employee_id,
+                'name': name,
+                'document_type': document_type,
+                'source': source,
+                'expiry_date': expiry.isoformat(),
+                'days_remaining': days_until
+            }
+            if days_until < 0:
+                alert['days_overdue'] = abs(days_until)
+                alerts['expired'].append(alert)
+            elif days_until <= 7:
+                alerts['days_7'].append(alert)
+            elif days_until <= 30:
+                alerts['days_30'].append(alert)
+            elif days_until <= days:
+                alerts['days_custom'].append(alert)
+        return alerts
+
+
+compliance_expiry_service = ComplianceExpiryService()
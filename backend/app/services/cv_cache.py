@@ -0,0 +1,187 @@
+"""Content-addressed cache for CV text extraction and scoring.
+
+Extracted text is keyed by the SHA-256 of the file bytes; scores by the hash
+of (text hash, job title + description hash, normalized required skills,
+model). Both live in database tables so they survive restarts and are shared
+between workers, with a small in-process LRU in front for hot keys. Each
+table is trimmed to ``cv_cache_max_entries`` rows by ``last_used_at`` every
+``EVICT_EVERY`` writes.
+"""
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional, Type
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.time import get_utc_now
+from app.models.cv_cache import CVScoreCache, CVTextCache
+from app.services.cv_scoring_service import extract_cv_text, get_cv_scorer
+
+logger = get_logger(__name__)
+
+MEMORY_ENTRIES = 256
+EVICT_EVERY = 100
+
+
+def content_hash(data: bytes | str) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_skills(required_skills: Optional[Iterable[str]]) -> list[str]:
+    """Order- and case-insensitive skill list used in score keys."""
+    return sorted({s.strip().casefold() for s in required_skills or [] if s and s.strip()})
+
+
+@dataclass(frozen=True)
+class ScoreKey:
+    cache_key: str
+    text_hash: str
+    job_hash: str
+    model: str
+
+
+def score_key(
+    cv_text: str, job_title: str, job_description: str, required_skills: Optional[Iterable[str]], model: str
+) -> ScoreKey:
+    text_hash = content_hash(cv_text)
+    job_hash = content_hash(f"{job_title}\n{job_description}")
+    skills = "\x1f".join(normalize_skills(required_skills))
+    return ScoreKey(content_hash(f"{text_hash}|{job_hash}|{skills}|{model}"), text_hash, job_hash, model)
+
+
+def requisition_hash(job_title: str, job_description: Optional[str], required_skills: Optional[Iterable[str]]) -> str:
+    """Version of a requisition's job; an LLM score made against another one is stale."""
+    skills = "\x1f".join(normalize_skills(required_skills))
+    return content_hash(f"{job_title}\n{job_description or ''}\n{skills}")
+
+
+class _LRU:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CVCache:
+    """Two-level (memory + database) cache for CV text and scores."""
+
+    def __init__(self, max_entries: Optional[int] = None, memory_entries: int = MEMORY_ENTRIES) -> None:
+        self.max_entries = max_entries or get_settings().cv_cache_max_entries
+        self._texts = _LRU(memory_entries)
+        self._scores = _LRU(memory_entries)
+        self._writes = 0
+
+    def clear_memory(self) -> None:
+        self._texts.clear()
+        self._scores.clear()
+
+    # ---- extracted text ----------------------------------------------------
+
+    async def extract_text(self, session: AsyncSession, content: bytes, filename: str) -> Optional[str]:
+        """Extracted text for a file, running extraction only on a cache miss."""
+        key = content_hash(content)
+        text = self._texts.get(key)
+        if text is not None:
+            return text
+
+        row = await session.get(CVTextCache, key)
+        if row is not None:
+            await self._touch(session, CVTextCache, CVTextCache.content_hash, key)
+            self._texts.put(key, row.text)
+            return row.text
+
+        text = await extract_cv_text(content, filename)
+        if text and text.strip():
+            await self._insert(
+                session, CVTextCache, content_hash=key, text=text, char_count=len(text), last_used_at=get_utc_now()
+            )
+            self._texts.put(key, text)
+        return text
+
+    # ---- scores --------------------------------------------------------------
+
+    def score_key(
+        self, cv_text: str, job_title: str, job_description: str, required_skills: Optional[Iterable[str]]
+    ) -> Optional[ScoreKey]:
+        """Key for the active scoring backend, or None when scoring is disabled."""
+        scorer = get_cv_scorer()
+        if scorer is None:
+            return None
+        return score_key(cv_text, job_title, job_description, required_skills, scorer.model)
+
+    async def get_scores(self, session: AsyncSession, key: ScoreKey) -> Optional[Dict[str, Any]]:
+        scores = self._scores.get(key.cache_key)
+        if scores is not None:
+            return dict(scores)
+        row = await session.get(CVScoreCache, key.cache_key)
+        if row is None:
+            return None
+        await self._touch(session, CVScoreCache, CVScoreCache.cache_key, key.cache_key, hit=True)
+        self._scores.put(key.cache_key, row.result)
+        return dict(row.result)
+
+    async def put_scores(self, session: AsyncSession, key: ScoreKey, scores: Dict[str, Any]) -> None:
+        await self._insert(
+            session, CVScoreCache,
+            cache_key=key.cache_key, text_hash=key.text_hash, job_hash=key.job_hash,
+            model=key.model, result=scores, last_used_at=get_utc_now(), hit_count=0,
+        )
+        self._scores.put(key.cache_key, scores)
+
+    # ---- storage ---------------------------------------------------------------
+
+    async def _touch(self, session: AsyncSession, table: Type, pk, key: str, hit: bool = False) -> None:
+        values: Dict[str, Any] = {"last_used_at": get_utc_now()}
+        if hit:
+            values["hit_count"] = table.hit_count + 1
+        await session.execute(
+            update(table).where(pk == key).values(**values).execution_options(synchronize_session=False)
+        )
+
+    async def _insert(self, session: AsyncSession, table: Type, **values: Any) -> None:
+        try:
+            async with session.begin_nested():
+                await session.execute(insert(table).values(**values))
+        except IntegrityError:
+            # Another worker cached the same content first
+            return
+        self._writes += 1
+        if self._writes % EVICT_EVERY == 0:
+            await self.evict(session)
+
+    async def evict(self, session: AsyncSession) -> int:
+        """Trim both tables to ``max_entries`` rows, least recently used first."""
+        removed = 0
+        for table, pk in ((CVTextCache, CVTextCache.content_hash), (CVScoreCache, CVScoreCache.cache_key)):
+            stale = select(pk).order_by(table.last_used_at.desc()).offset(self.max_entries)
+            result = await session.execute(
+                delete(table).where(pk.in_(stale)).execution_options(synchronize_session=False)
+            )
+            removed += result.rowcount or 0
+        if removed:
+            logger.info(f"Evicted {removed} CV cache entries")
+        return removed
+
+
+cv_cache = CVCache()
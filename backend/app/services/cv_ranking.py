@@ -0,0 +1,285 @@
+"""Local, offline candidate pre-ranking.
+
+Each CV's text is reduced once to a hashed bag-of-words vector (unigrams and
+bigrams hashed into ``VECTOR_DIM`` buckets, sublinear term frequency) and
+stored on ``Candidate.cv_vector`` as packed int32 indices + float32 weights,
+typically a few KB. Ranking a requisition loads every vector in one query
+and scores them against the job title, description and required skills with
+TF-IDF cosine similarity in a single vectorized NumPy pass (IDF is computed
+over the requisition's own pool). The similarity is stored on
+``similarity_score`` and orders ``screening_rank`` until an LLM ``cv_scoring``
+for the current job is available, so only the top ``cv_llm_top_n`` candidates
+need the remote scorer. An LLM score is current while ``cv_scored_job_hash``
+matches the requisition's :func:`requisition_hash`; older scores are kept for
+reference but rank by similarity.
+"""
+import asyncio
+import math
+import re
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_cache import cv_cache, requisition_hash
+from app.services.cv_scoring_queue import CVScoringQueue, cv_scoring_queue
+
+logger = get_logger(__name__)
+
+VECTOR_DIM = 2 ** 18
+# Required skills count this many times in the job vector
+SKILL_WEIGHT = 3
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the "
+    "to was were will with you your we i my me this that".split()
+)
+
+SparseVector = Tuple[np.ndarray, np.ndarray]
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def _bucket(term: str) -> int:
+    # crc32 rather than hash(): stored vectors must survive process restarts
+    return zlib.crc32(term.encode("utf-8")) & (VECTOR_DIM - 1)
+
+
+def term_counts(text: str) -> Counter:
+    tokens = _tokens(text or "")
+    counts = Counter(_bucket(t) for t in tokens)
+    counts.update(_bucket(f"{a} {b}") for a, b in zip(tokens, tokens[1:]))
+    return counts
+
+
+def to_vector(counts: Counter) -> SparseVector:
+    """Sorted bucket indices and sublinear (1 + log tf) weights."""
+    if not counts:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    order = np.argsort(indices)
+    return indices[order], (1.0 + np.log(tf[order])).astype(np.float32)
+
+
+def vectorize(text: str) -> SparseVector:
+    return to_vector(term_counts(text))
+
+
+def job_vector(job_title: str, job_description: Optional[str], required_skills: Optional[Iterable[str]]) -> SparseVector:
+    counts = term_counts(f"{job_title}\n{job_description or ''}")
+    for skill in required_skills or []:
+        for bucket, n in term_counts(skill).items():
+            counts[bucket] += n * SKILL_WEIGHT
+    return to_vector(counts)
+
+
+def pack_vector(vector: SparseVector) -> bytes:
+    indices, weights = vector
+    return indices.astype("<i4").tobytes() + weights.astype("<f4").tobytes()
+
+
+def unpack_vector(data: bytes) -> SparseVector:
+    n = len(data) // 8
+    return (
+        np.frombuffer(data, dtype="<i4", count=n),
+        np.frombuffer(data, dtype="<f4", count=n, offset=n * 4),
+    )
+
+
+def cosine_scores(documents: Sequence[SparseVector], query: SparseVector) -> np.ndarray:
+    """TF-IDF cosine similarity of each document to the query, in [0, 1].
+
+    The documents are concatenated into COO arrays so IDF, norms and dot
+    products are each one ``bincount`` over every stored term.
+    """
+    n_docs = len(documents)
+    if not n_docs or not len(query[0]):
+        return np.zeros(n_docs)
+    lengths = np.array([len(d[0]) for d in documents])
+    doc = np.repeat(np.arange(n_docs), lengths)
+    terms = np.concatenate([d[0] for d in documents]).astype(np.intp)
+    tf = np.concatenate([d[1] for d in documents]).astype(np.float64)
+
+    df = np.bincount(terms, minlength=VECTOR_DIM)
+    idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+    weights = tf * idf[terms]
+    norms = np.sqrt(np.bincount(doc, weights=weights ** 2, minlength=n_docs))
+
+    q = np.zeros(VECTOR_DIM)
+    q_terms = query[0].astype(np.intp)
+    q[q_terms] = query[1] * idf[q_terms]
+    q_norm = math.sqrt(float(np.dot(q[q_terms], q[q_terms])))
+
+    dots = np.bincount(doc, weights=weights * q[terms], minlength=n_docs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = dots / (norms * q_norm)
+    return np.nan_to_num(scores, nan=0.0, posinf=0.0)
+
+
+def current_llm_score(request: RecruitmentRequest):
+    """SQL condition: the candidate's ``cv_scoring`` was made against the request's current job."""
+    job_hash = requisition_hash(request.position_title, request.job_description, request.required_skills)
+    # coalesce keeps the condition two-valued, so it can be negated
+    return and_(Candidate.cv_scoring.isnot(None), func.coalesce(Candidate.cv_scored_job_hash, "") == job_hash)
+
+
+async def refresh_screening_ranks(session: AsyncSession, request_id: int) -> int:
+    """
+    Rank a requisition's candidates (1 = best); no commit.
+
+    Candidates with a current LLM score come first by ``cv_scoring``, then the
+    rest by local ``similarity_score``. Candidates with neither are unranked.
+    """
+    request = await session.get(RecruitmentRequest, request_id)
+    if request is None:
+        return 0
+    in_request = Candidate.recruitment_request_id == request_id
+    current = current_llm_score(request)
+    has_score = Candidate.cv_scoring.isnot(None) | Candidate.similarity_score.isnot(None)
+    result = await session.execute(
+        select(Candidate.id)
+        .where(in_request, has_score)
+        .order_by(
+            case((current, 0), else_=1),
+            case((current, Candidate.cv_scoring)).desc(),
+            Candidate.similarity_score.is_(None),
+            Candidate.similarity_score.desc(),
+            Candidate.id,
+        )
+    )
+    ranks = [{"id": cid, "screening_rank": rank} for rank, cid in enumerate(result.scalars().all(), start=1)]
+    await session.execute(
+        update(Candidate)
+        .where(in_request, ~has_score)
+        .values(screening_rank=None)
+        .execution_options(synchronize_session=False)
+    )
+    if ranks:
+        await session.execute(update(Candidate), ranks)
+    return len(ranks)
+
+
+class CandidatePreRanker:
+    """Vectorizes stored CVs and ranks a requisition's pool without the LLM."""
+
+    async def ensure_vectors(self, session: AsyncSession, request_id: int) -> Dict[int, str]:
+        """
+        Vectorize candidates with a CV on file but no stored vector.
+
+        Text comes through :data:`cv_cache`, so CVs already extracted for
+        scoring are not parsed again. Unreadable CVs are marked ``failed``;
+        returns ``{candidate_id: error}`` for them. No commit.
+        """
+        result = await session.execute(
+            select(Candidate.id, Candidate.resume_path).where(
+                Candidate.recruitment_request_id == request_id,
+                Candidate.resume_path.isnot(None),
+                Candidate.cv_vector.is_(None),
+            )
+        )
+        vectors = []
+        errors: Dict[int, str] = {}
+        for candidate_id, resume_path in result.all():
+            try:
+                content = await asyncio.to_thread(Path(resume_path).read_bytes)
+                text = await cv_cache.extract_text(session, content, resume_path)
+            except OSError as e:
+                errors[candidate_id] = str(e)
+                continue
+            if not text or not text.strip():
+                errors[candidate_id] = "Insufficient text extracted from CV"
+                continue
+            vectors.append({"id": candidate_id, "cv_vector": pack_vector(vectorize(text))})
+
+        if vectors:
+            await session.execute(update(Candidate), vectors)
+        if errors:
+            await session.execute(
+                update(Candidate),
+                [
+                    {"id": cid, "cv_scoring_status": "failed", "cv_scoring_error": error[:500]}
+                    for cid, error in errors.items()
+                ],
+            )
+        return errors
+
+    async def rank(
+        self, session: AsyncSession, request_id: int, vectorize: bool = True
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank the requisition's candidates by similarity to the job.
+
+        Writes ``similarity_score`` and ``screening_rank``, commits, and returns ``(candidate_id, similarity)`` best first. Pass
+        ``vectorize=False`` when :meth:`ensure_vectors` has just run.
+        """
+        request = await session.get(RecruitmentRequest, request_id)
+        if request is None:
+            return []
+        if vectorize:
+            await self.ensure_vectors(session, request_id)
+
+        result = await session.execute(
+            select(Candidate.id, Candidate.cv_vector).where(
+                Candidate.recruitment_request_id == request_id,
+                Candidate.cv_vector.isnot(None),
+            )
+        )
+        rows = result.all()
+        query = job_vector(request.position_title, request.job_description, request.required_skills)
+        scores = cosine_scores([unpack_vector(row.cv_vector) for row in rows], query)
+
+        if rows:
+            await session.execute(
+                update(Candidate),
+                [{"id": row.id, "similarity_score": float(score)} for row, score in zip(rows, scores)],
+            )
+        await refresh_screening_ranks(session, request_id)
+        await session.commit()
+
+        order = np.argsort(-scores, kind="stable")
+        return [(rows[k].id, float(scores[k])) for k in order]
+
+    async def rank_and_queue(
+        self,
+        session: AsyncSession,
+        request_id: int,
+        top_n: Optional[int],
+        queue: CVScoringQueue = cv_scoring_queue,
+    ) -> Tuple[List[Tuple[int, float]], List[int]]:
+        """
+        Rank the pool, then queue LLM scoring for the ``top_n`` best
+        candidates (None = all) that have no LLM score for the current job
+        and are not already queued.
+
+        Returns the ranking and the queued candidate IDs.
+        """
+        ranked = await self.rank(session, request_id)
+        top = [cid for cid, _ in (ranked if top_n is None else ranked[:top_n])]
+        if not top:
+            return ranked, []
+        request = await session.get(RecruitmentRequest, request_id)
+        result = await session.execute(
+            select(Candidate.id).where(
+                Candidate.id.in_(top),
+                or_(Candidate.cv_scoring_status.is_(None), Candidate.cv_scoring_status.notin_(("queued", "scoring"))),
+                ~current_llm_score(request),
+            )
+        )
+        pending = set(result.scalars().all())
+        to_score = [cid for cid in top if cid in pending]
+        await queue.enqueue(session, to_score)
+        return ranked, to_score
+
+
+candidate_pre_ranker = CandidatePreRanker()
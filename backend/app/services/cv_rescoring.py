@@ -0,0 +1,255 @@
+"""Bulk re-scoring of a requisition's candidates.
+
+When a requisition's job description or required skills change, every
+candidate's ``cv_scoring``/``skills_match_score`` is stale (its
+``cv_scored_job_hash`` no longer matches). A re-score job pre-ranks the pool
+locally, marks the top ``cv_llm_top_n`` candidates ``queued`` in one UPDATE,
+walks them in ``RESCORE_BATCH_SIZE`` pages, scores each page with bounded
+concurrency through the cached extraction/scoring path, and writes each page
+back with a single by-primary-key bulk UPDATE. ``screening_rank`` is
+refreshed at the end.
+
+A job scores the job version it read when it started (``job_hash``); if the
+requisition is edited while it runs, a follow-up job is started when it
+finishes. Progress is kept in memory per requisition for the job that runs
+in this process; the persisted ``cv_scoring_status`` counts give the cross-process
+view, and candidates still ``queued`` after a crash are picked up by the
+scoring queue's recovery on the next start.
+"""
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.time import get_utc_now
+from app.database import AsyncSessionLocal
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_cache import requisition_hash
+from app.services.cv_ranking import candidate_pre_ranker, refresh_screening_ranks
+from app.services.cv_scoring_queue import (
+    BASE_RETRY_DELAY, CVScoringError, rate_limit_gate, retry_delay, score_resume
+)
+from app.services.cv_scoring_service import CVScoringRetryableError
+
+logger = get_logger(__name__)
+
+RESCORE_BATCH_SIZE = 50
+
+
+@dataclass
+class RescoreProgress:
+    """Progress of one requisition re-score job."""
+
+    job_id: str
+    recruitment_request_id: int
+    status: str = "running"  # running, completed, failed
+    total: int = 0
+    scored: int = 0
+    failed: int = 0
+    started_at: datetime = field(default_factory=get_utc_now)
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    # requisition_hash of the job version being scored
+    job_hash: Optional[str] = None
+
+    @property
+    def processed(self) -> int:
+        return self.scored + self.failed
+
+
+class RequisitionRescorer:
+    """Runs at most one re-score job per requisition in this process."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        base_delay: float = BASE_RETRY_DELAY,
+        top_n: Optional[int] = None,
+    ) -> None:
+        settings = get_settings()
+        self._session_factory = session_factory
+        self.concurrency = concurrency or settings.cv_scoring_workers
+        self.max_attempts = max_attempts or settings.cv_scoring_max_attempts
+        self.top_n = settings.cv_llm_top_n if top_n is None else top_n
+        self.base_delay = base_delay
+        self._progress: Dict[int, RescoreProgress] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def progress(self, request_id: int) -> Optional[RescoreProgress]:
+        return self._progress.get(request_id)
+
+    def start(self, request_id: int) -> RescoreProgress:
+        """
+        Start a job in the background, or return the one already running.
+
+        A running job rechecks the requisition when it finishes and re-runs
+        itself if the job changed meanwhile, so edits are never lost.
+        """
+        running = self._progress.get(request_id)
+        if running and running.status == "running":
+            return running
+        progress = RescoreProgress(job_id=uuid.uuid4().hex, recruitment_request_id=request_id)
+        self._progress[request_id] = progress
+        self._tasks[request_id] = asyncio.create_task(self._run(progress))
+        return progress
+
+    async def wait(self, request_id: int) -> Optional[RescoreProgress]:
+        """Wait for the requisition's job, including any follow-up re-runs."""
+        task = self._tasks.get(request_id)
+        while task is not None:
+            await asyncio.shield(task)
+            task, done = self._tasks.get(request_id), task
+            if task is done:
+                break
+        return self._progress.get(request_id)
+
+    async def status_counts(self, session: AsyncSession, request_id: int) -> Dict[str, int]:
+        result = await session.execute(
+            select(Candidate.cv_scoring_status, func.count())
+            .where(Candidate.recruitment_request_id == request_id, Candidate.cv_scoring_status.isnot(None))
+            .group_by(Candidate.cv_scoring_status)
+        )
+        return {status: count for status, count in result.all()}
+
+    async def _run(self, progress: RescoreProgress) -> None:
+        request_id = progress.recruitment_request_id
+        try:
+            async with self._session_factory() as session:
+                request = await session.get(RecruitmentRequest, request_id)
+                if request is None:
+                    raise CVScoringError("Recruitment request not found")
+                job = (request.position_title, request.job_description, request.required_skills)
+                progress.job_hash = requisition_hash(*job)
+                unreadable = await candidate_pre_ranker.ensure_vectors(session, request_id)
+                ranked = await candidate_pre_ranker.rank(session, request_id, vectorize=False)
+                selected = [cid for cid, _ in ranked]
+                if self.top_n:
+                    selected = selected[:self.top_n]
+
+                # Scores outside the selection stay, marked stale by their job
+                # hash; only drop jobs still waiting from an earlier re-score
+                await session.execute(
+                    update(Candidate)
+                    .where(
+                        Candidate.recruitment_request_id == request_id,
+                        Candidate.id.notin_(selected),
+                        Candidate.cv_scoring_status == "queued",
+                    )
+                    .values(
+                        cv_scoring_status=case((Candidate.cv_scoring.isnot(None), "scored"), else_=None),
+                        cv_scoring_attempts=0,
+                        cv_scoring_error=None,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.execute(
+                    update(Candidate)
+                    .where(Candidate.id.in_(selected))
+                    .values(cv_scoring_status="queued", cv_scoring_attempts=0, cv_scoring_error=None)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+            progress.total = len(selected) + len(unreadable)
+            progress.failed = len(unreadable)
+
+            # Best candidates first; each chunk is read in its own short session
+            # so no transaction stays open while the scorer runs
+            for start in range(0, len(selected), RESCORE_BATCH_SIZE):
+                chunk = selected[start:start + RESCORE_BATCH_SIZE]
+                async with self._session_factory() as session:
+                    result = await session.execute(
+                        select(Candidate.id, Candidate.resume_path).where(Candidate.id.in_(chunk))
+                    )
+                    batch = result.all()
+                outcomes = await self._score_batch(batch, job)
+                await self._write_batch(outcomes, progress.job_hash)
+                progress.scored += sum(1 for _, scores, _, _ in outcomes if scores)
+                progress.failed += sum(1 for _, scores, _, _ in outcomes if not scores)
+
+            async with self._session_factory() as session:
+                await refresh_screening_ranks(session, request_id)
+                await session.commit()
+                request = await session.get(RecruitmentRequest, request_id)
+                current = request and requisition_hash(
+                    request.position_title, request.job_description, request.required_skills
+                )
+            progress.status = "completed"
+            logger.info(
+                f"Re-scored requisition {request_id}: {progress.scored} scored, {progress.failed} failed"
+            )
+            if current is not None and current != progress.job_hash:
+                # Edited while this job ran; score the new version too
+                logger.info(f"Requisition {request_id} changed during re-scoring; re-running")
+                self.start(request_id)
+        except Exception as e:
+            progress.status = "failed"
+            progress.error = str(e)
+            logger.error(f"Re-scoring requisition {request_id} failed: {e}")
+        finally:
+            progress.finished_at = get_utc_now()
+
+    async def _score_batch(
+        self, rows, job: Tuple[str, Optional[str], Optional[List[str]]]
+    ) -> List[Tuple[int, Optional[Dict[str, Any]], int, Optional[str]]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def score(candidate_id: int, resume_path: str):
+            async with semaphore:
+                for attempt in range(1, self.max_attempts + 1):
+                    try:
+                        return candidate_id, await score_resume(self._session_factory, resume_path, *job), attempt, None
+                    except CVScoringRetryableError as e:
+                        if attempt == self.max_attempts:
+                            return candidate_id, None, attempt, f"{e} (gave up after {attempt} attempts)"
+                        rate_limit_gate.pause(e.retry_after)
+                        await asyncio.sleep(retry_delay(attempt, e.retry_after, self.base_delay))
+                    except (CVScoringError, OSError) as e:
+                        return candidate_id, None, attempt, str(e)
+
+        return await asyncio.gather(*(score(row.id, row.resume_path) for row in rows))
+
+    async def _write_batch(self, outcomes, job_hash: str) -> None:
+        """One bulk UPDATE for the scored rows and one for the failures."""
+        now = datetime.utcnow()  # Candidate.cv_scored_at is a naive timestamp
+        scored = [
+            {
+                "id": candidate_id,
+                "cv_scoring": scores["cv_scoring"],
+                "skills_match_score": scores["skills_match_score"],
+                "education_level": scores["education_level"],
+                "years_experience": scores["years_experience"],
+                "current_position": scores["current_position"],
+                "cv_scored_at": now,
+                "cv_scored_job_hash": job_hash,
+                "cv_scoring_status": "scored",
+                "cv_scoring_attempts": attempts,
+                "cv_scoring_error": None,
+            }
+            for candidate_id, scores, attempts, _ in outcomes if scores
+        ]
+        failed = [
+            {
+                "id": candidate_id,
+                "cv_scoring_status": "failed",
+                "cv_scoring_attempts": attempts,
+                "cv_scoring_error": error[:500],
+            }
+            for candidate_id, scores, attempts, error in outcomes if not scores
+        ]
+        async with self._session_factory() as session:
+            if scored:
+                await session.execute(update(Candidate), scored)
+            if failed:
+                await session.execute(update(Candidate), failed)
+            await session.commit()
+
+
+requisition_rescorer = RequisitionRescorer()
@@ -0,0 +1,332 @@
+"""Background CV scoring queue.
+
+Uploads only save the CV and enqueue the candidate; a fixed pool of worker
+tasks extracts the text and calls the scoring backend (both through
+:mod:`app.services.cv_cache`, so repeat CVs cost nothing), so request latency no
+longer includes the LLM round-trip and bulk uploads cannot exhaust the
+provider. Progress is persisted on ``Candidate.cv_scoring_status``
+(queued -> scoring -> scored | failed) for the polling endpoint.
+
+Every gunicorn worker runs its own queue, so a job is only run after an
+atomic ``queued -> scoring`` claim on the candidate row; whoever loses the
+claim drops the job. On start, each queue re-enqueues queued jobs and
+``scoring`` jobs whose lease (``cv_scoring_started_at``) has expired, i.e.
+jobs left behind by a process that died mid-run.
+
+Transient failures are retried with exponential backoff. A rate-limit
+response pauses *all* workers until the provider's ``Retry-After`` has
+passed, instead of each worker hammering the API on its own schedule.
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.time import get_utc_now
+from app.database import AsyncSessionLocal
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_cache import cv_cache, requisition_hash
+from app.services.cv_scoring_service import CVScoringRetryableError, analyze_cv, save_cv_scores
+
+logger = get_logger(__name__)
+
+BASE_RETRY_DELAY = 2.0
+MAX_RETRY_DELAY = 120.0
+
+
+
+class CVScoringError(Exception):
+    """Permanent scoring failure recorded on the candidate."""
+
+
+@dataclass
+class CVScoringJob:
+    candidate_id: int
+    attempts: int = 0
+
+
+class RateLimitGate:
+    """Shared pause so every scorer backs off together after a 429."""
+
+    def __init__(self) -> None:
+        self._paused_until = 0.0
+
+    def pause(self, seconds: Optional[float]) -> None:
+        if seconds:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def wait(self) -> None:
+        wait = self._paused_until - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+rate_limit_gate = RateLimitGate()
+
+
+def retry_delay(attempts: int, retry_after: Optional[float], base_delay: float = BASE_RETRY_DELAY) -> float:
+    """Exponential backoff with jitter, never shorter than the provider's hint."""
+    delay = min(base_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+    delay += random.uniform(0, delay / 4)
+    return max(delay, retry_after or 0.0)
+
+
+async def score_resume(
+    session_factory: Callable[[], AsyncSession],
+    resume_path: Optional[str],
+    job_title: str,
+    job_description: Optional[str],
+    required_skills: Optional[List[str]],
+) -> Dict[str, Any]:
+    """
+    Extract and score one stored CV through :data:`cv_cache`.
+
+    Raises :class:`CVScoringError` (permanent), ``OSError`` (file missing) or
+    :class:`CVScoringRetryableError` (transient provider failure).
+    """
+    if not resume_path:
+        raise CVScoringError("No CV on file")
+    content = await asyncio.to_thread(Path(resume_path).read_bytes)
+    job_description = job_description or f"Position: {job_title}"
+    required_skills = required_skills or []
+    async with session_factory() as session:
+        cv_text = await cv_cache.extract_text(session, content, resume_path)
+        key = None
+        scores = None
+        if cv_text and len(cv_text.strip()) >= 50:
+            key = cv_cache.score_key(cv_text, job_title, job_description, required_skills)
+            scores = await cv_cache.get_scores(session, key) if key else None
+        await session.commit()
+    if not cv_text or len(cv_text.strip()) < 50:
+        raise CVScoringError("Insufficient text extracted from CV")
+    if scores is not None:
+        return scores
+
+    await rate_limit_gate.wait()
+    scores = await analyze_cv(
+        cv_text=cv_text,
+        job_title=job_title,
+        job_description=job_description,
+        required_skills=required_skills,
+    )
+    if not scores:
+        raise CVScoringError("CV scoring unavailable or returned an invalid response")
+    async with session_factory() as session:
+        await cv_cache.put_scores(session, key, scores)
+        await session.commit()
+    return scores
+
+
+class CVScoringQueue:
+    """Bounded worker pool that scores candidate CVs in the background."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        base_delay: float = BASE_RETRY_DELAY,
+        lease_seconds: Optional[float] = None,
+    ) -> None:
+        settings = get_settings()
+        self._session_factory = session_factory
+        self.workers = workers or settings.cv_scoring_workers
+        self.max_attempts = max_attempts or settings.cv_scoring_max_attempts
+        self.base_delay = base_delay
+        self.lease_seconds = lease_seconds or settings.cv_scoring_lease_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retry_handles: List[asyncio.TimerHandle] = []
+        self._pending = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def _claimable(self):
+        """Jobs waiting for a worker: queued, or scoring with an expired lease."""
+        cutoff = get_utc_now() - timedelta(seconds=self.lease_seconds)
+        return or_(
+            Candidate.cv_scoring_status == "queued",
+            and_(
+                Candidate.cv_scoring_status == "scoring",
+                or_(Candidate.cv_scoring_started_at.is_(None), Candidate.cv_scoring_started_at < cutoff),
+            ),
+        )
+
+    async def start(self, recover: bool = True) -> None:
+        """Start the workers and re-enqueue jobs a previous process left behind."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        if recover:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(Candidate.id, Candidate.cv_scoring_attempts).where(self._claimable())
+                )
+                jobs = [CVScoringJob(candidate_id, attempts) for candidate_id, attempts in result.all()]
+            for job in jobs:
+                self._put(job)
+            if jobs:
+                logger.info(f"Recovered {len(jobs)} pending CV scoring jobs")
+
+    async def stop(self) -> None:
+        for handle in self._retry_handles:
+            handle.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._retry_handles = []
+
+    async def enqueue(self, session: AsyncSession, candidate_ids: List[int]) -> None:
+        """
+        Mark candidates queued and hand them to the workers.
+
+        Commits the session first so workers (separate sessions) see the CV
+        and the status.
+        """
+        if not candidate_ids:
+            return
+        await session.execute(
+            update(Candidate)
+            .where(Candidate.id.in_(candidate_ids))
+            .values(cv_scoring_status="queued", cv_scoring_attempts=0, cv_scoring_error=None)
+        )
+        await session.commit()
+        if not self.running:
+            await self.start(recover=False)
+        for candidate_id in candidate_ids:
+            self._put(CVScoringJob(candidate_id))
+
+    async def wait_idle(self) -> None:
+        """Wait until every enqueued job has finished (including retries)."""
+        if self._idle is not None:
+            await self._idle.wait()
+
+    def _put(self, job: CVScoringJob) -> None:
+        self._pending += 1
+        self._idle.clear()
+        self._queue.put_nowait(job)
+
+    def _done(self) -> None:
+        self._pending -= 1
+        if self._pending <= 0:
+            self._pending = 0
+            self._idle.set()
+
+    def _retry_later(self, job: CVScoringJob, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        handle = loop.call_later(delay, self._queue.put_nowait, job)
+        self._retry_handles = [h for h in self._retry_handles if not h.cancelled()] + [handle]
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if await self._run(job):
+                    self._done()
+            except Exception as e:  # never let a worker die
+                logger.error(f"CV scoring worker {number} crashed on candidate {job.candidate_id}: {e}")
+                self._done()
+            finally:
+                self._queue.task_done()
+
+    async def _claim(self, session: AsyncSession, job: CVScoringJob) -> bool:
+        """Atomically move the job to ``scoring``; False if another worker owns it."""
+        result = await session.execute(
+            update(Candidate)
+            .where(Candidate.id == job.candidate_id, self._claimable())
+            .values(
+                cv_scoring_status="scoring",
+                cv_scoring_attempts=job.attempts,
+                cv_scoring_error=None,
+                cv_scoring_started_at=get_utc_now(),
+            )
+            .returning(Candidate.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.first() is not None
+        await session.commit()
+        return claimed
+
+    async def _run(self, job: CVScoringJob) -> bool:
+        """Run one attempt; returns False when the job was rescheduled."""
+        job.attempts += 1
+        async with self._session_factory() as session:
+            if not await self._claim(session, job):
+                return True
+            result = await session.execute(
+                select(
+                    Candidate.resume_path,
+                    RecruitmentRequest.position_title,
+                    RecruitmentRequest.job_description,
+                    RecruitmentRequest.required_skills,
+                )
+                .join(RecruitmentRequest, RecruitmentRequest.id == Candidate.recruitment_request_id)
+                .where(Candidate.id == job.candidate_id)
+            )
+            row = result.one_or_none()
+            if row is None:
+                return True
+
+        try:
+            scores = await score_resume(
+                self._session_factory, row.resume_path,
+                row.position_title, row.job_description, row.required_skills,
+            )
+        except CVScoringRetryableError as e:
+            if job.attempts >= self.max_attempts:
+                await self._fail(job, f"{e} (gave up after {job.attempts} attempts)")
+                return True
+            delay = retry_delay(job.attempts, e.retry_after, self.base_delay)
+            rate_limit_gate.pause(e.retry_after)
+            logger.warning(f"CV scoring for candidate {job.candidate_id} retrying in {delay:.1f}s: {e}")
+            async with self._session_factory() as session:
+                await self._set_status(session, job, "queued", error=str(e))
+            self._retry_later(job, delay)
+            return False
+        except (CVScoringError, OSError) as e:
+            await self._fail(job, str(e))
+            return True
+
+        async with self._session_factory() as session:
+            await save_cv_scores(
+                session, job.candidate_id, scores,
+                requisition_hash(row.position_title, row.job_description, row.required_skills),
+            )
+            await session.commit()
+        logger.info(f"Scored candidate {job.candidate_id}: {scores['cv_scoring']}%")
+        return True
+
+    async def _fail(self, job: CVScoringJob, error: str) -> None:
+        logger.warning(f"CV scoring failed for candidate {job.candidate_id}: {error}")
+        async with self._session_factory() as session:
+            await self._set_status(session, job, "failed", error=error)
+
+    @staticmethod
+    async def _set_status(
+        session: AsyncSession, job: CVScoringJob, status: str, error: Optional[str] = None
+    ) -> None:
+        await session.execute(
+            update(Candidate)
+            .where(Candidate.id == job.candidate_id)
+            .values(cv_scoring_status=status, cv_scoring_attempts=job.attempts, cv_scoring_error=error and error[:500])
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+
+cv_scoring_queue = CVScoringQueue()
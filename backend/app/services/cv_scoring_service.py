@@ -1,58 +1,102 @@
 """
 CV Scoring Service - Automatically analyzes CVs and LinkedIn profiles 
 to generate candidate scores against job requirements.
+
+The scoring backend is pluggable: the OpenAI backend uses the async client so
+scoring never blocks the event loop, and the stub backend
+(``CV_SCORING_BACKEND=stub``) scores deterministically from keyword overlap
+for local development and tests. Transient provider failures (rate limits,
+timeouts, 5xx) raise :class:`CVScoringRetryableError` so the background queue
+in :mod:`app.services.cv_scoring_queue` can back off and retry.
 """
 import os
 import json
 import logging
+import re
 from datetime import datetime
-from typing import Optional, Dict, Any
-from openai import OpenAI
+from typing import Optional, Dict, Any, Protocol
+
+from openai import (
+    APIConnectionError, APITimeoutError, AsyncOpenAI, InternalServerError, RateLimitError
+)
+
+from app.core.config import get_settings
+from app.services.document_extraction import document_extractor
 
 logger = logging.getLogger(__name__)
 
-_client: Optional[OpenAI] = None
+CV_SCORING_MODEL = "gpt-4o-mini"
+
+# Only the head of the CV and job description is sent for scoring
+CV_TEXT_LIMIT = 4000
+JOB_DESCRIPTION_LIMIT = 2000
+
+
+class CVScoringRetryableError(Exception):
+    """Transient scoring failure; ``retry_after`` is the provider's hint in seconds."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
-def _build_openai_client() -> Optional[OpenAI]:
+class CVScorer(Protocol):
+    """Scoring backend: returns the raw result dict before normalization."""
+
+    model: str
+
+    async def analyze(
+        self, cv_text: str, job_title: str, job_description: str, required_skills: list[str]
+    ) -> Optional[Dict[str, Any]]:
+        ...
+
+
+def _build_openai_client() -> Optional[AsyncOpenAI]:
     """Construct a client only when credentials are present."""
     api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("AI_INTEGRATIONS_OPENAI_API_KEY")
     if not api_key:
         logger.warning("OpenAI API key missing; CV scoring disabled.")
         return None
 
-    return OpenAI(
+    return AsyncOpenAI(
         api_key=api_key,
         base_url=os.environ.get("OPENAI_BASE_URL") or os.environ.get("AI_INTEGRATIONS_OPENAI_BASE_URL"),
     )
 
-async def analyze_cv(
-    cv_text: str,
-    job_title: str,
-    job_description: str,
-    required_skills: list[str] = None
-) -> Optional[Dict[str, Any]]:
-    """
-    Analyze CV text against job requirements and return scoring.
-    
-    Returns:
-        Dict with cv_scoring, skills_match_score, education_level, 
-        years_experience, current_position or None when disabled/failed.
-    """
-    required_skills = required_skills or []
-    skills_list = ", ".join(required_skills) if required_skills else "Not specified"
-    
-    prompt = f"""Analyze this CV/resume against the job requirements and provide a JSON response.
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class OpenAICVScorer:
+    """Scores CVs with a chat completion on the async OpenAI client."""
+
+    model = CV_SCORING_MODEL
+
+    def __init__(self, client: AsyncOpenAI):
+        self.client = client
+
+    async def analyze(
+        self, cv_text: str, job_title: str, job_description: str, required_skills: list[str]
+    ) -> Optional[Dict[str, Any]]:
+        skills_list = ", ".join(required_skills) if required_skills else "Not specified"
+        
+        prompt = f"""Analyze this CV/resume against the job requirements and provide a JSON response.
 
 JOB TITLE: {job_title}
 
 JOB DESCRIPTION:
-{job_description[:2000]}
+{job_description[:JOB_DESCRIPTION_LIMIT]}
 
 REQUIRED SKILLS: {skills_list}
 
 CV/RESUME TEXT:
-{cv_text[:4000]}
+{cv_text[:CV_TEXT_LIMIT]}
 
 Provide a JSON response with these exact fields:
 {{
@@ -68,28 +112,26 @@ Provide a JSON response with these exact fields:
 Be accurate and fair in scoring. A score of 80+ indicates excellent match, 60-79 good match, 40-59 moderate match, below 40 poor match.
 Return ONLY valid JSON, no additional text."""
 
-    global _client
-    client = _client or _build_openai_client()
-    _client = client
-    if client is None:
-        return None
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert HR recruiter analyzing CVs. Provide accurate, unbiased assessments in JSON format only."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert HR recruiter analyzing CVs. Provide accurate, unbiased assessments in JSON format only."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.3,
+                max_tokens=500
+            )
+        except RateLimitError as e:
+            raise CVScoringRetryableError("CV scoring rate limited", _retry_after(e)) from e
+        except (APITimeoutError, APIConnectionError, InternalServerError) as e:
+            raise CVScoringRetryableError(f"CV scoring provider unavailable: {e}") from e
         
         result_text = response.choices[0].message.content.strip()
         
@@ -100,7 +142,95 @@ Return ONLY valid JSON, no additional text."""
                 result_text = result_text[4:]
         result_text = result_text.strip()
         
-        result = json.loads(result_text)
+        return json.loads(result_text)
+
+
+_EDUCATION_KEYWORDS = [
+    ("PhD", re.compile(r"\b(ph\.?d|doctorate)\b", re.I)),
+    ("Master's Degree", re.compile(r"\b(master|m\.?sc|mba)\b", re.I)),
+    ("Bachelor's Degree", re.compile(r"\b(bachelor|b\.?sc|b\.?eng|b\.?a)\b", re.I)),
+    ("Diploma", re.compile(r"\bdiploma\b", re.I)),
+    ("High School", re.compile(r"\bhigh school\b", re.I)),
+]
+_YEARS_PATTERN = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)", re.I)
+_WORD_PATTERN = re.compile(r"[a-z][a-z0-9+#.]{3,}")
+
+
+class StubCVScorer:
+    """Deterministic offline scorer based on keyword overlap (no network)."""
+
+    model = "stub"
+
+    async def analyze(
+        self, cv_text: str, job_title: str, job_description: str, required_skills: list[str]
+    ) -> Optional[Dict[str, Any]]:
+        text = cv_text[:CV_TEXT_LIMIT].lower()
+        words = set(_WORD_PATTERN.findall(text))
+
+        matched = [skill for skill in required_skills if skill.lower() in text]
+        skills_score = round(100 * len(matched) / len(required_skills)) if required_skills else 50
+
+        job_words = set(_WORD_PATTERN.findall(f"{job_title} {job_description[:JOB_DESCRIPTION_LIMIT]}".lower()))
+        overlap = len(job_words & words) / len(job_words) if job_words else 0.0
+        education = next((label for label, pattern in _EDUCATION_KEYWORDS if pattern.search(text)), "Not Specified")
+        years = max((int(y) for y in _YEARS_PATTERN.findall(text)), default=0)
+
+        return {
+            "cv_scoring": round(0.6 * skills_score + 40 * overlap),
+            "skills_match_score": skills_score,
+            "education_level": education,
+            "years_experience": years,
+            "current_position": "",
+            "key_strengths": matched[:3],
+            "areas_of_concern": [s for s in required_skills if s not in matched][:2],
+        }
+
+
+_scorer: Optional[CVScorer] = None
+
+
+def get_cv_scorer() -> Optional[CVScorer]:
+    """The configured scoring backend, or None when scoring is disabled."""
+    global _scorer
+    if _scorer is None:
+        if get_settings().cv_scoring_backend == "stub":
+            _scorer = StubCVScorer()
+        else:
+            client = _build_openai_client()
+            _scorer = OpenAICVScorer(client) if client else None
+    return _scorer
+
+
+def set_cv_scorer(scorer: Optional[CVScorer]) -> None:
+    """Swap the scoring backend (local testing); None re-reads settings."""
+    global _scorer
+    _scorer = scorer
+
+
+async def analyze_cv(
+    cv_text: str,
+    job_title: str,
+    job_description: str,
+    required_skills: list[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Analyze CV text against job requirements and return scoring.
+    
+    Returns:
+        Dict with cv_scoring, skills_match_score, education_level, 
+        years_experience, current_position or None when disabled/failed.
+    
+    Raises:
+        CVScoringRetryableError: on rate limits and transient provider errors.
+    """
+    scorer = get_cv_scorer()
+    if scorer is None:
+        return None
+
+    try:
+        result = await scorer.analyze(cv_text, job_title, job_description, required_skills or [])
+        if not result:
+            return None
         
         # Validate and normalize values
         return {
@@ -113,6 +243,8 @@ Return ONLY valid JSON, no additional text."""
             "areas_of_concern": result.get("areas_of_concern", [])
         }
         
+    except CVScoringRetryableError:
+        raise
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse CV analysis response: {e}")
         return None
@@ -122,52 +254,39 @@ Return ONLY valid JSON, no additional text."""
 
 
 async def extract_text_from_pdf(pdf_content: bytes) -> Optional[str]:
-    """Extract text from PDF content."""
-    try:
-        import io
-        # Try using pdfplumber if available
-        try:
-            import pdfplumber
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-                return text
-        except ImportError:
-            pass
-        
-        # Fallback to PyPDF2
-        try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(io.BytesIO(pdf_content))
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() or ""
-            return text
-        except ImportError:
-            pass
-            
-        logger.warning("No PDF library available for text extraction")
-        return None
-    except Exception as e:
-        logger.error(f"PDF extraction failed: {e}")
-        return None
+    """Extract text from PDF content in the extraction process pool."""
+    return await document_extractor.extract(pdf_content, "cv.pdf")
 
 
 async def extract_text_from_docx(docx_content: bytes) -> Optional[str]:
-    """Extract text from DOCX content."""
-    try:
-        import io
-        from docx import Document
-        doc = Document(io.BytesIO(docx_content))
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text
-    except ImportError:
-        logger.warning("python-docx not available for DOCX extraction")
-        return None
-    except Exception as e:
-        logger.error(f"DOCX extraction failed: {e}")
-        return None
+    """Extract text from DOCX content in the extraction process pool."""
+    return await document_extractor.extract(docx_content, "cv.docx")
+
+
+async def extract_cv_text(cv_content: bytes, filename: str) -> Optional[str]:
+    """Extract up to the configured character budget; None for unsupported types."""
+    return await document_extractor.extract(cv_content, filename)
+
+
+async def save_cv_scores(
+    db_session, candidate_id: int, scores: Dict[str, Any], job_hash: Optional[str] = None
+) -> None:
+    """Write scores made against job version ``job_hash`` and mark scoring done (no commit)."""
+    from sqlalchemy import update
+    from app.models.recruitment import Candidate
+    
+    stmt = update(Candidate).where(Candidate.id == candidate_id).values(
+        cv_scoring=scores["cv_scoring"],
+        skills_match_score=scores["skills_match_score"],
+        education_level=scores["education_level"],
+        years_experience=scores["years_experience"],
+        current_position=scores["current_position"],
+        cv_scored_at=datetime.utcnow(),
+        cv_scored_job_hash=job_hash,
+        cv_scoring_status="scored",
+        cv_scoring_error=None
+    )
+    await db_session.execute(stmt)
 
 
 async def score_candidate_cv(
@@ -182,6 +301,9 @@ async def score_candidate_cv(
     """
     Score a candidate's CV and update their record.
     
+    Runs inline; request handlers should enqueue on
+    :data:`app.services.cv_scoring_queue.cv_scoring_queue` instead.
+    
     Args:
         candidate_id: ID of the candidate
         cv_content: Raw file content
@@ -194,45 +316,35 @@ async def score_candidate_cv(
     Returns:
         Scoring results or None on failure
     """
-    # Extract text based on file type
-    ext = filename.lower().split('.')[-1]
+    from app.services.cv_cache import cv_cache, requisition_hash
     
-    if ext == 'pdf':
-        cv_text = await extract_text_from_pdf(cv_content)
-    elif ext in ('docx', 'doc'):
-        cv_text = await extract_text_from_docx(cv_content)
-    elif ext == 'txt':
-        cv_text = cv_content.decode('utf-8', errors='ignore')
+    if db_session:
+        cv_text = await cv_cache.extract_text(db_session, cv_content, filename)
     else:
-        logger.warning(f"Unsupported file type: {ext}")
-        return None
+        cv_text = await extract_cv_text(cv_content, filename)
     
     if not cv_text or len(cv_text.strip()) < 50:
         logger.warning("Insufficient text extracted from CV")
         return None
     
-    # Analyze the CV
-    scores = await analyze_cv(
-        cv_text=cv_text,
-        job_title=job_title,
-        job_description=job_description,
-        required_skills=required_skills
-    )
+    key = cv_cache.score_key(cv_text, job_title, job_description, required_skills) if db_session else None
+    scores = await cv_cache.get_scores(db_session, key) if key else None
+    
+    if scores is None:
+        # Analyze the CV
+        scores = await analyze_cv(
+            cv_text=cv_text,
+            job_title=job_title,
+            job_description=job_description,
+            required_skills=required_skills
+        )
+        if scores and key:
+            await cv_cache.put_scores(db_session, key, scores)
     
     if scores and db_session:
-        # Update candidate record
-        from sqlalchemy import update
-        from app.models.recruitment import Candidate
-        
-        stmt = update(Candidate).where(Candidate.id == candidate_id).values(
-            cv_scoring=scores["cv_scoring"],
-            skills_match_score=scores["skills_match_score"],
-            education_level=scores["education_level"],
-            years_experience=scores["years_experience"],
-            current_position=scores["current_position"],
-            cv_scored_at=datetime.utcnow()
+        await save_cv_scores(
+            db_session, candidate_id, scores, requisition_hash(job_title, job_description, required_skills)
         )
-        await db_session.execute(stmt)
         await db_session.commit()
         
         logger.info(f"Updated candidate {candidate_id} with CV scores: {scores['cv_scoring']}%")
@@ -0,0 +1,233 @@
+"""CV text extraction in a process pool.
+
+PDF and DOCX parsing is CPU-bound and can take seconds on long documents, so
+it runs in a small :class:`~concurrent.futures.ProcessPoolExecutor` instead
+of the event loop (or a thread holding the GIL). Each document gets a page
+and character budget: scoring only reads the first ``CV_TEXT_LIMIT``
+characters, so extraction stops as soon as the budget is met instead of
+walking a 200-page portfolio. A document that exceeds the timeout has its
+pool torn down (the only way to stop a stuck worker process) and is
+reported as failed; other documents that were in that pool are retried once
+on a fresh one. Per-type timing is kept in :attr:`DocumentExtractor.metrics`.
+"""
+import asyncio
+import io
+import logging
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+EXTRACTORS_BY_EXTENSION = {"pdf": "pdf", "docx": "docx", "doc": "docx", "txt": "txt"}
+
+
+def document_kind(filename: str) -> Optional[str]:
+    return EXTRACTORS_BY_EXTENSION.get(filename.lower().rsplit(".", 1)[-1])
+
+
+def _collect(parts: List[str], text: str, size: int) -> int:
+    if text:
+        parts.append(text)
+        size += len(text) + 1
+    return size
+
+
+def _pdf_pages(content: bytes):
+    """Yield page texts lazily with pdfplumber, falling back to PyPDF2."""
+    try:
+        import pdfplumber
+    except ImportError:
+        pdfplumber = None
+    if pdfplumber is not None:
+        with pdfplumber.open(io.BytesIO(content)) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+        return
+
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
+        logger.warning("No PDF library available for text extraction")
+        return
+    for page in PdfReader(io.BytesIO(content)).pages:
+        yield page.extract_text() or ""
+
+
+def _docx_paragraphs(content: bytes):
+    try:
+        from docx import Document
+    except ImportError:
+        logger.warning("python-docx not available for DOCX extraction")
+        return
+    for para in Document(io.BytesIO(content)).paragraphs:
+        yield para.text
+
+
+def extract_document(kind: str, content: bytes, max_pages: int, max_chars: int) -> Tuple[Optional[str], int, bool]:
+    """
+    Extract up to ``max_chars`` characters (blocking; runs in the pool).
+
+    Returns ``(text, pdf_pages_read, truncated)``; text is None when
+    nothing could be extracted. Parts are collected in a list and joined
+    once rather than concatenated per page.
+    """
+    parts: List[str] = []
+    size = 0
+    pages = 0
+    truncated = False
+    try:
+        if kind == "txt":
+            # UTF-8 is at most 4 bytes per character
+            text = content[: max_chars * 4].decode("utf-8", errors="ignore")
+            return text[:max_chars], 1, len(text) > max_chars or len(content) > max_chars * 4
+
+        units = _pdf_pages(content) if kind == "pdf" else _docx_paragraphs(content)
+        for text in units:
+            if kind == "pdf":
+                if pages >= max_pages:
+                    truncated = True
+                    break
+                pages += 1
+            size = _collect(parts, text, size)
+            if size >= max_chars:
+                truncated = True
+                break
+    except Exception as e:
+        logger.error(f"{kind.upper()} extraction failed: {e}")
+        return None, pages, truncated
+
+    if not parts:
+        return None, pages, truncated
+    return "\n".join(parts)[:max_chars], pages, truncated
+
+
+@dataclass
+class ExtractionStats:
+    documents: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    truncated: int = 0
+    pages: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.documents if self.documents else 0.0
+
+    def record(self, seconds: float, pages: int = 0, truncated: bool = False, ok: bool = True) -> None:
+        self.documents += 1
+        self.pages += pages
+        self.truncated += int(truncated)
+        self.failures += int(not ok)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+class DocumentExtractor:
+    """Bounded, time-limited text extraction for uploaded CVs."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ) -> None:
+        settings = get_settings()
+        self.workers = workers or settings.cv_extract_workers
+        self.timeout = timeout or settings.cv_extract_timeout_seconds
+        self.max_pages = max_pages or settings.cv_extract_max_pages
+        self.max_chars = max_chars or settings.cv_extract_max_chars
+        self.metrics: Dict[str, ExtractionStats] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Pools torn down by a timeout, as opposed to a crashed worker
+        self._terminated: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _stats(self, kind: str) -> ExtractionStats:
+        return self.metrics.setdefault(kind, ExtractionStats())
+
+    async def extract(self, content: bytes, filename: str) -> Optional[str]:
+        """Extracted text within the budget; None if unsupported, empty or timed out."""
+        kind = document_kind(filename)
+        if kind is None:
+            logger.warning(f"Unsupported file type: {filename}")
+            return None
+
+        started = time.perf_counter()
+        if kind == "txt":
+            text, pages, truncated = extract_document(kind, content, self.max_pages, self.max_chars)
+            self._stats(kind).record(time.perf_counter() - started, pages, truncated, ok=bool(text))
+            return text
+
+        loop = asyncio.get_running_loop()
+        for attempt in (1, 2):
+            pool = self._get_pool()
+            try:
+                text, pages, truncated = await asyncio.wait_for(
+                    loop.run_in_executor(pool, extract_document, kind, content, self.max_pages, self.max_chars),
+                    timeout=self.timeout,
+                )
+                break
+            except asyncio.TimeoutError:
+                self._terminate_pool(pool)
+                stats = self._stats(kind)
+                stats.timeouts += 1
+                stats.record(time.perf_counter() - started, ok=False)
+                logger.warning(f"Extraction of {filename} timed out after {self.timeout}s")
+                return None
+            except BrokenProcessPool as e:
+                if self._pool is pool:
+                    self._pool = None
+                if attempt == 1 and pool in self._terminated:
+                    # Collateral of another document's timeout, not this one's fault
+                    logger.info(f"Retrying extraction of {filename} after its pool was stopped")
+                    continue
+                self._stats(kind).record(time.perf_counter() - started, ok=False)
+                logger.error(f"Extraction pool failed on {filename}: {e}")
+                return None
+
+        self._stats(kind).record(time.perf_counter() - started, pages, truncated, ok=bool(text))
+        return text
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "timeout_seconds": self.timeout,
+            "max_pages": self.max_pages,
+            "max_chars": self.max_chars,
+            "by_type": {
+                kind: {**asdict(stats), "avg_seconds": stats.avg_seconds}
+                for kind, stats in self.metrics.items()
+            },
+        }
+
+    def _terminate_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Kill the pool's processes; a running extraction cannot be cancelled otherwise."""
+        if self._pool is pool:
+            self._pool = None
+        self._terminated.add(pool)
+        processes = list((pool._processes or {}).values())
+        # Queued work is not cancelled: it fails with BrokenProcessPool and is retried
+        pool.shutdown(wait=False)
+        for process in processes:
+            process.terminate()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+document_extractor = DocumentExtractor()
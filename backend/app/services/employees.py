@@ -1,5 +1,6 @@
 import csv
 import hashlib
+import json
 import secrets
 from datetime import date, datetime, timedelta, timezone
 from io import StringIO
@@ -12,6 +13,7 @@ import logging
 
 from app.core.config import get_settings
 from app.models.employee import Employee
+from app.models.compliance_expiry import EMPLOYEE_EXPIRY_FIELDS
 from app.repositories.employees import EmployeeRepository
 from app.schemas.employee import (
     EmployeeCreate,
@@ -22,6 +24,18 @@ from app.schemas.employee import (
     LoginResponse,
     PasswordChangeRequest,
 )
+from app.services.compliance_expiries import compliance_expiry_service
+from app.services.org_hierarchy import invalidate_org_hierarchy
+
+
+# Fields accepted by the JSON bulk update endpoint
+BULK_UPDATE_FIELDS = (
+    "department",
+    "job_title",
+    "line_manager_name",
+    "employment_status",
+    "location",
+)
 
 
 def hash_password(password: str) -> str:
@@ -204,6 +218,7 @@ class EmployeeService:
             department=data.department,
             role=data.role,
         )
+        await invalidate_org_hierarchy(session)
         await session.commit()
         
         return EmployeeResponse.model_validate(employee)
@@ -388,6 +403,8 @@ class EmployeeService:
             except Exception as e:
                 errors.append(f"Row {row_num}: {str(e)}")
 
+        if created:
+            await invalidate_org_hierarchy(session)
         await session.commit()
 
         return {
@@ -489,6 +506,8 @@ class EmployeeService:
                 detail="Employee not found",
             )
         result = await self._repo.deactivate(session, employee_id)
+        await compliance_expiry_service.invalidate(session)
+        await invalidate_org_hierarchy(session)
         await session.commit()
         return result
 
@@ -529,6 +548,11 @@ class EmployeeService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Employee not found after update",
             )
+        if update_data.keys() & {field for field, _ in EMPLOYEE_EXPIRY_FIELDS}:
+            await compliance_expiry_service.sync_employee(session, employee)
+        elif "is_active" in update_data:
+            await compliance_expiry_service.invalidate(session)
+        await invalidate_org_hierarchy(session)
         await session.commit()
         await session.refresh(employee)
         return employee
@@ -539,7 +563,8 @@ class EmployeeService:
         """
         Get employees with expiring compliance documents.
         
-        Returns alerts grouped by urgency:
+        Served from the ``compliance_expiries`` projection, which also covers
+        employee document expiries. Returns alerts grouped by urgency:
         - expired: Already expired
         - days_7: Expiring within 7 days
         - days_30: Expiring within 30 days
@@ -552,50 +577,7 @@ class EmployeeService:
                 detail="Days must be between 1 and 365",
             )
         
-        today = date.today()
-        employees = await self._repo.get_all_active_for_compliance(session)
-        
-        alerts = {
-            'expired': [],
-            'days_7': [],
-            'days_30': [],
-            'days_custom': []
-        }
-        
-        # Fields to check for expiry
-        compliance_fields = [
-            ('visa_expiry_date', 'Visa'),
-            ('emirates_id_expiry', 'Emirates ID'),
-            ('medical_fitness_expiry', 'Medical Fitness'),
-            ('iloe_expiry', 'ILOE'),
-            ('contract_end_date', 'Contract'),
-        ]
-        
-        for emp in employees:
-            for field_name, label in compliance_fields:
-                expiry = getattr(emp, field_name, None)
-                if expiry:
-                    days_until = (expiry - today).days
-                    
-                    alert = {
-                        'employee_id': emp.employee_id,
-                        'name': emp.name,
-                        'document_type': label,
-                        'expiry_date': expiry.isoformat(),
-                        'days_remaining': days_until
-                    }
-                    
-                    if days_until < 0:
-                        alert['days_overdue'] = abs(days_until)
-                        alerts['expired'].append(alert)
-                    elif days_until <= 7:
-                        alerts['days_7'].append(alert)
-                    elif days_until <= 30:
-                        alerts['days_30'].append(alert)
-                    elif days_until <= days:
-                        alerts['days_custom'].append(alert)
-        
-        return alerts
+        return await compliance_expiry_service.get_alerts(session, days)
 
     async def bulk_update_from_csv(
         self, session: AsyncSession, file: UploadFile, update_layer: str
@@ -758,6 +740,8 @@ class EmployeeService:
             except Exception as e:
                 errors.append(f"Row {row_num}: {str(e)}")
         
+        if updated:
+            await invalidate_org_hierarchy(session)
         await session.commit()
         
         return {
@@ -871,59 +855,88 @@ class EmployeeService:
         return output.getvalue()
 
     async def bulk_update_employees(
-        self, session: AsyncSession, updates: List[dict]
+        self, session: AsyncSession, updates: List[dict], actor_id: Optional[str] = None
     ) -> dict:
         """
         Bulk update multiple employees at once.
         
         Updates format: [{"employee_id": "EMP001", "department": "IT", "manager": "MGR001", "status": "Active"}]
+        
+        Matching rows are resolved in one SELECT and the changes are sent as a
+        single executemany UPDATE by primary key; the audit trail is written as
+        a single batch insert, so a reorg touching hundreds of employees costs a
+        handful of statements instead of one per row.
         """
-        updated = 0
-        not_found = 0
+        from sqlalchemy import insert
+        from app.models.audit_log import AuditLog
+
         errors = []
-        
+        results = []
+        # Merge duplicate IDs so the last value for each field wins
+        changes: dict[str, dict] = {}
+
         for item in updates:
-            try:
-                employee_id = item.get("employee_id")
-                if not employee_id:
-                    errors.append("Missing employee_id in update")
+            employee_id = item.get("employee_id") if isinstance(item, dict) else None
+            if not employee_id:
+                errors.append("Missing employee_id in update")
+                continue
+
+            change = changes.setdefault(employee_id, {"employee_id": employee_id})
+            for field in BULK_UPDATE_FIELDS:
+                if field not in item:
                     continue
-                
-                employee = await self._repo.get_by_employee_id(session, employee_id)
-                if not employee:
-                    not_found += 1
-                    errors.append(f"Employee {employee_id} not found")
+                # Department and job title are never cleared by a bulk update
+                if field in ("department", "job_title") and not item[field]:
                     continue
-                
-                # Update allowed fields
-                if "department" in item and item["department"]:
-                    employee.department = item["department"]
-                if "job_title" in item and item["job_title"]:
-                    employee.job_title = item["job_title"]
-                if "line_manager_name" in item:
-                    employee.line_manager_name = item["line_manager_name"]
-                if "employment_status" in item:
-                    employee.employment_status = item["employment_status"]
-                if "location" in item:
-                    employee.location = item["location"]
-                
-                updated += 1
-                
-            except Exception as e:
-                # Log the failure without including potentially sensitive employee identifiers
-                logging.exception(
-                    "Failed to bulk update an employee record"
-                )
-                errors.append(
-                    "Employee update failed"
-                )
-        
+                change[field] = item[field]
+
+        try:
+            matched = await self._repo.bulk_update(
+                session, list(changes.values()), BULK_UPDATE_FIELDS
+            )
+        except Exception:
+            # Log the failure without including potentially sensitive employee identifiers
+            logging.exception("Failed to bulk update employee records")
+            await session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Employee bulk update failed",
+            )
+
+        matched_ids = {employee_id: id for id, employee_id in matched}
+        for employee_id, change in changes.items():
+            if employee_id in matched_ids:
+                results.append({"employee_id": employee_id, "status": "updated"})
+            else:
+                results.append({"employee_id": employee_id, "status": "not_found"})
+                errors.append(f"Employee {employee_id} not found")
+
+        if matched:
+            await session.execute(
+                insert(AuditLog),
+                [
+                    {
+                        "action": "EMPLOYEE_BULK_UPDATE",
+                        "entity": "employees",
+                        "entity_id": matched_ids[employee_id],
+                        "user_id": actor_id,
+                        "timestamp": datetime.now(timezone.utc),
+                        "details": json.dumps(
+                            {k: v for k, v in changes[employee_id].items() if k != "employee_id"}
+                        ),
+                    }
+                    for employee_id in matched_ids
+                ],
+            )
+            await invalidate_org_hierarchy(session)
+
         await session.commit()
         
         return {
-            "updated": updated,
-            "not_found": not_found,
+            "updated": len(matched_ids),
+            "not_found": len(changes) - len(matched_ids),
             "errors": errors[:20],
+            "results": results,
         }
 
     async def search_employees(
@@ -0,0 +1,306 @@
+"""In-memory geofence matching.
+
+Active geofences are loaded once per ``geofences`` cache version into NumPy
+arrays plus a uniform lat/lon grid (``CELL_DEGREES`` cells) that maps each
+cell to the geofences whose radius reaches it. A single-point match only
+measures the handful of fences registered in the point's cell, so clock-in
+validation stays flat as sites are added; nearest-site and nearby queries use
+a vectorized bounding-box prefilter and haversine over the arrays. Batches of
+points (e.g. a month of clock-ins) are matched block-wise as a points x
+geofences distance matrix. Geofence writes call :func:`invalidate_geofences`.
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import VersionedCache, bump_cache_version
+from app.models.geofence import Geofence
+
+GEOFENCES_CACHE_SCOPE = "geofences"
+
+EARTH_RADIUS_METERS = 6371000.0
+# Same sphere as haversine_many, so bounding boxes never undershoot its distances
+METERS_PER_DEGREE = EARTH_RADIUS_METERS * math.pi / 180
+
+# ~5.5 km cells; fences spanning more cells than the cap are checked for every point
+CELL_DEGREES = 0.05
+MAX_CELLS_PER_FENCE = 100
+
+# Points per distance-matrix block in batch matching
+BATCH_BLOCK_SIZE = 2048
+
+
+async def invalidate_geofences(session: AsyncSession) -> None:
+    """Bump the geofence version (call in the same transaction as the write)."""
+    await bump_cache_version(session, GEOFENCES_CACHE_SCOPE)
+
+
+def haversine_many(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Vectorized great-circle distance in meters (degrees in, broadcasting)."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lon2) - np.radians(lon1)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+@dataclass(frozen=True)
+class GeofenceInfo:
+    """Detached copy of an active Geofence row."""
+
+    id: int
+    name: str
+    latitude: Decimal
+    longitude: Decimal
+    radius_meters: int
+    validation_required: bool
+
+
+@dataclass(frozen=True)
+class GeofenceMatch:
+    """Result of matching one point: the fence it is inside (nearest one if
+    several overlap) and the nearest fence overall with its distance."""
+
+    matched: Optional[GeofenceInfo]
+    nearest: Optional[GeofenceInfo]
+    distance_meters: float
+
+
+def _cell(lat: float, lon: float) -> Tuple[int, int]:
+    return math.floor(lat / CELL_DEGREES), math.floor(lon / CELL_DEGREES)
+
+
+def _bbox(lat: float, radius_meters: float) -> Tuple[float, float]:
+    """Half-height and half-width in degrees of a box containing the radius."""
+    dlat = radius_meters / METERS_PER_DEGREE
+    # The circle is widest on its poleward edge, not at the center latitude
+    widest = min(abs(lat) + dlat, 89.0)
+    dlon = radius_meters / (METERS_PER_DEGREE * max(math.cos(math.radians(widest)), 0.01))
+    return dlat, dlon
+
+
+def _cells_within(lat: float, lon: float, radius_meters: float) -> Optional[List[Tuple[int, int]]]:
+    """
+    Grid cells overlapping the radius' bounding box plus a one-cell margin,
+    or None if over the cap. The margin keeps points on a cell boundary (or
+    off by float rounding) registered with every fence that reaches them.
+    """
+    dlat, dlon = _bbox(lat, radius_meters)
+    lat_lo, lon_lo = _cell(lat - dlat, lon - dlon)
+    lat_hi, lon_hi = _cell(lat + dlat, lon + dlon)
+    lat_lo, lon_lo, lat_hi, lon_hi = lat_lo - 1, lon_lo - 1, lat_hi + 1, lon_hi + 1
+    if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > MAX_CELLS_PER_FENCE:
+        return None
+    return [(i, j) for i in range(lat_lo, lat_hi + 1) for j in range(lon_lo, lon_hi + 1)]
+
+
+class GeofenceIndex:
+    """Immutable geofence arrays with a grid index over their coverage."""
+
+    def __init__(self, geofences: Iterable[GeofenceInfo]) -> None:
+        self._fences: List[GeofenceInfo] = sorted(geofences, key=lambda g: g.id)
+        self._by_name: Dict[str, int] = {g.name: k for k, g in enumerate(self._fences)}
+        self._lat = np.array([float(g.latitude) for g in self._fences], dtype=np.float64)
+        self._lon = np.array([float(g.longitude) for g in self._fences], dtype=np.float64)
+        self._radius = np.array([g.radius_meters for g in self._fences], dtype=np.float64)
+
+        grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        wide: List[int] = []
+        for k, fence in enumerate(self._fences):
+            cells = _cells_within(self._lat[k], self._lon[k], fence.radius_meters)
+            if cells is None:
+                wide.append(k)
+                continue
+            for cell in cells:
+                grid[cell].append(k)
+        self._grid = {cell: np.array(sorted(ks + wide), dtype=np.intp) for cell, ks in grid.items()}
+        self._wide_only = np.array(wide, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self._fences)
+
+    def get(self, name: str) -> Optional[GeofenceInfo]:
+        k = self._by_name.get(name)
+        return self._fences[k] if k is not None else None
+
+    def match(self, lat: float, lon: float) -> GeofenceMatch:
+        """Match one point using only the fences registered in its grid cell."""
+        if not self._fences:
+            return GeofenceMatch(None, None, float("inf"))
+
+        candidates = self._grid.get(_cell(lat, lon), self._wide_only)
+        if len(candidates):
+            distances = haversine_many(lat, lon, self._lat[candidates], self._lon[candidates])
+            inside = distances <= self._radius[candidates]
+            if inside.any():
+                best = int(np.argmin(np.where(inside, distances, np.inf)))
+                fence = self._fences[candidates[best]]
+                return GeofenceMatch(fence, fence, float(distances[best]))
+
+        distances = haversine_many(lat, lon, self._lat, self._lon)
+        nearest = int(np.argmin(distances))
+        return GeofenceMatch(None, self._fences[nearest], float(distances[nearest]))
+
+    def distance_to(self, lat: float, lon: float, fence: GeofenceInfo) -> float:
+        k = self._by_name[fence.name]
+        return float(haversine_many(lat, lon, self._lat[k], self._lon[k]))
+
+    def nearby(self, lat: float, lon: float, max_distance: float) -> List[Tuple[GeofenceInfo, float]]:
+        """Fences whose center is within ``max_distance`` meters, nearest first."""
+        if not self._fences:
+            return []
+        # Bounding-box prefilter, then exact distances for the survivors only
+        dlat, dlon = _bbox(lat, max_distance)
+        candidates = np.nonzero(
+            (np.abs(self._lat - lat) <= dlat) & (np.abs(self._lon - lon) <= dlon)
+        )[0]
+        distances = haversine_many(lat, lon, self._lat[candidates], self._lon[candidates])
+        order = np.argsort(distances, kind="stable")
+        return [
+            (self._fences[candidates[i]], float(distances[i]))
+            for i in order
+            if distances[i] <= max_distance
+        ]
+
+    def match_many(
+        self, lats: Sequence[float], lons: Sequence[float]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Match many points at once.
+
+        Returns ``(matched, nearest, distance)`` arrays: indexes into the
+        index's fences (``-1`` = no match) and the distance to the matched or
+        nearest fence in meters.
+        """
+        lat_arr = np.asarray(lats, dtype=np.float64)
+        lon_arr = np.asarray(lons, dtype=np.float64)
+        n = len(lat_arr)
+        matched = np.full(n, -1, dtype=np.intp)
+        nearest = np.full(n, -1, dtype=np.intp)
+        distance = np.full(n, np.inf)
+        if not self._fences or not n:
+            return matched, nearest, distance
+
+        for start in range(0, n, BATCH_BLOCK_SIZE):
+            block = slice(start, start + BATCH_BLOCK_SIZE)
+            d = haversine_many(
+                lat_arr[block, None], lon_arr[block, None], self._lat[None, :], self._lon[None, :]
+            )
+            inside = np.where(d <= self._radius[None, :], d, np.inf)
+            best_inside = np.argmin(inside, axis=1)
+            has_match = np.isfinite(inside[np.arange(len(d)), best_inside])
+            closest = np.argmin(d, axis=1)
+            chosen = np.where(has_match, best_inside, closest)
+            matched[block] = np.where(has_match, best_inside, -1)
+            nearest[block] = chosen
+            distance[block] = d[np.arange(len(d)), chosen]
+        return matched, nearest, distance
+
+    def fence(self, k: int) -> Optional[GeofenceInfo]:
+        return self._fences[k] if k >= 0 else None
+
+
+def validation_result(
+    index: GeofenceIndex,
+    lat: float,
+    lon: float,
+    work_location: Optional[str] = None,
+    match: Optional[GeofenceMatch] = None,
+) -> dict:
+    """Build the geofence validation payload for one point.
+
+    ``match`` may be supplied from :meth:`GeofenceIndex.match_many` so batch
+    callers share the same rules as single validation.
+    """
+    if not len(index):
+        return {
+            "is_valid": True,
+            "message": "No geofences configured",
+            "validation_required": False
+        }
+
+    # If work_location specified, check that specific geofence
+    expected = index.get(work_location) if work_location else None
+    if expected:
+        distance = index.distance_to(lat, lon, expected)
+        is_within = distance <= expected.radius_meters
+        return {
+            "is_valid": is_within or not expected.validation_required,
+            "work_location": work_location,
+            "matched_geofence": expected.name if is_within else None,
+            "distance_meters": distance,
+            "within_radius": is_within,
+            "validation_required": expected.validation_required,
+            "message": f"Within {expected.name}" if is_within else f"{distance:.0f}m from {expected.name}"
+        }
+
+    match = match or index.match(lat, lon)
+    if match.matched:
+        return {
+            "is_valid": True,
+            "work_location": match.matched.name,
+            "matched_geofence": match.matched.name,
+            "distance_meters": match.distance_meters,
+            "within_radius": True,
+            "validation_required": match.matched.validation_required,
+            "message": f"Location detected: {match.matched.name}"
+        }
+
+    nearest = match.nearest
+    return {
+        "is_valid": False,
+        "work_location": None,
+        "matched_geofence": None,
+        "distance_meters": match.distance_meters,
+        "within_radius": False,
+        "validation_required": nearest.validation_required if nearest else False,
+        "message": f"Outside all geofences. Nearest: {nearest.name} ({match.distance_meters:.0f}m)" if nearest else "No geofences found"
+    }
+
+
+def validate_many(
+    index: GeofenceIndex, points: Sequence[Tuple[float, float, Optional[str]]]
+) -> List[dict]:
+    """Validate ``(lat, lon, work_location)`` points with one vectorized match."""
+    if not points:
+        return []
+    matched, nearest, distance = index.match_many([p[0] for p in points], [p[1] for p in points])
+    return [
+        validation_result(
+            index, lat, lon, work_location,
+            match=GeofenceMatch(index.fence(matched[k]), index.fence(nearest[k]), float(distance[k])),
+        )
+        for k, (lat, lon, work_location) in enumerate(points)
+    ]
+
+
+async def _load_geofence_index(session: AsyncSession) -> GeofenceIndex:
+    result = await session.execute(
+        select(
+            Geofence.id,
+            Geofence.name,
+            Geofence.latitude,
+            Geofence.longitude,
+            Geofence.radius_meters,
+            Geofence.validation_required,
+        ).where(Geofence.is_active == True)
+    )
+    return GeofenceIndex(GeofenceInfo(*row) for row in result.all())
+
+
+_index_cache: VersionedCache[GeofenceIndex] = VersionedCache(
+    GEOFENCES_CACHE_SCOPE, _load_geofence_index
+)
+
+
+async def get_geofence_index(session: AsyncSession) -> GeofenceIndex:
+    """Return the geofence index for the current geofence version."""
+    return await _index_cache.get(session)
@@ -0,0 +1,236 @@
+"""Bulk leave approval and rejection.
+
+A batch of decisions is validated with a handful of set-based queries (the
+requests themselves, the affected balances and the employees' already
+approved leave), then applied in one transaction: two ``UPDATE ... WHERE id
+IN`` statements for the status changes, one batched ledger post for the
+balance moves and one in-app digest notification per employee instead of an
+email per request.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.employee import Employee
+from app.models.leave import LeaveBalance, LeaveRequest
+from app.repositories.notification import NotificationRepository
+from app.services.calendar_snapshots import invalidate_leave_calendar
+from app.services.leave_coverage import LeaveInterval, leave_index
+from app.services.leave_ledger import BALANCE_EXEMPT_LEAVE_TYPES, leave_ledger_service
+from app.services.org_hierarchy import get_org_hierarchy
+
+logger = get_logger(__name__)
+
+
+def _label(leave_type: str) -> str:
+    return leave_type.replace("_", " ").title() + " leave"
+
+
+class LeaveApprovalService:
+    """Validates and applies batches of leave decisions."""
+
+    async def bulk_decide(
+        self,
+        session: AsyncSession,
+        request_ids: Sequence[int],
+        approved: bool,
+        actor: Employee,
+        rejection_reason: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Approve or reject many pending requests in one transaction.
+
+        Returns one ``{"request_id", "status", "detail"}`` result per requested ID.
+        Requests that fail validation are skipped; the rest are committed together.
+        """
+        ids = list(dict.fromkeys(request_ids))
+        result = await session.execute(
+            select(LeaveRequest)
+            .where(LeaveRequest.id.in_(ids))
+            .order_by(LeaveRequest.start_date, LeaveRequest.id)
+            .with_for_update()
+        )
+        requests = {r.id: r for r in result.scalars().all()}
+
+        hierarchy = await get_org_hierarchy(session) if actor.role == "manager" else None
+        outcomes: Dict[int, Tuple[str, Optional[str]]] = {}
+        candidates: List[LeaveRequest] = []
+        for request_id in ids:
+            request = requests.get(request_id)
+            if request is None:
+                outcomes[request_id] = ("not_found", "Leave request not found")
+            elif request.status != "pending":
+                outcomes[request_id] = ("skipped", f"Leave request is {request.status}")
+            elif hierarchy is not None and getattr(
+                hierarchy.get(request.employee_id), "line_manager_id", None
+            ) != actor.id:
+                outcomes[request_id] = ("forbidden", "You can only approve leave for your direct reports")
+            else:
+                candidates.append(request)
+
+        if approved:
+            candidates = await self._validate_approvals(session, candidates, outcomes)
+
+        now = datetime.now(timezone.utc)
+        decided_ids = [r.id for r in candidates]
+        if decided_ids:
+            values = (
+                {"status": "approved", "approved_by": actor.id, "approved_at": now}
+                if approved
+                else {"status": "rejected", "rejection_reason": rejection_reason}
+            )
+            await session.execute(
+                update(LeaveRequest)
+                .where(LeaveRequest.id.in_(decided_ids), LeaveRequest.status == "pending")
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+
+            entries = []
+            for request in candidates:
+                if approved:
+                    entries.extend(leave_ledger_service.approval_entries(request, actor.id))
+                else:
+                    entries.extend(leave_ledger_service.release_entries(
+                        request, "pending", actor.id, note="Rejected"
+                    ))
+            await leave_ledger_service.post_many(session, entries)
+
+            if approved:
+                await invalidate_leave_calendar(session)
+            await self._notify(session, candidates, approved, rejection_reason)
+            await session.commit()
+
+            status_label = "approved" if approved else "rejected"
+            for request_id in decided_ids:
+                outcomes[request_id] = (status_label, None)
+            logger.info(
+                "Bulk leave decision applied",
+                extra={"decision": status_label, "count": len(decided_ids), "actor_id": actor.id},
+            )
+
+        return [
+            {"request_id": request_id, "status": outcomes[request_id][0], "detail": outcomes[request_id][1]}
+            for request_id in ids
+        ]
+
+    async def _validate_approvals(
+        self,
+        session: AsyncSession,
+        candidates: List[LeaveRequest],
+        outcomes: Dict[int, Tuple[str, Optional[str]]],
+    ) -> List[LeaveRequest]:
+        """Drop requests that exceed the balance or overlap approved leave."""
+        if not candidates:
+            return []
+        employee_ids = {r.employee_id for r in candidates}
+
+        # Balances for every (employee, type, year) touched by the batch
+        keys = {(r.employee_id, r.leave_type, r.start_date.year) for r in candidates}
+        result = await session.execute(
+            select(LeaveBalance).where(
+                LeaveBalance.employee_id.in_(employee_ids),
+                LeaveBalance.year.in_({year for _, _, year in keys}),
+            )
+        )
+        # Pending days the batch itself reserved; everything else in pending is
+        # held by requests outside the batch and stays unavailable
+        in_batch: Dict[Tuple[int, str, int], Decimal] = defaultdict(Decimal)
+        for r in candidates:
+            in_batch[(r.employee_id, r.leave_type, r.start_date.year)] += r.total_days
+        headroom: Dict[Tuple[int, str, int], Decimal] = {}
+        for b in result.scalars().all():
+            key = (b.employee_id, b.leave_type, b.year)
+            reserved_elsewhere = max(b.pending - in_batch[key], Decimal("0"))
+            headroom[key] = b.entitlement + b.carried_forward + b.adjustment - b.used - reserved_elsewhere
+
+        # Approved leave of the same employees across the batch's date span
+        result = await session.execute(
+            select(
+                LeaveRequest.id, LeaveRequest.employee_id, LeaveRequest.start_date, LeaveRequest.end_date
+            ).where(
+                and_(
+                    LeaveRequest.employee_id.in_(employee_ids),
+                    LeaveRequest.status == "approved",
+                    LeaveRequest.start_date <= max(r.end_date for r in candidates),
+                    LeaveRequest.end_date >= min(r.start_date for r in candidates),
+                )
+            )
+        )
+        booked: Dict[int, List[LeaveInterval]] = defaultdict(list)
+        for request_id, employee_id, start, end in result.all():
+            booked[employee_id].append(LeaveInterval(start, end, request_id, employee_id))
+        indexes = {employee_id: leave_index(items) for employee_id, items in booked.items()}
+
+        accepted: List[LeaveRequest] = []
+        accepted_by_employee: Dict[int, List[LeaveRequest]] = defaultdict(list)
+        for request in candidates:
+            employee_id = request.employee_id
+            index = indexes.get(employee_id)
+            if index is not None and index.overlapping(request.start_date, request.end_date):
+                outcomes[request.id] = ("conflict", "Overlaps with already approved leave")
+                continue
+            if any(
+                other.start_date <= request.end_date and request.start_date <= other.end_date
+                for other in accepted_by_employee[employee_id]
+            ):
+                outcomes[request.id] = ("conflict", "Overlaps with another request in this batch")
+                continue
+
+            if request.leave_type not in BALANCE_EXEMPT_LEAVE_TYPES:
+                key = (employee_id, request.leave_type, request.start_date.year)
+                available = headroom.get(key, Decimal("0"))
+                if available < request.total_days:
+                    outcomes[request.id] = (
+                        "insufficient_balance",
+                        f"Insufficient {_label(request.leave_type).lower()} balance. Available: {available} days, "
+                        f"Requested: {request.total_days} days",
+                    )
+                    continue
+                headroom[key] = available - request.total_days
+
+            accepted.append(request)
+            accepted_by_employee[employee_id].append(request)
+        return accepted
+
+    async def _notify(
+        self,
+        session: AsyncSession,
+        decided: List[LeaveRequest],
+        approved: bool,
+        rejection_reason: Optional[str],
+    ) -> None:
+        """Stage one digest notification per employee."""
+        by_employee: Dict[int, List[LeaveRequest]] = defaultdict(list)
+        for request in decided:
+            by_employee[request.employee_id].append(request)
+
+        verb = "approved" if approved else "rejected"
+        repo = NotificationRepository()
+        for employee_id, items in by_employee.items():
+            lines = [
+                f"- {_label(r.leave_type)}: "
+                f"{r.start_date.isoformat()} to {r.end_date.isoformat()} ({r.total_days} days)"
+                for r in items
+            ]
+            message = f"The following leave {'request was' if len(items) == 1 else 'requests were'} {verb}:\n"
+            message += "\n".join(lines)
+            if not approved and rejection_reason:
+                message += f"\nReason: {rejection_reason}"
+            await repo.add(
+                session,
+                user_id=str(employee_id),
+                title=f"Leave {verb}" if len(items) == 1 else f"{len(items)} leave requests {verb}",
+                message=message,
+                type="leave_decision",
+                link="/leave",
+                is_read=False,
+            )
+
+
+leave_approval_service = LeaveApprovalService()
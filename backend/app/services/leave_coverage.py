@@ -0,0 +1,228 @@
+"""Leave overlap and team coverage engine.
+
+Leaves are loaded once per query into an interval index (sorted by start
+date with a running max end). Overlap lookups are bisects; coverage for a date range is
+a sweep line over start/end events (difference arrays), so per-day absence
+counts for every department come out of a single pass instead of expanding
+each leave day by day.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.interval_index import IntervalIndex
+from app.models.employee import Employee
+from app.models.leave import LeaveRequest
+from app.services.work_calendar import get_work_calendar
+
+UNASSIGNED_DEPARTMENT = "Unassigned"
+DEFAULT_ABSENCE_THRESHOLD = 30.0  # % of a department off on one day
+MAX_COVERAGE_DAYS = 366
+
+
+@dataclass(frozen=True)
+class LeaveInterval:
+    """One leave request as an inclusive date interval."""
+
+    start: date
+    end: date
+    request_id: int
+    employee_id: int
+    department: str = UNASSIGNED_DEPARTMENT
+    leave_type: str = ""
+    status: str = "approved"
+    is_half_day: bool = False
+
+    @property
+    def weight(self) -> float:
+        return 0.5 if self.is_half_day else 1.0
+
+
+def leave_index(intervals: Iterable[LeaveInterval]) -> IntervalIndex[LeaveInterval]:
+    """Index leave intervals by their inclusive start/end dates."""
+    return IntervalIndex(intervals, attrgetter("start", "end"))
+
+
+def compute_coverage(
+    index: IntervalIndex[LeaveInterval],
+    start: date,
+    end: date,
+    headcounts: Dict[str, int],
+    threshold: float = DEFAULT_ABSENCE_THRESHOLD,
+    calendar=None,
+) -> dict:
+    """
+    Sweep-line coverage for [start, end].
+
+    Returns per-day totals, per-department absence percentages and conflict
+    warnings (days where a department's absence reaches ``threshold`` %).
+    """
+    days = (end - start).days + 1
+    departments = sorted(set(headcounts) | {i.department for i in index})
+    diff: Dict[str, List[float]] = {d: [0.0] * (days + 1) for d in departments}
+
+    for interval in index.overlapping(start, end):
+        lo = (max(interval.start, start) - start).days
+        hi = (min(interval.end, end) - start).days + 1
+        row = diff[interval.department]
+        row[lo] += interval.weight
+        row[hi] -= interval.weight
+
+    total_headcount = sum(headcounts.values())
+    running = {d: 0.0 for d in departments}
+    result_days: List[dict] = []
+    conflicts: List[dict] = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        per_department = {}
+        off_total = 0.0
+        for department in departments:
+            running[department] += diff[department][offset]
+            off = round(running[department], 1)
+            if not off and not headcounts.get(department):
+                continue
+            headcount = headcounts.get(department, 0)
+            pct = round(off / headcount * 100, 1) if headcount else 0.0
+            per_department[department] = {
+                "headcount": headcount,
+                "on_leave": off,
+                "absence_pct": pct,
+            }
+            off_total += off
+            if off and pct >= threshold:
+                conflicts.append({
+                    "date": day,
+                    "department": department,
+                    "on_leave": off,
+                    "headcount": headcount,
+                    "absence_pct": pct,
+                    "message": f"{department}: {off:g} of {headcount} off ({pct:g}%)",
+                })
+        result_days.append({
+            "date": day,
+            "is_weekend": bool(calendar and calendar.is_weekend(day)),
+            "is_holiday": bool(calendar and calendar.is_holiday(day)),
+            "headcount": total_headcount,
+            "on_leave": round(off_total, 1),
+            "available": round(total_headcount - off_total, 1),
+            "departments": per_department,
+        })
+
+    return {
+        "start_date": start,
+        "end_date": end,
+        "threshold_pct": threshold,
+        "days": result_days,
+        "conflicts": conflicts,
+    }
+
+
+class LeaveCoverageService:
+    """Loads leaves into an IntervalIndex and answers overlap/coverage queries."""
+
+    async def load_index(
+        self,
+        session: AsyncSession,
+        start: date,
+        end: date,
+        statuses: Sequence[str] = ("approved",),
+        employee_ids: Optional[Sequence[int]] = None,
+        department: Optional[str] = None,
+        exclude_request_id: Optional[int] = None,
+    ) -> IntervalIndex[LeaveInterval]:
+        query = (
+            select(
+                LeaveRequest.start_date,
+                LeaveRequest.end_date,
+                LeaveRequest.id,
+                LeaveRequest.employee_id,
+                Employee.department,
+                LeaveRequest.leave_type,
+                LeaveRequest.status,
+                LeaveRequest.is_half_day,
+            )
+            .join(Employee, Employee.id == LeaveRequest.employee_id)
+            .where(
+                and_(
+                    LeaveRequest.status.in_(statuses),
+                    LeaveRequest.start_date <= end,
+                    LeaveRequest.end_date >= start,
+                )
+            )
+        )
+        if employee_ids is not None:
+            query = query.where(LeaveRequest.employee_id.in_(employee_ids))
+        if department:
+            query = query.where(Employee.department == department)
+        if exclude_request_id:
+            query = query.where(LeaveRequest.id != exclude_request_id)
+
+        result = await session.execute(query.order_by(LeaveRequest.id))
+        return leave_index(
+            LeaveInterval(
+                start=row[0], end=row[1], request_id=row[2], employee_id=row[3],
+                department=row[4] or UNASSIGNED_DEPARTMENT, leave_type=row[5],
+                status=row[6], is_half_day=bool(row[7]),
+            )
+            for row in result.all()
+        )
+
+    async def headcounts(
+        self,
+        session: AsyncSession,
+        employee_ids: Optional[Sequence[int]] = None,
+        department: Optional[str] = None,
+    ) -> Dict[str, int]:
+        query = (
+            select(Employee.department, func.count(Employee.id))
+            .where(Employee.is_active == True)
+            .group_by(Employee.department)
+        )
+        if employee_ids is not None:
+            query = query.where(Employee.id.in_(employee_ids))
+        if department:
+            query = query.where(Employee.department == department)
+        result = await session.execute(query)
+        counts: Dict[str, int] = {}
+        for dept, count in result.all():
+            key = dept or UNASSIGNED_DEPARTMENT
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    async def coverage(
+        self,
+        session: AsyncSession,
+        start: date,
+        end: date,
+        employee_ids: Optional[Sequence[int]] = None,
+        department: Optional[str] = None,
+        include_pending: bool = False,
+        threshold: float = DEFAULT_ABSENCE_THRESHOLD,
+    ) -> dict:
+        statuses = ("approved", "pending") if include_pending else ("approved",)
+        index = await self.load_index(session, start, end, statuses, employee_ids, department)
+        headcounts = await self.headcounts(session, employee_ids, department)
+        calendar = await get_work_calendar(session)
+        return compute_coverage(index, start, end, headcounts, threshold, calendar)
+
+    async def find_overlaps(
+        self,
+        session: AsyncSession,
+        employee_id: int,
+        start: date,
+        end: date,
+        exclude_request_id: Optional[int] = None,
+    ) -> List[LeaveInterval]:
+        """Pending/approved leaves of one employee that intersect [start, end]."""
+        index = await self.load_index(
+            session, start, end, ("pending", "approved"),
+            employee_ids=[employee_id], exclude_request_id=exclude_request_id,
+        )
+        return index.overlapping(start, end)
+
+
+leave_coverage_service = LeaveCoverageService()
@@ -0,0 +1,358 @@
+"""Leave ledger: append-only entries with materialized LeaveBalance totals.
+
+Every balance movement (accrual, pending reservation, approval, rejection,
+cancellation, carry-forward, HR adjustment) is posted here in
+the caller's transaction. The matching LeaveBalance column is updated with an
+atomic ``col = col + delta`` so concurrent requests never lose an update, and
+balance reads remain single-row lookups.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, extract, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.cache_version import CacheVersion
+from app.models.employee import Employee
+from app.models.leave import LEDGER_ENTRY_TYPES, LeaveBalance, LeaveLedgerEntry, LeaveRequest
+
+logger = get_logger(__name__)
+
+# Leave types that never touch a balance
+BALANCE_EXEMPT_LEAVE_TYPES = {"unpaid"}
+
+# Only annual leave carries over at year end
+CARRY_FORWARD_LEAVE_TYPES = {"annual"}
+
+# cache_versions row recording that balances were converted to ledger semantics
+LEDGER_CONVERSION_MARKER = "leave_ledger_conversion"
+
+_BALANCE_COLUMNS = ("entitlement", "carried_forward", "adjustment", "pending", "used")
+
+
+class LeaveLedgerService:
+    """Posts ledger entries and keeps LeaveBalance rows in step."""
+
+    async def post(
+        self,
+        session: AsyncSession,
+        employee_id: int,
+        leave_type: str,
+        year: int,
+        entry_type: str,
+        days: Decimal,
+        leave_request_id: Optional[int] = None,
+        note: Optional[str] = None,
+        created_by: Optional[int] = None,
+    ) -> None:
+        """Append one entry and apply it to the balance (no commit)."""
+        await self.post_many(session, [
+            self.entry(employee_id, leave_type, year, entry_type, days, leave_request_id, note, created_by)
+        ])
+
+    @staticmethod
+    def entry(
+        employee_id: int,
+        leave_type: str,
+        year: int,
+        entry_type: str,
+        days: Decimal,
+        leave_request_id: Optional[int] = None,
+        note: Optional[str] = None,
+        created_by: Optional[int] = None,
+    ) -> dict:
+        """Build a ledger row for :meth:`post_many`."""
+        if entry_type not in LEDGER_ENTRY_TYPES:
+            raise ValueError(f"Unknown ledger entry type: {entry_type}")
+        return {
+            "employee_id": employee_id,
+            "year": year,
+            "leave_type": leave_type,
+            "entry_type": entry_type,
+            "days": days,
+            "leave_request_id": leave_request_id,
+            "note": note,
+            "created_by": created_by,
+        }
+
+    async def post_many(self, session: AsyncSession, entries: Iterable[dict]) -> None:
+        """
+        Append entries with one batched insert and apply them to the balances (no commit).
+
+        Deltas are summed per balance row, so each affected LeaveBalance gets a
+        single atomic ``UPDATE`` however many entries touch it.
+        """
+        rows = [e for e in entries if e["days"]]
+        if not rows:
+            return
+        await session.execute(insert(LeaveLedgerEntry), rows)
+
+        deltas: Dict[Tuple[int, str, int], Dict[str, Decimal]] = defaultdict(
+            lambda: defaultdict(lambda: Decimal("0"))
+        )
+        for row in rows:
+            key = (row["employee_id"], row["leave_type"], row["year"])
+            deltas[key][LEDGER_ENTRY_TYPES[row["entry_type"]]] += row["days"]
+
+        for (employee_id, leave_type, year), columns in deltas.items():
+            result = await session.execute(
+                update(LeaveBalance)
+                .where(
+                    and_(
+                        LeaveBalance.employee_id == employee_id,
+                        LeaveBalance.leave_type == leave_type,
+                        LeaveBalance.year == year,
+                    )
+                )
+                .values({name: getattr(LeaveBalance, name) + days for name, days in columns.items()})
+                .execution_options(synchronize_session=False)
+            )
+            if not result.rowcount:
+                values = {name: Decimal("0") for name in _BALANCE_COLUMNS}
+                values.update(columns)
+                await session.execute(
+                    insert(LeaveBalance).values(
+                        employee_id=employee_id,
+                        leave_type=leave_type,
+                        year=year,
+                        offset_days_used=Decimal("0"),
+                        **values,
+                    )
+                )
+
+    # ---- Leave request lifecycle ----
+
+    def _tracked(self, request: LeaveRequest) -> bool:
+        return request.leave_type not in BALANCE_EXEMPT_LEAVE_TYPES
+
+    async def request_submitted(
+        self, session: AsyncSession, request: LeaveRequest
+    ) -> None:
+        """Reserve the requested days as pending (request must be flushed)."""
+        if self._tracked(request):
+            await self.post(
+                session, request.employee_id, request.leave_type, request.start_date.year,
+                "pending", request.total_days, leave_request_id=request.id,
+                created_by=request.employee_id,
+            )
+
+    def approval_entries(
+        self, request: LeaveRequest, actor_id: Optional[int] = None
+    ) -> List[dict]:
+        """Entries moving a request's reserved days from pending to used."""
+        if not self._tracked(request):
+            return []
+        year = request.start_date.year
+        return [
+            self.entry(request.employee_id, request.leave_type, year, "pending",
+                       -request.total_days, request.id, created_by=actor_id),
+            self.entry(request.employee_id, request.leave_type, year, "taken",
+                       request.total_days, request.id, created_by=actor_id),
+        ]
+
+    def release_entries(
+        self,
+        request: LeaveRequest,
+        previous_status: str,
+        actor_id: Optional[int] = None,
+        note: Optional[str] = None,
+    ) -> List[dict]:
+        """Entries giving days back after a rejection or cancellation."""
+        entry_type = {"pending": "pending", "approved": "taken"}.get(previous_status)
+        if not entry_type or not self._tracked(request):
+            return []
+        return [
+            self.entry(request.employee_id, request.leave_type, request.start_date.year,
+                       entry_type, -request.total_days, request.id, note, actor_id),
+        ]
+
+    async def request_approved(
+        self, session: AsyncSession, request: LeaveRequest, actor_id: Optional[int] = None
+    ) -> None:
+        """Move the reserved days from pending to used."""
+        await self.post_many(session, self.approval_entries(request, actor_id))
+
+    async def request_released(
+        self,
+        session: AsyncSession,
+        request: LeaveRequest,
+        previous_status: str,
+        actor_id: Optional[int] = None,
+        note: Optional[str] = None,
+    ) -> None:
+        """Give days back after a rejection or cancellation."""
+        await self.post_many(session, self.release_entries(request, previous_status, actor_id, note))
+
+    # ---- Batch jobs ----
+
+    async def rollover_year(
+        self,
+        session: AsyncSession,
+        from_year: int,
+        max_carry_forward: Optional[Decimal] = None,
+        actor_id: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Open next year's balances for every active employee in one pass.
+
+        Each (employee, leave type) balance of ``from_year`` gets a next-year
+        row with the same entitlement (accrual entry); unused annual leave is
+        carried forward, optionally capped. Pairs that already have a
+        next-year balance are left untouched, so the job is safe to re-run.
+        """
+        to_year = from_year + 1
+        result = await session.execute(
+            select(LeaveBalance)
+            .join(Employee, Employee.id == LeaveBalance.employee_id)
+            .where(LeaveBalance.year == from_year, Employee.is_active == True)
+        )
+        balances = result.scalars().all()
+
+        existing = await session.execute(
+            select(LeaveBalance.employee_id, LeaveBalance.leave_type).where(
+                LeaveBalance.year == to_year
+            )
+        )
+        already_open = set(existing.all())
+
+        balance_rows: List[dict] = []
+        ledger_rows: List[dict] = []
+        carried_total = Decimal("0")
+        for balance in balances:
+            if (balance.employee_id, balance.leave_type) in already_open:
+                continue
+            carry = Decimal("0")
+            if balance.leave_type in CARRY_FORWARD_LEAVE_TYPES:
+                carry = max(balance.available, Decimal("0"))
+                if max_carry_forward is not None:
+                    carry = min(carry, max_carry_forward)
+            balance_rows.append({
+                "employee_id": balance.employee_id,
+                "leave_type": balance.leave_type,
+                "year": to_year,
+                "entitlement": balance.entitlement,
+                "carried_forward": carry,
+                "adjustment": Decimal("0"),
+                "pending": Decimal("0"),
+                "used": Decimal("0"),
+                "offset_days_used": Decimal("0"),
+            })
+            for entry_type, days in (("accrual", balance.entitlement), ("carry_forward", carry)):
+                if days:
+                    ledger_rows.append({
+                        "employee_id": balance.employee_id,
+                        "year": to_year,
+                        "leave_type": balance.leave_type,
+                        "entry_type": entry_type,
+                        "days": days,
+                        "leave_request_id": None,
+                        "note": f"Year-end rollover from {from_year}",
+                        "created_by": actor_id,
+                    })
+            carried_total += carry
+
+        if balance_rows:
+            await session.execute(insert(LeaveBalance), balance_rows)
+        if ledger_rows:
+            await session.execute(insert(LeaveLedgerEntry), ledger_rows)
+
+        logger.info(
+            "Leave rollover complete",
+            extra={"from_year": from_year, "opened": len(balance_rows), "carried": str(carried_total)},
+        )
+        return {
+            "from_year": from_year,
+            "to_year": to_year,
+            "balances_opened": len(balance_rows),
+            "skipped": len(balances) - len(balance_rows),
+            "ledger_entries": len(ledger_rows),
+        }
+
+    async def convert_balances(self, session: AsyncSession) -> bool:
+        """
+        Switch balances to ledger semantics once; no commit.
+
+        Approved days used to be added to ``pending`` and requests awaiting
+        approval reserved nothing, so approved days move to ``used`` and
+        ``pending`` becomes the total of pending requests. The ``20261018_0026``
+        migration does the same and ``20261018_0039`` sets the marker, so this
+        only does work on deployments built by ``create_all``. Returns False
+        when the conversion has already run.
+        """
+        result = await session.execute(
+            select(CacheVersion.scope).where(CacheVersion.scope == LEDGER_CONVERSION_MARKER)
+        )
+        if result.scalar_one_or_none() is not None:
+            return False
+
+        awaiting = (
+            select(func.coalesce(func.sum(LeaveRequest.total_days), 0))
+            .where(
+                LeaveRequest.employee_id == LeaveBalance.employee_id,
+                LeaveRequest.leave_type == LeaveBalance.leave_type,
+                LeaveRequest.status == "pending",
+                extract("year", LeaveRequest.start_date) == LeaveBalance.year,
+            )
+            .scalar_subquery()
+        )
+        await session.execute(update(LeaveBalance).values(used=LeaveBalance.used + LeaveBalance.pending))
+        await session.execute(update(LeaveBalance).values(pending=awaiting))
+        await session.execute(insert(CacheVersion).values(scope=LEDGER_CONVERSION_MARKER, version=1))
+        return True
+
+    async def open_ledger(self, session: AsyncSession) -> int:
+        """
+        Seed the ledger with opening entries from existing balances (when it is empty).
+
+        Balances are taken as they stand, after :meth:`convert_balances`, so
+        re-seeding an empty ledger never moves days between balance columns
+        again.
+        """
+        result = await session.execute(select(LeaveBalance))
+        balances = result.scalars().all()
+
+        ledger_rows: List[dict] = []
+        for balance in balances:
+            for entry_type, column_name in _opening_columns():
+                days = getattr(balance, column_name)
+                if days:
+                    ledger_rows.append({
+                        "employee_id": balance.employee_id,
+                        "year": balance.year,
+                        "leave_type": balance.leave_type,
+                        "entry_type": entry_type,
+                        "days": days,
+                        "leave_request_id": None,
+                        "note": "Opening balance",
+                        "created_by": None,
+                    })
+
+        if ledger_rows:
+            await session.execute(insert(LeaveLedgerEntry), ledger_rows)
+        return len(ledger_rows)
+
+    async def history(
+        self, session: AsyncSession, employee_id: int, year: int, leave_type: Optional[str] = None
+    ) -> List[LeaveLedgerEntry]:
+        query = select(LeaveLedgerEntry).where(
+            LeaveLedgerEntry.employee_id == employee_id, LeaveLedgerEntry.year == year
+        )
+        if leave_type:
+            query = query.where(LeaveLedgerEntry.leave_type == leave_type)
+        result = await session.execute(query.order_by(LeaveLedgerEntry.created_at, LeaveLedgerEntry.id))
+        return list(result.scalars().all())
+
+
+def _opening_columns() -> Iterable[Tuple[str, str]]:
+    return (
+        ("accrual", "entitlement"),
+        ("carry_forward", "carried_forward"),
+        ("adjustment", "adjustment"),
+        ("pending", "pending"),
+        ("taken", "used"),
+    )
+
+
+leave_ledger_service = LeaveLedgerService()
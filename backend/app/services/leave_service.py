@@ -16,8 +16,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.employee import Employee
 from app.models.leave import LeaveBalance, LeaveRequest, LEAVE_TYPES
-from app.models.public_holiday import PublicHoliday
 from app.services.email_service import get_email_service
+from app.services.leave_coverage import leave_coverage_service
+from app.services.work_calendar import HolidayInfo, get_work_calendar
 
 
 class LeaveValidationError(Exception):
@@ -56,28 +57,20 @@ class LeaveService:
             exclude_request_id: Optional request ID to exclude (for updates)
         
         Returns:
-            LeaveRequest if overlap exists, None otherwise
+            Earliest overlapping LeaveRequest, or None
         """
-        query = select(LeaveRequest).where(
-            and_(
-                LeaveRequest.employee_id == employee_id,
-                LeaveRequest.status.in_(["pending", "approved"]),
-                LeaveRequest.start_date <= end_date,
-                LeaveRequest.end_date >= start_date
-            )
+        overlaps = await leave_coverage_service.find_overlaps(
+            self.session, employee_id, start_date, end_date, exclude_request_id
         )
-        
-        if exclude_request_id:
-            query = query.where(LeaveRequest.id != exclude_request_id)
-        
-        result = await self.session.execute(query)
-        return result.scalar_one_or_none()
+        if not overlaps:
+            return None
+        return await self.session.get(LeaveRequest, overlaps[0].request_id)
     
     async def get_public_holidays_in_range(
         self,
         start_date: date,
         end_date: date
-    ) -> List[PublicHoliday]:
+    ) -> List[HolidayInfo]:
         """Get all public holidays within a date range.
         
         Args:
@@ -85,24 +78,18 @@ class LeaveService:
             end_date: Range end date
         
         Returns:
-            List of PublicHoliday objects
+            List of HolidayInfo objects from the in-memory work calendar
         """
-        query = select(PublicHoliday).where(
-            and_(
-                PublicHoliday.is_active == True,
-                PublicHoliday.start_date <= end_date,
-                PublicHoliday.end_date >= start_date
-            )
-        ).order_by(PublicHoliday.start_date)
-        
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+        calendar = await get_work_calendar(self.session)
+        return calendar.holidays_in_range(start_date, end_date)
     
     async def calculate_working_days(
         self,
         start_date: date,
         end_date: date,
-        exclude_holidays: bool = True
+        exclude_holidays: bool = True,
+        work_schedule: Optional[str] = None,
+        exclude_weekends: bool = False
     ) -> Decimal:
         """Calculate working days between two dates, optionally excluding public holidays.
         
@@ -110,6 +97,8 @@ class LeaveService:
             start_date: Start date
             end_date: End date
             exclude_holidays: Whether to exclude public holidays from count
+            work_schedule: Employee work schedule ("5 days" / "6 days") for the weekend pattern
+            exclude_weekends: Whether to also exclude weekend days for ``work_schedule``
         
         Returns:
             Number of working days as Decimal
@@ -117,27 +106,14 @@ class LeaveService:
         if end_date < start_date:
             raise LeaveValidationError("End date must be after start date")
         
-        # Calculate total days
-        total_days = (end_date - start_date).days + 1
-        
-        # If not excluding holidays, return total
-        if not exclude_holidays:
-            return Decimal(str(total_days))
-        
-        # Get public holidays in range
-        holidays = await self.get_public_holidays_in_range(start_date, end_date)
-        
-        # Count holiday days that overlap with leave period
-        holiday_days = 0
-        for holiday in holidays:
-            # Calculate overlap
-            overlap_start = max(start_date, holiday.start_date)
-            overlap_end = min(end_date, holiday.end_date)
-            if overlap_start <= overlap_end:
-                holiday_days += (overlap_end - overlap_start).days + 1
-        
-        working_days = total_days - holiday_days
-        return Decimal(str(max(0, working_days)))
+        calendar = await get_work_calendar(self.session)
+        if exclude_weekends:
+            days = calendar.working_days(start_date, end_date, work_schedule, exclude_holidays)
+        else:
+            days = (end_date - start_date).days + 1
+            if exclude_holidays:
+                days -= calendar.holiday_days(start_date, end_date)
+        return Decimal(str(max(0, days)))
     
     async def get_leave_balance(
         self,
@@ -229,6 +205,7 @@ class LeaveService:
         if is_half_day:
             calculated_days = Decimal("0.5")
         else:
+            # Leave is counted in calendar days
             calculated_days = await self.calculate_working_days(
                 start_date, end_date, exclude_holidays=False
             )
@@ -1,7 +1,7 @@
 from app.repositories.notification import NotificationRepository
-from app.schemas.notification import NotificationCreate, NotificationResponse
+from app.schemas.notification import NotificationCreate, NotificationPage, NotificationResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Optional
 
 class NotificationService:
     def __init__(self, repo: NotificationRepository):
@@ -11,10 +11,26 @@ class NotificationService:
         notification = await self.repo.create(session, **data.dict())
         return NotificationResponse.from_orm(notification)
 
-    async def list(self, session: AsyncSession, user_id: Optional[str] = None, unread_only: bool = False) -> List[NotificationResponse]:
-        notifications = await self.repo.list(session, user_id, unread_only)
-        return [NotificationResponse.from_orm(n) for n in notifications]
+    async def list(
+        self,
+        session: AsyncSession,
+        user_id: Optional[str] = None,
+        unread_only: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> NotificationPage:
+        notifications, next_cursor = await self.repo.list(session, user_id, unread_only, cursor, limit)
+        return NotificationPage(
+            items=[NotificationResponse.from_orm(n) for n in notifications],
+            next_cursor=next_cursor,
+        )
 
     async def mark_read(self, session: AsyncSession, notification_id: int) -> Optional[NotificationResponse]:
         notification = await self.repo.mark_read(session, notification_id)
         return NotificationResponse.from_orm(notification) if notification else None
+
+    async def mark_all_read(self, session: AsyncSession, user_id: str) -> int:
+        return await self.repo.mark_all_read(session, user_id)
+
+    async def unread_count(self, session: AsyncSession, user_id: str) -> int:
+        return await self.repo.unread_count(session, user_id)
@@ -0,0 +1,200 @@
+"""Offset-hours ledger: append-only entries with a materialized balance row.
+
+Employees on the Offset overtime policy earn time off in lieu instead of
+overtime pay. Every movement (earned from an attendance record, taken as time
+off, expired, HR adjustment) is posted here in the caller's transaction and
+applied to ``offset_hours_balances`` with an atomic ``col = col + delta``, so
+the balance endpoint is a single-row lookup and history pages are keyset
+index scans instead of a full attendance-history dump.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.core.pagination import keyset_page, split_page
+from app.core.time import get_uae_today
+from app.models.attendance import (
+    OFFSET_ENTRY_TYPES, AttendanceRecord, OffsetHoursBalance, OffsetHoursEntry
+)
+
+logger = get_logger(__name__)
+
+HOURS_PER_OFFSET_DAY = Decimal("8")
+
+# Entries that draw down the balance and must not overdraw it
+DEBIT_ENTRY_TYPES = {"used", "expired"}
+
+
+class InsufficientOffsetBalance(ValueError):
+    """Raised when a debit would take the balance below zero."""
+
+
+class OffsetHoursService:
+    """Posts offset-hours entries and keeps the balance row in step."""
+
+    async def post(
+        self,
+        session: AsyncSession,
+        employee_id: int,
+        entry_type: str,
+        hours: Decimal,
+        entry_date: Optional[date] = None,
+        attendance_record_id: Optional[int] = None,
+        note: Optional[str] = None,
+        created_by: Optional[int] = None,
+    ) -> None:
+        """
+        Append one entry and apply it to the balance (no commit).
+
+        Anything that lowers the available balance (``used``/``expired``
+        debits, negative ``earned`` corrections and ``adjusted`` entries) is
+        applied with a guarded UPDATE and raises
+        :class:`InsufficientOffsetBalance` if the balance would go negative.
+        """
+        if entry_type not in OFFSET_ENTRY_TYPES:
+            raise ValueError(f"Unknown offset entry type: {entry_type}")
+        if not hours:
+            return
+
+        column = getattr(OffsetHoursBalance, entry_type)
+        condition = OffsetHoursBalance.employee_id == employee_id
+        drawdown = hours if entry_type in DEBIT_ENTRY_TYPES else -hours
+        if drawdown > 0:
+            available = (
+                OffsetHoursBalance.earned + OffsetHoursBalance.adjusted
+                - OffsetHoursBalance.used - OffsetHoursBalance.expired
+            )
+            condition = and_(condition, available >= drawdown)
+        result = await session.execute(
+            update(OffsetHoursBalance)
+            .where(condition)
+            .values({entry_type: column + hours})
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            if drawdown > 0:
+                raise InsufficientOffsetBalance(
+                    f"Insufficient offset balance for {drawdown} hours"
+                )
+            values = {name: Decimal("0") for name in OFFSET_ENTRY_TYPES}
+            values[entry_type] = hours
+            await session.execute(
+                insert(OffsetHoursBalance).values(employee_id=employee_id, **values)
+            )
+
+        await session.execute(
+            insert(OffsetHoursEntry).values(
+                employee_id=employee_id,
+                entry_type=entry_type,
+                hours=hours,
+                entry_date=entry_date or get_uae_today(),
+                attendance_record_id=attendance_record_id,
+                note=note,
+                created_by=created_by,
+            )
+        )
+
+    async def sync_record(
+        self, session: AsyncSession, record: AttendanceRecord, actor_id: Optional[int] = None
+    ) -> None:
+        """
+        Post the change in ``record.offset_hours_earned`` since it was last synced.
+
+        A downward correction goes through the same guard as a debit and raises
+        :class:`InsufficientOffsetBalance` if those hours were already taken.
+        """
+        result = await session.execute(
+            select(func.coalesce(func.sum(OffsetHoursEntry.hours), 0)).where(
+                OffsetHoursEntry.attendance_record_id == record.id,
+                OffsetHoursEntry.entry_type == "earned",
+            )
+        )
+        posted = Decimal(result.scalar() or 0)
+        delta = (record.offset_hours_earned or Decimal("0")) - posted
+        if delta:
+            await self.post(
+                session, record.employee_id, "earned", delta,
+                entry_date=record.attendance_date, attendance_record_id=record.id,
+                note="Overtime converted to offset hours" if posted == 0 else "Offset hours corrected",
+                created_by=actor_id,
+            )
+
+    async def get_balance(self, session: AsyncSession, employee_id: int) -> Optional[OffsetHoursBalance]:
+        return await session.get(OffsetHoursBalance, employee_id)
+
+    async def history(
+        self,
+        session: AsyncSession,
+        employee_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[OffsetHoursEntry], Optional[str]]:
+        """One page of an employee's entries, newest first."""
+        query = select(OffsetHoursEntry).where(OffsetHoursEntry.employee_id == employee_id)
+        query = keyset_page(query, OffsetHoursEntry.created_at, OffsetHoursEntry.id, cursor, limit)
+        result = await session.execute(query)
+        return split_page(list(result.scalars().all()), limit, "created_at")
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """
+        Rebuild the ledger and balances from attendance records (set-based).
+
+        Earned hours come from ``offset_hours_earned``; records whose
+        ``offset_day_reference`` mentions "Used" were consumed as time off.
+        """
+        await session.execute(delete(OffsetHoursEntry))
+        await session.execute(delete(OffsetHoursBalance))
+
+        target = ["employee_id", "entry_type", "hours", "entry_date", "attendance_record_id", "note"]
+        has_offset = AttendanceRecord.offset_hours_earned > 0
+        await session.execute(
+            insert(OffsetHoursEntry).from_select(
+                target,
+                select(
+                    AttendanceRecord.employee_id,
+                    literal("earned"),
+                    AttendanceRecord.offset_hours_earned,
+                    AttendanceRecord.attendance_date,
+                    AttendanceRecord.id,
+                    literal("Opening balance"),
+                ).where(has_offset),
+            )
+        )
+        await session.execute(
+            insert(OffsetHoursEntry).from_select(
+                target,
+                select(
+                    AttendanceRecord.employee_id,
+                    literal("used"),
+                    AttendanceRecord.offset_hours_earned,
+                    AttendanceRecord.attendance_date,
+                    AttendanceRecord.id,
+                    AttendanceRecord.offset_day_reference,
+                ).where(has_offset, AttendanceRecord.offset_day_reference.like("%Used%")),
+            )
+        )
+
+        def total(entry_type: str):
+            return func.coalesce(
+                func.sum(case((OffsetHoursEntry.entry_type == entry_type, OffsetHoursEntry.hours), else_=0)), 0
+            )
+
+        await session.execute(
+            insert(OffsetHoursBalance).from_select(
+                ["employee_id", *OFFSET_ENTRY_TYPES],
+                select(
+                    OffsetHoursEntry.employee_id, *(total(t) for t in OFFSET_ENTRY_TYPES)
+                ).group_by(OffsetHoursEntry.employee_id),
+            )
+        )
+        result = await session.execute(select(func.count()).select_from(OffsetHoursEntry))
+        count = result.scalar() or 0
+        logger.info(f"Rebuilt offset hours ledger with {count} entries")
+        return count
+
+
+offset_hours_service = OffsetHoursService()
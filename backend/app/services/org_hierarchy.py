@@ -0,0 +1,182 @@
+"""Org chart / reporting-line index.
+
+The ``line_manager_id`` hierarchy is loaded once per employee-table version
+into an in-memory index:
+
+- adjacency lists answer direct reports and ``has_team`` in O(1)
+- an Euler tour (entry/exit positions) answers full subtrees in O(k) and
+  "is X under Y" in O(1)
+- manager chains walk parent pointers in O(depth)
+
+Employee writes bump the ``employees`` cache version so every worker rebuilds
+the index on its next read.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import VersionedCache, bump_cache_version
+from app.models.employee import Employee
+
+EMPLOYEES_CACHE_SCOPE = "employees"
+
+
+@dataclass(frozen=True)
+class OrgNode:
+    """Lightweight employee projection used by the hierarchy index."""
+
+    id: int
+    employee_id: str
+    name: str
+    email: Optional[str]
+    job_title: Optional[str]
+    department: Optional[str]
+    function: Optional[str]
+    role: str
+    line_manager_id: Optional[int]
+    is_active: bool
+    employment_status: Optional[str]
+
+    @property
+    def is_active_employee(self) -> bool:
+        """Active flag set and employment status is 'Active'."""
+        return bool(self.is_active) and (self.employment_status or "").strip().lower() == "active"
+
+
+class OrgHierarchy:
+    """Immutable reporting-line index built from a list of nodes."""
+
+    def __init__(self, nodes: Iterable[OrgNode]) -> None:
+        self._nodes: Dict[int, OrgNode] = {node.id: node for node in nodes}
+
+        children: Dict[int, List[int]] = {}
+        for node in self._nodes.values():
+            if node.line_manager_id is not None and node.line_manager_id in self._nodes:
+                children.setdefault(node.line_manager_id, []).append(node.id)
+        self._children: Dict[int, Tuple[int, ...]] = {
+            manager_id: tuple(sorted(report_ids)) for manager_id, report_ids in children.items()
+        }
+
+        # Euler tour: every subtree occupies the contiguous slice order[enter:exit]
+        self._order: List[int] = []
+        self._enter: Dict[int, int] = {}
+        self._exit: Dict[int, int] = {}
+        roots = [
+            node_id for node_id, node in self._nodes.items()
+            if node.line_manager_id is None or node.line_manager_id not in self._nodes
+        ]
+        for root in sorted(roots):
+            self._walk(root)
+        # Employees stuck in a reporting cycle are never reached from a root
+        for node_id in sorted(self._nodes):
+            if node_id not in self._enter:
+                self._walk(node_id)
+
+    def _walk(self, root: int) -> None:
+        stack: List[Tuple[int, bool]] = [(root, False)]
+        while stack:
+            node_id, done = stack.pop()
+            if done:
+                self._exit[node_id] = len(self._order)
+                continue
+            if node_id in self._enter:
+                continue
+            self._enter[node_id] = len(self._order)
+            self._order.append(node_id)
+            stack.append((node_id, True))
+            for child in reversed(self._children.get(node_id, ())):
+                if child not in self._enter:
+                    stack.append((child, False))
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def get(self, employee_pk: int) -> Optional[OrgNode]:
+        return self._nodes.get(employee_pk)
+
+    def has_team(self, manager_id: int, active_only: bool = False) -> bool:
+        if not active_only:
+            return manager_id in self._children
+        return any(self._nodes[c].is_active for c in self._children.get(manager_id, ()))
+
+    def direct_report_ids(self, manager_id: int) -> Tuple[int, ...]:
+        return self._children.get(manager_id, ())
+
+    def direct_reports(self, manager_id: int, active_only: bool = False) -> List[OrgNode]:
+        reports = [self._nodes[c] for c in self._children.get(manager_id, ())]
+        if active_only:
+            reports = [r for r in reports if r.is_active]
+        return reports
+
+    def subtree_ids(self, manager_id: int) -> List[int]:
+        """All direct and indirect reports (excluding the manager)."""
+        if manager_id not in self._enter:
+            return []
+        return self._order[self._enter[manager_id] + 1:self._exit[manager_id]]
+
+    def subtree(self, manager_id: int, active_only: bool = False) -> List[OrgNode]:
+        nodes = [self._nodes[i] for i in self.subtree_ids(manager_id)]
+        if active_only:
+            nodes = [n for n in nodes if n.is_active]
+        return nodes
+
+    def is_in_subtree(self, manager_id: int, employee_pk: int) -> bool:
+        """True if ``employee_pk`` reports (directly or indirectly) to ``manager_id``."""
+        if manager_id not in self._enter or employee_pk not in self._enter or manager_id == employee_pk:
+            return False
+        return self._enter[manager_id] < self._enter[employee_pk] < self._exit[manager_id]
+
+    def manager_chain(self, employee_pk: int) -> List[OrgNode]:
+        """Line managers from the direct manager up to the top of the chart."""
+        chain: List[OrgNode] = []
+        seen = {employee_pk}
+        node = self._nodes.get(employee_pk)
+        while node and node.line_manager_id is not None and node.line_manager_id not in seen:
+            manager = self._nodes.get(node.line_manager_id)
+            if manager is None:
+                break
+            chain.append(manager)
+            seen.add(manager.id)
+            node = manager
+        return chain
+
+    def managers(self) -> List[OrgNode]:
+        """Employees with at least one direct report."""
+        return [self._nodes[m] for m in self._children]
+
+
+async def _load_hierarchy(session: AsyncSession) -> OrgHierarchy:
+    result = await session.execute(
+        select(
+            Employee.id,
+            Employee.employee_id,
+            Employee.name,
+            Employee.email,
+            Employee.job_title,
+            Employee.department,
+            Employee.function,
+            Employee.role,
+            Employee.line_manager_id,
+            Employee.is_active,
+            Employee.employment_status,
+        )
+    )
+    return OrgHierarchy(OrgNode(*row) for row in result.all())
+
+
+_hierarchy_cache: VersionedCache[OrgHierarchy] = VersionedCache(
+    EMPLOYEES_CACHE_SCOPE, _load_hierarchy
+)
+
+
+async def get_org_hierarchy(session: AsyncSession) -> OrgHierarchy:
+    """Return the reporting-line index for the current employee-table version."""
+    return await _hierarchy_cache.get(session)
+
+
+async def invalidate_org_hierarchy(session: AsyncSession) -> None:
+    """Bump the employee-table version (call in the same transaction as the write)."""
+    await bump_cache_version(session, EMPLOYEES_CACHE_SCOPE)
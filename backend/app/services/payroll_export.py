@@ -0,0 +1,257 @@
+"""Streaming payroll export of HR-approved timesheets.
+
+An export run first claims the month's ``hr_approved`` timesheets with one
+UPDATE that stamps them ``exported`` under a payroll reference, then streams
+every row carrying that reference in ``yield_per`` partitions, joined with
+bank details and salary components. Memory stays flat regardless of
+headcount, and retrying with the same reference replays the same batch
+(plus any timesheets approved since) instead of failing or double-claiming.
+
+Two formats are produced:
+
+* ``csv`` - one header line and one row per timesheet.
+* ``sif`` - WPS salary information file layout as fixed-width records: one
+  EDR line per employee followed by an SCR control record with the totals.
+"""
+import calendar
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.time import get_uae_now, get_utc_now
+from app.models.employee import Employee
+from app.models.employee_bank import EmployeeBank
+from app.models.employee_compliance import EmployeeCompliance
+from app.models.timesheet import Timesheet
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ("csv", "sif")
+EXPORT_CHUNK_SIZE = 500
+
+CSV_HEADER = [
+    "payroll_reference", "employee_id", "employee_name", "work_permit_number",
+    "bank_name", "swift_code", "account_number", "iban", "bank_verified",
+    "working_days", "paid_days", "leave_days", "overtime_hours", "overtime_amount",
+    "food_allowance", "fixed_income", "variable_income", "currency",
+]
+
+ZERO = Decimal("0")
+
+
+def default_payroll_reference(year: int, month: int) -> str:
+    return f"PAY-{year}-{month:02d}"
+
+
+@dataclass(frozen=True)
+class PayrollClaim:
+    """Outcome of claiming a month's timesheets for a payroll reference."""
+
+    reference: str
+    newly_exported: int
+    total_rows: int
+    total_amount: Decimal
+
+
+def _money(value: Optional[Decimal]) -> Decimal:
+    return (value or ZERO).quantize(Decimal("0.01"))
+
+
+def _fixed(value: Optional[str], width: int) -> str:
+    """Left-aligned text field, truncated to width."""
+    return (value or "").strip()[:width].ljust(width)
+
+
+def _amount(value: Decimal, width: int = 15) -> str:
+    """Right-aligned, zero-padded amount with two decimals."""
+    return f"{value:0{width}.2f}"
+
+
+# Fixed and variable pay components (SIF splits income this way)
+FIXED_INCOME = (
+    func.coalesce(Employee.basic_salary, 0)
+    + func.coalesce(Employee.housing_allowance, 0)
+    + func.coalesce(Employee.transportation_allowance, 0)
+    + func.coalesce(Employee.other_allowance, 0)
+)
+VARIABLE_INCOME = Timesheet.total_overtime_amount + Timesheet.food_allowance_total
+
+
+class PayrollExportService:
+    """Claims approved timesheets for payroll and streams them out."""
+
+    async def claim(
+        self, session: AsyncSession, year: int, month: int, reference: str
+    ) -> PayrollClaim:
+        """
+        Mark the month's HR-approved timesheets as exported under ``reference``.
+
+        One UPDATE; already-exported rows keep their original reference, so a
+        retry with the same reference is a no-op apart from late approvals.
+        """
+        result = await session.execute(
+            update(Timesheet)
+            .where(
+                Timesheet.year == year,
+                Timesheet.month == month,
+                Timesheet.status == "hr_approved",
+            )
+            .values(status="exported", exported_at=get_utc_now(), payroll_reference=reference)
+            .execution_options(synchronize_session=False)
+        )
+        totals = await session.execute(
+            select(func.count(), func.coalesce(func.sum(FIXED_INCOME + VARIABLE_INCOME), 0))
+            .select_from(Timesheet)
+            .join(Employee, Employee.id == Timesheet.employee_id)
+            .where(*self._batch_conditions(year, month, reference))
+        )
+        count, amount = totals.one()
+        await session.commit()
+        if result.rowcount:
+            logger.info(f"Claimed {result.rowcount} timesheets for payroll {reference}")
+        return PayrollClaim(reference, result.rowcount or 0, count, _money(Decimal(amount)))
+
+    @staticmethod
+    def _batch_conditions(year: int, month: int, reference: str):
+        return (
+            Timesheet.year == year,
+            Timesheet.month == month,
+            Timesheet.status == "exported",
+            Timesheet.payroll_reference == reference,
+        )
+
+    def _batch_query(self, year: int, month: int, reference: str) -> Select:
+        return (
+            select(
+                Employee.employee_id,
+                Employee.name,
+                EmployeeCompliance.work_permit_number,
+                EmployeeBank.bank_name,
+                EmployeeBank.swift_code,
+                EmployeeBank.account_number,
+                EmployeeBank.iban,
+                EmployeeBank.is_verified,
+                EmployeeBank.currency,
+                Timesheet.total_working_days,
+                Timesheet.total_absent_days,
+                Timesheet.total_leave_days,
+                Timesheet.total_overtime_hours,
+                Timesheet.total_overtime_amount,
+                Timesheet.food_allowance_total,
+                FIXED_INCOME.label("fixed_income"),
+                VARIABLE_INCOME.label("variable_income"),
+            )
+            .join(Employee, Employee.id == Timesheet.employee_id)
+            .outerjoin(EmployeeBank, EmployeeBank.employee_id == Timesheet.employee_id)
+            .outerjoin(EmployeeCompliance, EmployeeCompliance.employee_id == Timesheet.employee_id)
+            .where(*self._batch_conditions(year, month, reference))
+            .order_by(Timesheet.id)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+
+    async def stream(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        year: int,
+        month: int,
+        claim: PayrollClaim,
+        export_format: str = "csv",
+    ) -> AsyncIterator[str]:
+        """
+        Yield the export one chunk of ``EXPORT_CHUNK_SIZE`` rows at a time.
+
+        Opens its own session: the response body is sent after the request's
+        session dependency has been closed.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        sif = export_format == "sif"
+        pay_start = date(year, month, 1)
+        pay_end = date(year, month, calendar.monthrange(year, month)[1])
+
+        if not sif:
+            yield self._csv_lines([CSV_HEADER])
+
+        async with session_factory() as session:
+            result = await session.stream(self._batch_query(year, month, claim.reference))
+            async for partition in result.partitions():
+                if sif:
+                    yield "".join(self._edr_line(row, pay_start, pay_end) for row in partition)
+                else:
+                    yield self._csv_lines(self._csv_row(row, claim.reference) for row in partition)
+
+        if sif:
+            yield self._scr_line(claim, pay_start)
+
+    @staticmethod
+    def _csv_lines(rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _csv_row(row, reference: str) -> list:
+        return [
+            reference,
+            row.employee_id,
+            row.name,
+            row.work_permit_number or "",
+            row.bank_name or "",
+            row.swift_code or "",
+            row.account_number or "",
+            row.iban or "",
+            "yes" if row.is_verified else "no",
+            row.total_working_days,
+            max(row.total_working_days - row.total_absent_days, 0),
+            _money(row.total_leave_days),
+            _money(row.total_overtime_hours),
+            _money(row.total_overtime_amount),
+            _money(row.food_allowance_total),
+            _money(Decimal(row.fixed_income)),
+            _money(Decimal(row.variable_income)),
+            row.currency or "AED",
+        ]
+
+    @staticmethod
+    def _edr_line(row, pay_start: date, pay_end: date) -> str:
+        """Employee detail record: one fixed-width line per employee."""
+        return "".join([
+            "EDR",
+            _fixed(row.work_permit_number or row.employee_id, 14),
+            _fixed(row.swift_code, 11),
+            _fixed(row.iban or row.account_number, 34),
+            pay_start.isoformat(),
+            pay_end.isoformat(),
+            f"{max(row.total_working_days - row.total_absent_days, 0):04d}",
+            _amount(_money(Decimal(row.fixed_income))),
+            _amount(_money(Decimal(row.variable_income))),
+            f"{int(row.total_leave_days or 0):04d}",
+        ]) + "\n"
+
+    @staticmethod
+    def _scr_line(claim: PayrollClaim, pay_start: date) -> str:
+        """Salary control record: employer, file timestamp and batch totals."""
+        settings = get_settings()
+        now: datetime = get_uae_now()
+        return "".join([
+            "SCR",
+            _fixed(settings.wps_employer_id, 13),
+            _fixed(settings.wps_routing_code, 11),
+            now.strftime("%Y-%m-%d"),
+            now.strftime("%H%M"),
+            pay_start.strftime("%m%Y"),
+            f"{claim.total_rows:06d}",
+            _amount(claim.total_amount, 18),
+            "AED",
+        ]) + "\n"
+
+
+payroll_export_service = PayrollExportService()
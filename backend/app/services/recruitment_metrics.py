@@ -0,0 +1,369 @@
+"""Recruitment dashboard metrics as a cached snapshot.
+
+The dashboard used to issue a dozen ``COUNT`` queries per load. The snapshot
+is built from three grouped, conditional-aggregate queries (requisitions,
+candidates, stage-transition durations) and kept in a :class:`VersionedCache`
+bumped by every requisition or candidate write, so most loads cost a single
+version check. Rolling figures (overdue requisitions, hires in the last 30
+days) are recomputed at least daily.
+
+Duration metrics come from ``candidate_stage_transitions``, the append-only
+history written alongside every stage change (including the initial
+application). Each batch of transitions is also folded into
+``recruitment_stage_stats`` -- running entered/exited counts and durations per
+requisition and stage -- so funnel, conversion and velocity reports read a
+handful of pre-aggregated rows instead of scanning candidates. Candidates
+that predate the log are given their entry transition once at startup
+(:meth:`RecruitmentMetricsService.seed_entry_transitions`).
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import VersionedCache, bump_cache_version
+from app.core.logging import get_logger
+from app.models.recruitment import (
+    Candidate, CandidateStageTransition, RecruitmentRequest, RecruitmentStageStat, RECRUITMENT_STAGES
+)
+
+logger = get_logger(__name__)
+
+RECRUITMENT_METRICS_CACHE_SCOPE = "recruitment_metrics"
+
+ACTIVE_REQUEST_STATUSES = ("pending", "approved")
+PENDING_OFFER_STATUSES = ("offer", "in_preparation", "released")
+RECENT_HIRE_DAYS = 30
+
+SECONDS_PER_DAY = 86400
+
+
+def _seconds_between(start: Optional[datetime], end: Optional[datetime]) -> Optional[int]:
+    """Whole seconds from ``start`` to ``end``; tolerates naive/aware mixes."""
+    if start is None or end is None:
+        return None
+    if (start.tzinfo is None) != (end.tzinfo is None):
+        # Naive stage timestamps are local time (datetime.now())
+        start = start.astimezone().replace(tzinfo=None) if start.tzinfo else start
+        end = end.astimezone().replace(tzinfo=None) if end.tzinfo else end
+    return max(int((end - start).total_seconds()), 0)
+
+
+def stage_transition(candidate: Candidate, to_stage: str, changed_at: datetime) -> Dict[str, Any]:
+    """Transition row for moving ``candidate`` (still on its old stage) to ``to_stage``."""
+    entered_at = candidate.stage_changed_at or candidate.created_at
+    return {
+        "candidate_id": candidate.id,
+        "recruitment_request_id": candidate.recruitment_request_id,
+        "from_stage": candidate.stage,
+        "to_stage": to_stage,
+        "changed_at": changed_at,
+        "stage_seconds": _seconds_between(entered_at, changed_at),
+        "elapsed_seconds": _seconds_between(candidate.created_at, changed_at),
+    }
+
+
+def entry_transition(candidate_id: int, recruitment_request_id: int, applied_at: datetime) -> Dict[str, Any]:
+    """Transition row for a new application entering the pipeline."""
+    return {
+        "candidate_id": candidate_id,
+        "recruitment_request_id": recruitment_request_id,
+        "from_stage": None,
+        "to_stage": "applied",
+        "changed_at": applied_at,
+        "stage_seconds": None,
+        "elapsed_seconds": 0,
+    }
+
+
+def _rate(numerator: int, denominator: int) -> Optional[float]:
+    return round(numerator / denominator * 100, 1) if denominator else None
+
+
+def _days(seconds: float, count: int) -> Optional[float]:
+    return round(seconds / count / SECONDS_PER_DAY, 1) if count else None
+
+
+class RecruitmentMetricsService:
+    """Builds and caches the recruitment dashboard snapshot."""
+
+    def __init__(self) -> None:
+        self._snapshot: VersionedCache[dict] = VersionedCache(
+            RECRUITMENT_METRICS_CACHE_SCOPE, self._load, check_interval=60
+        )
+
+    async def invalidate(self, session: AsyncSession) -> None:
+        """Mark the snapshot stale; call in the writer's transaction."""
+        await bump_cache_version(session, RECRUITMENT_METRICS_CACHE_SCOPE)
+
+    async def record_transitions(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """
+        Append stage transitions (see :func:`stage_transition`) and fold them
+        into the per-stage aggregates; no commit.
+        """
+        if rows:
+            await session.execute(insert(CandidateStageTransition), rows)
+            await self._apply_to_stage_stats(session, rows)
+        await self.invalidate(session)
+
+    async def _apply_to_stage_stats(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        # (request, stage) -> [entered, exited, elapsed_seconds, stage_seconds]
+        deltas: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+        for row in rows:
+            entered = deltas[(row["recruitment_request_id"], row["to_stage"])]
+            entered[0] += 1
+            entered[2] += row["elapsed_seconds"] or 0
+            if row["from_stage"] is not None:
+                exited = deltas[(row["recruitment_request_id"], row["from_stage"])]
+                exited[1] += 1
+                exited[3] += row["stage_seconds"] or 0
+
+        s = RecruitmentStageStat
+        for (request_id, stage), (entered, exited, elapsed, in_stage) in deltas.items():
+            result = await session.execute(
+                update(s)
+                .where(s.recruitment_request_id == request_id, s.stage == stage)
+                .values(
+                    entered=s.entered + entered,
+                    exited=s.exited + exited,
+                    elapsed_seconds=s.elapsed_seconds + elapsed,
+                    stage_seconds=s.stage_seconds + in_stage,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if not result.rowcount:
+                await session.execute(
+                    insert(s).values(
+                        recruitment_request_id=request_id, stage=stage, entered=entered,
+                        exited=exited, elapsed_seconds=elapsed, stage_seconds=in_stage,
+                    )
+                )
+
+    async def seed_entry_transitions(self, session: AsyncSession) -> int:
+        """
+        Record a ``None -> stage`` entry for candidates without one; no commit.
+
+        Candidates never moved since the log started enter their current stage
+        when it last changed; the others enter the stage their first logged
+        move left, on their creation date. Without these rows the stage
+        aggregates see exits with no matching entries. Returns rows added.
+        """
+        t = CandidateStageTransition
+        has_entry = select(t.id).where(t.candidate_id == Candidate.id, t.from_stage.is_(None)).exists()
+        first_move = (
+            select(t.from_stage)
+            .where(t.candidate_id == Candidate.id)
+            .order_by(t.changed_at, t.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        result = await session.execute(
+            select(
+                Candidate.id, Candidate.recruitment_request_id, Candidate.stage,
+                Candidate.created_at, Candidate.stage_changed_at, first_move.label("first_stage"),
+            ).where(~has_entry)
+        )
+        rows = []
+        for c in result.all():
+            if c.first_stage is not None:
+                stage, entered_at = c.first_stage, c.created_at
+            else:
+                stage, entered_at = c.stage, c.stage_changed_at or c.created_at
+            entered_at = entered_at or datetime.now()
+            rows.append({
+                "candidate_id": c.id,
+                "recruitment_request_id": c.recruitment_request_id,
+                "from_stage": None,
+                "to_stage": stage,
+                "changed_at": entered_at,
+                "stage_seconds": None,
+                "elapsed_seconds": _seconds_between(c.created_at, entered_at) or 0,
+            })
+        if rows:
+            await self.record_transitions(session, rows)
+        return len(rows)
+
+    async def get_funnel(self, session: AsyncSession, recruitment_request_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Funnel, conversion and velocity per stage from the aggregate rows.
+
+        ``conversion_rate`` is the share of entries into a pipeline stage
+        matched by entries into the next one; durations are in days.
+        """
+        s = RecruitmentStageStat
+        query = select(
+            s.stage, func.sum(s.entered), func.sum(s.exited),
+            func.sum(s.elapsed_seconds), func.sum(s.stage_seconds),
+        ).group_by(s.stage)
+        if recruitment_request_id is not None:
+            query = query.where(s.recruitment_request_id == recruitment_request_id)
+        totals = {stage: row for stage, *row in (await session.execute(query)).all()}
+
+        pipeline = [stage for stage in RECRUITMENT_STAGES if stage["key"] != "rejected"]
+        next_stage = {a["key"]: b["key"] for a, b in zip(pipeline, pipeline[1:])}
+        stages = []
+        for stage in RECRUITMENT_STAGES:
+            entered, exited, elapsed, in_stage = totals.get(stage["key"], (0, 0, 0, 0))
+            following = next_stage.get(stage["key"])
+            stages.append({
+                "stage": stage["key"],
+                "name": stage["name"],
+                "entered": entered,
+                "exited": exited,
+                "current": entered - exited,
+                "conversion_rate": _rate(totals.get(following, (0,))[0], entered) if following else None,
+                "avg_days_in_stage": _days(in_stage, exited),
+                "avg_days_to_reach": _days(elapsed, entered),
+            })
+
+        # Every transition but an entry is an exit, so this counts entries
+        applications = sum(row[0] - row[1] for row in totals.values())
+        hires = totals.get("hired", (0,))[0]
+        return {
+            "recruitment_request_id": recruitment_request_id,
+            "applications": applications,
+            "hires": hires,
+            "hire_rate": _rate(hires, applications),
+            "stages": stages,
+        }
+
+    async def get_metrics(self, session: AsyncSession) -> Dict[str, Any]:
+        snapshot = await self._snapshot.get(session)
+        if snapshot["date"] != date.today():
+            self._snapshot.clear()
+            snapshot = await self._snapshot.get(session)
+        return snapshot["metrics"]
+
+    async def get_stats(self, session: AsyncSession) -> Dict[str, Any]:
+        metrics = await self.get_metrics(session)
+        return {
+            "total_requests": metrics["total_requests"],
+            "active_requests": metrics["active_requests"],
+            "total_candidates": metrics["total_candidates"],
+            "by_stage": metrics["candidates_by_stage"],
+            "by_source": metrics["candidates_by_source"],
+            "recent_hires": metrics["recent_hires"],
+        }
+
+    async def _load(self, session: AsyncSession) -> dict:
+        today = date.today()
+        metrics = {
+            **await self._request_metrics(session, today),
+            **await self._candidate_metrics(session, datetime.now() - timedelta(days=RECENT_HIRE_DAYS)),
+            **await self._duration_metrics(session),
+        }
+        return {"date": today, "metrics": metrics}
+
+    async def _request_metrics(self, session: AsyncSession, today: date) -> Dict[str, Any]:
+        result = await session.execute(
+            select(
+                RecruitmentRequest.status,
+                RecruitmentRequest.priority,
+                func.count(),
+                func.sum(case((RecruitmentRequest.target_hire_date < today, 1), else_=0)),
+            ).group_by(RecruitmentRequest.status, RecruitmentRequest.priority)
+        )
+        totals: Dict[str, int] = defaultdict(int)
+        by_priority: Dict[str, int] = defaultdict(int)
+        overdue = 0
+        for status, priority, count, past_target in result.all():
+            totals[status] += count
+            if status in ACTIVE_REQUEST_STATUSES:
+                by_priority[priority or "normal"] += count
+                overdue += past_target or 0
+
+        return {
+            "total_requests": sum(totals.values()),
+            "active_requests": sum(totals[s] for s in ACTIVE_REQUEST_STATUSES),
+            "filled_requests": totals["filled"],
+            "cancelled_requests": totals["cancelled"],
+            "overdue_requests": overdue,
+            "requests_by_priority": dict(by_priority),
+        }
+
+    async def _candidate_metrics(self, session: AsyncSession, recent_since: datetime) -> Dict[str, Any]:
+        result = await session.execute(
+            select(
+                Candidate.stage,
+                Candidate.status,
+                Candidate.source,
+                func.count(),
+                func.sum(case((Candidate.stage_changed_at >= recent_since, 1), else_=0)),
+            ).group_by(Candidate.stage, Candidate.status, Candidate.source)
+        )
+        by_stage: Dict[str, int] = {stage["key"]: 0 for stage in RECRUITMENT_STAGES}
+        by_source: Dict[str, int] = defaultdict(int)
+        by_status: Dict[str, int] = defaultdict(int)
+        recent_hires = pending_interviews = pending_offers = 0
+        for stage, status, source, count, recent in result.all():
+            by_stage[stage] = by_stage.get(stage, 0) + count
+            by_status[status] += count
+            if source is not None:
+                by_source[source] += count
+            if stage == "hired":
+                recent_hires += recent or 0
+            elif stage == "interview" and status != "completed":
+                pending_interviews += count
+            elif stage == "offer" and status in PENDING_OFFER_STATUSES:
+                pending_offers += count
+
+        # Everyone at or past a stage has passed through it
+        hired = by_stage["hired"]
+        offered = by_stage["offer"] + hired
+        interviewed = by_stage["interview"] + offered
+        screened = by_stage["screening"] + interviewed
+        applied = by_stage["applied"] + screened
+
+        return {
+            "total_candidates": sum(by_stage.values()),
+            "candidates_by_stage": by_stage,
+            "candidates_by_source": dict(by_source),
+            "candidates_by_status": dict(by_status),
+            "application_to_screening_rate": _rate(screened, applied),
+            "screening_to_interview_rate": _rate(interviewed, screened),
+            "interview_to_offer_rate": _rate(offered, interviewed),
+            "offer_acceptance_rate": _rate(hired, offered),
+            "recent_hires": recent_hires,
+            "pending_interviews": pending_interviews,
+            "pending_offers": pending_offers,
+        }
+
+    async def _duration_metrics(self, session: AsyncSession) -> Dict[str, Optional[float]]:
+        """Average days to fill, in screening and to offer, per requisition in one pass."""
+        t = CandidateStageTransition
+        left_screening = t.from_stage == "screening"
+        to_offer = t.to_stage == "offer"
+        result = await session.execute(
+            select(
+                RecruitmentRequest.created_at,
+                func.min(case((t.to_stage == "hired", t.changed_at))),
+                func.sum(case((left_screening, t.stage_seconds))),
+                func.count(case((left_screening, t.stage_seconds))),
+                func.sum(case((to_offer, t.elapsed_seconds))),
+                func.count(case((to_offer, t.elapsed_seconds))),
+            )
+            .join(RecruitmentRequest, RecruitmentRequest.id == t.recruitment_request_id)
+            .group_by(t.recruitment_request_id, RecruitmentRequest.created_at)
+        )
+        fill_seconds = screening_seconds = offer_seconds = 0.0
+        fills = screenings = offers = 0
+        for opened_at, first_hire, screening_sum, screening_count, offer_sum, offer_count in result.all():
+            seconds_to_fill = _seconds_between(opened_at, first_hire)
+            if seconds_to_fill is not None:
+                fill_seconds += seconds_to_fill
+                fills += 1
+            screening_seconds += screening_sum or 0
+            screenings += screening_count
+            offer_seconds += offer_sum or 0
+            offers += offer_count
+
+        return {
+            "avg_time_to_fill": _days(fill_seconds, fills),
+            "avg_time_in_screening": _days(screening_seconds, screenings),
+            "avg_time_to_offer": _days(offer_seconds, offers),
+        }
+
+
+recruitment_metrics_service = RecruitmentMetricsService()
@@ -2,27 +2,33 @@
 Recruitment notification service for automated communications.
 Supports solo HR by automating interview reminders, offer expiry alerts, etc.
 """
+import asyncio
 import logging
 from datetime import datetime, date, timedelta, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.recruitment import (
-    RecruitmentRequest, Candidate, Interview, Offer
+    RecruitmentRequest, Candidate, Interview, Offer, RECRUITMENT_STAGES
 )
+from app.repositories.notification import NotificationRepository
 from app.services.email_service import EmailService
 from app.services.notification import NotificationService
 
 logger = logging.getLogger(__name__)
 
+# Concurrent SMTP sends for one batch of stage updates
+STAGE_UPDATE_CONCURRENCY = 5
+
 
 class RecruitmentNotificationService:
     """Service for automated recruitment notifications."""
     
     def __init__(self):
         self.email_service = EmailService()
-        self.notification_service = NotificationService()
+        self.notification_service = NotificationService(NotificationRepository())
+        self._pending: Set[asyncio.Task] = set()
     
     async def send_interview_reminder(
         self,
@@ -144,6 +150,73 @@ class RecruitmentNotificationService:
         
         return success
     
+    async def send_stage_update(
+        self,
+        email: str,
+        full_name: str,
+        position_title: str,
+        stage: str
+    ) -> bool:
+        """Tell a candidate their application moved to a new stage."""
+        stage_name = next((s['name'] for s in RECRUITMENT_STAGES if s['key'] == stage), stage)
+        if stage == 'rejected':
+            subject = f"Your application for {position_title}"
+            message = (
+                "Thank you for your interest. After careful consideration, we will not be "
+                "moving forward with your application at this time."
+            )
+        else:
+            subject = f"Application update: {position_title}"
+            message = f"Your application has moved to the {stage_name} stage."
+
+        html_body = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <p>Dear {full_name},</p>
+            <p>{message}</p>
+            <p>Best regards,<br>HR Team</p>
+        </body>
+        </html>
+        """
+        text_body = f"Dear {full_name},\n\n{message}\n\nBest regards,\nHR Team"
+        return await self.email_service.send_email(
+            to_email=email,
+            subject=subject,
+            html_body=html_body,
+            text_body=text_body
+        )
+
+    def enqueue_stage_updates(self, recipients: List[Dict[str, str]], stage: str) -> None:
+        """
+        Email candidates about a stage change in the background.
+
+        ``recipients`` are ``{"email", "full_name", "position_title"}`` dicts;
+        returns immediately so bulk updates do not wait on SMTP.
+        """
+        if not recipients:
+            return
+        task = asyncio.create_task(self._send_stage_updates(recipients, stage))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def wait_stage_updates(self) -> None:
+        """Wait for queued stage-update emails to finish."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def _send_stage_updates(self, recipients: List[Dict[str, str]], stage: str) -> None:
+        semaphore = asyncio.Semaphore(STAGE_UPDATE_CONCURRENCY)
+
+        async def send(recipient: Dict[str, str]) -> bool:
+            async with semaphore:
+                return await self.send_stage_update(
+                    recipient['email'], recipient['full_name'], recipient['position_title'], stage
+                )
+
+        results = await asyncio.gather(*(send(r) for r in recipients), return_exceptions=True)
+        sent = sum(1 for result in results if result is True)
+        logger.info(f"Sent {sent}/{len(recipients)} '{stage}' stage updates to candidates")
+
     async def send_offer_expiry_alert(
         self,
         session: AsyncSession,
@@ -2,15 +2,16 @@
 import logging
 import uuid
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select, and_, func
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import select, and_, case, func, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.recruitment import (
     RecruitmentRequest, Candidate, Interview, Evaluation,
     RECRUITMENT_STAGES, INTERVIEW_TYPES, EMPLOYMENT_TYPES
 )
+from app.models.activity_log import ActivityLog
 from app.models.passes import Pass
 from app.schemas.recruitment import (
     RecruitmentRequestCreate, RecruitmentRequestUpdate,
@@ -19,12 +20,17 @@ from app.schemas.recruitment import (
     EvaluationCreate, EvaluationUpdate,
     InterviewSlotsProvide, InterviewSlotConfirm
 )
+from app.services.recruitment_metrics import entry_transition, recruitment_metrics_service, stage_transition
+from app.services.recruitment_notifications import recruitment_notification_service
 
 logger = logging.getLogger(__name__)
 
 # Constants for slot booking status
 SLOT_BOOKED_BY_OTHER = "__SLOT_UNAVAILABLE__"  # Marks slot as taken by another candidate
 
+# Candidates updated per statement by the bulk stage/reject operations
+BULK_CHUNK_SIZE = 200
+
 class RecruitmentService:
     """Service for recruitment operations."""
 
@@ -57,6 +63,7 @@ class RecruitmentService:
         )
 
         session.add(request)
+        await recruitment_metrics_service.invalidate(session)
         await session.commit()
         await session.refresh(request)
 
@@ -129,6 +136,7 @@ class RecruitmentService:
         for key, value in update_data.items():
             setattr(request, key, value)
 
+        await recruitment_metrics_service.invalidate(session)
         await session.commit()
         await session.refresh(request)
         return request
@@ -162,6 +170,7 @@ class RecruitmentService:
             approval_status.get('budget', {}).get('status') == 'approved'):
             request.status = 'approved'
 
+        await recruitment_metrics_service.invalidate(session)
         await session.commit()
         await session.refresh(request)
         return request
@@ -196,6 +205,10 @@ class RecruitmentService:
         )
 
         session.add(candidate)
+        await session.flush()
+        await recruitment_metrics_service.record_transitions(
+            session, [entry_transition(candidate.id, candidate.recruitment_request_id, candidate.stage_changed_at)]
+        )
         await session.commit()
         await session.refresh(candidate)
 
@@ -270,6 +283,7 @@ class RecruitmentService:
         for key, value in update_data.items():
             setattr(candidate, key, value)
 
+        await recruitment_metrics_service.invalidate(session)
         await session.commit()
         await session.refresh(candidate)
         return candidate
@@ -290,9 +304,17 @@ class RecruitmentService:
         if new_stage not in valid_stages:
             raise ValueError(f"Invalid stage: {new_stage}")
 
+        now = datetime.now()
+        if new_stage != candidate.stage:
+            await recruitment_metrics_service.record_transitions(
+                session, [stage_transition(candidate, new_stage, now)]
+            )
+        else:
+            await recruitment_metrics_service.invalidate(session)
+
         # Update stage
         candidate.stage = new_stage
-        candidate.stage_changed_at = datetime.now()
+        candidate.stage_changed_at = now
 
         # Update status based on stage
         stage_status_map = {
@@ -321,10 +343,14 @@ class RecruitmentService:
         if not candidate:
             raise ValueError("Candidate not found")
 
+        now = datetime.now()
+        transitions = [stage_transition(candidate, 'rejected', now)] if candidate.stage != 'rejected' else []
+        await recruitment_metrics_service.record_transitions(session, transitions)
+
         candidate.stage = 'rejected'
         candidate.status = 'rejected'
         candidate.rejection_reason = reason
-        candidate.stage_changed_at = datetime.now()
+        candidate.stage_changed_at = now
 
         await session.commit()
         await session.refresh(candidate)
@@ -453,6 +479,7 @@ class RecruitmentService:
             if candidate:
                 candidate.status = 'slots_available'
                 candidate.last_activity_at = datetime.now()
+                await recruitment_metrics_service.invalidate(session)
 
         await session.commit()
         await session.refresh(interview)
@@ -514,6 +541,7 @@ class RecruitmentService:
             if candidate:
                 candidate.status = 'scheduled'
                 candidate.last_activity_at = datetime.now()
+                await recruitment_metrics_service.invalidate(session)
         
         # Mark this slot as unavailable in other interviews for the same recruitment request
         # This prevents double-booking of manager's time
@@ -650,52 +678,16 @@ class RecruitmentService:
     # =========================================================================
 
     async def get_stats(self, session: AsyncSession) -> Dict[str, Any]:
-        """Get recruitment statistics."""
-        # Count requests
-        total_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id))
-        )
-        active_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                RecruitmentRequest.status.in_(['pending', 'approved'])
-            )
-        )
-
-        # Count candidates
-        total_candidates = await session.execute(
-            select(func.count(Candidate.id))
-        )
-
-        # Get pipeline counts
-        pipeline_counts = await self.get_pipeline_counts(session)
-
-        # Count by source
-        source_result = await session.execute(
-            select(Candidate.source, func.count(Candidate.id))
-            .where(Candidate.source.isnot(None))
-            .group_by(Candidate.source)
-        )
-        by_source = {row[0]: row[1] for row in source_result.all()}
-
-        # Recent hires (last 30 days)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_hires = await session.execute(
-            select(func.count(Candidate.id)).where(
-                and_(
-                    Candidate.stage == 'hired',
-                    Candidate.stage_changed_at >= thirty_days_ago
-                )
-            )
-        )
+        """Get recruitment statistics (from the cached metrics snapshot)."""
+        return await recruitment_metrics_service.get_stats(session)
 
-        return {
-            "total_requests": total_requests.scalar() or 0,
-            "active_requests": active_requests.scalar() or 0,
-            "total_candidates": total_candidates.scalar() or 0,
-            "by_stage": pipeline_counts,
-            "by_source": by_source,
-            "recent_hires": recent_hires.scalar() or 0
-        }
+    async def get_funnel(
+        self,
+        session: AsyncSession,
+        recruitment_request_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get stage funnel, conversion and velocity figures."""
+        return await recruitment_metrics_service.get_funnel(session, recruitment_request_id)
 
     # =========================================================================
     # HELPER METHODS
@@ -1010,388 +1002,160 @@ class RecruitmentService:
         session: AsyncSession,
         candidate_ids: List[int],
         new_stage: str,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        performed_by_id: Optional[str] = None,
+        notify_candidates: bool = False
     ) -> Dict[str, Any]:
-        """Bulk update candidate stages for efficiency."""
-        # Validate stage
+        """Move many candidates to one stage with set-based updates."""
         valid_stages = [s['key'] for s in RECRUITMENT_STAGES]
         if new_stage not in valid_stages:
             raise ValueError(f"Invalid stage: {new_stage}")
 
-        success_count = 0
-        failed_ids = []
-
-        for candidate_id in candidate_ids:
-            try:
-                candidate = await self.get_candidate(session, candidate_id)
-                if candidate:
-                    candidate.stage = new_stage
-                    candidate.stage_changed_at = datetime.now()
-                    # Update status based on stage
-                    stage_status_map = {
-                        'applied': 'applied',
-                        'screening': 'screening',
-                        'interview': 'interview',
-                        'offer': 'offer',
-                        'hired': 'hired',
-                        'rejected': 'rejected'
-                    }
-                    candidate.status = stage_status_map.get(new_stage, candidate.status)
-                    if notes:
-                        existing_notes = candidate.recruiter_notes or ""
-                        candidate.recruiter_notes = f"{existing_notes}\n[{datetime.now().strftime('%Y-%m-%d')}] Stage changed to {new_stage}: {notes}".strip()
-                    success_count += 1
-                else:
-                    failed_ids.append(candidate_id)
-            except SQLAlchemyError as e:
-                logger.warning(f"Database error updating candidate {candidate_id}: {e}")
-                failed_ids.append(candidate_id)
-
-        await session.commit()
-
+        updated, failed_ids = await self._bulk_transition(
+            session, candidate_ids, new_stage,
+            note=f"Stage changed to {new_stage}: {notes}" if notes else None,
+            performed_by_id=performed_by_id,
+            notify_candidates=notify_candidates
+        )
         return {
-            "success_count": success_count,
+            "success_count": len(updated),
             "failed_count": len(failed_ids),
             "failed_ids": failed_ids,
-            "message": f"Successfully updated {success_count} candidates to stage '{new_stage}'"
+            "message": f"Successfully updated {len(updated)} candidates to stage '{new_stage}'"
         }
 
     async def bulk_reject_candidates(
         self,
         session: AsyncSession,
         candidate_ids: List[int],
-        rejection_reason: str
+        rejection_reason: str,
+        performed_by_id: Optional[str] = None,
+        notify_candidates: bool = False
     ) -> Dict[str, Any]:
-        """Bulk reject candidates for efficiency."""
-        success_count = 0
-        failed_ids = []
-
-        for candidate_id in candidate_ids:
-            try:
-                candidate = await self.get_candidate(session, candidate_id)
-                if candidate and candidate.stage != 'hired':
-                    candidate.stage = 'rejected'
-                    candidate.status = 'rejected'
-                    candidate.rejection_reason = rejection_reason
-                    candidate.stage_changed_at = datetime.now()
-                    success_count += 1
-                else:
-                    failed_ids.append(candidate_id)
-            except SQLAlchemyError as e:
-                logger.warning(f"Database error rejecting candidate {candidate_id}: {e}")
-                failed_ids.append(candidate_id)
-
-        await session.commit()
-
+        """Reject many candidates at once; hired candidates are reported as failed."""
+        updated, failed_ids = await self._bulk_transition(
+            session, candidate_ids, 'rejected',
+            note=f"Rejected: {rejection_reason}",
+            extra_values={'rejection_reason': rejection_reason},
+            skip_stages=('hired',),
+            performed_by_id=performed_by_id,
+            notify_candidates=notify_candidates
+        )
         return {
-            "success_count": success_count,
+            "success_count": len(updated),
             "failed_count": len(failed_ids),
             "failed_ids": failed_ids,
-            "message": f"Successfully rejected {success_count} candidates"
+            "message": f"Successfully rejected {len(updated)} candidates"
         }
 
-    # =========================================================================
-    # ENHANCED ANALYTICS
-    # =========================================================================
-
-    async def get_recruitment_metrics(self, session: AsyncSession) -> Dict[str, Any]:
-        """Get detailed recruitment metrics for dashboard and analytics."""
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-
-        # Request counts
-        total_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id))
-        )
-        active_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                RecruitmentRequest.status.in_(['pending', 'approved'])
-            )
-        )
-        filled_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                RecruitmentRequest.status == 'filled'
-            )
-        )
-        cancelled_requests = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                RecruitmentRequest.status == 'cancelled'
-            )
-        )
-
-        # Total candidates
-        total_candidates = await session.execute(
-            select(func.count(Candidate.id))
-        )
-
-        # Pipeline counts
-        pipeline_counts = await self.get_pipeline_counts(session)
-
-        # By source
-        source_result = await session.execute(
-            select(Candidate.source, func.count(Candidate.id))
-            .where(Candidate.source.isnot(None))
-            .group_by(Candidate.source)
-        )
-        by_source = {row[0]: row[1] for row in source_result.all()}
-
-        # By status
-        status_result = await session.execute(
-            select(Candidate.status, func.count(Candidate.id))
-            .group_by(Candidate.status)
-        )
-        by_status = {row[0]: row[1] for row in status_result.all()}
+    async def _bulk_transition(
+        self,
+        session: AsyncSession,
+        candidate_ids: List[int],
+        new_stage: str,
+        note: Optional[str] = None,
+        extra_values: Optional[Dict[str, Any]] = None,
+        skip_stages: Tuple[str, ...] = (),
+        performed_by_id: Optional[str] = None,
+        notify_candidates: bool = False
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Move candidates to ``new_stage`` in chunks of ``BULK_CHUNK_SIZE``.
 
-        # Recent hires
-        recent_hires = await session.execute(
-            select(func.count(Candidate.id)).where(
-                and_(
-                    Candidate.stage == 'hired',
-                    Candidate.stage_changed_at >= thirty_days_ago
-                )
+        Each chunk is one locking SELECT of the prior stages and one
+        ``UPDATE ... WHERE id IN (...) RETURNING id``; transitions and
+        activity rows are then inserted in bulk and everything commits
+        together. Candidate emails are queued after the commit. Returns the
+        updated IDs and the IDs that were missing or skipped.
+        """
+        now = datetime.now()
+        ids = list(dict.fromkeys(candidate_ids))
+        values: Dict[str, Any] = {
+            'stage': new_stage,
+            'status': new_stage,
+            'stage_changed_at': now,
+            **(extra_values or {}),
+        }
+        if note:
+            entry = f"[{now.strftime('%Y-%m-%d %H:%M')}] {note}"
+            values['recruiter_notes'] = case(
+                (func.coalesce(Candidate.recruiter_notes, '') == '', entry),
+                else_=Candidate.recruiter_notes + '\n' + entry
             )
-        )
 
-        # Pending interviews
-        pending_interviews = await session.execute(
-            select(func.count(Candidate.id)).where(
-                and_(
-                    Candidate.stage == 'interview',
-                    Candidate.status != 'completed'
+        updated: List[int] = []
+        transitions: List[Dict[str, Any]] = []
+        activities: List[Dict[str, Any]] = []
+        recipients: List[Tuple[int, str, str]] = []
+        for start in range(0, len(ids), BULK_CHUNK_SIZE):
+            chunk = ids[start:start + BULK_CHUNK_SIZE]
+            result = await session.execute(
+                select(
+                    Candidate.id, Candidate.recruitment_request_id, Candidate.stage,
+                    Candidate.stage_changed_at, Candidate.created_at,
+                    Candidate.email, Candidate.full_name
                 )
+                .where(Candidate.id.in_(chunk))
+                .with_for_update()
             )
-        )
+            before = {row.id: row for row in result.all() if row.stage not in skip_stages}
+            if not before:
+                continue
 
-        # Pending offers
-        pending_offers = await session.execute(
-            select(func.count(Candidate.id)).where(
-                and_(
-                    Candidate.stage == 'offer',
-                    Candidate.status.in_(['offer', 'in_preparation', 'released'])
-                )
+            result = await session.execute(
+                update(Candidate)
+                .where(Candidate.id.in_(list(before)))
+                .values(**values)
+                .returning(Candidate.id)
+                .execution_options(synchronize_session=False)
             )
-        )
-
-        # Priority counts
-        priority_result = await session.execute(
-            select(RecruitmentRequest.priority, func.count(RecruitmentRequest.id))
-            .where(RecruitmentRequest.status.in_(['pending', 'approved']))
-            .group_by(RecruitmentRequest.priority)
-        )
-        by_priority = {row[0] or 'normal': row[1] for row in priority_result.all()}
-
-        # Calculate conversion rates
-        total_cand = total_candidates.scalar() or 0
-        screening_count = pipeline_counts.get('screening', 0) + pipeline_counts.get('interview', 0) + pipeline_counts.get('offer', 0) + pipeline_counts.get('hired', 0)
-        interview_count = pipeline_counts.get('interview', 0) + pipeline_counts.get('offer', 0) + pipeline_counts.get('hired', 0)
-        offer_count = pipeline_counts.get('offer', 0) + pipeline_counts.get('hired', 0)
-        hired_count = pipeline_counts.get('hired', 0)
-
-        applied_count = pipeline_counts.get('applied', 0) + screening_count
-
-        app_to_screen_rate = (screening_count / applied_count * 100) if applied_count > 0 else None
-        screen_to_interview_rate = (interview_count / screening_count * 100) if screening_count > 0 else None
-        interview_to_offer_rate = (offer_count / interview_count * 100) if interview_count > 0 else None
-        offer_accept_rate = (hired_count / offer_count * 100) if offer_count > 0 else None
-
-        # Overdue requests (past target hire date)
-        overdue = await session.execute(
-            select(func.count(RecruitmentRequest.id)).where(
-                and_(
-                    RecruitmentRequest.target_hire_date < date.today(),
-                    RecruitmentRequest.status.in_(['pending', 'approved'])
-                )
+            for candidate_id in result.scalars().all():
+                row = before[candidate_id]
+                updated.append(candidate_id)
+                if row.stage != new_stage:
+                    transitions.append(stage_transition(row, new_stage, now))
+                activities.append({
+                    'candidate_id': candidate_id,
+                    'stage': new_stage,
+                    'action_type': 'stage_changed',
+                    'action_description': note or f"Stage changed from {row.stage} to {new_stage}",
+                    'performed_by': 'hr',
+                    'performed_by_id': performed_by_id,
+                    'timestamp': datetime.utcnow(),
+                    'visibility': 'internal',
+                })
+                if notify_candidates and row.email:
+                    recipients.append((row.recruitment_request_id, row.email, row.full_name))
+
+        if activities:
+            await session.execute(insert(ActivityLog), activities)
+        await recruitment_metrics_service.record_transitions(session, transitions)
+
+        notifications = []
+        if recipients:
+            result = await session.execute(
+                select(RecruitmentRequest.id, RecruitmentRequest.position_title)
+                .where(RecruitmentRequest.id.in_({request_id for request_id, _, _ in recipients}))
             )
-        )
-
-        return {
-            "total_requests": total_requests.scalar() or 0,
-            "active_requests": active_requests.scalar() or 0,
-            "filled_requests": filled_requests.scalar() or 0,
-            "cancelled_requests": cancelled_requests.scalar() or 0,
-            "total_candidates": total_cand,
-            "candidates_by_stage": pipeline_counts,
-            "candidates_by_source": by_source,
-            "candidates_by_status": by_status,
-            "avg_time_to_fill": None,  # Would need historical data
-            "avg_time_in_screening": None,
-            "avg_time_to_offer": None,
-            "application_to_screening_rate": round(app_to_screen_rate, 1) if app_to_screen_rate else None,
-            "screening_to_interview_rate": round(screen_to_interview_rate, 1) if screen_to_interview_rate else None,
-            "interview_to_offer_rate": round(interview_to_offer_rate, 1) if interview_to_offer_rate else None,
-            "offer_acceptance_rate": round(offer_accept_rate, 1) if offer_accept_rate else None,
-            "recent_hires": recent_hires.scalar() or 0,
-            "pending_interviews": pending_interviews.scalar() or 0,
-            "pending_offers": pending_offers.scalar() or 0,
-            "overdue_requests": overdue.scalar() or 0,
-            "requests_by_priority": by_priority
-        }
-
+            titles = dict(result.all())
+            notifications = [
+                {"email": email, "full_name": full_name, "position_title": titles.get(request_id, "")}
+                for request_id, email, full_name in recipients
+            ]
 
-    async def bulk_update_candidate_stage(
-        self,
-        session: AsyncSession,
-        candidate_ids: List[int],
-        new_stage: str,
-        notes: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """
-        Bulk update candidate stages.
-        
-        Returns:
-            {"success_count": int, "failed_count": int, "failed_ids": List[int], "message": str}
-        """
-        success_count = 0
-        failed_count = 0
-        failed_ids = []
-        now = datetime.now()
-        
-        for candidate_id in candidate_ids:
-            try:
-                candidate = await self.get_candidate(session, candidate_id)
-                if not candidate:
-                    failed_count += 1
-                    failed_ids.append(candidate_id)
-                    continue
-                
-                candidate.stage = new_stage
-                candidate.stage_changed_at = now
-                candidate.status = new_stage  # Sync status with stage
-                
-                if notes:
-                    # Append notes to recruiter_notes
-                    timestamp = now.strftime("%Y-%m-%d %H:%M")
-                    note_entry = f"[{timestamp}] Stage changed to {new_stage}: {notes}"
-                    if candidate.recruiter_notes:
-                        candidate.recruiter_notes += f"\n{note_entry}"
-                    else:
-                        candidate.recruiter_notes = note_entry
-                
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to update candidate {candidate_id}: {str(e)}")
-                failed_count += 1
-                failed_ids.append(candidate_id)
-        
         await session.commit()
-        
-        return {
-            "success_count": success_count,
-            "failed_count": failed_count,
-            "failed_ids": failed_ids,
-            "message": f"Successfully updated {success_count} candidates, {failed_count} failed"
-        }
+        recruitment_notification_service.enqueue_stage_updates(notifications, new_stage)
 
-    async def bulk_reject_candidates(
-        self,
-        session: AsyncSession,
-        candidate_ids: List[int],
-        rejection_reason: str
-    ) -> Dict[str, Any]:
-        """
-        Bulk reject candidates with reason.
-        
-        Returns:
-            {"success_count": int, "failed_count": int, "failed_ids": List[int], "message": str}
-        """
-        success_count = 0
-        failed_count = 0
-        failed_ids = []
-        now = datetime.now()
-        
-        for candidate_id in candidate_ids:
-            try:
-                candidate = await self.get_candidate(session, candidate_id)
-                if not candidate:
-                    failed_count += 1
-                    failed_ids.append(candidate_id)
-                    continue
-                
-                candidate.stage = "rejected"
-                candidate.status = "rejected"
-                candidate.stage_changed_at = now
-                candidate.rejection_reason = rejection_reason
-                
-                # Add note to recruiter_notes
-                timestamp = now.strftime("%Y-%m-%d %H:%M")
-                note_entry = f"[{timestamp}] Rejected: {rejection_reason}"
-                if candidate.recruiter_notes:
-                    candidate.recruiter_notes += f"\n{note_entry}"
-                else:
-                    candidate.recruiter_notes = note_entry
-                
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to reject candidate {candidate_id}: {str(e)}")
-                failed_count += 1
-                failed_ids.append(candidate_id)
-        
-        await session.commit()
-        
-        return {
-            "success_count": success_count,
-            "failed_count": failed_count,
-            "failed_ids": failed_ids,
-            "message": f"Successfully rejected {success_count} candidates, {failed_count} failed"
-        }
+        updated_set = set(updated)
+        return updated, [cid for cid in ids if cid not in updated_set]
+
+    # =========================================================================
+    # ENHANCED ANALYTICS
+    # =========================================================================
 
     async def get_recruitment_metrics(self, session: AsyncSession) -> Dict[str, Any]:
-        """
-        Get detailed recruitment metrics including time-to-hire and source effectiveness.
-        
-        Enhanced version of get_stats with additional analytics.
-        """
-        # Get basic stats first
-        stats = await self.get_stats(session)
-        
-        # Calculate time-to-hire average (from created_at to offer stage)
-        time_to_hire_query = select(
-            func.avg(
-                func.extract('epoch', Candidate.stage_changed_at - Candidate.created_at) / 86400
-            )
-        ).where(
-            and_(
-                Candidate.stage == "offer",
-                Candidate.stage_changed_at.isnot(None)
-            )
-        )
-        time_to_hire_result = await session.execute(time_to_hire_query)
-        avg_time_to_hire = time_to_hire_result.scalar()
-        
-        # Calculate source effectiveness (conversion rate from applied to hired by source)
-        source_effectiveness = {}
-        
-        # Get all unique sources
-        sources_query = select(Candidate.source).distinct().where(Candidate.source.isnot(None))
-        sources_result = await session.execute(sources_query)
-        sources = [row[0] for row in sources_result.fetchall()]
-        
-        for source in sources:
-            total_count = (await session.execute(
-                select(func.count()).select_from(Candidate).where(Candidate.source == source)
-            )).scalar() or 0
-            
-            hired_count = (await session.execute(
-                select(func.count()).select_from(Candidate).where(
-                    and_(Candidate.source == source, Candidate.stage == "hired")
-                )
-            )).scalar() or 0
-            
-            conversion_rate = round((hired_count / total_count * 100), 1) if total_count > 0 else 0
-            
-            source_effectiveness[source] = {
-                "total": total_count,
-                "hired": hired_count,
-                "conversion_rate": conversion_rate
-            }
-        
-        # Merge with basic stats
-        return {
-            **stats,
-            "avg_time_to_hire_days": round(avg_time_to_hire, 1) if avg_time_to_hire else None,
-            "source_effectiveness": source_effectiveness
-        }
+        """Get detailed recruitment metrics for dashboard and analytics."""
+        return await recruitment_metrics_service.get_metrics(session)
 
 
 # Singleton instance
@@ -0,0 +1,573 @@
+"""Bulk resume ingestion.
+
+A zip archive or a multi-file upload is streamed to a staging directory in
+``CHUNK_SIZE`` pieces (hashing as it goes) while the request is open; the
+rest runs as a background job:
+
+1. files whose content hash repeats within the upload, or matches a CV
+   already on the requisition, are marked duplicates without being parsed;
+2. the rest are parsed concurrently (warm resume-parser workers, falling back
+   to the extraction pool plus contact regexes when pyresparser is absent);
+3. candidates whose email or phone repeats, in the upload or on the
+   requisition, are marked duplicates;
+4. candidates and their recruitment passes are inserted ``INGEST_BATCH_SIZE``
+   at a time with pre-allocated numbers, and the CVs moved into storage;
+5. the requisition is pre-ranked and its top candidates queued for scoring.
+
+The job runs in the process that received the upload (the staged files are
+on its local disk), but its status and per-file progress are written to
+``resume_ingestion_jobs``/``resume_ingestion_files`` after each step, so a
+poll answered by any worker sees it.
+"""
+import asyncio
+import hashlib
+import re
+import secrets
+import shutil
+import uuid
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.time import get_utc_now
+from app.database import AsyncSessionLocal
+from app.models.passes import Pass
+from app.models.recruitment import Candidate, ResumeIngestionFile, ResumeIngestionJob
+from app.schemas.recruitment import CandidateCreate
+from app.services.cv_ranking import candidate_pre_ranker
+from app.services.cv_scoring_queue import CVScoringQueue, cv_scoring_queue
+from app.services.document_extraction import document_extractor
+from app.services.recruitment_metrics import entry_transition, recruitment_metrics_service
+from app.services.resume_parser import resume_parser_service
+
+logger = get_logger(__name__)
+
+RESUME_DIR = Path("storage/resumes")
+INCOMING_DIR = RESUME_DIR / "incoming"
+
+CHUNK_SIZE = 1024 * 1024
+MAX_FILE_SIZE = 10 * 1024 * 1024
+MAX_ARCHIVE_SIZE = 200 * 1024 * 1024
+MAX_INGEST_FILES = 500
+INGEST_BATCH_SIZE = 100
+MAX_NUMBER_ATTEMPTS = 3
+# Finished jobs kept for polling
+INGEST_JOB_RETENTION_DAYS = 30
+
+SUPPORTED_EXTENSIONS = set(resume_parser_service.SUPPORTED_FORMATS)
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?:\+|00)?\d[\d\s().-]{7,}\d")
+NAME_LINE_RE = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?: [A-Za-z][A-Za-z.'-]*){1,4}$")
+FILENAME_NOISE_RE = re.compile(r"\b(?:cv|resume|curriculum|vitae|final|updated|\d+)\b", re.IGNORECASE)
+
+
+class IngestionError(Exception):
+    """Upload rejected before a job was started."""
+
+
+@dataclass
+class IngestFile:
+    """Progress of one CV in an ingestion job."""
+
+    index: int
+    filename: str
+    status: str = "stored"  # stored, parsed, created, duplicate, failed
+    size: int = 0
+    content_hash: Optional[str] = None
+    candidate_id: Optional[int] = None
+    duplicate_of: Optional[int] = None
+    error: Optional[str] = None
+    path: Optional[Path] = None
+    contact: Dict = field(default_factory=dict)
+
+    def fail(self, error: str) -> None:
+        self.status = "failed"
+        self.error = error
+
+
+@dataclass
+class IngestJob:
+    job_id: str
+    recruitment_request_id: int
+    created_by: str
+    source: str
+    files: List[IngestFile] = field(default_factory=list)
+    status: str = "uploading"  # uploading, running, completed, failed
+    started_at: datetime = field(default_factory=get_utc_now)
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def total_files(self) -> int:
+        return len(self.files)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return dict(Counter(f.status for f in self.files))
+
+
+def contact_from_text(text: str, filename: str) -> Dict:
+    """Best-effort name/email/phone when the NLP parser is unavailable."""
+    email = EMAIL_RE.search(text)
+    phone = PHONE_RE.search(text)
+    name = next(
+        (line.strip() for line in text.splitlines()[:5] if NAME_LINE_RE.match(line.strip())),
+        None,
+    )
+    if not name:
+        stem = FILENAME_NOISE_RE.sub(" ", re.sub(r"[_\-.]+", " ", Path(filename).stem))
+        name = " ".join(stem.split()).title() or None
+    data = {
+        "name": name,
+        "email": email.group(0) if email else None,
+        "mobile_number": resume_parser_service._clean_phone(phone.group(0)) if phone else None,
+    }
+    data.update(resume_parser_service._extract_uae_specific_data(text))
+    return data
+
+
+def _extract_archive(archive: Path, dest: Path, start_index: int, limit: int) -> List[IngestFile]:
+    """Unpack supported CVs from a zip into ``dest`` (blocking)."""
+    files: List[IngestFile] = []
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                name = Path(info.filename).name
+                if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                if len(files) >= limit:
+                    raise IngestionError(f"Too many files; the limit is {MAX_INGEST_FILES} per upload")
+                entry = IngestFile(index=start_index + len(files), filename=name)
+                files.append(entry)
+                if Path(name).suffix.lower() not in SUPPORTED_EXTENSIONS:
+                    entry.fail("Unsupported file type")
+                    continue
+                if info.file_size > MAX_FILE_SIZE:
+                    entry.fail("File too large. Maximum size is 10 MB")
+                    continue
+                staged = _StagedFile(entry, dest)
+                with zf.open(info) as src:
+                    while (chunk := src.read(CHUNK_SIZE)) and staged.write(chunk):
+                        pass
+                staged.close()
+    except zipfile.BadZipFile as e:
+        raise IngestionError(f"Invalid zip archive: {e}")
+    finally:
+        archive.unlink(missing_ok=True)
+    return files
+
+
+class _StagedFile:
+    """Writes one CV to the staging dir, hashing and enforcing the size cap."""
+
+    def __init__(self, entry: IngestFile, dest: Path) -> None:
+        self.entry = entry
+        entry.path = dest / f"{entry.index:04d}_{entry.filename}"
+        self._digest = hashlib.sha256()
+        self._out = open(entry.path, "wb")
+
+    def write(self, chunk: bytes) -> bool:
+        """Append a chunk; False once the file is over the limit."""
+        self.entry.size += len(chunk)
+        if self.entry.size > MAX_FILE_SIZE:
+            return False
+        self._digest.update(chunk)
+        self._out.write(chunk)
+        return True
+
+    def close(self) -> None:
+        self._out.close()
+        if self.entry.size > MAX_FILE_SIZE:
+            self.entry.path.unlink(missing_ok=True)
+            self.entry.path = None
+            self.entry.fail("File too large. Maximum size is 10 MB")
+        else:
+            self.entry.content_hash = self._digest.hexdigest()
+
+
+class ResumeIngestionService:
+    """Runs bulk CV uploads as background jobs."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        scoring_queue: CVScoringQueue = cv_scoring_queue,
+        parse_concurrency: Optional[int] = None,
+        llm_top_n: Optional[int] = None,
+    ) -> None:
+        settings = get_settings()
+        self._session_factory = session_factory
+        self._scoring_queue = scoring_queue
+        self.parse_concurrency = parse_concurrency or settings.resume_parser_workers * 2
+        # Setting 0 = score everyone
+        self.llm_top_n = llm_top_n if llm_top_n is not None else (settings.cv_llm_top_n or None)
+        # Jobs running in this process
+        self._jobs: Dict[str, IngestJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def get_job(self, session: AsyncSession, job_id: str) -> Optional[ResumeIngestionJob]:
+        """Persisted job with its files, whichever worker is running it."""
+        result = await session.execute(
+            select(ResumeIngestionJob)
+            .options(selectinload(ResumeIngestionJob.files))
+            .where(ResumeIngestionJob.job_id == job_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def wait(self, job_id: str) -> Optional[IngestJob]:
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self._jobs.get(job_id)
+
+    async def submit(
+        self, request_id: int, uploads: List[UploadFile], created_by: str, source: str = "Bulk Upload"
+    ) -> IngestJob:
+        """Stage the uploaded files and start the job; raises IngestionError."""
+        job = IngestJob(job_id=uuid.uuid4().hex, recruitment_request_id=request_id, created_by=created_by, source=source)
+        staging = INCOMING_DIR / job.job_id
+        staging.mkdir(parents=True, exist_ok=True)
+        try:
+            await self._stage(job, uploads, staging)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if not job.files:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise IngestionError("No CV files found in the upload")
+
+        self._forget_finished()
+        job.status = "running"
+        try:
+            await self._create_job(job)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job, staging))
+        return job
+
+    async def _stage(self, job: IngestJob, uploads: List[UploadFile], staging: Path) -> None:
+        for upload in uploads:
+            name = Path(upload.filename or "upload").name
+            if Path(name).suffix.lower() == ".zip":
+                archive = staging / f"archive_{uuid.uuid4().hex}.zip"
+                size = 0
+                with open(archive, "wb") as out:
+                    while chunk := await upload.read(CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > MAX_ARCHIVE_SIZE:
+                            raise IngestionError("Archive too large. Maximum size is 200 MB")
+                        out.write(chunk)
+                job.files += await asyncio.to_thread(
+                    _extract_archive, archive, staging, len(job.files), MAX_INGEST_FILES - len(job.files)
+                )
+                continue
+
+            if len(job.files) >= MAX_INGEST_FILES:
+                raise IngestionError(f"Too many files; the limit is {MAX_INGEST_FILES} per upload")
+            entry = IngestFile(index=len(job.files), filename=name)
+            job.files.append(entry)
+            if Path(name).suffix.lower() not in SUPPORTED_EXTENSIONS:
+                entry.fail("Unsupported file type")
+                continue
+            staged = _StagedFile(entry, staging)
+            while (chunk := await upload.read(CHUNK_SIZE)) and staged.write(chunk):
+                pass
+            staged.close()
+
+    def _forget_finished(self) -> None:
+        # Finished jobs are read back from the database
+        for job in [j for j in self._jobs.values() if j.status in ("completed", "failed")]:
+            self._jobs.pop(job.job_id, None)
+            self._tasks.pop(job.job_id, None)
+
+    async def _create_job(self, job: IngestJob) -> None:
+        """Insert the job and its file rows, dropping jobs past retention."""
+        cutoff = get_utc_now() - timedelta(days=INGEST_JOB_RETENTION_DAYS)
+        expired = select(ResumeIngestionJob.job_id).where(ResumeIngestionJob.finished_at < cutoff)
+        async with self._session_factory() as session:
+            await session.execute(delete(ResumeIngestionFile).where(ResumeIngestionFile.job_id.in_(expired)))
+            await session.execute(delete(ResumeIngestionJob).where(ResumeIngestionJob.finished_at < cutoff))
+            await session.execute(insert(ResumeIngestionJob).values(
+                job_id=job.job_id,
+                recruitment_request_id=job.recruitment_request_id,
+                created_by=job.created_by,
+                source=job.source,
+                status=job.status,
+                total_files=job.total_files,
+                started_at=job.started_at,
+            ))
+            await session.execute(insert(ResumeIngestionFile), [
+                {"job_id": job.job_id, "index": entry.index, "filename": entry.filename, **_file_progress(entry)}
+                for entry in job.files
+            ])
+            await session.commit()
+
+    async def _save(self, job: IngestJob, files: Optional[List[IngestFile]] = None) -> None:
+        """Write the job's status and the progress of ``files`` (default: all)."""
+        files = job.files if files is None else files
+        async with self._session_factory() as session:
+            if files:
+                await session.execute(
+                    update(ResumeIngestionFile),
+                    [{"job_id": job.job_id, "index": entry.index, **_file_progress(entry)} for entry in files],
+                )
+            await session.execute(
+                update(ResumeIngestionJob)
+                .where(ResumeIngestionJob.job_id == job.job_id)
+                .values(status=job.status, error=job.error and job.error[:500], finished_at=job.finished_at)
+            )
+            await session.commit()
+
+    # ---- background job --------------------------------------------------------
+
+    async def _run(self, job: IngestJob, staging: Path) -> None:
+        request_id = job.recruitment_request_id
+        try:
+            stored = [f for f in job.files if f.status == "stored"]
+            pending = await self._drop_duplicate_files(request_id, stored)
+            await self._save(job, stored)
+            await self._parse_all(pending)
+            pending = await self._drop_duplicate_contacts(request_id, [f for f in pending if f.status == "parsed"])
+            await self._save(job, stored)
+
+            for start in range(0, len(pending), INGEST_BATCH_SIZE):
+                batch = pending[start:start + INGEST_BATCH_SIZE]
+                await self._insert_batch(job, batch)
+                await self._save(job, batch)
+
+            if any(f.status == "created" for f in job.files):
+                async with self._session_factory() as session:
+                    await candidate_pre_ranker.rank_and_queue(
+                        session, request_id, self.llm_top_n, queue=self._scoring_queue
+                    )
+            job.status = "completed"
+            logger.info(f"Resume ingestion {job.job_id} for request {request_id}: {job.counts}")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            for entry in job.files:
+                if entry.status in ("stored", "parsed"):
+                    entry.fail("Ingestion stopped")
+            logger.error(f"Resume ingestion {job.job_id} failed: {e}")
+        finally:
+            job.finished_at = get_utc_now()
+            shutil.rmtree(staging, ignore_errors=True)
+            try:
+                await self._save(job)
+            except Exception as e:
+                logger.error(f"Could not save resume ingestion {job.job_id}: {e}")
+
+    async def _drop_duplicate_files(self, request_id: int, files: List[IngestFile]) -> List[IngestFile]:
+        """Skip CVs already on the requisition or repeated in this upload."""
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Candidate.resume_hash, Candidate.id).where(
+                    Candidate.recruitment_request_id == request_id,
+                    Candidate.resume_hash.in_({f.content_hash for f in files}),
+                )
+            )
+            known: Dict[str, Optional[int]] = dict(result.all())
+        unique = []
+        first_index: Dict[str, int] = {}
+        for entry in files:
+            if entry.content_hash in known:
+                entry.status = "duplicate"
+                entry.duplicate_of = known[entry.content_hash]
+                entry.error = "Same CV already on this requisition"
+            elif entry.content_hash in first_index:
+                entry.status = "duplicate"
+                entry.error = f"Same CV as file #{first_index[entry.content_hash]} in this upload"
+            else:
+                first_index[entry.content_hash] = entry.index
+                unique.append(entry)
+        return unique
+
+    async def _parse_all(self, files: List[IngestFile]) -> None:
+        semaphore = asyncio.Semaphore(self.parse_concurrency)
+
+        async def parse(entry: IngestFile) -> None:
+            async with semaphore:
+                try:
+                    content = await asyncio.to_thread(entry.path.read_bytes)
+                    parsed = await resume_parser_service.parse_bytes(content, entry.filename)
+                    if parsed.get("parsed"):
+                        contact = parsed
+                    else:
+                        text = await document_extractor.extract(content, entry.filename)
+                        contact = contact_from_text(text or "", entry.filename)
+                except OSError as e:
+                    entry.fail(str(e))
+                    return
+                if not contact.get("email"):
+                    entry.fail("No email address found in CV")
+                    return
+                entry.contact = contact
+                entry.status = "parsed"
+
+        await asyncio.gather(*(parse(entry) for entry in files))
+
+    async def _drop_duplicate_contacts(self, request_id: int, files: List[IngestFile]) -> List[IngestFile]:
+        """Skip candidates whose email or phone is already on the requisition or in this upload."""
+        emails = {f.contact["email"].lower() for f in files}
+        phones = {f.contact["mobile_number"] for f in files if f.contact.get("mobile_number")}
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(Candidate.id, Candidate.email, Candidate.phone).where(
+                    Candidate.recruitment_request_id == request_id,
+                    or_(func.lower(Candidate.email).in_(emails), Candidate.phone.in_(phones)),
+                )
+            )
+            rows = result.all()
+        by_email = {row.email.lower(): row.id for row in rows}
+        by_phone = {row.phone: row.id for row in rows if row.phone}
+
+        unique = []
+        seen: Dict[str, int] = {}
+        for entry in files:
+            email = entry.contact["email"].lower()
+            phone = entry.contact.get("mobile_number")
+            existing = by_email.get(email) or (by_phone.get(phone) if phone else None)
+            if existing:
+                entry.status = "duplicate"
+                entry.duplicate_of = existing
+                entry.error = "Candidate with this email or phone already on this requisition"
+                continue
+            earlier = seen.get(email) if email in seen else (seen.get(phone) if phone else None)
+            if earlier is not None:
+                entry.status = "duplicate"
+                entry.error = f"Same email or phone as file #{earlier} in this upload"
+                continue
+            seen[email] = entry.index
+            if phone:
+                seen[phone] = entry.index
+            unique.append(entry)
+        return unique
+
+    async def _insert_batch(self, job: IngestJob, files: List[IngestFile]) -> None:
+        """Insert one batch of candidates and passes in a single transaction."""
+        candidates = []
+        for entry in files:
+            contact = entry.contact
+            try:
+                data = CandidateCreate(
+                    recruitment_request_id=job.recruitment_request_id,
+                    full_name=contact.get("name") or "Unknown",
+                    email=contact["email"],
+                    phone=contact.get("mobile_number"),
+                    current_position=(contact.get("designation") or [None])[0],
+                    current_company=(contact.get("company_names") or [None])[0],
+                    years_experience=contact.get("total_experience"),
+                    source=job.source,
+                    emirates_id=contact.get("emirates_id"),
+                    visa_status=contact.get("visa_status"),
+                )
+            except ValidationError as e:
+                entry.fail(f"Invalid candidate data: {e.errors()[0]['msg']}")
+                continue
+            candidates.append((entry, data))
+        if not candidates:
+            return
+
+        for attempt in range(1, MAX_NUMBER_ATTEMPTS + 1):
+            async with self._session_factory() as session:
+                try:
+                    ids = await self._insert_rows(session, job, candidates)
+                    await session.commit()
+                    break
+                except IntegrityError:
+                    # A candidate or pass number was taken concurrently
+                    await session.rollback()
+                    if attempt == MAX_NUMBER_ATTEMPTS:
+                        raise
+
+        for (entry, _), (candidate_id, resume_path) in zip(candidates, ids):
+            await asyncio.to_thread(shutil.move, entry.path, resume_path)
+            entry.candidate_id = candidate_id
+            entry.status = "created"
+
+    async def _insert_rows(
+        self, session: AsyncSession, job: IngestJob, candidates: List[Tuple[IngestFile, CandidateCreate]]
+    ) -> List[Tuple[int, str]]:
+        today = date.today()
+        candidate_numbers = await _next_numbers(session, Candidate.candidate_number, "CAN", len(candidates))
+        pass_numbers = await _next_numbers(session, Pass.pass_number, "REC", len(candidates))
+        now = datetime.now()
+
+        candidate_rows = []
+        pass_rows = []
+        for (entry, data), number, pass_number in zip(candidates, candidate_numbers, pass_numbers):
+            resume_path = str(RESUME_DIR / f"{number}_{entry.filename}")
+            candidate_rows.append({
+                **data.model_dump(exclude={"references"}, exclude_none=True),
+                "candidate_number": number,
+                "pass_number": pass_number,
+                "pass_token": secrets.token_hex(32),
+                "stage": "applied",
+                "status": "applied",
+                "stage_changed_at": now,
+                "resume_path": resume_path,
+                "resume_hash": entry.content_hash,
+            })
+            pass_rows.append({
+                "pass_number": pass_number,
+                "pass_type": "recruitment",
+                "full_name": data.full_name,
+                "email": data.email,
+                "phone": data.phone,
+                "position": data.current_position,
+                "valid_from": today,
+                "valid_until": today + timedelta(days=60),
+                "purpose": f"Candidate application (Ref: {number})",
+                "status": "active",
+                "created_by": job.created_by,
+            })
+
+        await session.execute(insert(Pass), pass_rows)
+        result = await session.execute(
+            insert(Candidate).returning(Candidate.id, Candidate.resume_path, sort_by_parameter_order=True),
+            candidate_rows,
+        )
+        created = [tuple(row) for row in result.all()]
+        await recruitment_metrics_service.record_transitions(
+            session, [entry_transition(candidate_id, job.recruitment_request_id, now) for candidate_id, _ in created]
+        )
+        return created
+
+
+def _file_progress(entry: IngestFile) -> Dict:
+    return {
+        "status": entry.status,
+        "size": entry.size,
+        "candidate_id": entry.candidate_id,
+        "duplicate_of": entry.duplicate_of,
+        "error": entry.error and entry.error[:500],
+    }
+
+
+async def _next_numbers(session: AsyncSession, column, prefix: str, count: int) -> List[str]:
+    """``count`` sequential PREFIX-YYYYMMDD-NNNN numbers after today's highest."""
+    today = date.today().strftime('%Y%m%d')
+    result = await session.execute(select(func.max(column)).where(column.like(f"{prefix}-{today}-%")))
+    max_number = result.scalar()
+    try:
+        last_seq = int(max_number.split('-')[-1]) if max_number else 0
+    except ValueError:
+        last_seq = 0
+    return [f"{prefix}-{today}-{last_seq + k:04d}" for k in range(1, count + 1)]
+
+
+resume_ingestion_service = ResumeIngestionService()
@@ -1,9 +1,24 @@
-"""Automated resume parsing service using pyresparser."""
-from typing import Dict, Optional
+"""Automated resume parsing service using pyresparser.
+
+``pyresparser.ResumeParser`` calls ``spacy.load`` for two models on every
+construction, which costs seconds per resume. Parsing therefore runs in a
+small pool of long-lived worker processes: each worker memoizes
+``spacy.load`` and loads the models once when it starts (the pool is warmed
+at application startup), so a parse costs only extraction and inference.
+Resumes are passed to the workers as in-memory bytes; no temp file is
+written.
+"""
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import re
 import logging
 
+from app.core.config import get_settings
+
 # Try to import pyresparser - it's optional and may not be installed
 try:
     from pyresparser import ResumeParser
@@ -13,13 +28,54 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Emirates ID (format: 784-XXXX-XXXXXXX-X)
+EMIRATES_ID_RE = re.compile(r'784[-\s]?\d{4}[-\s]?\d{7}[-\s]?\d{1}')
+EMIRATES_ID_SEPARATORS_RE = re.compile(r'[-\s]')
+DIGITS_RE = re.compile(r'\d+')
+
+# Visa status keywords, checked in order, with up to 30 characters of context
+VISA_KEYWORDS = [
+    'employment visa', 'work permit', 'residence visa',
+    'golden visa', 'visit visa', 'tourist visa',
+    'freelance visa', 'investor visa'
+]
+VISA_PATTERNS = [
+    (keyword, re.compile(rf'.{{0,30}}{re.escape(keyword)}.{{0,30}}', re.IGNORECASE))
+    for keyword in VISA_KEYWORDS
+]
+
+
+def _init_parser_worker() -> None:
+    """Load the spaCy models once per worker process."""
+    import functools
+    import os
+    import spacy
+    import pyresparser.resume_parser
+
+    spacy.load = functools.lru_cache(maxsize=None)(spacy.load)
+    spacy.load('en_core_web_sm')
+    spacy.load(os.path.dirname(os.path.abspath(pyresparser.resume_parser.__file__)))
+
+
+def _warm_parser_worker() -> bool:
+    return True
+
+
+def _parse_in_worker(content: bytes, filename: str) -> Dict:
+    """Run pyresparser on in-memory bytes (blocking; runs in the pool)."""
+    resume = io.BytesIO(content)
+    resume.name = filename  # pyresparser picks the extractor from the name
+    return ResumeParser(resume).get_extracted_data()
+
 
 class ResumeParserService:
     """Service for parsing resumes using NLP."""
 
     SUPPORTED_FORMATS = ['.pdf', '.docx', '.doc', '.txt']
 
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or get_settings().resume_parser_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
         if not PYRESPARSER_AVAILABLE:
             logger.warning(
                 "Resume parsing functionality disabled - pyresparser not installed. "
@@ -30,13 +86,52 @@ class ResumeParserService:
         """Check if resume parsing is available."""
         return PYRESPARSER_AVAILABLE
 
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_parser_worker)
+        return self._pool
+
+    async def start(self) -> None:
+        """Start the workers and load their models before the first upload."""
+        if not PYRESPARSER_AVAILABLE:
+            return
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(*(loop.run_in_executor(pool, _warm_parser_worker) for _ in range(self.workers)))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
     async def parse_resume(self, file_path: str) -> Dict:
         """
-        Parse resume and extract structured data.
+        Parse a resume stored on disk.
 
         Args:
             file_path: Path to resume file
 
+        Returns:
+            Dict with extracted data (name, email, phone, skills, etc.)
+        """
+        try:
+            content = await asyncio.to_thread(Path(file_path).read_bytes)
+        except OSError as e:
+            return {'error': str(e), 'parsed': False}
+        return await self.parse_bytes(content, Path(file_path).name)
+
+    async def parse_many(self, files: List[Tuple[bytes, str]]) -> List[Dict]:
+        """Parse ``(content, filename)`` pairs concurrently across the workers."""
+        return list(await asyncio.gather(*(self.parse_bytes(content, name) for content, name in files)))
+
+    async def parse_bytes(self, content: bytes, filename: str) -> Dict:
+        """
+        Parse an in-memory resume and extract structured data.
+
+        Args:
+            content: Resume file bytes
+            filename: Original filename (selects the format)
+
         Returns:
             Dict with extracted data (name, email, phone, skills, etc.)
         """
@@ -48,39 +143,38 @@ class ResumeParserService:
 
         try:
             # Validate file format
-            file_ext = Path(file_path).suffix.lower()
+            file_ext = Path(filename).suffix.lower()
             if file_ext not in self.SUPPORTED_FORMATS:
                 raise ValueError(f"Unsupported format: {file_ext}. Supported: {', '.join(self.SUPPORTED_FORMATS)}")
 
-            # Parse using pyresparser (NLP-powered)
-            parser = ResumeParser(file_path)
-            data = parser.get_extracted_data()
+            # Parse using pyresparser (NLP-powered) in a warm worker
+            loop = asyncio.get_running_loop()
+            pool = self._get_pool()
+            try:
+                data = await loop.run_in_executor(pool, _parse_in_worker, content, filename)
+            except BrokenProcessPool:
+                if self._pool is pool:
+                    self._pool = None
+                raise
 
             # Clean and structure data
             cleaned_data = self._clean_parsed_data(data)
 
             # Try to extract UAE-specific data from text content
             try:
-                # Try to read file as text with different encodings
                 text_content = ""
-                file_ext = Path(file_path).suffix.lower()
-                
                 if file_ext == '.txt':
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        text_content = f.read()
-                else:
-                    # For PDF/DOCX, try to get text from parsed data
-                    # pyresparser extracts text internally
-                    if data:
-                        # Combine all text fields for UAE-specific extraction
-                        text_parts = []
-                        for key, value in data.items():
-                            if isinstance(value, str):
-                                text_parts.append(value)
-                            elif isinstance(value, list):
-                                text_parts.extend([str(v) for v in value])
-                        text_content = ' '.join(text_parts)
-                
+                    text_content = content.decode('utf-8', errors='ignore')
+                elif data:
+                    # For PDF/DOCX, combine the parsed text fields
+                    text_parts = []
+                    for key, value in data.items():
+                        if isinstance(value, str):
+                            text_parts.append(value)
+                        elif isinstance(value, list):
+                            text_parts.extend([str(v) for v in value])
+                    text_content = ' '.join(text_parts)
+
                 if text_content:
                     uae_data = self._extract_uae_specific_data(text_content)
                     cleaned_data.update(uae_data)
@@ -161,7 +255,7 @@ class ResumeParserService:
         if isinstance(experience, str):
             try:
                 # Try to extract number from string
-                numbers = re.findall(r'\d+', experience)
+                numbers = DIGITS_RE.findall(experience)
                 if numbers:
                     return int(numbers[0])
             except (ValueError, IndexError):
@@ -173,26 +267,18 @@ class ResumeParserService:
         data = {}
 
         # Extract Emirates ID (format: 784-XXXX-XXXXXXX-X)
-        eid_pattern = r'784[-\s]?\d{4}[-\s]?\d{7}[-\s]?\d{1}'
-        eid_match = re.search(eid_pattern, text)
+        eid_match = EMIRATES_ID_RE.search(text)
         if eid_match:
             # Clean the Emirates ID
-            eid = eid_match.group(0)
-            eid = re.sub(r'[-\s]', '', eid)
+            eid = EMIRATES_ID_SEPARATORS_RE.sub('', eid_match.group(0))
             data['emirates_id'] = f"{eid[:3]}-{eid[3:7]}-{eid[7:14]}-{eid[14]}"
 
         # Extract Visa status keywords
-        visa_keywords = [
-            'employment visa', 'work permit', 'residence visa',
-            'golden visa', 'visit visa', 'tourist visa',
-            'freelance visa', 'investor visa'
-        ]
         text_lower = text.lower()
-        for keyword in visa_keywords:
+        for keyword, pattern in VISA_PATTERNS:
             if keyword in text_lower:
                 # Try to extract surrounding context
-                pattern = rf'.{{0,30}}{re.escape(keyword)}.{{0,30}}'
-                match = re.search(pattern, text, re.IGNORECASE)
+                match = pattern.search(text)
                 if match:
                     data['visa_status'] = match.group(0).strip()
                 else:
@@ -0,0 +1,218 @@
+"""Working-day calendar engine.
+
+Active public holidays are loaded once per ``public_holidays`` cache version
+into a per-year bitmap (one flag per day of the year) plus a NumPy business-day
+calendar per weekend pattern. Working-day counts for a range are then a single
+``numpy.busday_count`` call, independent of the range length, and many ranges
+can be evaluated in one vectorized call (balance recomputation, payroll).
+The holidays themselves sit in an interval index, so "which holiday is this",
+range listings and "next holiday" (clock-in reminders, holiday check
+endpoints) are bisects that never touch the database.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import VersionedCache, bump_cache_version
+from app.core.interval_index import IntervalIndex
+from app.models.public_holiday import PublicHoliday
+
+HOLIDAYS_CACHE_SCOPE = "public_holidays"
+
+DEFAULT_WORK_SCHEDULE = "5 days"
+
+# Mon..Sun working-day masks per Employee.work_schedule
+# 5-day week: Friday + Saturday off; 6-day week: Friday off
+WEEKMASKS = {
+    "5 days": "1111001",
+    "6 days": "1111011",
+}
+
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+def weekmask_for(work_schedule: Optional[str]) -> str:
+    """Resolve an employee work_schedule ("5 days" / "6 days") to a weekmask."""
+    if work_schedule and "6" in work_schedule:
+        return WEEKMASKS["6 days"]
+    return WEEKMASKS[DEFAULT_WORK_SCHEDULE]
+
+
+@dataclass(frozen=True)
+class HolidayInfo:
+    """Detached copy of an active PublicHoliday row."""
+
+    id: int
+    name: str
+    name_arabic: Optional[str]
+    start_date: date
+    end_date: date
+    year: int
+    holiday_type: str
+    is_paid: bool
+    description: Optional[str]
+    is_active: bool
+    created_at: Optional[datetime]
+
+
+class WorkCalendar:
+    """Immutable holiday calendar with O(1) day lookups and range counts."""
+
+    def __init__(self, holidays: Iterable[HolidayInfo]) -> None:
+        self._index: IntervalIndex[HolidayInfo] = IntervalIndex(
+            holidays, attrgetter("start_date", "end_date")
+        )
+        days = set()
+        for holiday in self._index:
+            current = holiday.start_date
+            while current <= holiday.end_date:
+                days.add(current)
+                current += timedelta(days=1)
+
+        self._holidays = np.array(sorted(days), dtype="datetime64[D]")
+        self._bitmaps: Dict[int, np.ndarray] = {}
+        for day in days:
+            bitmap = self._bitmaps.get(day.year)
+            if bitmap is None:
+                bitmap = np.zeros(366, dtype=bool)
+                self._bitmaps[day.year] = bitmap
+            bitmap[day.timetuple().tm_yday - 1] = True
+        self._calendars: Dict[Tuple[str, bool], np.busdaycalendar] = {}
+
+    def _calendar(self, weekmask: str, exclude_holidays: bool) -> np.busdaycalendar:
+        key = (weekmask, exclude_holidays)
+        calendar = self._calendars.get(key)
+        if calendar is None:
+            holidays = self._holidays if exclude_holidays else []
+            calendar = np.busdaycalendar(weekmask=weekmask, holidays=holidays)
+            self._calendars[key] = calendar
+        return calendar
+
+    def is_holiday(self, day: date) -> bool:
+        bitmap = self._bitmaps.get(day.year)
+        return bool(bitmap is not None and bitmap[day.timetuple().tm_yday - 1])
+
+    def holiday_on(self, day: date) -> Optional[HolidayInfo]:
+        """The holiday covering ``day``, or None."""
+        return self._index.at(day) if self.is_holiday(day) else None
+
+    def holidays_in_range(self, start: date, end: date) -> List[HolidayInfo]:
+        """Holidays intersecting the inclusive range, ordered by start date."""
+        return self._index.overlapping(start, end)
+
+    def next_holiday(self, day: date) -> Optional[HolidayInfo]:
+        """The holiday in progress on ``day`` or, failing that, the next one to start."""
+        return self._index.next_from(day)
+
+    def is_weekend(self, day: date, work_schedule: Optional[str] = None) -> bool:
+        return weekmask_for(work_schedule)[day.weekday()] == "0"
+
+    def is_working_day(
+        self, day: date, work_schedule: Optional[str] = None, exclude_holidays: bool = True
+    ) -> bool:
+        if self.is_weekend(day, work_schedule):
+            return False
+        return not (exclude_holidays and self.is_holiday(day))
+
+    def holiday_days(self, start: date, end: date) -> int:
+        """Number of holiday calendar days in the inclusive range."""
+        if end < start:
+            return 0
+        lo = np.searchsorted(self._holidays, np.datetime64(start, "D"), side="left")
+        hi = np.searchsorted(self._holidays, np.datetime64(end, "D"), side="right")
+        return int(hi - lo)
+
+    def working_days(
+        self,
+        start: date,
+        end: date,
+        work_schedule: Optional[str] = None,
+        exclude_holidays: bool = True,
+    ) -> int:
+        """Working days in the inclusive range for a weekend pattern."""
+        if end < start:
+            return 0
+        return int(
+            np.busday_count(
+                np.datetime64(start, "D"),
+                np.datetime64(end, "D") + _ONE_DAY,
+                busdaycal=self._calendar(weekmask_for(work_schedule), exclude_holidays),
+            )
+        )
+
+    def working_days_batch(
+        self,
+        starts: Sequence[date],
+        ends: Sequence[date],
+        work_schedules: Optional[Sequence[Optional[str]]] = None,
+        exclude_holidays: bool = True,
+    ) -> np.ndarray:
+        """
+        Vectorized working-day counts for many inclusive ranges.
+
+        ``work_schedules`` is either omitted (5-day week for every row) or one
+        schedule per row; rows are grouped by weekend pattern so each pattern
+        costs one ``busday_count`` call. Ranges with end < start count as 0.
+        """
+        begin = np.array(starts, dtype="datetime64[D]")
+        finish = np.array(ends, dtype="datetime64[D]") + _ONE_DAY
+        finish = np.maximum(finish, begin)
+        counts = np.zeros(len(begin), dtype=np.int64)
+        if not len(begin):
+            return counts
+
+        if work_schedules is None:
+            groups: Dict[str, List[int]] = {weekmask_for(None): list(range(len(begin)))}
+        else:
+            groups = {}
+            for i, schedule in enumerate(work_schedules):
+                groups.setdefault(weekmask_for(schedule), []).append(i)
+
+        for mask, rows in groups.items():
+            idx = np.array(rows)
+            counts[idx] = np.busday_count(
+                begin[idx], finish[idx], busdaycal=self._calendar(mask, exclude_holidays)
+            )
+        return counts
+
+
+async def _load_work_calendar(session: AsyncSession) -> WorkCalendar:
+    result = await session.execute(
+        select(
+            PublicHoliday.id,
+            PublicHoliday.name,
+            PublicHoliday.name_arabic,
+            PublicHoliday.start_date,
+            PublicHoliday.end_date,
+            PublicHoliday.year,
+            PublicHoliday.holiday_type,
+            PublicHoliday.is_paid,
+            PublicHoliday.description,
+            PublicHoliday.is_active,
+            PublicHoliday.created_at,
+        )
+        .where(PublicHoliday.is_active == True)
+        .order_by(PublicHoliday.id)
+    )
+    return WorkCalendar(HolidayInfo(*row) for row in result.all())
+
+
+_calendar_cache: VersionedCache[WorkCalendar] = VersionedCache(
+    HOLIDAYS_CACHE_SCOPE, _load_work_calendar
+)
+
+
+async def get_work_calendar(session: AsyncSession) -> WorkCalendar:
+    """Return the calendar for the current public-holiday version."""
+    return await _calendar_cache.get(session)
+
+
+async def invalidate_work_calendar(session: AsyncSession) -> None:
+    """Bump the public-holiday version (call in the same transaction as the write)."""
+    await bump_cache_version(session, HOLIDAYS_CACHE_SCOPE)
@@ -29,6 +29,11 @@ async def run_startup_migrations(session: AsyncSession):
         await ensure_admin_access(session)
         await backfill_line_manager_ids(session)
         await seed_nomination_settings(session)
+        await backfill_compliance_expiries(session)
+        await backfill_notification_counters(session)
+        await backfill_leave_ledger(session)
+        await backfill_offset_hours(session)
+        await backfill_stage_transitions(session)
         await session.commit()
         logger.info("Startup migrations completed successfully")
     except Exception as e:
@@ -301,3 +306,108 @@ async def backfill_line_manager_ids(session: AsyncSession):
     is_active_fixed = is_active_result.rowcount if hasattr(is_active_result, 'rowcount') else 0
     if is_active_fixed > 0:
         logger.info(f"Fixed {is_active_fixed} is_active flags to match employment_status")
+    
+    # Reporting lines changed - rebuild the cached org hierarchy in every worker
+    from app.services.org_hierarchy import invalidate_org_hierarchy
+    await invalidate_org_hierarchy(session)
+
+
+async def backfill_compliance_expiries(session: AsyncSession):
+    """Populate the compliance_expiries projection the first time it exists."""
+    try:
+        result = await session.execute(text("SELECT COUNT(*) FROM compliance_expiries"))
+        count = result.scalar() or 0
+    except Exception as e:
+        logger.warning(f"compliance_expiries table not accessible: {e}")
+        return
+    
+    if count > 0:
+        return
+    
+    from app.services.compliance_expiries import compliance_expiry_service
+    rows = await compliance_expiry_service.rebuild(session)
+    logger.info(f"Backfilled {rows} compliance expiry rows")
+
+
+async def backfill_notification_counters(session: AsyncSession):
+    """Seed per-user unread counters from existing notifications the first time."""
+    try:
+        result = await session.execute(text("SELECT COUNT(*) FROM notification_counters"))
+        count = result.scalar() or 0
+    except Exception as e:
+        logger.warning(f"notification_counters table not accessible: {e}")
+        return
+    
+    if count > 0:
+        return
+    
+    result = await session.execute(
+        text("""
+            INSERT INTO notification_counters (user_id, unread_count)
+            SELECT user_id, COUNT(*)
+            FROM notifications
+            WHERE user_id IS NOT NULL AND is_read = false
+            GROUP BY user_id
+        """)
+    )
+    seeded = result.rowcount if hasattr(result, 'rowcount') else 0
+    if seeded and seeded > 0:
+        logger.info(f"Seeded unread notification counters for {seeded} users")
+
+
+async def backfill_leave_ledger(session: AsyncSession):
+    """Convert balances to ledger semantics once, then seed an empty ledger with them."""
+    try:
+        result = await session.execute(text("SELECT COUNT(*) FROM leave_ledger_entries"))
+        count = result.scalar() or 0
+    except Exception as e:
+        logger.warning(f"leave_ledger_entries table not accessible: {e}")
+        return
+    
+    from app.services.leave_ledger import leave_ledger_service
+    if await leave_ledger_service.convert_balances(session):
+        logger.info("Converted leave balances to ledger semantics")
+    
+    if count > 0:
+        return
+    
+    entries = await leave_ledger_service.open_ledger(session)
+    if entries:
+        logger.info(f"Seeded leave ledger with {entries} opening entries")
+
+
+async def backfill_offset_hours(session: AsyncSession):
+    """Build the offset-hours ledger from attendance records the first time it exists."""
+    try:
+        result = await session.execute(text("SELECT COUNT(*) FROM offset_hours_entries"))
+        count = result.scalar() or 0
+    except Exception as e:
+        logger.warning(f"offset_hours_entries table not accessible: {e}")
+        return
+    
+    if count > 0:
+        return
+    
+    result = await session.execute(
+        text("SELECT COUNT(*) FROM attendance_records WHERE offset_hours_earned > 0")
+    )
+    if not result.scalar():
+        return
+    
+    from app.services.offset_hours import offset_hours_service
+    entries = await offset_hours_service.rebuild(session)
+    logger.info(f"Seeded offset hours ledger with {entries} entries")
+
+
+async def backfill_stage_transitions(session: AsyncSession):
+    """Give candidates that predate the stage transition log their entry transition."""
+    try:
+        await session.execute(text("SELECT 1 FROM recruitment_stage_stats LIMIT 1"))
+    except Exception as e:
+        logger.warning(f"recruitment_stage_stats table not accessible: {e}")
+        return
+    
+    from app.services.recruitment_metrics import recruitment_metrics_service
+    seeded = await recruitment_metrics_service.seed_entry_transitions(session)
+    if seeded:
+        logger.info(f"Seeded pipeline entry transitions for {seeded} candidates")
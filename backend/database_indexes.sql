@@ -26,6 +26,17 @@ CREATE INDEX IF NOT EXISTS idx_employees_emirates_id_expiry ON employees(emirate
 CREATE INDEX IF NOT EXISTS idx_employees_medical_expiry ON employees(medical_fitness_expiry) WHERE medical_fitness_expiry IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_employees_contract_expiry ON employees(contract_end_date) WHERE contract_end_date IS NOT NULL;
 
+-- Compliance expiry projection (alert buckets are range scans on expiry_date)
+CREATE INDEX IF NOT EXISTS ix_compliance_expiries_expiry_date ON compliance_expiries(expiry_date);
+CREATE INDEX IF NOT EXISTS ix_compliance_expiries_employee_id ON compliance_expiries(employee_id);
+
+-- Notification bell and audit log listings (keyset pagination)
+CREATE INDEX IF NOT EXISTS ix_notifications_user_read_created ON notifications(user_id, is_read, created_at);
+CREATE INDEX IF NOT EXISTS ix_audit_logs_entity_timestamp ON audit_logs(entity, timestamp);
+
+-- Timesheet month grid (status counts and pages per period)
+CREATE INDEX IF NOT EXISTS ix_timesheets_period_status ON timesheets(year, month, status);
+
 -- Onboarding tokens indexes
 CREATE INDEX IF NOT EXISTS idx_onboarding_tokens_employee_id ON onboarding_tokens(employee_id);
 CREATE INDEX IF NOT EXISTS idx_onboarding_tokens_is_used ON onboarding_tokens(is_used);
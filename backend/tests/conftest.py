@@ -5,8 +5,47 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
+
+
+@pytest.fixture
+def db_tables():
+    """Models created by ``db_engine``.
+
+    Override this fixture in a test module (or parametrize it) with the models
+    the tests touch; SQLite cannot create the full Postgres schema.
+    """
+    return ()
+
+
+@pytest.fixture
+async def db_engine(tmp_path, db_tables):
+    """A fresh SQLite database holding the tables named by ``db_tables``."""
+    import app.models  # noqa: F401 - configure mappers
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    # Models can live on different declarative bases, so group by metadata
+    by_metadata = {}
+    for model in db_tables:
+        by_metadata.setdefault(model.metadata, []).append(model.__table__)
+    async with engine.begin() as conn:
+        for metadata, tables in by_metadata.items():
+            await conn.run_sync(metadata.create_all, tables=tables)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def db_factory(db_engine):
+    return async_sessionmaker(db_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+@pytest.fixture
+async def db_session(db_factory):
+    async with db_factory() as session:
+        yield session
@@ -0,0 +1,60 @@
+import pytest
+
+from app.core.http_cache import SnapshotCache, etag_matches, make_etag
+from app.models.cache_version import CacheVersion
+from app.services import calendar_snapshots
+from app.services.calendar_snapshots import (
+    LEAVE_CALENDAR_SCOPES,
+    invalidate_leave_calendar,
+    serve_snapshot,
+)
+
+
+@pytest.fixture
+def db_tables():
+    return (CacheVersion,)
+
+
+def test_etag_matching_and_snapshot_eviction():
+    etag = make_etag("leave_calendar", 2026, 3)
+    assert etag.startswith('"') and etag == make_etag("leave_calendar", 2026, 3)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+
+    cache = SnapshotCache(maxsize=2)
+    cache.put("a", '"1"', [1])
+    cache.put("b", '"1"', [2])
+    assert cache.get("a", '"2"') is None
+    assert cache.get("a", '"1"') == [1]
+    cache.put("c", '"1"', [3])
+    assert cache.get("b", '"1"') is None
+
+
+@pytest.mark.anyio
+async def test_snapshot_revalidates_until_version_bump(db_session, monkeypatch):
+    monkeypatch.setattr(calendar_snapshots, "_snapshots", SnapshotCache())
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return [{"day": len(builds)}]
+
+    key = ("leave_calendar", 2026, 3)
+    first = await serve_snapshot(db_session, key, LEAVE_CALENDAR_SCOPES, build)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.body == b'[{"day":1}]'
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    again = await serve_snapshot(db_session, key, LEAVE_CALENDAR_SCOPES, build)
+    assert again.body == first.body and len(builds) == 1
+
+    revalidated = await serve_snapshot(db_session, key, LEAVE_CALENDAR_SCOPES, build, etag)
+    assert revalidated.status_code == 304
+
+    await invalidate_leave_calendar(db_session)
+    await db_session.commit()
+    rebuilt = await serve_snapshot(db_session, key, LEAVE_CALENDAR_SCOPES, build, etag)
+    assert rebuilt.status_code == 200 and rebuilt.headers["ETag"] != etag
+    assert rebuilt.body == b'[{"day":2}]'
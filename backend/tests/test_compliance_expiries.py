@@ -0,0 +1,53 @@
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import VersionedCache
+from app.services import compliance_expiries
+from app.services.compliance_expiries import ComplianceExpiryService
+
+
+class DummyResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+@pytest.mark.anyio
+async def test_alert_buckets_from_projection_rows(monkeypatch):
+    today = date(2026, 3, 1)
+    monkeypatch.setattr(compliance_expiries, "get_uae_today", lambda: today)
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=DummyResult([
+        ("EMP001", "Alice", "Visa", date(2026, 2, 20), "employee"),
+        ("EMP002", "Bob", "Emirates ID", date(2026, 3, 5), "employee"),
+        ("EMP003", "Cara", "Passport", date(2026, 3, 25), "document"),
+        ("EMP004", "Dan", "Contract", date(2026, 4, 20), "employee"),
+    ]))
+
+    alerts = await ComplianceExpiryService().get_alerts(session, days=90)
+
+    assert [a["employee_id"] for a in alerts["expired"]] == ["EMP001"]
+    assert alerts["expired"][0]["days_overdue"] == 9
+    assert [a["employee_id"] for a in alerts["days_7"]] == ["EMP002"]
+    assert [a["source"] for a in alerts["days_30"]] == ["document"]
+    assert [a["employee_id"] for a in alerts["days_custom"]] == ["EMP004"]
+
+
+@pytest.mark.anyio
+async def test_versioned_cache_reloads_only_when_version_moves(monkeypatch):
+    versions = iter([1, 1, 2])
+    monkeypatch.setattr(
+        cache_module, "get_cache_version", AsyncMock(side_effect=lambda *_: next(versions))
+    )
+    loader = AsyncMock(side_effect=["first", "second"])
+    cache = VersionedCache("test_scope", loader, check_interval=0)
+
+    assert await cache.get(None) == "first"
+    assert await cache.get(None) == "first"
+    assert await cache.get(None) == "second"
+    assert loader.await_count == 2
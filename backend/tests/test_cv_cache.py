@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import func, select
+
+import app.models  # noqa: F401 - configure mappers
+from app.models.cv_cache import CVScoreCache, CVTextCache
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_cache import CVCache, cv_cache, score_key
+from app.services.cv_scoring_service import StubCVScorer, score_candidate_cv, set_cv_scorer
+
+CV_BYTES = (
+    b"Data engineer with 5 years of experience in Python, Airflow and SQL warehouses. "
+    b"Master of Science in Computer Science."
+)
+
+
+class CountingScorer(StubCVScorer):
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze(self, *args, **kwargs):
+        self.calls += 1
+        return await super().analyze(*args, **kwargs)
+
+
+@pytest.fixture
+def db_tables():
+    return (RecruitmentRequest, Candidate, CVTextCache, CVScoreCache)
+
+
+@pytest.fixture
+async def session(db_session):
+    yield db_session
+    set_cv_scorer(None)
+    cv_cache.clear_memory()
+
+
+def test_score_key_ignores_skill_order_and_case():
+    a = score_key("cv", "Data Engineer", "Pipelines", ["SQL", "Python"], "gpt-4o-mini")
+    b = score_key("cv", "Data Engineer", "Pipelines", ["python", " sql "], "gpt-4o-mini")
+    assert a == b
+    assert a != score_key("cv", "Data Engineer", "Pipelines", ["python", "sql"], "stub")
+    assert a.cache_key != score_key("cv", "Data Engineer", "Streaming", ["python", "sql"], "gpt-4o-mini").cache_key
+
+
+@pytest.mark.anyio
+async def test_repeat_scoring_is_served_from_cache(session):
+    scorer = CountingScorer()
+    set_cv_scorer(scorer)
+    args = dict(job_title="Data Engineer", job_description="Build pipelines", required_skills=["Python", "Spark"])
+
+    first = await score_candidate_cv(1, CV_BYTES, "cv.txt", **args, db_session=session)
+    cv_cache.clear_memory()  # second lookup must come from the tables (as after a restart)
+    second = await score_candidate_cv(2, CV_BYTES, "cv.txt", **args, db_session=session)
+
+    assert first == second and scorer.calls == 1
+    hits = (await session.execute(select(CVScoreCache.hit_count))).scalar_one()
+    texts = (await session.execute(select(func.count()).select_from(CVTextCache))).scalar_one()
+    assert (hits, texts) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_eviction_keeps_most_recently_used(session):
+    set_cv_scorer(StubCVScorer())
+    cache = CVCache(max_entries=2)
+    for n in range(4):
+        await cache.extract_text(session, f"CV number {n} ".encode() * 10, "cv.txt")
+
+    assert await cache.evict(session) == 2
+    remaining = (await session.execute(select(func.count()).select_from(CVTextCache))).scalar_one()
+    assert remaining == 2
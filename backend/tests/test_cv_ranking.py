@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+import app.models  # noqa: F401 - configure mappers
+from app.models.cv_cache import CVScoreCache, CVTextCache
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_cache import cv_cache, requisition_hash
+from app.services.cv_ranking import (
+    CandidatePreRanker, cosine_scores, job_vector, pack_vector, unpack_vector, vectorize
+)
+
+JOB = ("Data Engineer", "Build Spark and Airflow pipelines on AWS", ["Spark", "Airflow", "AWS", "SQL"])
+CVS = {
+    1: "Retail sales associate, customer service and cash handling.",
+    2: "Data analyst using SQL and Excel dashboards.",
+    3: "Data engineer: Spark, Airflow and SQL pipelines on AWS for 6 years.",
+}
+
+
+def test_vectors_roundtrip_compactly():
+    vector = vectorize(CVS[3])
+    data = pack_vector(vector)
+    indices, weights = unpack_vector(data)
+
+    assert len(data) == 8 * len(indices)
+    assert np.array_equal(indices, vector[0]) and np.allclose(weights, vector[1])
+    assert np.all(np.diff(indices) > 0)
+    assert vectorize(CVS[3])[0].tolist() == indices.tolist()  # stable across calls
+
+
+def test_cosine_scores_rank_by_job_overlap():
+    scores = cosine_scores([vectorize(CVS[k]) for k in (1, 2, 3)], job_vector(*JOB))
+
+    assert list(np.argsort(-scores)) == [2, 1, 0]
+    assert scores[0] == 0.0 and 0.0 < scores[2] <= 1.0
+    assert cosine_scores([], job_vector(*JOB)).shape == (0,)
+
+
+@pytest.fixture
+def db_tables():
+    return (RecruitmentRequest, Candidate, CVTextCache, CVScoreCache)
+
+
+@pytest.fixture
+async def session(tmp_path, db_factory):
+    async with db_factory() as s:
+        s.add(RecruitmentRequest(
+            id=1, request_number="RR-1", position_title=JOB[0], department="IT", requested_by="HR",
+            employment_type="Full-time", job_description=JOB[1], required_skills=JOB[2],
+        ))
+        for cid, text in CVS.items():
+            resume = tmp_path / f"CAN-{cid}_cv.txt"
+            resume.write_text(text)
+            s.add(Candidate(id=cid, candidate_number=f"CAN-{cid}", recruitment_request_id=1,
+                            full_name=f"C{cid}", email=f"c{cid}@x.com", resume_path=str(resume)))
+        s.add(Candidate(id=4, candidate_number="CAN-4", recruitment_request_id=1, full_name="C4",
+                        email="c4@x.com", resume_path=str(tmp_path / "missing.pdf")))
+        await s.commit()
+        yield s
+    cv_cache.clear_memory()
+
+
+@pytest.mark.anyio
+async def test_pre_ranker_fills_similarity_and_screening_rank(session):
+    ranked = await CandidatePreRanker().rank(session, 1)
+
+    assert [cid for cid, _ in ranked] == [3, 2, 1]
+    rows = {c.id: c for c in (await session.execute(select(Candidate))).scalars()}
+    assert [rows[c].screening_rank for c in (3, 2, 1)] == [1, 2, 3]
+    assert rows[3].similarity_score == pytest.approx(ranked[0][1]) and rows[1].similarity_score == 0
+    assert all(rows[c].ai_ranking is None for c in CVS)
+    vectors = (await session.execute(select(Candidate.cv_vector).where(Candidate.id.in_(CVS)))).scalars()
+    assert all(vectors)
+    assert (rows[4].cv_scoring_status, rows[4].screening_rank) == ("failed", None)
+
+
+@pytest.mark.anyio
+async def test_llm_scores_rank_ahead_of_local_similarity(session):
+    ranker = CandidatePreRanker()
+    await ranker.rank(session, 1)
+    current, stale = await session.get(Candidate, 1), await session.get(Candidate, 2)
+    current.cv_scoring, current.cv_scored_job_hash = 40, requisition_hash(*JOB)
+    stale.cv_scoring, stale.cv_scored_job_hash = 95, requisition_hash("Data Engineer", "Old description", [])
+    await session.commit()
+
+    await ranker.rank(session, 1)  # vectors are reused, not rebuilt
+    rows = {c.id: c.screening_rank for c in (await session.execute(select(Candidate))).scalars()}
+    assert rows == {1: 1, 3: 2, 2: 3, 4: None}
+
+
+@pytest.mark.anyio
+async def test_rank_and_queue_rescores_stale_llm_scores(session):
+    class Queue:
+        async def enqueue(self, session, candidate_ids):
+            self.queued = candidate_ids
+
+    for cid, job_hash in ((3, requisition_hash(*JOB)), (2, "older job")):
+        candidate = await session.get(Candidate, cid)
+        candidate.cv_scoring, candidate.cv_scoring_status, candidate.cv_scored_job_hash = 80, "scored", job_hash
+    await session.commit()
+
+    queue = Queue()
+    _, to_score = await CandidatePreRanker().rank_and_queue(session, 1, top_n=2, queue=queue)
+    assert to_score == queue.queued == [2]
@@ -0,0 +1,145 @@
+import pytest
+from sqlalchemy import select
+
+import app.models  # noqa: F401 - configure mappers
+from app.models.cv_cache import CVScoreCache, CVTextCache
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_cache import cv_cache, requisition_hash
+from app.services.cv_rescoring import RequisitionRescorer
+from app.services.cv_scoring_service import StubCVScorer, set_cv_scorer
+
+SKILLS = ["Python", "FastAPI", "Kubernetes", "Terraform"]
+CVS = {
+    1: "Python developer with 3 years of experience. Bachelor of Science in Computer Science.",
+    2: "Python and FastAPI engineer with 6 years of experience running Kubernetes. Master of Science.",
+    3: "Platform engineer: Python, FastAPI, Kubernetes and Terraform, 9 years of experience. PhD.",
+}
+
+
+@pytest.fixture
+def db_tables():
+    return (RecruitmentRequest, Candidate, CVTextCache, CVScoreCache)
+
+
+@pytest.fixture
+async def factory(tmp_path, db_factory):
+    async with db_factory() as s:
+        s.add(RecruitmentRequest(
+            id=1, request_number="RR-1", position_title="Platform Engineer", department="IT",
+            requested_by="HR", employment_type="Full-time",
+            job_description="Run our platform", required_skills=SKILLS,
+        ))
+        for cid, text in CVS.items():
+            resume = tmp_path / f"CAN-{cid}_cv.txt"
+            resume.write_text(text)
+            s.add(Candidate(id=cid, candidate_number=f"CAN-{cid}", recruitment_request_id=1,
+                            full_name=f"C{cid}", email=f"c{cid}@x.com", resume_path=str(resume)))
+        s.add(Candidate(id=4, candidate_number="CAN-4", recruitment_request_id=1, full_name="C4",
+                        email="c4@x.com", resume_path=str(tmp_path / "missing.pdf"), screening_rank=1))
+        s.add(Candidate(id=5, candidate_number="CAN-5", recruitment_request_id=1, full_name="C5",
+                        email="c5@x.com"))
+        await s.commit()
+    set_cv_scorer(StubCVScorer())
+    yield db_factory
+    set_cv_scorer(None)
+    cv_cache.clear_memory()
+
+
+@pytest.mark.anyio
+async def test_rescore_writes_scores_failures_and_ranks(factory, monkeypatch):
+    monkeypatch.setattr("app.services.cv_rescoring.RESCORE_BATCH_SIZE", 2)
+    rescorer = RequisitionRescorer(session_factory=factory, concurrency=2, max_attempts=2, base_delay=0.01)
+
+    first = rescorer.start(1)
+    assert rescorer.start(1) is first  # already running
+    progress = await rescorer.wait(1)
+
+    assert (progress.status, progress.total, progress.scored, progress.failed) == ("completed", 4, 3, 1)
+    async with factory() as s:
+        rows = {c.id: c for c in (await s.execute(select(Candidate))).scalars()}
+        assert await rescorer.status_counts(s, 1) == {"scored": 3, "failed": 1}
+
+    assert rows[4].cv_scoring_status == "failed" and rows[4].screening_rank is None
+    assert rows[5].cv_scoring_status is None
+    scored = sorted((rows[c] for c in CVS), key=lambda c: c.screening_rank)
+    assert [c.screening_rank for c in scored] == [1, 2, 3]
+    assert [c.cv_scoring for c in scored] == sorted((c.cv_scoring for c in scored), reverse=True)
+    assert scored[0].id == 3 and scored[0].skills_match_score == 100
+
+
+@pytest.mark.anyio
+async def test_rescore_after_job_change_reuses_extracted_text(factory):
+    rescorer = RequisitionRescorer(session_factory=factory, concurrency=2)
+    rescorer.start(1)
+    await rescorer.wait(1)
+
+    async with factory() as s:
+        request = await s.get(RecruitmentRequest, 1)
+        request.required_skills = ["Python"]
+        await s.commit()
+    cv_cache.clear_memory()
+    second = rescorer.start(1)
+    await rescorer.wait(1)
+
+    async with factory() as s:
+        text_rows = (await s.execute(select(CVTextCache))).scalars().all()
+        score_rows = (await s.execute(select(CVScoreCache))).scalars().all()
+        skills = (await s.execute(select(Candidate.skills_match_score).where(Candidate.id.in_(CVS)))).scalars().all()
+    assert second.scored == 3
+    assert len(text_rows) == 3  # extraction cached across job changes
+    assert len(score_rows) == 6  # one score per (CV, job version)
+    assert set(skills) == {100}
+
+
+@pytest.mark.anyio
+async def test_rescore_sends_only_top_candidates_to_llm(factory):
+    async with factory() as s:
+        weak = await s.get(Candidate, 1)
+        weak.cv_scoring = 99  # scored against an older job description
+        await s.commit()
+
+    rescorer = RequisitionRescorer(session_factory=factory, concurrency=2, top_n=1)
+    rescorer.start(1)
+    progress = await rescorer.wait(1)
+
+    assert (progress.total, progress.scored, progress.failed) == (2, 1, 1)
+    async with factory() as s:
+        rows = {c.id: c for c in (await s.execute(select(Candidate))).scalars()}
+    assert rows[3].cv_scoring_status == "scored" and rows[3].screening_rank == 1
+    assert rows[3].cv_scored_job_hash == requisition_hash("Platform Engineer", "Run our platform", SKILLS)
+    assert rows[2].cv_scoring is None and rows[2].cv_scoring_status is None
+    # The stale score is kept but ranks by local similarity
+    assert rows[1].cv_scoring == 99 and rows[1].cv_scored_job_hash is None
+    assert rows[2].screening_rank == 2 and rows[1].screening_rank == 3
+    assert rows[4].cv_scoring_status == "failed"
+
+
+@pytest.mark.anyio
+async def test_job_edited_during_rescore_is_scored_by_a_follow_up_run(factory):
+    class EditingScorer(StubCVScorer):
+        """HR narrows the skills while the first CV is being scored."""
+
+        edited = False
+
+        async def analyze(self, *args, **kwargs):
+            if not self.edited:
+                self.edited = True
+                async with factory() as s:
+                    request = await s.get(RecruitmentRequest, 1)
+                    request.required_skills = ["Python"]
+                    await s.commit()
+            return await super().analyze(*args, **kwargs)
+
+    set_cv_scorer(EditingScorer())
+    rescorer = RequisitionRescorer(session_factory=factory, concurrency=1)
+    first = rescorer.start(1)
+    assert rescorer.start(1) is first  # the edit's own start() joins the running job
+    final = await rescorer.wait(1)
+
+    assert final is not first and first.status == final.status == "completed"
+    assert final.job_hash == requisition_hash("Platform Engineer", "Run our platform", ["Python"])
+    async with factory() as s:
+        rows = (await s.execute(
+            select(Candidate.cv_scored_job_hash, Candidate.skills_match_score).where(Candidate.id.in_(CVS))
+        )).all()
+    assert set(rows) == {(final.job_hash, 100)}
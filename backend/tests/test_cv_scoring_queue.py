@@ -0,0 +1,142 @@
+import pytest
+
+import app.models  # noqa: F401 - configure mappers
+from app.core.time import get_utc_now
+from app.models.cv_cache import CVScoreCache, CVTextCache
+from app.models.recruitment import Candidate, RecruitmentRequest
+from app.services.cv_cache import cv_cache
+from app.services.cv_scoring_queue import CVScoringQueue
+from app.services.cv_scoring_service import (
+    CVScoringRetryableError, StubCVScorer, analyze_cv, set_cv_scorer
+)
+
+CV_TEXT = (
+    "Senior Python developer with 7 years of experience building FastAPI services "
+    "and PostgreSQL data pipelines. Bachelor of Science in Computer Engineering."
+)
+
+
+class FlakyScorer(StubCVScorer):
+    """Rate limited on the first call, then scores normally."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise CVScoringRetryableError("rate limited", retry_after=0.01)
+        return await super().analyze(*args, **kwargs)
+
+
+@pytest.fixture
+def db_tables():
+    return (RecruitmentRequest, Candidate, CVTextCache, CVScoreCache)
+
+
+@pytest.fixture
+async def factory(tmp_path, db_factory):
+    resume = tmp_path / "CAN-1_cv.txt"
+    resume.write_text(CV_TEXT)
+    async with db_factory() as s:
+        s.add(RecruitmentRequest(
+            id=1, request_number="RR-1", position_title="Python Developer", department="IT",
+            requested_by="HR", employment_type="Full-time",
+            job_description="Build Python services", required_skills=["Python", "FastAPI", "Kubernetes"],
+        ))
+        s.add(Candidate(id=1, candidate_number="CAN-1", recruitment_request_id=1, full_name="A", email="a@x.com",
+                        resume_path=str(resume)))
+        s.add(Candidate(id=2, candidate_number="CAN-2", recruitment_request_id=1, full_name="B", email="b@x.com",
+                        resume_path=str(tmp_path / "missing.pdf")))
+        await s.commit()
+    yield db_factory
+    set_cv_scorer(None)
+    cv_cache.clear_memory()
+
+
+@pytest.mark.anyio
+async def test_stub_scorer_is_deterministic():
+    set_cv_scorer(StubCVScorer())
+    first = await analyze_cv(CV_TEXT, "Python Developer", "Build Python services", ["Python", "FastAPI", "Kubernetes"])
+    second = await analyze_cv(CV_TEXT, "Python Developer", "Build Python services", ["Python", "FastAPI", "Kubernetes"])
+    set_cv_scorer(None)
+
+    assert first == second
+    assert (first["skills_match_score"], first["years_experience"]) == (67, 7)
+    assert first["education_level"] == "Bachelor's Degree"
+    assert first["areas_of_concern"] == ["Kubernetes"]
+
+
+@pytest.mark.anyio
+async def test_queue_retries_rate_limits_and_persists_status(factory):
+    scorer = FlakyScorer()
+    set_cv_scorer(scorer)
+    queue = CVScoringQueue(session_factory=factory, workers=2, max_attempts=3, base_delay=0.01)
+
+    async with factory() as session:
+        await queue.enqueue(session, [1, 2])
+        statuses = {c.id: c.cv_scoring_status for c in (await session.get(Candidate, 1), await session.get(Candidate, 2))}
+    assert statuses == {1: "queued", 2: "queued"}
+
+    await queue.wait_idle()
+    await queue.stop()
+
+    async with factory() as session:
+        scored = await session.get(Candidate, 1)
+        failed = await session.get(Candidate, 2)
+    assert (scored.cv_scoring_status, scored.cv_scoring_attempts, scored.skills_match_score) == ("scored", 2, 67)
+    assert scored.cv_scoring_error is None and scored.cv_scored_at is not None
+    assert failed.cv_scoring_status == "failed" and failed.cv_scoring_attempts == 1
+    assert scorer.calls == 2
+
+
+@pytest.mark.anyio
+async def test_start_recovers_pending_jobs(factory):
+    set_cv_scorer(StubCVScorer())
+    async with factory() as session:
+        candidate = await session.get(Candidate, 1)
+        candidate.cv_scoring_status = "scoring"  # worker died mid-job, before the lease existed
+        await session.commit()
+
+    queue = CVScoringQueue(session_factory=factory, workers=1, base_delay=0.01)
+    await queue.start()
+    await queue.wait_idle()
+    await queue.stop()
+
+    async with factory() as session:
+        assert (await session.get(Candidate, 1)).cv_scoring_status == "scored"
+        assert (await session.get(Candidate, 2)).cv_scoring_status is None
+
+
+class CountingScorer(StubCVScorer):
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze(self, *args, **kwargs):
+        self.calls += 1
+        return await super().analyze(*args, **kwargs)
+
+
+@pytest.mark.anyio
+async def test_recovery_skips_live_leases_and_claims_each_job_once(factory):
+    scorer = CountingScorer()
+    set_cv_scorer(scorer)
+    async with factory() as session:
+        live = await session.get(Candidate, 2)
+        live.cv_scoring_status, live.cv_scoring_started_at = "scoring", get_utc_now()  # another worker's job
+        queued = await session.get(Candidate, 1)
+        queued.cv_scoring_status = "queued"
+        await session.commit()
+
+    # Two gunicorn workers starting together both see candidate 1
+    queues = [CVScoringQueue(session_factory=factory, workers=1, base_delay=0.01) for _ in range(2)]
+    for queue in queues:
+        await queue.start()
+    for queue in queues:
+        await queue.wait_idle()
+        await queue.stop()
+
+    async with factory() as session:
+        assert (await session.get(Candidate, 1)).cv_scoring_status == "scored"
+        assert (await session.get(Candidate, 2)).cv_scoring_status == "scoring"
+    assert scorer.calls == 1
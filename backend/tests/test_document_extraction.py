@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.document_extraction import DocumentExtractor, extract_document
+
+
+def test_text_documents_stop_at_the_character_budget():
+    text, _, truncated = extract_document("txt", ("word " * 1000).encode(), max_pages=10, max_chars=100)
+
+    assert len(text) == 100 and truncated
+    assert extract_document("txt", b"short cv", 10, 100) == ("short cv", 1, False)
+
+
+@pytest.mark.anyio
+async def test_extractor_records_metrics_per_type():
+    extractor = DocumentExtractor(workers=1, timeout=30, max_chars=50)
+    try:
+        assert await extractor.extract(b"x" * 80, "cv.txt") == "x" * 50
+        assert await extractor.extract(b"data", "cv.xlsx") is None
+        # No PDF library here: runs in the pool and is recorded as a failure
+        assert await extractor.extract(b"%PDF-1.4 not really", "cv.pdf") is None
+    finally:
+        extractor.shutdown()
+
+    metrics = extractor.snapshot()["by_type"]
+    assert (metrics["txt"]["documents"], metrics["txt"]["truncated"]) == (1, 1)
+    assert (metrics["pdf"]["documents"], metrics["pdf"]["failures"], metrics["pdf"]["timeouts"]) == (1, 1, 0)
+    assert "xlsx" not in metrics
+
+
+@pytest.mark.anyio
+async def test_timeout_replaces_the_pool():
+    extractor = DocumentExtractor(workers=1, timeout=1e-6)
+    try:
+        assert await extractor.extract(b"%PDF-1.4", "slow.pdf") is None
+        assert extractor._pool is None
+        assert extractor.metrics["pdf"].timeouts == 1
+
+        extractor.timeout = 30
+        await extractor.extract(b"%PDF-1.4", "next.pdf")  # served by a fresh pool
+        assert extractor.metrics["pdf"].documents == 2 and extractor.metrics["pdf"].timeouts == 1
+    finally:
+        extractor.shutdown()
+
+
+def sleepy_extract(kind, content, max_pages, max_chars):
+    time.sleep(float(content))
+    return content.decode(), 1, False
+
+
+@pytest.mark.anyio
+async def test_documents_caught_in_another_timeout_are_retried(monkeypatch):
+    monkeypatch.setattr("app.services.document_extraction.extract_document", sleepy_extract)
+    extractor = DocumentExtractor(workers=2, timeout=2)
+
+    async def in_flight_at_timeout():
+        await asyncio.sleep(1.5)
+        return await extractor.extract(b"1", "cv.pdf")
+
+    try:
+        results = await asyncio.gather(extractor.extract(b"30", "stuck.pdf"), in_flight_at_timeout())
+    finally:
+        extractor.shutdown()
+
+    assert results == [None, "1"]
+    stats = extractor.metrics["pdf"]
+    assert (stats.documents, stats.timeouts, stats.failures) == (2, 1, 1)
@@ -0,0 +1,117 @@
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+
+import app.models  # noqa: F401 - configure mappers
+from app.models.employee import Employee
+from app.repositories.employees import EmployeeRepository
+from app.services.employees import BULK_UPDATE_FIELDS, EmployeeService
+
+
+class DummyRepo:
+    def __init__(self, matched):
+        self.matched = matched
+        self.calls = []
+
+    async def bulk_update(self, session, changes, fields):
+        self.calls.append((changes, fields))
+        return self.matched
+
+
+@pytest.mark.anyio
+async def test_bulk_update_sends_one_statement_and_reports_outcomes():
+    repo = DummyRepo(matched=[(1, "EMP001")])
+    service = EmployeeService(repo)
+    session = AsyncMock()
+
+    result = await service.bulk_update_employees(
+        session,
+        [
+            {"employee_id": "EMP001", "department": "IT", "job_title": ""},
+            {"employee_id": "EMP002", "location": None},
+            {"department": "HR"},
+        ],
+        actor_id="BAYN00008",
+    )
+
+    assert len(repo.calls) == 1
+    changes, fields = repo.calls[0]
+    assert fields == BULK_UPDATE_FIELDS
+    assert changes == [
+        {"employee_id": "EMP001", "department": "IT"},
+        {"employee_id": "EMP002", "location": None},
+    ]
+    assert result["updated"] == 1
+    assert result["not_found"] == 1
+    assert result["results"] == [
+        {"employee_id": "EMP001", "status": "updated"},
+        {"employee_id": "EMP002", "status": "not_found"},
+    ]
+    assert "Missing employee_id in update" in result["errors"]
+
+    # One batched audit insert for the matched rows
+    batched = [c.args[1] for c in session.execute.await_args_list if len(c.args) > 1]
+    assert len(batched) == 1
+    audit_rows = batched[0]
+    assert [row["entity_id"] for row in audit_rows] == [1]
+    assert audit_rows[0]["user_id"] == "BAYN00008"
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_bulk_update_merges_duplicate_ids():
+    repo = DummyRepo(matched=[(1, "EMP001")])
+    service = EmployeeService(repo)
+    session = AsyncMock()
+
+    await service.bulk_update_employees(
+        session,
+        [
+            {"employee_id": "EMP001", "department": "IT"},
+            {"employee_id": "EMP001", "department": "Finance", "location": "Dubai"},
+        ],
+    )
+
+    changes, _ = repo.calls[0]
+    assert changes == [
+        {"employee_id": "EMP001", "department": "Finance", "location": "Dubai"}
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("db_tables", [(Employee,)])
+async def test_repository_bulk_update_on_sqlite(db_factory):
+    async with db_factory() as session:
+        session.add_all([
+            Employee(
+                employee_id=f"EMP00{n}", name=f"Employee {n}", date_of_birth=date(1990, 1, n),
+                password_hash="x", department="Ops", location="Abu Dhabi",
+            )
+            for n in (1, 2, 3)
+        ])
+        await session.commit()
+
+        matched = await EmployeeRepository().bulk_update(
+            session,
+            [
+                {"employee_id": "EMP001", "department": "IT", "location": None},
+                {"employee_id": "EMP002", "job_title": "Analyst"},
+                {"employee_id": "EMP404", "department": "HR"},
+            ],
+            BULK_UPDATE_FIELDS,
+        )
+        await session.commit()
+
+        rows = (await session.execute(
+            select(Employee.employee_id, Employee.department, Employee.job_title, Employee.location)
+            .order_by(Employee.employee_id)
+        )).all()
+
+    assert sorted(employee_id for _, employee_id in matched) == ["EMP001", "EMP002"]
+    assert [tuple(row) for row in rows] == [
+        ("EMP001", "IT", None, None),
+        ("EMP002", "Ops", "Analyst", "Abu Dhabi"),
+        ("EMP003", "Ops", None, "Abu Dhabi"),
+    ]
@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.geofence import haversine_distance
+from app.services.geofence_index import GeofenceIndex, GeofenceInfo, validate_many, validation_result
+
+
+def fence(pk, name, lat, lon, radius, required=True):
+    return GeofenceInfo(
+        id=pk, name=name, latitude=Decimal(lat), longitude=Decimal(lon),
+        radius_meters=radius, validation_required=required,
+    )
+
+
+HEAD_OFFICE = fence(1, "Head Office", "24.4539", "54.3773", 200)
+KEZAD = fence(2, "KEZAD", "24.6400", "54.6350", 500)
+SAFARIO = fence(3, "Safario", "24.3500", "54.5000", 300, required=False)
+# Large site straddling several grid cells
+EMIRATE = fence(4, "Emirate Wide", "24.0000", "54.0000", 60000, required=False)
+
+INDEX = GeofenceIndex([KEZAD, HEAD_OFFICE, SAFARIO])
+
+
+def test_single_point_match_and_nearest():
+    inside = INDEX.match(24.4540, 54.3775)
+    assert inside.matched == HEAD_OFFICE
+    assert inside.distance_meters == pytest.approx(haversine_distance(24.4540, 54.3775, 24.4539, 54.3773))
+
+    outside = INDEX.match(24.3600, 54.5000)
+    assert outside.matched is None and outside.nearest == SAFARIO
+    assert outside.distance_meters == pytest.approx(1112, abs=2)
+
+    wide = GeofenceIndex([HEAD_OFFICE, EMIRATE])
+    assert wide.match(24.3, 54.2).matched == EMIRATE
+    assert wide.match(24.4539, 54.3773).matched == HEAD_OFFICE
+
+
+def test_nearby_is_sorted_and_bounded():
+    names = [(g.name, round(d)) for g, d in INDEX.nearby(24.4539, 54.3773, 20000)]
+    assert names == [("Head Office", 0), ("Safario", round(haversine_distance(24.4539, 54.3773, 24.35, 54.5)))]
+    assert [g.name for g, _ in INDEX.nearby(24.4539, 54.3773, 50000)] == ["Head Office", "Safario", "KEZAD"]
+    assert GeofenceIndex([]).nearby(24.0, 54.0, 1000) == []
+
+
+def test_batch_validation_matches_single_point_rules():
+    points = [
+        (24.4540, 54.3775, None),
+        (24.6400, 54.6350, "Head Office"),  # at KEZAD but declared Head Office
+        (24.3600, 54.5000, "Safario"),  # outside, validation not required
+        (25.2000, 55.2700, None),  # Dubai: outside everything
+    ]
+    results = validate_many(INDEX, points)
+
+    assert results == [validation_result(INDEX, *p) for p in points]
+    assert [r["is_valid"] for r in results] == [True, False, True, False]
+    assert results[0]["matched_geofence"] == "Head Office"
+    assert results[3]["message"].startswith("Outside all geofences. Nearest: KEZAD")
+
+    assert validation_result(GeofenceIndex([]), 24.0, 54.0)["message"] == "No geofences configured"
+
+
+
+def test_points_on_cell_boundaries_match_like_the_batch_path():
+    # Each fence reaches just across a 0.05-degree grid line (24.45 N / 54.40 E)
+    fences = [
+        fence(5, "North Edge", "24.441012", "54.3700", 1000),
+        fence(6, "East Edge", "24.4200", "54.390150", 1000),
+        fence(7, "Corner", "24.4496", "54.3996", 80),
+    ]
+    index = GeofenceIndex(fences)
+    points = [
+        (24.45, 54.37), (24.450003, 54.37),
+        (24.42, 54.40), (24.42, 54.400003),
+        (24.45, 54.40), (24.4500001, 54.4000001),
+    ]
+    matched, nearest, distance = index.match_many([p[0] for p in points], [p[1] for p in points])
+
+    for k, (lat, lon) in enumerate(points):
+        single = index.match(lat, lon)
+        assert single.matched is not None
+        assert single.matched == index.fence(matched[k])
+        assert single.distance_meters == pytest.approx(distance[k])
@@ -0,0 +1,99 @@
+import asyncio
+import base64
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+
+from app.auth import jwt as auth_jwt
+
+SECRET = b"jwks-test-secret-0123456789abcdef"
+KEY = {
+    "kty": "oct",
+    "kid": "k1",
+    "alg": "HS256",
+    "k": base64.urlsafe_b64encode(SECRET).rstrip(b"=").decode(),
+}
+SETTINGS = SimpleNamespace(
+    dev_auth_bypass=False,
+    auth_jwks_url="https://idp.example/jwks",
+    auth_audience="hr-portal",
+    auth_issuer="https://idp.example",
+)
+
+
+def make_token(**extra):
+    claims = {
+        "sub": "BAYN00008",
+        "aud": SETTINGS.auth_audience,
+        "iss": SETTINGS.auth_issuer,
+        "exp": int(time.time()) + 600,
+        **extra,
+    }
+    return jwt.encode(claims, SECRET, algorithm="HS256", headers={"kid": "k1"})
+
+
+@pytest.fixture(autouse=True)
+def reset_jwks(monkeypatch):
+    calls = []
+
+    async def fake_download(settings):
+        calls.append(settings)
+        await asyncio.sleep(0)
+        auth_jwt._JWKS_CACHE = {"k1": KEY}
+        auth_jwt._JWKS_KEYS = {"k1": jwt.PyJWK.from_dict(KEY)}
+        auth_jwt._JWKS_FETCHED_AT = auth_jwt.datetime.now(auth_jwt.timezone.utc)
+        return auth_jwt._JWKS_CACHE
+
+    monkeypatch.setattr(auth_jwt, "_download_jwks", fake_download)
+    monkeypatch.setattr(auth_jwt, "_JWKS_CACHE", None)
+    monkeypatch.setattr(auth_jwt, "_JWKS_KEYS", {})
+    monkeypatch.setattr(auth_jwt, "_JWKS_FETCHED_AT", None)
+    monkeypatch.setattr(auth_jwt, "_JWKS_LOCK", None)
+    monkeypatch.setattr(auth_jwt, "_JWKS_REFRESH_TASK", None)
+    auth_jwt.verified_token_cache.clear()
+    yield calls
+    auth_jwt.verified_token_cache.clear()
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_fetch_jwks_once(reset_jwks):
+    tokens = [make_token(jti=str(i)) for i in range(5)]
+    results = await asyncio.gather(*(auth_jwt.decode_jwt(t, SETTINGS) for t in tokens))
+
+    assert len(reset_jwks) == 1
+    assert [r["jti"] for r in results] == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.anyio
+async def test_verified_token_is_served_from_cache(reset_jwks, monkeypatch):
+    token = make_token()
+    first = await auth_jwt.decode_jwt(token, SETTINGS)
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("signature verified twice")
+
+    monkeypatch.setattr(auth_jwt.jwt, "decode", fail_decode)
+    second = await auth_jwt.decode_jwt(token, SETTINGS)
+
+    assert second == first
+    second["sub"] = "mutated"
+    assert (await auth_jwt.decode_jwt(token, SETTINGS))["sub"] == "BAYN00008"
+
+
+def test_cache_drops_expired_and_evicts_lru():
+    cache = auth_jwt.VerifiedTokenCache(maxsize=2)
+    cache.put("expired", {"exp": time.time() - 1})
+    cache.put("no-exp", {"sub": "x"})
+    assert cache.get("expired") is None
+    assert cache.get("no-exp") is None
+
+    future = time.time() + 60
+    cache.put("a", {"exp": future})
+    cache.put("b", {"exp": future})
+    cache.get("a")
+    cache.put("c", {"exp": future})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
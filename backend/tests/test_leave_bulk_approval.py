@@ -0,0 +1,126 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.models.cache_version import CacheVersion
+from app.models.employee import Employee
+from app.models.leave import LeaveBalance, LeaveLedgerEntry, LeaveRequest
+from app.models.notification import Notification, NotificationCounter
+from app.services.leave_approvals import LeaveApprovalService
+from app.services.leave_ledger import LeaveLedgerService
+
+TABLES = (
+    Employee, LeaveRequest, LeaveBalance, LeaveLedgerEntry,
+    Notification, NotificationCounter, CacheVersion,
+)
+
+
+@pytest.fixture
+def db_tables():
+    return TABLES
+
+
+@pytest.fixture
+async def session(db_session):
+    for pk, role in ((1, "viewer"), (2, "viewer"), (9, "hr")):
+        db_session.add(Employee(
+            id=pk, employee_id=f"EMP00{pk}", name=f"Employee {pk}", date_of_birth=date(1990, 1, 1),
+            password_hash="x", role=role, is_active=True,
+        ))
+        db_session.add(LeaveBalance(
+            employee_id=pk, year=2026, leave_type="annual", entitlement=Decimal("10"),
+            carried_forward=Decimal("0"), used=Decimal("0"), pending=Decimal("0"),
+            adjustment=Decimal("0"), offset_days_used=Decimal("0"),
+        ))
+    await db_session.commit()
+    return db_session
+
+
+async def submit(session, employee_id, start, end, days, leave_type="annual", status="pending"):
+    request = LeaveRequest(
+        employee_id=employee_id, leave_type=leave_type, start_date=start, end_date=end,
+        total_days=Decimal(days), status=status,
+    )
+    session.add(request)
+    await session.flush()
+    if status == "pending":
+        await LeaveLedgerService().request_submitted(session, request)
+    return request
+
+
+@pytest.mark.anyio
+async def test_bulk_approve_validates_batch_and_sends_digests(session):
+    r1 = await submit(session, 1, date(2026, 3, 2), date(2026, 3, 6), "5")
+    r2 = await submit(session, 1, date(2026, 4, 6), date(2026, 4, 9), "4")
+    r3 = await submit(session, 1, date(2026, 5, 4), date(2026, 5, 6), "3")  # exceeds balance
+    r4 = await submit(session, 1, date(2026, 3, 5), date(2026, 3, 5), "1", "unpaid")  # overlaps r1
+    await submit(session, 2, date(2026, 6, 1), date(2026, 6, 4), "4", status="approved")
+    r6 = await submit(session, 2, date(2026, 6, 3), date(2026, 6, 3), "1")  # overlaps approved leave
+    r7 = await submit(session, 2, date(2026, 7, 1), date(2026, 7, 2), "2")
+    await session.commit()
+    hr = await session.get(Employee, 9)
+
+    results = await LeaveApprovalService().bulk_decide(
+        session, [r1.id, r2.id, r3.id, r4.id, r6.id, r7.id, 999], approved=True, actor=hr
+    )
+
+    outcome = {r["request_id"]: r["status"] for r in results}
+    assert outcome == {
+        r1.id: "approved", r2.id: "approved", r3.id: "insufficient_balance",
+        r4.id: "conflict", r6.id: "conflict", r7.id: "approved", 999: "not_found",
+    }
+
+    rows = await session.execute(
+        select(LeaveRequest.id, LeaveRequest.status, LeaveRequest.approved_by)
+        .execution_options(populate_existing=True)
+    )
+    stored = {rid: (status, by) for rid, status, by in rows.all()}
+    assert stored[r1.id] == ("approved", 9)
+    assert stored[r3.id][0] == "pending"
+
+    balances = await session.execute(
+        select(LeaveBalance.employee_id, LeaveBalance.used, LeaveBalance.pending)
+        .where(LeaveBalance.leave_type == "annual")
+        .execution_options(populate_existing=True)
+    )
+    assert {e: (used, pending) for e, used, pending in balances.all()}[1] == (Decimal("9"), Decimal("3"))
+
+    notifications = (await session.execute(select(Notification))).scalars().all()
+    assert sorted(n.user_id for n in notifications) == ["1", "2"]
+    assert next(n for n in notifications if n.user_id == "1").title == "2 leave requests approved"
+
+
+@pytest.mark.anyio
+async def test_bulk_reject_releases_pending_days(session):
+    r1 = await submit(session, 1, date(2026, 3, 2), date(2026, 3, 3), "2")
+    await session.commit()
+    hr = await session.get(Employee, 9)
+
+    results = await LeaveApprovalService().bulk_decide(
+        session, [r1.id, r1.id], approved=False, actor=hr, rejection_reason="Peak season"
+    )
+
+    assert results == [{"request_id": r1.id, "status": "rejected", "detail": None}]
+    balance = await session.execute(
+        select(LeaveBalance.pending).where(LeaveBalance.employee_id == 1)
+        .execution_options(populate_existing=True)
+    )
+    assert balance.scalar_one() == Decimal("0")
+    notification = (await session.execute(select(Notification))).scalar_one()
+    assert "Reason: Peak season" in notification.message
+
+
+@pytest.mark.anyio
+async def test_bulk_approve_respects_days_reserved_outside_the_batch(session):
+    await submit(session, 1, date(2026, 2, 2), date(2026, 2, 5), "4")  # stays pending
+    r2 = await submit(session, 1, date(2026, 3, 2), date(2026, 3, 9), "8")
+    r3 = await submit(session, 1, date(2026, 4, 6), date(2026, 4, 7), "2")
+    await session.commit()
+    hr = await session.get(Employee, 9)
+
+    results = await LeaveApprovalService().bulk_decide(session, [r2.id, r3.id], approved=True, actor=hr)
+
+    assert {r["request_id"]: r["status"] for r in results} == {r2.id: "insufficient_balance", r3.id: "approved"}
+    assert "Available: 6.00 days" in results[0]["detail"]
@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+from app.services.leave_coverage import LeaveInterval, compute_coverage, leave_index
+from app.services.work_calendar import HolidayInfo, WorkCalendar
+
+
+def leave(request_id, start, end, employee_id, department="IT", half=False):
+    return LeaveInterval(
+        start=start, end=end, request_id=request_id, employee_id=employee_id,
+        department=department, is_half_day=half,
+    )
+
+
+def test_overlapping_matches_brute_force():
+    intervals = [
+        leave(i, date(2026, 1, 1) + timedelta(days=(i * 7) % 90), date(2026, 1, 1) + timedelta(days=(i * 7) % 90 + i % 12), i)
+        for i in range(60)
+    ]
+    index = leave_index(intervals)
+    for offset in range(0, 100, 5):
+        start = date(2026, 1, 1) + timedelta(days=offset)
+        end = start + timedelta(days=3)
+        expected = sorted(
+            (i for i in intervals if i.start <= end and i.end >= start),
+            key=lambda i: (i.start, i.end, i.request_id),
+        )
+        assert index.overlapping(start, end) == expected
+
+
+def test_coverage_counts_departments_and_conflicts():
+    index = leave_index([
+        leave(1, date(2026, 3, 1), date(2026, 3, 4), 1),
+        leave(2, date(2026, 3, 3), date(2026, 3, 3), 2, half=True),
+        leave(3, date(2026, 2, 20), date(2026, 3, 2), 3, department="HR"),
+        leave(4, date(2026, 4, 1), date(2026, 4, 2), 4),
+    ])
+    calendar = WorkCalendar([HolidayInfo(
+        id=1, name="Holiday", name_arabic=None, start_date=date(2026, 3, 2), end_date=date(2026, 3, 2),
+        year=2026, holiday_type="uae_official", is_paid=True, description=None, is_active=True, created_at=None,
+    )])
+
+    result = compute_coverage(
+        index, date(2026, 3, 1), date(2026, 3, 5), {"IT": 4, "HR": 2},
+        threshold=50, calendar=calendar,
+    )
+
+    days = {d["date"]: d for d in result["days"]}
+    assert [d["on_leave"] for d in result["days"]] == [2.0, 2.0, 1.5, 1.0, 0.0]
+    assert days[date(2026, 3, 3)]["available"] == 4.5
+    assert days[date(2026, 3, 3)]["departments"]["IT"] == {
+        "headcount": 4, "on_leave": 1.5, "absence_pct": 37.5,
+    }
+    assert days[date(2026, 3, 2)]["is_holiday"]
+    assert [(c["date"], c["department"]) for c in result["conflicts"]] == [
+        (date(2026, 3, 1), "HR"), (date(2026, 3, 2), "HR"),
+    ]
@@ -15,11 +15,19 @@ from unittest.mock import AsyncMock, patch
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.cache_version import CacheVersion
 from app.models.employee import Employee
 from app.models.leave import LeaveBalance, LeaveRequest
 from app.models.public_holiday import PublicHoliday, UAE_HOLIDAYS_2026
 from app.services.leave_service import LeaveService
 
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db_tables():
+    return (Employee, LeaveBalance, LeaveRequest, PublicHoliday, CacheVersion)
+
 
 @pytest.fixture
 async def test_employee(db_session: AsyncSession):
@@ -0,0 +1,124 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.models.cache_version import CacheVersion
+from app.models.employee import Employee
+from app.models.leave import LeaveBalance, LeaveLedgerEntry, LeaveRequest
+from app.services.leave_ledger import LeaveLedgerService
+
+
+@pytest.fixture
+def db_tables():
+    return (Employee, LeaveRequest, LeaveBalance, LeaveLedgerEntry, CacheVersion)
+
+
+@pytest.fixture
+async def session(db_session):
+    db_session.add(Employee(
+        id=1, employee_id="EMP001", name="Test Employee", date_of_birth=date(1990, 1, 1),
+        password_hash="x", role="viewer", is_active=True,
+    ))
+    db_session.add(LeaveBalance(
+        employee_id=1, year=2026, leave_type="annual", entitlement=Decimal("30"),
+        carried_forward=Decimal("0"), used=Decimal("0"), pending=Decimal("0"),
+        adjustment=Decimal("0"), offset_days_used=Decimal("0"),
+    ))
+    await db_session.commit()
+    return db_session
+
+
+async def make_request(session, days, leave_type="annual"):
+    request = LeaveRequest(
+        employee_id=1, leave_type=leave_type, start_date=date(2026, 5, 4),
+        end_date=date(2026, 5, 4), total_days=Decimal(days), status="pending",
+    )
+    session.add(request)
+    await session.flush()
+    return request
+
+
+async def balance(session, year=2026):
+    result = await session.execute(
+        select(LeaveBalance).where(LeaveBalance.year == year).execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.anyio
+async def test_request_lifecycle_moves_balance_columns(session):
+    ledger = LeaveLedgerService()
+
+    first = await make_request(session, "5")
+    await ledger.request_submitted(session, first)
+    second = await make_request(session, "3")
+    await ledger.request_submitted(session, second)
+    b = await balance(session)
+    assert (b.pending, b.used, b.available) == (Decimal("8"), Decimal("0"), Decimal("22"))
+
+    await ledger.request_approved(session, first, actor_id=9)
+    await ledger.request_released(session, second, "pending", actor_id=9)
+    b = await balance(session)
+    assert (b.pending, b.used, b.available) == (Decimal("0"), Decimal("5"), Decimal("25"))
+
+    await ledger.request_released(session, first, "approved", actor_id=1)
+    b = await balance(session)
+    assert b.available == Decimal("30")
+
+    unpaid = await make_request(session, "2", leave_type="unpaid")
+    await ledger.request_submitted(session, unpaid)
+
+    entries = (await session.execute(select(LeaveLedgerEntry))).scalars().all()
+    assert sum(e.days for e in entries if e.entry_type == "pending") == Decimal("0")
+    assert sum(e.days for e in entries if e.entry_type == "taken") == Decimal("0")
+    assert all(e.leave_type == "annual" for e in entries)
+
+
+@pytest.mark.anyio
+async def test_rollover_carries_annual_leave_once(session):
+    ledger = LeaveLedgerService()
+    request = await make_request(session, "12")
+    await ledger.request_submitted(session, request)
+    await ledger.request_approved(session, request)
+
+    summary = await ledger.rollover_year(session, 2026, max_carry_forward=Decimal("15"))
+    assert summary["balances_opened"] == 1
+    opened = await balance(session, 2027)
+    assert (opened.entitlement, opened.carried_forward) == (Decimal("30"), Decimal("15"))
+
+    again = await ledger.rollover_year(session, 2026)
+    assert again["balances_opened"] == 0 and again["skipped"] == 1
+
+
+@pytest.mark.anyio
+async def test_reopening_an_empty_ledger_keeps_balance_columns(session):
+    ledger = LeaveLedgerService()
+    b = await balance(session)
+    b.used, b.pending = Decimal("4"), Decimal("2")
+    await session.flush()
+
+    for _ in range(2):
+        await session.execute(delete(LeaveLedgerEntry))
+        assert await ledger.open_ledger(session) == 3
+
+    b = await balance(session)
+    assert (b.used, b.pending, b.available) == (Decimal("4"), Decimal("2"), Decimal("24"))
+
+
+@pytest.mark.anyio
+async def test_balance_conversion_runs_once(session):
+    ledger = LeaveLedgerService()
+    b = await balance(session)
+    b.used, b.pending = Decimal("4"), Decimal("3")  # 3 approved days still counted as pending
+    await make_request(session, "2")
+    await session.flush()
+
+    assert await ledger.convert_balances(session) is True
+    assert await ledger.convert_balances(session) is False
+    await session.execute(delete(LeaveLedgerEntry))
+    assert await ledger.convert_balances(session) is False  # not keyed on an empty ledger
+
+    b = await balance(session)
+    assert (b.used, b.pending, b.available) == (Decimal("7"), Decimal("2"), Decimal("21"))
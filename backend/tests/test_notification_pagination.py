@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.notification import Notification, NotificationCounter
+from app.repositories.notification import NotificationRepository
+
+
+@pytest.fixture
+def db_tables():
+    return (Notification, NotificationCounter)
+
+
+@pytest.mark.anyio
+async def test_keyset_pages_and_unread_counter(db_session):
+    repo = NotificationRepository()
+    base = datetime(2026, 10, 1, 9, 0)
+    for i in range(5):
+        await repo.create(
+            db_session, user_id="EMP1", title=f"n{i}", message="m", created_at=base + timedelta(minutes=i)
+        )
+    await repo.create(db_session, user_id="EMP2", title="other", message="m", created_at=base)
+
+    first, cursor = await repo.list(db_session, "EMP1", limit=2)
+    assert [n.title for n in first] == ["n4", "n3"]
+    second, cursor = await repo.list(db_session, "EMP1", cursor=cursor, limit=2)
+    assert [n.title for n in second] == ["n2", "n1"]
+    last, cursor = await repo.list(db_session, "EMP1", cursor=cursor, limit=2)
+    assert [n.title for n in last] == ["n0"] and cursor is None
+
+    assert await repo.unread_count(db_session, "EMP1") == 5
+    await repo.mark_read(db_session, first[0].id)
+    await repo.mark_read(db_session, first[0].id)
+    assert await repo.unread_count(db_session, "EMP1") == 4
+
+    assert await repo.mark_all_read(db_session, "EMP1") == 4
+    assert await repo.unread_count(db_session, "EMP1") == 0
+    assert await repo.unread_count(db_session, "EMP2") == 1
+    unread, _ = await repo.list(db_session, "EMP1", unread_only=True)
+    assert unread == []
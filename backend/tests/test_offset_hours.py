@@ -0,0 +1,75 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models.attendance import AttendanceRecord, OffsetHoursBalance, OffsetHoursEntry
+from app.models.employee import Employee
+from app.services.offset_hours import InsufficientOffsetBalance, OffsetHoursService
+
+
+@pytest.fixture
+def db_tables():
+    return (Employee, AttendanceRecord, OffsetHoursEntry, OffsetHoursBalance)
+
+
+@pytest.fixture
+async def session(db_session):
+    db_session.add(Employee(
+        id=1, employee_id="EMP001", name="Test Employee", date_of_birth=date(1990, 1, 1),
+        password_hash="x", role="viewer", is_active=True, overtime_type="Offset",
+    ))
+    await db_session.commit()
+    return db_session
+
+
+async def balance(session):
+    return await session.get(OffsetHoursBalance, 1, populate_existing=True)
+
+
+@pytest.mark.anyio
+async def test_rebuild_from_attendance_history(session):
+    session.add_all([
+        AttendanceRecord(employee_id=1, attendance_date=date(2026, 3, 2), offset_hours_earned=Decimal("2")),
+        AttendanceRecord(
+            employee_id=1, attendance_date=date(2026, 3, 3), offset_hours_earned=Decimal("1.5"),
+            offset_day_reference="Used on 2026-03-20",
+        ),
+        AttendanceRecord(employee_id=1, attendance_date=date(2026, 3, 4), overtime_hours=Decimal("1")),
+    ])
+    await session.flush()
+
+    assert await OffsetHoursService().rebuild(session) == 3
+    totals = await balance(session)
+    assert (totals.earned, totals.used, totals.balance) == (Decimal("3.5"), Decimal("1.5"), Decimal("2"))
+
+
+@pytest.mark.anyio
+async def test_sync_posts_deltas_and_debits_are_guarded(session):
+    service = OffsetHoursService()
+    record = AttendanceRecord(employee_id=1, attendance_date=date(2026, 5, 4), offset_hours_earned=Decimal("2"))
+    session.add(record)
+    await session.flush()
+
+    await service.sync_record(session, record)
+    await service.sync_record(session, record)  # no change -> no entry
+    record.offset_hours_earned = Decimal("1.5")  # approved for fewer hours
+    await service.sync_record(session, record, actor_id=9)
+    assert (await balance(session)).earned == Decimal("1.5")
+
+    await service.post(session, 1, "used", Decimal("1"))
+    record.offset_hours_earned = Decimal("0.5")  # would leave -0.5 available
+    with pytest.raises(InsufficientOffsetBalance):
+        await service.sync_record(session, record)
+    with pytest.raises(InsufficientOffsetBalance):
+        await service.post(session, 1, "expired", Decimal("1"))
+    await service.post(session, 1, "adjusted", Decimal("-0.5"), note="Correction")
+    await session.commit()
+
+    totals = await balance(session)
+    assert (totals.used, totals.expired, totals.balance) == (Decimal("1"), Decimal("0"), Decimal("0"))
+
+    page, cursor = await service.history(session, 1, limit=3)
+    assert [e.entry_type for e in page] == ["adjusted", "used", "earned"] and cursor
+    page, cursor = await service.history(session, 1, limit=4)
+    assert [e.hours for e in page][-1] == Decimal("2") and cursor is None
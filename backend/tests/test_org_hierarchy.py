@@ -0,0 +1,63 @@
+from app.services.org_hierarchy import OrgHierarchy, OrgNode
+
+
+def make_node(id, manager_id=None, is_active=True, status="Active", function=None):
+    return OrgNode(
+        id=id,
+        employee_id=f"EMP{id:03d}",
+        name=f"Employee {id}",
+        email=None,
+        job_title=None,
+        department=None,
+        function=function,
+        role="viewer",
+        line_manager_id=manager_id,
+        is_active=is_active,
+        employment_status=status,
+    )
+
+
+def build_org():
+    # 1 -> (2 -> (4, 5), 3 -> 6)
+    return OrgHierarchy([
+        make_node(1),
+        make_node(2, 1),
+        make_node(3, 1),
+        make_node(4, 2),
+        make_node(5, 2, is_active=False),
+        make_node(6, 3),
+    ])
+
+
+def test_direct_reports_and_has_team():
+    org = build_org()
+    assert org.direct_report_ids(2) == (4, 5)
+    assert [n.id for n in org.direct_reports(2, active_only=True)] == [4]
+    assert org.has_team(3)
+    assert not org.has_team(4)
+    assert {m.id for m in org.managers()} == {1, 2, 3}
+
+
+def test_subtree_and_membership():
+    org = build_org()
+    assert sorted(org.subtree_ids(1)) == [2, 3, 4, 5, 6]
+    assert sorted(org.subtree_ids(2)) == [4, 5]
+    assert org.subtree_ids(6) == []
+    assert org.is_in_subtree(1, 6)
+    assert not org.is_in_subtree(2, 6)
+    assert not org.is_in_subtree(2, 2)
+
+
+def test_manager_chain_and_cycles():
+    org = build_org()
+    assert [n.id for n in org.manager_chain(4)] == [2, 1]
+
+    cyclic = OrgHierarchy([make_node(1, 2), make_node(2, 1), make_node(3, 1)])
+    assert [n.id for n in cyclic.manager_chain(3)] == [1, 2]
+    assert sorted(cyclic.subtree_ids(1)) == [2, 3]
+
+
+def test_active_employee_flag():
+    assert make_node(1, status=" active ").is_active_employee
+    assert not make_node(1, status="Resigned").is_active_employee
+    assert not make_node(1, is_active=False).is_active_employee
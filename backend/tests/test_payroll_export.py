@@ -0,0 +1,79 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.models.employee import Employee
+from app.models.employee_bank import EmployeeBank
+from app.models.employee_compliance import EmployeeCompliance
+from app.models.timesheet import Timesheet
+from app.services.payroll_export import CSV_HEADER, PayrollExportService
+
+
+@pytest.fixture
+def db_tables():
+    return (Employee, EmployeeBank, EmployeeCompliance, Timesheet)
+
+
+@pytest.fixture
+async def factory(db_factory):
+    async with db_factory() as s:
+        for pk, status in enumerate(["hr_approved", "hr_approved", "submitted"], start=1):
+            s.add(Employee(
+                id=pk, employee_id=f"EMP00{pk}", name=f"Employee {pk}", date_of_birth=date(1990, 1, 1),
+                password_hash="x", role="viewer", is_active=True,
+                basic_salary=Decimal("5000"), housing_allowance=Decimal("2000"),
+            ))
+            s.add(Timesheet(
+                employee_id=pk, year=2026, month=9, status=status, total_working_days=22,
+                total_absent_days=1, total_overtime_amount=Decimal("150.50"),
+            ))
+        s.add(EmployeeBank(employee_id=1, bank_name="ENBD", swift_code="EBILAEAD", iban="AE070331234567890123456"))
+        s.add(EmployeeCompliance(employee_id=1, work_permit_number="12345678"))
+        await s.commit()
+    return db_factory
+
+
+async def run_export(factory, export_format, reference="PAY-2026-09"):
+    service = PayrollExportService()
+    async with factory() as session:
+        claim = await service.claim(session, 2026, 9, reference)
+    chunks = [c async for c in service.stream(factory, 2026, 9, claim, export_format)]
+    return claim, "".join(chunks)
+
+
+@pytest.mark.anyio
+async def test_csv_export_claims_approved_rows_once(factory):
+    claim, body = await run_export(factory, "csv")
+    lines = body.splitlines()
+
+    assert (claim.newly_exported, claim.total_rows, claim.total_amount) == (2, 2, Decimal("14301.00"))
+    assert lines[0].split(",") == CSV_HEADER
+    assert lines[1].startswith("PAY-2026-09,EMP001,Employee 1,12345678,ENBD,EBILAEAD,")
+    assert len(lines) == 3
+
+    async with factory() as session:
+        statuses = (await session.execute(select(Timesheet.status).order_by(Timesheet.id))).scalars().all()
+    assert statuses == ["exported", "exported", "submitted"]
+
+    # Retry replays the same batch without claiming anything new
+    retry, again = await run_export(factory, "csv")
+    assert (retry.newly_exported, retry.total_rows) == (0, 2)
+    assert again == body
+
+    # A different reference finds nothing left to export
+    other, _ = await run_export(factory, "csv", reference="PAY-2026-09-B")
+    assert other.total_rows == 0
+
+
+@pytest.mark.anyio
+async def test_sif_export_is_fixed_width_with_control_record(factory):
+    claim, body = await run_export(factory, "sif")
+    *edrs, scr = body.splitlines()
+
+    assert len(edrs) == 2 and len({len(line) for line in edrs}) == 1
+    assert edrs[0].startswith("EDR12345678      EBILAEAD   AE070331234567890123456")
+    assert "2026-09-012026-09-300021" in edrs[0]
+    assert edrs[1].startswith("EDREMP002")
+    assert scr.startswith("SCR") and scr.endswith("092026000002000000000014301.00AED")
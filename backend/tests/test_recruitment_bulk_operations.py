@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import event, func, insert, select
+
+import app.models  # noqa: F401 - configure mappers
+from app.models.activity_log import ActivityLog
+from app.models.cache_version import CacheVersion
+from app.models.recruitment import (
+    Candidate, CandidateStageTransition, RecruitmentRequest, RecruitmentStageStat
+)
+from app.services.recruitment_metrics import recruitment_metrics_service
+from app.services.recruitment_notifications import recruitment_notification_service
+from app.services.recruitment_service import recruitment_service
+
+POOL_SIZE = 450
+
+
+@pytest.fixture
+def db_tables():
+    return (RecruitmentRequest, Candidate, CandidateStageTransition, RecruitmentStageStat, CacheVersion, ActivityLog)
+
+
+@pytest.fixture
+async def db(db_engine, db_factory):
+    async with db_factory() as s:
+        s.add(RecruitmentRequest(
+            id=1, request_number="RR-1", position_title="Data Analyst", department="IT",
+            requested_by="HR", employment_type="Full-time",
+        ))
+        await s.flush()
+        await s.execute(insert(Candidate), [
+            {
+                "id": n, "candidate_number": f"CAN-{n}", "recruitment_request_id": 1,
+                "full_name": f"Candidate {n}", "email": f"c{n}@example.com",
+                "stage": "hired" if n == 1 else "screening", "status": "screening",
+                "recruiter_notes": "Strong SQL" if n == 2 else None,
+            }
+            for n in range(1, POOL_SIZE + 1)
+        ])
+        await s.commit()
+
+    statements = []
+    event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    yield db_factory, statements
+    recruitment_metrics_service._snapshot.clear()
+
+
+@pytest.mark.anyio
+async def test_bulk_reject_closes_a_requisition_in_chunks(db, monkeypatch):
+    factory, statements = db
+    sent = []
+
+    async def fake_send(email, full_name, position_title, stage):
+        sent.append((email, position_title, stage))
+        return True
+
+    monkeypatch.setattr(recruitment_notification_service, "send_stage_update", fake_send)
+    ids = list(range(1, POOL_SIZE + 1)) + [9999, 2]
+
+    async with factory() as session:
+        result = await recruitment_service.bulk_reject_candidates(
+            session, ids, "Position closed", performed_by_id="EMP001", notify_candidates=True
+        )
+        await recruitment_notification_service.wait_stage_updates()
+
+        assert result["success_count"] == POOL_SIZE - 1
+        assert result["failed_ids"] == [1, 9999]
+        # SELECT + UPDATE per 200-candidate chunk, not a round-trip per candidate
+        assert len(statements) < 25
+
+        stages = dict((await session.execute(
+            select(Candidate.stage, func.count()).group_by(Candidate.stage)
+        )).all())
+        assert stages == {"hired": 1, "rejected": POOL_SIZE - 1}
+        notes = (await session.execute(select(Candidate.recruiter_notes).where(Candidate.id == 2))).scalar()
+        assert notes.startswith("Strong SQL\n[") and notes.endswith("] Rejected: Position closed")
+        reason = (await session.execute(select(Candidate.rejection_reason).where(Candidate.id == 3))).scalar()
+        assert reason == "Position closed"
+
+        transitions = (await session.execute(select(func.count()).select_from(CandidateStageTransition))).scalar()
+        activities = (await session.execute(
+            select(func.count()).select_from(ActivityLog).where(ActivityLog.performed_by_id == "EMP001")
+        )).scalar()
+        assert transitions == activities == POOL_SIZE - 1
+
+    assert len(sent) == POOL_SIZE - 1
+    assert sent[0] == ("c2@example.com", "Data Analyst", "rejected")
+
+
+@pytest.mark.anyio
+async def test_bulk_stage_update_validates_stage_once(db):
+    factory, statements = db
+    async with factory() as session:
+        with pytest.raises(ValueError):
+            await recruitment_service.bulk_update_stage(session, [2, 3], "archived")
+        assert statements == []
+
+        result = await recruitment_service.bulk_update_stage(session, [2, 3], "interview", notes="Shortlisted")
+        rows = (await session.execute(
+            select(Candidate.stage, Candidate.status, Candidate.recruiter_notes).where(Candidate.id.in_([2, 3]))
+        )).all()
+
+    assert result["success_count"] == 2
+    assert {(stage, status) for stage, status, _ in rows} == {("interview", "interview")}
+    assert all(notes.endswith("Stage changed to interview: Shortlisted") for _, _, notes in rows)
@@ -0,0 +1,162 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+
+import app.models  # noqa: F401 - configure mappers
+from app.models.cache_version import CacheVersion
+from app.models.recruitment import Candidate, CandidateStageTransition, RecruitmentRequest, RecruitmentStageStat
+from app.services.recruitment_metrics import entry_transition, recruitment_metrics_service
+from app.services.recruitment_service import recruitment_service
+
+
+def days_ago(days):
+    return datetime.now() - timedelta(days=days)
+
+
+@pytest.fixture
+def db_tables():
+    return (RecruitmentRequest, Candidate, CandidateStageTransition, RecruitmentStageStat, CacheVersion)
+
+
+@pytest.fixture
+async def db(db_engine, db_factory):
+    def request(id, status, **kwargs):
+        return RecruitmentRequest(
+            id=id, request_number=f"RR-{id}", position_title="Engineer", department="IT",
+            requested_by="HR", employment_type="Full-time", status=status, **kwargs,
+        )
+
+    def candidate(id, stage, created, changed, source=None):
+        return Candidate(
+            id=id, candidate_number=f"CAN-{id}", recruitment_request_id=1, full_name=f"Candidate {id}",
+            email=f"candidate{id}@example.com",
+            stage=stage, status=stage, source=source, created_at=created, stage_changed_at=changed,
+        )
+
+    async with db_factory() as s:
+        s.add_all([
+            request(1, "approved", priority="high", created_at=days_ago(20),
+                    target_hire_date=date.today() - timedelta(days=1)),
+            request(2, "filled"),
+            request(3, "cancelled"),
+        ])
+        s.add_all([
+            candidate(1, "screening", days_ago(10), days_ago(4), source="LinkedIn"),
+            candidate(2, "applied", days_ago(3), days_ago(3)),
+            candidate(3, "applied", days_ago(2), days_ago(2), source="Referral"),
+        ])
+        await s.commit()
+
+    statements = []
+    event.listen(db_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    recruitment_metrics_service._snapshot.clear()
+    yield db_factory, statements
+    recruitment_metrics_service._snapshot.clear()
+
+
+@pytest.mark.anyio
+async def test_metrics_from_aggregates_and_transition_history(db):
+    factory, statements = db
+    async with factory() as session:
+        for stage in ("interview", "offer", "hired"):
+            await recruitment_service.move_candidate_stage(session, 1, stage)
+        await recruitment_service.reject_candidate(session, 2, "Not a fit")
+
+        transitions = (await session.execute(
+            select(CandidateStageTransition.from_stage, CandidateStageTransition.to_stage)
+            .order_by(CandidateStageTransition.id)
+        )).all()
+        assert [tuple(t) for t in transitions] == [
+            ("screening", "interview"), ("interview", "offer"), ("offer", "hired"), ("applied", "rejected"),
+        ]
+
+        statements.clear()
+        metrics = await recruitment_service.get_recruitment_metrics(session)
+        # Version check plus the request, candidate and duration aggregates
+        assert len(statements) == 4
+
+    assert metrics["total_requests"] == 3
+    assert (metrics["active_requests"], metrics["filled_requests"], metrics["cancelled_requests"]) == (1, 1, 1)
+    assert metrics["overdue_requests"] == 1
+    assert metrics["requests_by_priority"] == {"high": 1}
+    assert metrics["total_candidates"] == 3
+    assert metrics["candidates_by_stage"] == {
+        "applied": 1, "screening": 0, "interview": 0, "offer": 0, "hired": 1, "rejected": 1,
+    }
+    assert metrics["candidates_by_source"] == {"LinkedIn": 1, "Referral": 1}
+    assert metrics["recent_hires"] == 1
+    assert metrics["avg_time_in_screening"] == 4.0
+    assert metrics["avg_time_to_offer"] == 10.0
+    assert metrics["avg_time_to_fill"] == 20.0
+    assert metrics["offer_acceptance_rate"] == 100.0
+
+
+@pytest.mark.anyio
+async def test_snapshot_is_reused_until_a_candidate_write(db):
+    factory, statements = db
+    async with factory() as session:
+        first = await recruitment_service.get_stats(session)
+        statements.clear()
+        assert await recruitment_service.get_stats(session) == first
+        assert statements == []
+
+        await recruitment_service.move_candidate_stage(session, 3, "screening")
+        stats = await recruitment_service.get_stats(session)
+        version = (await session.execute(select(func.max(CacheVersion.version)))).scalar()
+
+    assert first["by_stage"]["screening"] == 1
+    assert stats["by_stage"]["screening"] == 2
+    assert stats["total_candidates"] == 3
+    assert version == 1
+
+
+@pytest.mark.anyio
+async def test_funnel_from_incremental_stage_stats(db):
+    factory, _ = db
+    async with factory() as session:
+        await recruitment_metrics_service.record_transitions(
+            session, [entry_transition(2, 1, days_ago(3)), entry_transition(3, 1, days_ago(2))]
+        )
+        await session.commit()
+        await recruitment_service.move_candidate_stage(session, 2, "screening")
+        await recruitment_service.move_candidate_stage(session, 2, "interview")
+        await recruitment_service.reject_candidate(session, 3, "Not a fit")
+
+        funnel = await recruitment_service.get_funnel(session, 1)
+
+    stages = {s["stage"]: s for s in funnel["stages"]}
+    assert (funnel["applications"], funnel["hires"], funnel["hire_rate"]) == (2, 0, 0.0)
+    assert (stages["applied"]["entered"], stages["applied"]["current"]) == (2, 0)
+    assert stages["applied"]["conversion_rate"] == 50.0
+    assert stages["applied"]["avg_days_in_stage"] == 2.5
+    assert stages["screening"]["conversion_rate"] == 100.0
+    assert (stages["interview"]["current"], stages["interview"]["conversion_rate"]) == (1, 0.0)
+    assert stages["interview"]["avg_days_to_reach"] == 3.0
+    assert stages["rejected"]["entered"] == 1
+    assert stages["rejected"]["conversion_rate"] is None
+
+
+@pytest.mark.anyio
+async def test_candidates_predating_the_log_get_one_entry_transition(db):
+    factory, _ = db
+    async with factory() as session:
+        # Candidate 2 was moved after the log started, 1 and 3 never were
+        await recruitment_service.move_candidate_stage(session, 2, "screening")
+        assert await recruitment_metrics_service.seed_entry_transitions(session) == 3
+        await session.commit()
+        assert await recruitment_metrics_service.seed_entry_transitions(session) == 0
+
+        entries = {
+            row.candidate_id: row for row in (await session.execute(
+                select(CandidateStageTransition).where(CandidateStageTransition.from_stage.is_(None))
+            )).scalars()
+        }
+        funnel = await recruitment_service.get_funnel(session, 1)
+
+    assert {cid: row.to_stage for cid, row in entries.items()} == {1: "screening", 2: "applied", 3: "applied"}
+    assert entries[1].elapsed_seconds == 6 * 86400 and entries[2].elapsed_seconds == 0
+    stages = {s["stage"]: s for s in funnel["stages"]}
+    assert funnel["applications"] == 3
+    assert (stages["applied"]["current"], stages["screening"]["current"]) == (1, 2)
+    assert all(s["current"] >= 0 for s in funnel["stages"])
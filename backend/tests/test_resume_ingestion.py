@@ -0,0 +1,135 @@
+import io
+import zipfile
+
+import pytest
+from sqlalchemy import select
+from starlette.datastructures import UploadFile
+
+import app.models  # noqa: F401 - configure mappers
+from app.models.cache_version import CacheVersion
+from app.models.cv_cache import CVScoreCache, CVTextCache
+from app.models.passes import Pass
+from app.models.recruitment import (
+    Candidate, CandidateStageTransition, RecruitmentRequest, RecruitmentStageStat,
+    ResumeIngestionFile, ResumeIngestionJob,
+)
+from app.schemas.recruitment import ResumeIngestionJobResponse
+from app.services import resume_ingestion
+from app.services.cv_cache import content_hash, cv_cache
+from app.services.cv_scoring_queue import CVScoringQueue
+from app.services.cv_scoring_service import StubCVScorer, set_cv_scorer
+from app.services.resume_ingestion import IngestionError, ResumeIngestionService, contact_from_text
+
+
+def cv(name, email, phone, skills):
+    return (
+        f"{name}\n{email} | {phone}\n"
+        f"Engineer with 5 years of experience in {skills}. Bachelor of Engineering.\n"
+    ).encode()
+
+
+ALICE = cv("Alice Khan", "alice@example.com", "050 123 4567", "Python, FastAPI and AWS")
+BOB = cv("Bob Das", "bob@example.com", "055 765 4321", "Java and SQL")
+EXISTING = cv("Cara Lee", "cara@example.com", "052 000 1111", "Python")
+
+
+@pytest.fixture
+def db_tables():
+    return (
+        RecruitmentRequest, Candidate, Pass, CVTextCache, CVScoreCache,
+        CacheVersion, CandidateStageTransition, RecruitmentStageStat, ResumeIngestionJob, ResumeIngestionFile,
+    )
+
+
+@pytest.fixture
+async def factory(tmp_path, monkeypatch, db_factory):
+    monkeypatch.setattr(resume_ingestion, "RESUME_DIR", tmp_path / "resumes")
+    monkeypatch.setattr(resume_ingestion, "INCOMING_DIR", tmp_path / "resumes" / "incoming")
+    async with db_factory() as s:
+        s.add(RecruitmentRequest(
+            id=1, request_number="RR-1", position_title="Python Engineer", department="IT",
+            requested_by="HR", employment_type="Full-time",
+            job_description="Python APIs on AWS", required_skills=["Python", "FastAPI", "AWS"],
+        ))
+        s.add(Candidate(id=1, candidate_number="CAN-OLD-1", recruitment_request_id=1, full_name="Cara Lee",
+                        email="Cara@Example.com", resume_hash=content_hash(b"old upload")))
+        await s.commit()
+    set_cv_scorer(StubCVScorer())
+    yield db_factory
+    set_cv_scorer(None)
+    cv_cache.clear_memory()
+
+
+def zipped(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+def upload(name, content):
+    return UploadFile(file=io.BytesIO(content), filename=name)
+
+
+def test_contact_from_text_falls_back_to_filename():
+    contact = contact_from_text("Summary\njane@x.org  +971 50 111 2222", "jane_doe_CV_2024.pdf")
+
+    assert contact == {"name": "Jane Doe", "email": "jane@x.org", "mobile_number": "+971501112222"}
+
+
+@pytest.mark.anyio
+async def test_bulk_upload_creates_and_dedups_candidates(factory, tmp_path):
+    queue = CVScoringQueue(session_factory=factory, workers=2)
+    service = ResumeIngestionService(session_factory=factory, scoring_queue=queue, llm_top_n=1)
+    archive = zipped({
+        "batch/alice.txt": ALICE, "batch/alice_copy.txt": ALICE, "__MACOSX/batch/._alice.txt": b"",
+        "cara.txt": EXISTING, "notes.xlsx": b"x", "old.txt": b"old upload",
+    })
+    bob_again = BOB.replace(b"bob@example.com", b"Bob@Example.com").replace(b"Bob Das", b"Robert Das")
+
+    job = await service.submit(1, [upload("cvs.zip", archive), upload("bob.txt", BOB), upload("bob2.txt", bob_again)], "HR1")
+    await service.wait(job.job_id)
+    await queue.wait_idle()
+    await queue.stop()
+
+    files = {f.filename: f for f in job.files}
+    assert job.status == "completed" and job.total_files == 7
+    assert job.counts == {"created": 2, "duplicate": 4, "failed": 1}
+    assert files["alice_copy.txt"].error.startswith("Same CV as file #0")
+    assert files["old.txt"].duplicate_of == 1 and files["cara.txt"].duplicate_of == 1
+    assert files["bob2.txt"].status == "duplicate" and files["notes.xlsx"].error == "Unsupported file type"
+
+    async with factory() as s:
+        created = {c.email: c for c in (await s.execute(select(Candidate).where(Candidate.id != 1))).scalars()}
+        passes = (await s.execute(select(Pass))).scalars().all()
+    alice = created["alice@example.com"]
+    assert set(created) == {"alice@example.com", "bob@example.com"}
+    assert (alice.full_name, alice.phone, alice.resume_hash) == ("Alice Khan", "+971501234567", content_hash(ALICE))
+    assert {p.pass_number for p in passes} == {c.pass_number for c in created.values()}
+    assert len({c.candidate_number for c in created.values()}) == 2
+    assert (tmp_path / "resumes" / f"{alice.candidate_number}_alice.txt").read_bytes() == ALICE
+    assert not (tmp_path / "resumes" / "incoming" / job.job_id).exists()
+    # Pre-ranked locally; only the best match went to the LLM scorer
+    assert alice.screening_rank == 1 and alice.cv_scoring_status == "scored"
+    assert created["bob@example.com"].cv_scoring_status is None
+
+    # Progress is read back from the database, as another worker would
+    async with factory() as s:
+        stored = await ResumeIngestionService(session_factory=factory).get_job(s, job.job_id)
+        response = ResumeIngestionJobResponse.model_validate(stored)
+    assert response.status == "completed" and response.total_files == 7
+    assert response.counts == job.counts and response.files[0].candidate_id == alice.id
+    assert [f.status for f in response.files] == [f.status for f in job.files]
+    assert response.files[1].error.startswith("Same CV as file #0")
+
+
+@pytest.mark.anyio
+async def test_bulk_upload_rejects_bad_archives(factory, monkeypatch):
+    service = ResumeIngestionService(session_factory=factory, llm_top_n=0)
+
+    with pytest.raises(IngestionError, match="Invalid zip"):
+        await service.submit(1, [upload("cvs.zip", b"not a zip")], "HR1")
+    monkeypatch.setattr(resume_ingestion, "MAX_INGEST_FILES", 2)
+    with pytest.raises(IngestionError, match="Too many files"):
+        await service.submit(1, [upload("a.txt", ALICE), upload("b.txt", BOB), upload("c.txt", EXISTING)], "HR1")
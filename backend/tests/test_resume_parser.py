@@ -0,0 +1,30 @@
+import pytest
+
+from app.services.resume_parser import PYRESPARSER_AVAILABLE, ResumeParserService
+
+
+def test_uae_data_uses_first_listed_visa_keyword():
+    service = ResumeParserService(workers=1)
+    text = "Holder of a tourist visa previously; now on Employment Visa (transferable). EID 784 1990 1234567 1"
+
+    data = service._extract_uae_specific_data(text)
+
+    assert data["emirates_id"] == "784-1990-1234567-1"
+    assert "Employment Visa" in data["visa_status"]
+    assert service._extract_uae_specific_data("No visa details") == {}
+    assert service._parse_experience("about 12 years") == 12
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(PYRESPARSER_AVAILABLE, reason="checks the fallback without pyresparser")
+async def test_parse_many_reports_unavailable_without_pyresparser(tmp_path):
+    service = ResumeParserService(workers=1)
+    resume = tmp_path / "cv.txt"
+    resume.write_text("Jane Doe")
+
+    results = await service.parse_many([(b"Jane Doe", "cv.txt"), (b"%PDF", "cv.pdf")])
+    from_disk = await service.parse_resume(str(resume))
+
+    assert [r["parsed"] for r in results] == [False, False]
+    assert from_disk["parsed"] is False and "not available" in from_disk["error"]
+    assert service._pool is None  # no workers started when parsing is disabled
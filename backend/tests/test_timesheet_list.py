@@ -0,0 +1,73 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models.employee import Employee
+from app.models.timesheet import Timesheet
+from app.routers.timesheets import list_timesheets
+from app.schemas.timesheet import TimesheetGridRow, TimesheetSummary
+
+
+@pytest.fixture
+def db_tables():
+    return (Employee, Timesheet)
+
+
+@pytest.fixture
+async def session(db_session):
+    rows = [
+        ("Amal", "draft", "0", False),
+        ("Bilal", "submitted", "6", True),
+        ("Chen", "hr_approved", "2", False),
+        ("Dina", "rejected", "4", True),
+        ("Eli", "exported", "0", False),
+    ]
+    for pk, (name, status, overtime, issues) in enumerate(rows, start=1):
+        db_session.add(Employee(
+            id=pk, employee_id=f"EMP00{pk}", name=name, date_of_birth=date(1990, 1, 1),
+            password_hash="x", role="viewer", is_active=True,
+        ))
+        db_session.add(Timesheet(
+            employee_id=pk, year=2026, month=9, status=status,
+            total_overtime_hours=Decimal(overtime), has_compliance_issues=issues,
+        ))
+    db_session.add(Employee(
+        id=9, employee_id="HR009", name="HR", date_of_birth=date(1990, 1, 1),
+        password_hash="x", role="hr", is_active=True,
+    ))
+    await db_session.commit()
+    return db_session
+
+
+async def list_page(session, **params):
+    hr = await session.get(Employee, 9)
+    defaults = {"status_filter": None, "sort_by": "employee", "compact": False, "page": 1, "page_size": 50}
+    return await list_timesheets(2026, 9, **{**defaults, **params}, current_user=hr, session=session)
+
+
+@pytest.mark.anyio
+async def test_counts_cover_selection_while_list_is_one_sorted_page(session):
+    result = await list_page(session, sort_by="overtime", page_size=2)
+
+    assert (result.total_count, result.pending_count, result.approved_count, result.rejected_count) == (5, 2, 2, 1)
+    assert result.status_counts["exported"] == 1
+    assert result.total_pages == 3
+    assert [t.employee_name for t in result.timesheets] == ["Bilal", "Dina"]
+    assert all(isinstance(t, TimesheetSummary) for t in result.timesheets)
+
+    last = await list_page(session, sort_by="overtime", page_size=2, page=3)
+    assert [t.employee_name for t in last.timesheets] == ["Eli"]
+
+
+@pytest.mark.anyio
+async def test_compact_projection_and_compliance_sort(session):
+    result = await list_page(session, sort_by="compliance", compact=True)
+
+    assert [t.employee_name for t in result.timesheets] == ["Bilal", "Dina", "Amal", "Chen", "Eli"]
+    assert all(isinstance(t, TimesheetGridRow) for t in result.timesheets)
+    payload = result.model_dump()
+    assert "days_at_kezad" not in payload["timesheets"][0]
+
+    filtered = await list_page(session, status_filter="rejected", compact=True)
+    assert filtered.total_count == 1 and filtered.status_counts == {"rejected": 1}
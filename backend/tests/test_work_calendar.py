@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+from app.services.work_calendar import HolidayInfo, WorkCalendar
+
+
+def holiday(pk, name, start, end):
+    return HolidayInfo(
+        id=pk, name=name, name_arabic=None, start_date=start, end_date=end, year=start.year,
+        holiday_type="uae_official", is_paid=True, description=None, is_active=True, created_at=None,
+    )
+
+
+# Eid Al Fitr 2026 (Fri 20 - Mon 23 March) and National Day (Wed 2 - Thu 3 Dec)
+HOLIDAYS = [
+    holiday(2, "Eid Al Fitr", date(2026, 3, 20), date(2026, 3, 23)),
+    holiday(3, "National Day", date(2026, 12, 2), date(2026, 12, 3)),
+]
+
+
+def naive_working_days(start, end, off_days, holidays):
+    count = 0
+    day = start
+    while day <= end:
+        if day.weekday() not in off_days and day not in holidays:
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+def test_working_days_respect_weekend_pattern_and_holidays():
+    cal = WorkCalendar(HOLIDAYS)
+    # Mon 16 - Sun 29 March 2026
+    start, end = date(2026, 3, 16), date(2026, 3, 29)
+    # 5-day week (Fri/Sat off): 10 working days minus Sun 22 and Mon 23 = 8
+    assert cal.working_days(start, end) == 8
+    # 6-day week: Fri off only -> 12 days minus Sat 21, Sun 22, Mon 23 holidays = 9
+    assert cal.working_days(start, end, "6 days") == 9
+    assert cal.working_days(start, end, exclude_holidays=False) == 10
+    assert cal.working_days(end, start) == 0
+
+    assert cal.is_holiday(date(2026, 3, 21))
+    assert not cal.is_holiday(date(2026, 3, 24))
+    assert cal.is_weekend(date(2026, 3, 27))
+    assert not cal.is_weekend(date(2026, 3, 28), "6 days")
+    assert cal.holiday_days(date(2026, 3, 21), date(2026, 12, 2)) == 4
+
+
+def test_batch_matches_day_by_day_count():
+    cal = WorkCalendar(HOLIDAYS)
+    holiday_set = {date(2026, 3, d) for d in range(20, 24)} | {date(2026, 12, 2), date(2026, 12, 3)}
+    starts = [date(2026, 1, 1) + timedelta(days=7 * i) for i in range(50)]
+    ends = [s + timedelta(days=(i * 11) % 45) for i, s in enumerate(starts)]
+    schedules = ["6 days" if i % 3 == 0 else "5 days" for i in range(50)]
+
+    counts = cal.working_days_batch(starts, ends, schedules)
+
+    for start, end, schedule, count in zip(starts, ends, schedules, counts):
+        off_days = {4} if schedule == "6 days" else {4, 5}
+        assert count == naive_working_days(start, end, off_days, holiday_set)
+    assert list(cal.working_days_batch([date(2026, 5, 2)], [date(2026, 5, 1)])) == [0]
+
+
+def test_holiday_point_and_range_lookups():
+    cal = WorkCalendar([
+        HOLIDAYS[1],
+        holiday(1, "New Year's Day", date(2026, 1, 1), date(2026, 1, 1)),
+        HOLIDAYS[0],
+        # Company day inside the Eid break
+        holiday(4, "Company Day", date(2026, 3, 21), date(2026, 3, 21)),
+    ])
+    assert cal.holiday_on(date(2026, 3, 22)).name == "Eid Al Fitr"
+    assert cal.holiday_on(date(2026, 3, 24)) is None
+    assert cal.holiday_on(date(2025, 12, 31)) is None
+
+    assert [h.id for h in cal.holidays_in_range(date(2026, 3, 21), date(2026, 12, 2))] == [2, 4, 3]
+    assert [h.id for h in cal.holidays_in_range(date(2026, 3, 23), date(2026, 3, 23))] == [2]
+    assert cal.holidays_in_range(date(2026, 4, 1), date(2026, 11, 30)) == []
+    assert cal.holidays_in_range(date(2026, 12, 3), date(2026, 1, 1)) == []
+
+
+def test_next_holiday_includes_holiday_in_progress():
+    cal = WorkCalendar(HOLIDAYS + [holiday(1, "New Year's Day", date(2026, 1, 1), date(2026, 1, 1))])
+    assert cal.next_holiday(date(2026, 1, 2)).name == "Eid Al Fitr"
+    assert cal.next_holiday(date(2026, 3, 22)).name == "Eid Al Fitr"
+    assert cal.next_holiday(date(2026, 3, 24)).name == "National Day"
+    assert cal.next_holiday(date(2026, 12, 4)) is None
+    assert WorkCalendar([]).next_holiday(date(2026, 1, 1)) is None